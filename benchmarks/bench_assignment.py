@@ -0,0 +1,93 @@
+"""
+Runtime benchmark of the auction assignment algorithm.
+
+For each epoch size, builds a cost matrix of vehicles x orders from
+random positions on a plane and times a cold solve. It then moves to the
+next epoch by replacing a fraction of the orders and moving the assigned
+vehicles, and times the solve warm started from the previous prices.
+
+Usage:
+    python benchmarks/bench_assignment.py --sizes 50 100 200 400 800 --churn 0.05
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.assignment import auction_assignment  # noqa: E402
+
+
+def epoch_costs(vehicles, orders, slack):
+    """
+    Cost of each vehicle picking up each order.
+
+    Args:
+        vehicles (numpy.ndarray): Vehicle positions, shape (n, 2)
+        orders (numpy.ndarray): Order origins, shape (m, 2)
+        slack (numpy.ndarray): Slack of each order, shape (m,)
+
+    Returns:
+        numpy.ndarray: Integer-valued cost matrix of shape (n, m)
+    """
+    travel = np.hypot(*(vehicles[:, None, :] - orders[None, :, :]).transpose(2, 0, 1))
+    return np.rint(0.5 * travel + 0.5 * slack[None, :])
+
+
+def timed(cost, prices=None, repeat=3):
+    """
+    Best solve time of a cost matrix.
+
+    Args:
+        cost (numpy.ndarray): Cost matrix
+        prices (numpy.ndarray, optional): Warm start prices
+        repeat (int, optional): Number of solves. Defaults to 3.
+
+    Returns:
+        tuple: (seconds, assignment, prices)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        assignment, new_prices = auction_assignment(cost, prices)
+        best = min(best, time.perf_counter() - start)
+    return best, assignment, new_prices
+
+
+def main():
+    """
+    Command-line entry point of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200, 400, 800])
+    parser.add_argument('--churn', type=float, default=0.05, help='fraction of orders replaced between epochs')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'tamanho':>8} {'frio (ms)':>10} {'morno (ms)':>11} {'ganho':>7}")
+    for size in args.sizes:
+        vehicles = rng.uniform(0, 100, (size, 2))
+        orders = rng.uniform(0, 100, (size, 2))
+        slack = rng.uniform(0, 240, size)
+        cold, assignment, prices = timed(epoch_costs(vehicles, orders, slack))
+
+        # Próxima época: parte dos pedidos é trocada e os veículos atribuídos andam
+        replaced = rng.random(size) < args.churn
+        orders[replaced] = rng.uniform(0, 100, (replaced.sum(), 2))
+        slack[replaced] = rng.uniform(0, 240, replaced.sum())
+        prices[replaced] = 0.0
+        moved = rng.random(size) < args.churn
+        vehicles[moved] = orders[assignment[moved]]
+        warm, _, _ = timed(epoch_costs(vehicles, orders, slack), prices)
+
+        print(f"{size:>8} {cold * 1000:>10.1f} {warm * 1000:>11.1f} {cold / warm:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
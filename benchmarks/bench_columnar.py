@@ -0,0 +1,95 @@
+"""
+Memory and access-time benchmark of the columnar order views.
+
+Builds the same orders as regular Order objects, as CompactOrder objects
+and as an OrderStore, touches a fraction of the rows, as a run that only
+reaches part of the orders does, and reports the memory taken by the
+objects or views (measured with tracemalloc, without the NumPy columns)
+and the time of an attribute read or write.
+
+Usage:
+    python benchmarks/bench_columnar.py --orders 1000000 --touched 0.1
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.columnar import OrderStore  # noqa: E402
+from models.compact import CompactOrder  # noqa: E402
+from models.order import LOADED, Order  # noqa: E402
+
+
+def order_args(n_orders):
+    """
+    Constructor arguments of the synthetic orders.
+
+    Args:
+        n_orders (int): Number of orders
+
+    Returns:
+        list: Arguments of each order
+    """
+    return [(f"O{i}", f"L{i % 50}", f"L{(i + 1) % 50}", i % 1440, i % 1440 + 120, 1 + i % 5)
+            for i in range(n_orders)]
+
+
+def access_ns(orders, repeat=5):
+    """
+    Mean time of an attribute read or write.
+
+    Args:
+        orders (list): Orders or views to access
+        repeat (int, optional): Passes over the orders. Defaults to 5.
+
+    Returns:
+        float: Nanoseconds per access
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for order in orders:
+            order.due_time + order.units + order.release_time
+            order.status = LOADED
+    return (time.perf_counter() - start) / (4 * repeat * len(orders)) * 1e9
+
+
+def main():
+    """
+    Command-line entry point of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--touched', type=float, default=0.1, help='fraction of the rows accessed')
+    args = parser.parse_args()
+
+    arguments = order_args(args.orders)
+    step = max(1, round(1 / args.touched))
+    for name, build in (('regular', lambda: [Order(*row) for row in arguments]),
+                        ('compact', lambda: [CompactOrder(*row) for row in arguments])):
+        tracemalloc.start()
+        orders = build()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        touched = orders[::step]
+        print(f"{name:>8}: {memory / 2 ** 20:7.1f} MB  {access_ns(touched):6.1f} ns por acesso")
+        del orders, touched
+
+    store = OrderStore.from_orders(Order(*row) for row in arguments)
+    tracemalloc.start()
+    views = store.views()
+    touched = [views[i] for i in range(0, args.orders, step)]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    columns = sum(getattr(store, name).nbytes for name in (
+        'origin', 'destination', 'release_time', 'due_time', 'units', 'delivery_time', 'status'))
+    print(f"columnar: {memory / 2 ** 20:7.1f} MB  {access_ns(touched):6.1f} ns por acesso  "
+          f"(+ {columns / 2 ** 20:.1f} MB de colunas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Decision-time benchmark for the greedy dispatch policy.
+
+Builds a synthetic network with many vehicles and open orders, frees the
+whole fleet at the same decision epoch and times one call to
+GreedyDispatchPolicy.choose_actions_batch, reporting the time per vehicle.
+
+Usage:
+    python benchmarks/bench_dispatch.py --vehicles 5000 --orders 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.arc import Arc  # noqa: E402
+from models.greedy_policy import GreedyDispatchPolicy  # noqa: E402
+from models.location import Location  # noqa: E402
+from models.network import Network  # noqa: E402
+from models.order import Order  # noqa: E402
+from models.vehicle import Vehicle  # noqa: E402
+
+
+def build_instance(n_vehicles, n_orders, n_locations, seed=0):
+    """
+    Build a synthetic instance with every order already released.
+
+    The network is a ring plus random chords, so every location is
+    reachable from every other.
+
+    Args:
+        n_vehicles (int): Number of vehicles
+        n_orders (int): Number of open orders
+        n_locations (int): Number of locations
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        tuple: (locations, network, fleet)
+    """
+    rng = random.Random(seed)
+    location_ids = [f"L{i}" for i in range(n_locations)]
+    locations = {
+        location_id: Location(location_id, rng.randint(1, 5), 1, rng.randint(1, 5), 1)
+        for location_id in location_ids
+    }
+    arcs = [Arc(a, b, rng.randint(10, 60)) for a, b in zip(location_ids, location_ids[1:] + location_ids[:1])]
+    arcs += [Arc(rng.choice(location_ids), rng.choice(location_ids), rng.randint(10, 120)) for _ in range(2 * n_locations)]
+    network = Network.from_arcs(arcs, location_ids)
+
+    for i in range(n_orders):
+        origin, destination = rng.sample(location_ids, 2)
+        release_time = rng.randint(0, 400)
+        locations[origin].load_queue.append(
+            Order(f"O{i}", origin, destination, release_time, release_time + rng.randint(60, 240), rng.randint(1, 5))
+        )
+    fleet = [Vehicle(f"V{i}", 5, rng.choice(location_ids)) for i in range(n_vehicles)]
+    return locations, network, fleet
+
+
+def main():
+    """
+    Command-line entry point of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vehicles', type=int, default=5000)
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--locations', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    locations, network, fleet = build_instance(args.vehicles, args.orders, args.locations)
+    best = float('inf')
+    for _ in range(args.repeat):
+        # Cada repetição parte da frota vazia e sem reservas
+        for vehicle in fleet:
+            vehicle.load = type(vehicle.load)()
+        policy = GreedyDispatchPolicy(locations, fleet, network)
+        start = time.perf_counter()
+        policy.choose_actions_batch(fleet, 400)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{args.vehicles} veículos, {args.orders} pedidos, {args.locations} localizações")
+    print(f"época: {best * 1000:.1f} ms, por veículo: {best / args.vehicles * 1e6:.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
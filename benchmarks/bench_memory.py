@@ -0,0 +1,173 @@
+"""
+Memory benchmark for the regular and compact (__slots__) model classes.
+
+Generates a synthetic scenario, loads it through main.load_simulation_data
+once with each representation, each in a fresh process, and reports the
+peak RSS, the RSS once loading has finished, the size of each order
+instance and the construction time.
+
+Usage:
+    python benchmarks/bench_memory.py --orders 1000000
+    python benchmarks/bench_memory.py --orders 1000000 --output memory_history.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def write_scenario(path, n_orders, n_locations, n_vehicles, seed=0):
+    """
+    Write a synthetic scenario in the format read by load_simulation_data.
+
+    Orders are written one at a time so the generator itself stays small.
+
+    Args:
+        path (str): Output JSON path
+        n_orders (int): Number of orders
+        n_locations (int): Number of locations
+        n_vehicles (int): Number of vehicles
+        seed (int, optional): Random seed. Defaults to 0.
+    """
+    rng = random.Random(seed)
+    location_ids = [f"L{i}" for i in range(n_locations)]
+    locations = {
+        location_id: {
+            "location_id": location_id,
+            "base_load": rng.randint(1, 5),
+            "gamma": 1,
+            "base_unload": rng.randint(1, 5),
+            "delta": 1
+        }
+        for location_id in location_ids
+    }
+    arcs = [
+        {"from_location": a, "to_location": b, "transit_time": rng.randint(10, 60)}
+        for a, b in zip(location_ids, location_ids[1:] + location_ids[:1])
+    ]
+    fleet = [
+        {"vehicle_id": f"V{i}", "capacity": 5, "start_location": rng.choice(location_ids)}
+        for i in range(n_vehicles)
+    ]
+
+    with open(path, 'w') as file:
+        file.write('{"locations": ')
+        json.dump(locations, file)
+        file.write(', "arcs": ')
+        json.dump(arcs, file)
+        file.write(', "orders": [')
+        for i in range(n_orders):
+            release_time = rng.randint(0, 1440)
+            origin, destination = rng.sample(location_ids, 2)
+            if i:
+                file.write(', ')
+            json.dump({
+                "order_id": f"O{i}",
+                "origin": origin,
+                "destination": destination,
+                "release_time": release_time,
+                "due_time": release_time + rng.randint(60, 480),
+                "units": rng.randint(1, 10)
+            }, file)
+        file.write('], "fleet": ')
+        json.dump(fleet, file)
+        file.write('}')
+
+
+def current_rss_mb():
+    """
+    Resident set size of the current process.
+
+    Returns:
+        float: RSS in megabytes
+    """
+    with open('/proc/self/statm') as file:
+        pages = int(file.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def measure(path, compact):
+    """
+    Load a scenario and measure memory and time. Runs in a child process.
+
+    Args:
+        path (str): Scenario JSON path
+        compact (bool): Use the compact model classes
+
+    Returns:
+        dict: Measurements for this representation
+    """
+    from main import load_simulation_data
+
+    baseline_mb = current_rss_mb()
+    start = time.perf_counter()
+    locations, arcs, orders, fleet = load_simulation_data(path, compact=compact)
+    elapsed = time.perf_counter() - start
+
+    # Tamanho da instância em si, sem contar os valores dos atributos
+    order = orders[0]
+    order_bytes = sys.getsizeof(order)
+    if hasattr(order, '__dict__'):
+        order_bytes += sys.getsizeof(order.__dict__)
+
+    return {
+        'representation': 'compact' if compact else 'regular',
+        'orders': len(orders),
+        'bytes_per_order': order_bytes,
+        'load_seconds': round(elapsed, 3),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'rss_after_load_mb': round(current_rss_mb() - baseline_mb, 1),
+    }
+
+
+def main():
+    """
+    Run the benchmark and print one result line per representation.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--locations', type=int, default=50)
+    parser.add_argument('--vehicles', type=int, default=1000)
+    parser.add_argument('--output', help='append the results as JSON lines to this file')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--compact', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.compact)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scenario.json')
+        write_scenario(path, args.orders, args.locations, args.vehicles)
+
+        results = []
+        for compact in (False, True):
+            command = [sys.executable, os.path.abspath(__file__), '--child', path]
+            if compact:
+                command.append('--compact')
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output))
+
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    for result in results:
+        result['timestamp'] = timestamp
+        print(json.dumps(result))
+
+    if args.output:
+        with open(args.output, 'a') as file:
+            for result in results:
+                file.write(json.dumps(result) + '\n')
+
+
+if __name__ == '__main__':
+    main()
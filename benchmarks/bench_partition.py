@@ -0,0 +1,130 @@
+"""
+Speedup benchmark of the spatially partitioned simulation.
+
+Builds a synthetic national network of dense clusters of locations,
+joined by short arcs, whose hubs are linked by long arcs, runs it with
+LocalPolicy in a single Simulator and then split across 2 to 32 worker
+processes with PartitionedSimulator. Reports the wall time, the speedup
+over the single process, the number of synchronization windows and
+whether the results match the single-process run. The speedups are
+only meaningful on a machine with at least as many CPUs as workers.
+
+Usage:
+    python benchmarks/bench_partition.py --clusters 32 --orders 100000 --workers 2 4 8 16 32
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.local_policy import LocalPolicy  # noqa: E402
+from scenario.builders import build_simulation_data  # noqa: E402
+from simulator.partition import PartitionedSimulator  # noqa: E402
+from simulator.simulator import Simulator  # noqa: E402
+
+
+def build_scenario(n_clusters, cluster_size, n_vehicles, n_orders, horizon, seed=0):
+    """
+    Build a clustered scenario, in the format of simulation_inputs.json.
+
+    Each cluster is a ring of locations 5 to 15 minutes apart with a few
+    chords, and the first location of each cluster is a hub linked to the
+    hubs of the next clusters by 60 to 90 minute arcs. Most orders stay
+    inside their cluster.
+
+    Args:
+        n_clusters (int): Number of clusters
+        cluster_size (int): Locations per cluster
+        n_vehicles (int): Number of vehicles
+        n_orders (int): Number of orders
+        horizon (int): Simulation time horizon
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict: Scenario with 'locations', 'arcs', 'orders' and 'fleet'
+    """
+    rng = random.Random(seed)
+    clusters = [[f"C{c}L{i}" for i in range(cluster_size)] for c in range(n_clusters)]
+    location_ids = [location_id for cluster in clusters for location_id in cluster]
+    locations = {
+        location_id: {'location_id': location_id, 'base_load': rng.randint(1, 5), 'gamma': 1,
+                      'base_unload': rng.randint(1, 5), 'delta': 1}
+        for location_id in location_ids
+    }
+
+    arcs = []
+
+    def link(a, b, transit_time):
+        arcs.append({'from_location': a, 'to_location': b, 'transit_time': transit_time})
+        arcs.append({'from_location': b, 'to_location': a, 'transit_time': transit_time})
+
+    for cluster in clusters:
+        for a, b in zip(cluster, cluster[1:] + cluster[:1]):
+            link(a, b, rng.randint(5, 15))
+        for _ in range(cluster_size // 4):
+            link(*rng.sample(cluster, 2), rng.randint(10, 20))
+    for c in range(n_clusters):
+        for step in (1, 3):
+            if n_clusters > step:
+                link(clusters[c][0], clusters[(c + step) % n_clusters][0], rng.randint(60, 90))
+
+    orders = []
+    for i in range(n_orders):
+        cluster = rng.choice(clusters)
+        origin = rng.choice(cluster)
+        # Um em cada cinco pedidos vai para outro cluster
+        destination = rng.choice(rng.choice(clusters) if rng.random() < 0.2 else cluster)
+        if destination == origin:
+            destination = cluster[(cluster.index(origin) + 1) % len(cluster)]
+        release_time = rng.randint(0, max(0, horizon - 60))
+        orders.append({'order_id': f"O{i}", 'origin': origin, 'destination': destination,
+                       'release_time': release_time, 'due_time': release_time + rng.randint(60, 240),
+                       'units': rng.randint(1, 5)})
+    orders.sort(key=lambda order: order['release_time'])
+    fleet = [{'vehicle_id': f"V{i}", 'capacity': 5, 'start_location': rng.choice(location_ids)}
+             for i in range(n_vehicles)]
+    return {'locations': locations, 'arcs': arcs, 'orders': orders, 'fleet': fleet}
+
+
+def main():
+    """
+    Command-line entry point of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clusters', type=int, default=32)
+    parser.add_argument('--cluster-size', type=int, default=20)
+    parser.add_argument('--vehicles', type=int, default=2000)
+    parser.add_argument('--orders', type=int, default=50000)
+    parser.add_argument('--horizon', type=int, default=960)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    data = build_scenario(args.clusters, args.cluster_size, args.vehicles, args.orders, args.horizon)
+    print(f"{args.clusters * args.cluster_size} localizações, {args.vehicles} veículos, {args.orders} pedidos, "
+          f"{os.cpu_count()} CPUs")
+    if max(args.workers) > os.cpu_count():
+        print("aviso: mais processos que CPUs, o speedup medido não vale para a partição")
+
+    locations, arcs, orders, fleet = build_simulation_data(data)
+    start = time.perf_counter()
+    expected = Simulator(locations, arcs, orders, fleet, args.horizon).run(LocalPolicy(locations, fleet))
+    baseline = time.perf_counter() - start
+    print(f"1 processo: {baseline:.2f} s  {expected}")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        simulator = PartitionedSimulator(data, LocalPolicy, workers, args.horizon)
+        results = simulator.run()
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>2} processos: {elapsed:.2f} s  speedup {baseline / elapsed:.2f}x  "
+              f"lookahead {simulator.lookahead} min  {simulator.windows} janelas  "
+              f"{'iguais' if results == expected else 'DIFERENTES'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,20 +5,20 @@ This module demonstrates the usage of the simulation framework by loading
 sample data from JSON and running simulations with different routing policies.
 """
 
+import argparse
 import json
-from models.location import Location
-from models.order import Order
-from models.vehicle import Vehicle
-from models.arc import Arc
 from models.policy import Policy
+from scenario.builders import build_simulation_data
 from simulator.simulator import Simulator
 
-def load_simulation_data(json_file_path):
+def load_simulation_data(json_file_path, compact=False):
     """
     Load simulation data from JSON file.
     
     Args:
         json_file_path (str): Path to the JSON file containing simulation data
+        compact (bool, optional): Build the __slots__ variants of the model
+            classes from models.compact. Defaults to False.
         
     Returns:
         tuple: (locations, arcs, orders, fleet)
@@ -26,48 +26,7 @@ def load_simulation_data(json_file_path):
     with open(json_file_path, 'r') as file:
         data = json.load(file)
     
-    # Create Location instances
-    locations = {}
-    for loc_id, loc_data in data['locations'].items():
-        locations[loc_id] = Location(
-            location_id=loc_data['location_id'],
-            base_load=loc_data['base_load'],
-            gamma=loc_data['gamma'],
-            base_unload=loc_data['base_unload'],
-            delta=loc_data['delta']
-        )
-    
-    # Create Arc instances
-    arcs = []
-    for arc_data in data['arcs']:
-        arcs.append(Arc(
-            from_location=arc_data['from_location'],
-            to_location=arc_data['to_location'],
-            transit_time=arc_data['transit_time']
-        ))
-    
-    # Create Order instances
-    orders = []
-    for order_data in data['orders']:
-        orders.append(Order(
-            order_id=order_data['order_id'],
-            origin=order_data['origin'],
-            destination=order_data['destination'],
-            release_time=order_data['release_time'],
-            due_time=order_data['due_time'],
-            units=order_data['units']
-        ))
-    
-    # Create Vehicle instances
-    fleet = []
-    for vehicle_data in data['fleet']:
-        fleet.append(Vehicle(
-            vehicle_id=vehicle_data['vehicle_id'],
-            capacity=vehicle_data['capacity'],
-            start_location=vehicle_data['start_location']
-        ))
-    
-    return locations, arcs, orders, fleet
+    return build_simulation_data(data, compact)
 
 def main():
     """
@@ -75,8 +34,20 @@ def main():
     
     Loads logistics data from JSON file including locations, orders, vehicles,
     and network connections, then runs a simulation to demonstrate
-    the system's capabilities.
+    the system's capabilities. With --profile the run is wrapped in a
+    profiler and its reports are written to --profile-dir. With
+    --checkpoint-dir a checkpoint is written every --checkpoint-every
+    simulated minutes, and the run resumes from the last one if the
+    directory already holds checkpoints.
     """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profile', choices=['sampling', 'cprofile'],
+                        help='profile the run with a sampling profiler or cProfile')
+    parser.add_argument('--profile-dir', default='profile_output', help='directory of the profiling reports')
+    parser.add_argument('--checkpoint-dir', help='directory of the checkpoints to write and resume from')
+    parser.add_argument('--checkpoint-every', type=int, default=60, help='simulated minutes between checkpoints')
+    args = parser.parse_args()
+
     # Load simulation data from JSON
     json_file_path = "simulation_inputs.json"
     try:
@@ -96,7 +67,18 @@ def main():
     
     simulator = Simulator(locations, arcs, orders, fleet)
     
-    results = simulator.run(policy)
+    if args.profile:
+        from simulator.profiling import profile_run
+
+        profile = profile_run(simulator, policy, args.profile_dir, mode=args.profile)
+        results = profile['results']
+        print(f"Perfil gravado em: {', '.join(profile['files'].values())}")
+    elif args.checkpoint_dir:
+        from simulator.checkpoint import Checkpointer
+
+        results = Checkpointer(args.checkpoint_dir, every=args.checkpoint_every).run(simulator, policy)
+    else:
+        results = simulator.run(policy)
     
     print("Resultados da Simulação:")
     print(results)
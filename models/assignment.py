@@ -0,0 +1,111 @@
+"""
+Auction algorithm for the linear assignment problem.
+
+Bertsekas' auction with epsilon-scaling, vectorized in NumPy: at every
+iteration all unassigned rows bid at once for their best column, each
+column goes to its highest bidder and its price rises by the bid
+increment. The final assignment is optimal when the costs are multiples
+of the resolution, and within one resolution of the optimum otherwise.
+
+Prices are returned so the next solve of a similar problem can start from
+them, which is how consecutive decision epochs are warm started: a warm
+start skips the first epsilon phases. Between phases, pairs that still
+satisfy epsilon-complementary slackness are kept instead of being bid for
+again.
+"""
+
+import numpy as np
+
+
+def auction_assignment(cost, prices=None, resolution=1.0, scaling=5.0):
+    """
+    Minimum-cost assignment of rows to columns.
+
+    Rectangular problems are padded with zero-cost dummy rows or columns,
+    so every row is assigned when there are at least as many columns, and
+    every column otherwise. Infinite costs mark forbidden pairs; a row
+    only gets one when no feasible assignment of the same size exists, and
+    it is then reported as unassigned.
+
+    Args:
+        cost (array_like): Matrix of shape (rows, columns)
+        prices (array_like, optional): Column prices of a previous solve,
+            used as a warm start. Defaults to a cold start.
+        resolution (float, optional): Granularity of the costs. Defaults to 1.0.
+        scaling (float, optional): Factor epsilon is divided by between
+            phases. Defaults to 5.0.
+
+    Returns:
+        tuple: (assignment, prices) where assignment holds the column of
+            each row, or -1, and prices the final price of each column
+    """
+    cost = np.asarray(cost, dtype=float)
+    n_rows, n_cols = cost.shape
+    n = max(n_rows, n_cols)
+    if n_rows == 0 or n_cols == 0:
+        return np.full(n_rows, -1), np.zeros(n_cols)
+
+    finite = np.isfinite(cost)
+    if finite.any():
+        low = cost[finite].min()
+        high = cost[finite].max()
+    else:
+        low = high = 0.0
+    # Custo de um par proibido: pior do que qualquer combinação de pares válidos
+    penalty = high + (high - low + resolution) * n
+
+    benefit = np.zeros((n, n))
+    benefit[:n_rows, :n_cols] = -np.where(finite, cost, penalty)
+    price = np.zeros(n)
+    if prices is not None:
+        price[:n_cols] = prices
+
+    epsilon_final = resolution / (n + 1)
+    span = (high if finite.all() else penalty) - min(low, 0.0)
+    # Preços de uma época anterior já estão próximos: pula as primeiras fases
+    epsilon = max(epsilon_final, span / (scaling if prices is None else scaling ** 3))
+
+    owner = np.full(n, -1)
+    assigned = np.full(n, -1)
+    while True:
+        # Mantém os pares que ainda satisfazem a folga complementar com o epsilon atual
+        matched = np.flatnonzero(assigned >= 0)
+        if matched.size:
+            values = benefit[matched] - price
+            kept = values[np.arange(matched.size), assigned[matched]] >= values.max(axis=1) - epsilon
+            owner[assigned[matched[~kept]]] = -1
+            assigned[matched[~kept]] = -1
+        unassigned = np.flatnonzero(assigned < 0)
+        while unassigned.size:
+            values = benefit[unassigned] - price
+            bidders = np.arange(unassigned.size)
+            best = values.argmax(axis=1)
+            best_value = values[bidders, best]
+            if n > 1:
+                values[bidders, best] = -np.inf
+                second_value = values.max(axis=1)
+            else:
+                second_value = best_value
+            bids = price[best] + best_value - second_value + epsilon
+
+            # Cada coluna fica com o maior lance
+            ranking = np.argsort(-bids, kind='stable')
+            columns, first = np.unique(best[ranking], return_index=True)
+            winners = unassigned[ranking[first]]
+            previous = owner[columns]
+            assigned[previous[previous >= 0]] = -1
+            owner[columns] = winners
+            assigned[winners] = columns
+            price[columns] = bids[ranking[first]]
+            unassigned = np.flatnonzero(assigned < 0)
+
+        if epsilon <= epsilon_final:
+            break
+        epsilon = max(epsilon_final, epsilon / scaling)
+
+    assignment = assigned[:n_rows].copy()
+    assignment[assignment >= n_cols] = -1
+    real = assignment >= 0
+    forbidden = ~finite[np.flatnonzero(real), assignment[real]]
+    assignment[np.flatnonzero(real)[forbidden]] = -1
+    return assignment, price[:n_cols].copy()
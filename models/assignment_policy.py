@@ -0,0 +1,75 @@
+import numpy as np
+
+from models.assignment import auction_assignment
+from models.greedy_policy import GreedyDispatchPolicy
+
+
+class AuctionAssignmentPolicy(GreedyDispatchPolicy):
+    """
+    Dispatch policy that matches empty vehicles to orders optimally.
+
+    Local loading, routing of loaded vehicles, candidate orders and the
+    cost matrix are the ones of GreedyDispatchPolicy, but the matching of
+    empty vehicles to candidate orders is solved exactly at every epoch
+    with the auction algorithm instead of greedy rounds, so the total time
+    the vehicles spend reaching and loading their orders, plus the cost of
+    the lateness, is minimized over the whole fleet rather than vehicle by
+    vehicle. Costs are rounded to whole minutes, for which the auction is
+    exact.
+
+    Consecutive epochs share most of their orders, so the final price of
+    every candidate order is kept and used to warm start the next solve.
+
+    Attributes:
+        _prices (dict): Maps each order of the last solve to its price; orders
+            hash by identity, and keying by the order itself keeps the
+            prices picklable with the policy
+    """
+
+    def __init__(self, locations, fleet, network=None, candidates_per_location=4,
+                 max_orders=1024, lateness_weight=10.0):
+        """
+        Initialize a new AuctionAssignmentPolicy instance.
+
+        Args:
+            locations (dict): Dictionary of available locations
+            fleet (list): List of available vehicles
+            network (Network, optional): Shortest-path view of the arcs. The
+                simulator provides its own when None. Defaults to None.
+            candidates_per_location (int, optional): Orders considered per
+                location. Defaults to 4.
+            max_orders (int, optional): Maximum number of orders in the cost
+                matrix. Defaults to 1024.
+            lateness_weight (float, optional): Cost of each minute of
+                lateness, in minutes of travel. Defaults to 10.0.
+        """
+        super().__init__(locations, fleet, network, candidates_per_location, max_orders, lateness_weight)
+        self._prices = {}
+
+    def _assign(self, vehicles, now, pending, claimed):
+        """
+        Match empty vehicles to pending orders with the auction algorithm.
+
+        Args:
+            vehicles (list): Empty vehicles to dispatch
+            now (int): Current simulation time
+            pending (dict): Load queue of each location
+            claimed (set): id() of the orders loaded in this epoch
+
+        Returns:
+            list: Order assigned to each vehicle, or None
+        """
+        orders = self._candidates(pending, now, claimed)
+        if not orders:
+            return [None] * len(vehicles)
+        cost = np.rint(self.cost_matrix(vehicles, orders, now))
+
+        prices = None
+        if self._prices:
+            prices = np.fromiter(
+                (self._prices.get(order, 0.0) for order in orders), dtype=float, count=len(orders)
+            )
+        assignment, prices = auction_assignment(cost, prices)
+        self._prices = {order: price for order, price in zip(orders, prices.tolist())}
+
+        return [orders[column] if column >= 0 else None for column in assignment.tolist()]
@@ -0,0 +1,210 @@
+class Cargo:
+    """
+    Orders carried by a vehicle, grouped by destination.
+
+    Each destination holds its own bucket of orders together with their
+    total units, so all orders for a location are unloaded with a single
+    dictionary pop and the number of orders and units on board are kept
+    as running totals.
+
+    The cargo behaves like a list of orders: it supports len, iteration,
+    membership and comparison with lists.
+
+    Attributes:
+        units (int): Total units on board
+        _buckets (dict): Maps a destination to a [orders, units] pair
+        _count (int): Number of orders on board
+        journal (Journal): Undo log notified of every change, or None
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty Cargo instance.
+        """
+        self.units = 0
+        self._buckets = {}
+        self._count = 0
+        self.journal = None
+
+    def __len__(self):
+        """
+        Number of orders on board.
+
+        Returns:
+            int: Number of orders
+        """
+        return self._count
+
+    def __iter__(self):
+        """
+        Iterate over the orders on board, grouped by destination.
+
+        Returns:
+            iterator: Orders on board
+        """
+        return (order for orders, _ in self._buckets.values() for order in orders)
+
+    def __contains__(self, order):
+        """
+        Check whether an order is on board.
+
+        Args:
+            order: Order object
+
+        Returns:
+            bool: True if the order is on board
+        """
+        bucket = self._buckets.get(getattr(order, 'destination', None))
+        return bucket is not None and order in bucket[0]
+
+    def __eq__(self, other):
+        """
+        Compare the cargo with another cargo or a list of orders.
+
+        Args:
+            other: Cargo, list or tuple
+
+        Returns:
+            bool: True if both hold the same orders in the same order
+        """
+        if isinstance(other, (Cargo, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        """
+        Representation of the cargo.
+
+        Returns:
+            str: Orders on board
+        """
+        return f"Cargo({list(self)!r})"
+
+    def add(self, order):
+        """
+        Put an order on board in O(1).
+
+        Args:
+            order: Order object to add
+        """
+        units = getattr(order, 'units', 0)
+        bucket = self._buckets.get(getattr(order, 'destination', None))
+        if bucket is None:
+            self._buckets[getattr(order, 'destination', None)] = [[order], units]
+        else:
+            bucket[0].append(order)
+            bucket[1] += units
+        self._count += 1
+        self.units += units
+        if self.journal is not None:
+            self.journal.record(self.remove, order)
+
+    def remove(self, order):
+        """
+        Take a single order off the vehicle.
+
+        Args:
+            order: Order object to remove
+
+        Raises:
+            ValueError: If the order is not on board
+        """
+        destination = getattr(order, 'destination', None)
+        bucket = self._buckets.get(destination)
+        if bucket is None or order not in bucket[0]:
+            raise ValueError("order not in Cargo")
+        if self.journal is not None and self.journal.recording:
+            self.journal.record(self._restore, destination, list(self._buckets).index(destination),
+                                bucket[0].index(order), [[order], getattr(order, 'units', 0)])
+        bucket[0].remove(order)
+        units = getattr(order, 'units', 0)
+        bucket[1] -= units
+        if not bucket[0]:
+            del self._buckets[destination]
+        self._count -= 1
+        self.units -= units
+
+    def pop_destination(self, destination):
+        """
+        Take off every order heading to a destination.
+
+        Args:
+            destination (str): Destination location identifier
+
+        Returns:
+            list: Orders heading to the destination, in loading order
+        """
+        if self.journal is not None and self.journal.recording and destination in self._buckets:
+            self.journal.record(self._restore, destination, list(self._buckets).index(destination), 0,
+                                self._buckets[destination])
+        bucket = self._buckets.pop(destination, None)
+        if bucket is None:
+            return []
+        orders, units = bucket
+        self._count -= len(orders)
+        self.units -= units
+        return orders
+
+    def units_for(self, destination):
+        """
+        Units on board heading to a destination.
+
+        Args:
+            destination (str): Destination location identifier
+
+        Returns:
+            int: Total units of those orders, or None if there are none
+        """
+        bucket = self._buckets.get(destination)
+        return None if bucket is None else bucket[1]
+
+    def destinations(self):
+        """
+        Destinations of the orders on board.
+
+        Returns:
+            list: Destination identifiers, in the order they were first loaded
+        """
+        return list(self._buckets)
+
+    def set_state(self, orders):
+        """
+        Replace the orders on board, without recording in the journal.
+
+        Args:
+            orders (iterable): Orders in the order the cargo iterates over
+                them, which recreates the same buckets in the same order
+        """
+        self._buckets = {}
+        self._count = 0
+        self.units = 0
+        for order in orders:
+            units = getattr(order, 'units', 0)
+            bucket = self._buckets.setdefault(getattr(order, 'destination', None), [[], 0])
+            bucket[0].append(order)
+            bucket[1] += units
+            self._count += 1
+            self.units += units
+
+    def _restore(self, destination, position, index, bucket):
+        """
+        Put orders back on board where they were before being taken off.
+
+        Args:
+            destination (str): Destination of the orders
+            position (int): Position of the destination among the buckets,
+                used when its bucket has to be recreated
+            index (int): Position of the orders within an existing bucket
+            bucket (list): [orders, units] pair of the orders to put back
+        """
+        orders, units = bucket
+        current = self._buckets.get(destination)
+        if current is not None:
+            current[0][index:index] = orders
+            current[1] += units
+        else:
+            items = list(self._buckets.items())
+            items.insert(position, (destination, [list(orders), units]))
+            self._buckets = dict(items)
+        self._count += len(orders)
+        self.units += units
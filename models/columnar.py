@@ -0,0 +1,488 @@
+from operator import attrgetter
+
+import numpy as np
+
+from models.order import Order, PENDING
+from models.vehicle import Vehicle
+
+
+def _column(name):
+    """
+    Property reading and writing one element of a store column.
+
+    Reads use ndarray.item, which returns a Python scalar in a single call
+    instead of creating a NumPy scalar first.
+
+    Args:
+        name (str): Name of the NumPy array attribute of the store
+
+    Returns:
+        property: Descriptor bound to element self._index of the column
+    """
+    column = attrgetter(name)
+
+    def getter(self):
+        return column(self._store).item(self._index)
+
+    def setter(self, value):
+        column(self._store)[self._index] = value
+
+    return property(getter, setter)
+
+
+def _location_column(name):
+    """
+    Property translating a column of location codes to identifiers.
+
+    Args:
+        name (str): Name of the NumPy array attribute of the store
+
+    Returns:
+        property: Descriptor bound to element self._index of the column
+    """
+    column = attrgetter(name)
+
+    def getter(self):
+        store = self._store
+        return store.location_ids[column(store).item(self._index)]
+
+    def setter(self, value):
+        store = self._store
+        column(store)[self._index] = store.location_code(value)
+
+    return property(getter, setter)
+
+
+class _Views:
+    """
+    Sequence of the views of a store, each created on first access.
+
+    The same view is returned every time a row is accessed, so views can
+    be compared and hashed by identity like regular objects, but rows that
+    are never touched cost a single list slot instead of an object.
+
+    Attributes:
+        _factory (callable): Builds the view of a row from its index
+        _views (list): View of each row, or None if not created yet
+    """
+
+    __slots__ = ('_factory', '_views')
+
+    def __init__(self, size, factory):
+        """
+        Initialize the sequence with no view created.
+
+        Args:
+            size (int): Number of rows
+            factory (callable): Builds the view of a row from its index
+        """
+        self._factory = factory
+        self._views = [None] * size
+
+    def __len__(self):
+        """
+        Number of rows.
+
+        Returns:
+            int: Number of rows
+        """
+        return len(self._views)
+
+    def __getitem__(self, index):
+        """
+        View of a row, or list of views of a slice of rows.
+
+        Args:
+            index (int or slice): Row index or slice
+
+        Returns:
+            View, or list of views for a slice
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._views)))]
+        view = self._views[index]
+        if view is None:
+            if index < 0:
+                index += len(self._views)
+            view = self._views[index] = self._factory(index)
+        return view
+
+    def __iter__(self):
+        """
+        Iterate over the views of every row, creating them as needed.
+
+        Returns:
+            iterator: Views in row order
+        """
+        return (self[i] for i in range(len(self._views)))
+
+
+class _LocationTable:
+    """
+    Mapping between location identifiers and integer codes.
+
+    Attributes:
+        location_ids (list): Location identifier of each code
+        location_index (dict): Maps a location identifier to its code
+    """
+
+    def __init__(self, location_ids=()):
+        """
+        Initialize the table.
+
+        Args:
+            location_ids (iterable, optional): Known location identifiers
+        """
+        self.location_ids = list(dict.fromkeys(location_ids))
+        self.location_index = {location_id: i for i, location_id in enumerate(self.location_ids)}
+
+    def location_code(self, location_id):
+        """
+        Integer code of a location, registering it if needed.
+
+        Args:
+            location_id (str): Location identifier
+
+        Returns:
+            int: Code of the location
+        """
+        code = self.location_index.get(location_id)
+        if code is None:
+            code = len(self.location_ids)
+            self.location_ids.append(location_id)
+            self.location_index[location_id] = code
+        return code
+
+
+class OrderStore(_LocationTable):
+    """
+    Columnar storage of orders backed by NumPy arrays.
+
+    Timing, size and state of every order live in one array per attribute,
+    so a million orders take a few tens of megabytes and KPIs can be
+    computed with vectorized reductions. OrderView objects expose a row
+    with the same attributes as Order, so policies, queues and vehicles
+    work with them unchanged.
+
+    Attributes:
+        order_ids (list): Identifier of each order
+        origin (numpy.ndarray): Location code of each origin
+        destination (numpy.ndarray): Location code of each destination
+        release_time (numpy.ndarray): Release time of each order
+        due_time (numpy.ndarray): Due time of each order
+        units (numpy.ndarray): Units of each order
+        delivery_time (numpy.ndarray): Delivery time of each order (0 if not delivered)
+        status (numpy.ndarray): State of each order (see models.order)
+    """
+
+    def __init__(self, size, location_ids=()):
+        """
+        Initialize a new OrderStore instance with zeroed columns.
+
+        Args:
+            size (int): Number of orders
+            location_ids (iterable, optional): Known location identifiers
+        """
+        super().__init__(location_ids)
+        self.order_ids = [None] * size
+        self.origin = np.zeros(size, dtype=np.int32)
+        self.destination = np.zeros(size, dtype=np.int32)
+        self.release_time = np.zeros(size, dtype=np.int64)
+        self.due_time = np.zeros(size, dtype=np.int64)
+        self.units = np.zeros(size, dtype=np.int64)
+        self.delivery_time = np.zeros(size, dtype=np.int64)
+        self.status = np.full(size, PENDING, dtype=np.int8)
+        self._views = None
+
+    def __len__(self):
+        """
+        Number of orders in the store.
+
+        Returns:
+            int: Number of orders
+        """
+        return len(self.order_ids)
+
+    @classmethod
+    def from_orders(cls, orders, location_ids=()):
+        """
+        Build a store from Order objects.
+
+        Args:
+            orders (iterable): Order objects
+            location_ids (iterable, optional): Known location identifiers
+
+        Returns:
+            OrderStore: Store holding the orders
+        """
+        orders = list(orders)
+        store = cls(len(orders), location_ids)
+        for i, order in enumerate(orders):
+            store.order_ids[i] = order.order_id
+            store.origin[i] = store.location_code(order.origin)
+            store.destination[i] = store.location_code(order.destination)
+            store.release_time[i] = order.release_time
+            store.due_time[i] = order.due_time
+            store.units[i] = order.units
+            store.delivery_time[i] = order.delivery_time
+            store.status[i] = getattr(order, 'status', PENDING)
+        return store
+
+    @classmethod
+    def from_columns(cls, order_ids, origin, destination, release_time, due_time, units, location_ids):
+        """
+        Build a store around existing columns, such as a memory-mapped file.
+
+        The input columns are used without copying when their dtype
+        matches, so read-only inputs give read-only attributes.
+        Delivery time and status always get fresh writable arrays.
+
+        Args:
+            order_ids (list): Identifier of each order
+            origin (array-like): Location code of each origin
+            destination (array-like): Location code of each destination
+            release_time (array-like): Release time of each order
+            due_time (array-like): Due time of each order
+            units (array-like): Units of each order
+            location_ids (iterable): Location identifier of each location code
+
+        Returns:
+            OrderStore: Store holding the orders
+        """
+        store = cls(0, location_ids)
+        store.order_ids = list(order_ids)
+        store.origin = np.asarray(origin, dtype=np.int32)
+        store.destination = np.asarray(destination, dtype=np.int32)
+        store.release_time = np.asarray(release_time, dtype=np.int64)
+        store.due_time = np.asarray(due_time, dtype=np.int64)
+        store.units = np.asarray(units, dtype=np.int64)
+        store.delivery_time = np.zeros(len(store.order_ids), dtype=np.int64)
+        store.status = np.full(len(store.order_ids), PENDING, dtype=np.int8)
+        return store
+
+    def view(self, index):
+        """
+        Order-like view of one row, the same object at every call.
+
+        Args:
+            index (int): Row of the order
+
+        Returns:
+            OrderView: View of the order
+        """
+        return self.views()[index]
+
+    def views(self):
+        """
+        Order-like views of every row, each created on first access.
+
+        Returns:
+            Sequence of OrderView objects in row order
+        """
+        if self._views is None:
+            self._views = _Views(len(self), lambda index: OrderView(self, index))
+        return self._views
+
+
+class OrderView:
+    """
+    Order whose attributes are stored in an OrderStore row.
+
+    Like the classes of models.compact, views declare __slots__ and borrow
+    the methods of Order instead of subclassing it, so each one only holds
+    a reference to the store and its row.
+
+    Attributes:
+        _store (OrderStore): Store holding the data
+        _index (int): Row of the order in the store
+    """
+
+    __slots__ = ('_store', '_index')
+
+    __str__ = Order.__str__
+
+    origin = _location_column('origin')
+    destination = _location_column('destination')
+    release_time = _column('release_time')
+    due_time = _column('due_time')
+    units = _column('units')
+    delivery_time = _column('delivery_time')
+    status = _column('status')
+
+    def __init__(self, store, index):
+        """
+        Initialize a new OrderView instance.
+
+        Args:
+            store (OrderStore): Store holding the data
+            index (int): Row of the order in the store
+        """
+        self._store = store
+        self._index = index
+
+    @property
+    def order_id(self):
+        """
+        Identifier of the order.
+
+        Returns:
+            str: Order identifier
+        """
+        return self._store.order_ids[self._index]
+
+
+class FleetStore(_LocationTable):
+    """
+    Columnar storage of vehicle state backed by NumPy arrays.
+
+    Location, availability and load of every vehicle live in one array per
+    attribute. VehicleView objects expose a row with the same attributes and
+    methods as Vehicle and keep the load columns up to date when orders are
+    loaded or unloaded through them.
+
+    Attributes:
+        vehicle_ids (list): Identifier of each vehicle
+        capacity (numpy.ndarray): Capacity of each vehicle, in orders
+        location (numpy.ndarray): Location code of each vehicle
+        available_at (numpy.ndarray): Time each vehicle becomes available
+        load (numpy.ndarray): Number of orders on board each vehicle
+        load_units (numpy.ndarray): Units on board each vehicle
+    """
+
+    def __init__(self, size, location_ids=()):
+        """
+        Initialize a new FleetStore instance with zeroed columns.
+
+        Args:
+            size (int): Number of vehicles
+            location_ids (iterable, optional): Known location identifiers
+        """
+        super().__init__(location_ids)
+        self.vehicle_ids = [None] * size
+        self.capacity = np.zeros(size, dtype=np.int64)
+        self.location = np.zeros(size, dtype=np.int32)
+        self.available_at = np.zeros(size, dtype=np.int64)
+        self.load = np.zeros(size, dtype=np.int32)
+        self.load_units = np.zeros(size, dtype=np.int64)
+        self._views = None
+
+    def __len__(self):
+        """
+        Number of vehicles in the store.
+
+        Returns:
+            int: Number of vehicles
+        """
+        return len(self.vehicle_ids)
+
+    @classmethod
+    def from_vehicles(cls, fleet, location_ids=()):
+        """
+        Build a store, and its views, from Vehicle objects.
+
+        The views take over the cargo of the original vehicles.
+
+        Args:
+            fleet (iterable): Vehicle objects
+            location_ids (iterable, optional): Known location identifiers
+
+        Returns:
+            FleetStore: Store holding the fleet
+        """
+        fleet = list(fleet)
+        store = cls(len(fleet), location_ids)
+        store._views = []
+        for i, vehicle in enumerate(fleet):
+            view = VehicleView(store, i, vehicle.vehicle_id, vehicle.capacity,
+                               vehicle.current_location, vehicle.unit_capacity)
+            view.available_at = vehicle.available_at
+            view.load = vehicle.load
+            store.load[i] = len(vehicle.load)
+            store.load_units[i] = vehicle.load.units
+            store._views.append(view)
+        return store
+
+    def views(self):
+        """
+        Vehicle-like views of every row.
+
+        Returns:
+            list: VehicleView objects in row order
+        """
+        return self._views
+
+
+class VehicleView:
+    """
+    Vehicle whose location, availability and load totals are stored in a
+    FleetStore row. The orders on board are kept in a regular Cargo.
+
+    Views declare __slots__ and borrow the methods of Vehicle instead of
+    subclassing it, as the classes of models.compact do.
+
+    Attributes:
+        _store (FleetStore): Store holding the data
+        _index (int): Row of the vehicle in the store
+    """
+
+    __slots__ = ('_store', '_index', 'vehicle_id', 'capacity', 'unit_capacity', 'load')
+
+    __str__ = Vehicle.__str__
+
+    current_location = _location_column('location')
+    available_at = _column('available_at')
+
+    def __init__(self, store, index, vehicle_id, capacity, start_location, unit_capacity=None):
+        """
+        Initialize a new VehicleView instance.
+
+        Args:
+            store (FleetStore): Store holding the data
+            index (int): Row of the vehicle in the store
+            vehicle_id (str): Unique identifier for the vehicle
+            capacity (int): Maximum number of orders the vehicle can carry
+            start_location (str): Initial location identifier
+            unit_capacity (int, optional): Maximum number of units the vehicle can carry
+        """
+        self._store = store
+        self._index = index
+        store.vehicle_ids[index] = vehicle_id
+        store.capacity[index] = capacity
+        Vehicle.__init__(self, vehicle_id, capacity, start_location, unit_capacity)
+
+    def unload(self, location):
+        """
+        Unload orders at a specific location and update the load columns.
+
+        Args:
+            location: Location object where unloading occurs
+
+        Returns:
+            list: List of orders that were unloaded
+        """
+        unloaded = Vehicle.unload(self, location)
+        if unloaded:
+            self._sync_load()
+        return unloaded
+
+    def load_order(self, order):
+        """
+        Load an order onto the vehicle and update the load columns.
+
+        Args:
+            order: Order object to be loaded
+
+        Returns:
+            bool: True if order was loaded successfully, False otherwise
+        """
+        loaded = Vehicle.load_order(self, order)
+        if loaded:
+            self._sync_load()
+        return loaded
+
+    def _sync_load(self):
+        """
+        Copy the cargo totals to the store.
+        """
+        self._store.load[self._index] = len(self.load)
+        self._store.load_units[self._index] = self.load.units
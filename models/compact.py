@@ -0,0 +1,61 @@
+"""
+Compact variants of the model classes.
+
+These classes declare __slots__ instead of carrying a per-instance
+__dict__, which cuts the memory of each instance roughly in half. They
+reuse the constructors and methods of the regular classes, so they take
+the same arguments and behave the same way, but they do not accept new
+attributes and are not subclasses of the regular classes.
+"""
+
+from models.arc import Arc
+from models.location import Location
+from models.order import Order
+from models.vehicle import Vehicle
+
+
+class CompactArc:
+    """
+    Arc with __slots__. See models.arc.Arc.
+    """
+
+    __slots__ = ('from_location', 'to_location', 'transit_time')
+
+    __init__ = Arc.__init__
+    __str__ = Arc.__str__
+
+
+class CompactLocation:
+    """
+    Location with __slots__. See models.location.Location.
+    """
+
+    __slots__ = ('location_id', 'base_load', 'gamma', 'base_unload', 'delta', 'load_queue', 'unload_queue', 'docks')
+
+    __init__ = Location.__init__
+    load_time = Location.load_time
+    unload_time = Location.unload_time
+
+
+class CompactOrder:
+    """
+    Order with __slots__. See models.order.Order.
+    """
+
+    __slots__ = ('order_id', 'origin', 'destination', 'release_time', 'due_time', 'units', 'delivery_time', 'status')
+
+    __init__ = Order.__init__
+    __str__ = Order.__str__
+
+
+class CompactVehicle:
+    """
+    Vehicle with __slots__. See models.vehicle.Vehicle.
+    """
+
+    __slots__ = ('vehicle_id', 'capacity', 'unit_capacity', 'current_location', 'load', 'available_at')
+
+    __init__ = Vehicle.__init__
+    __str__ = Vehicle.__str__
+    unload = Vehicle.unload
+    load_order = Vehicle.load_order
@@ -0,0 +1,117 @@
+import heapq
+
+
+class DockPool:
+    """
+    Docks of a location, served first come, first served.
+
+    The time each dock becomes free is kept in a binary heap, so the
+    earliest free dock is always at the top and a vehicle takes it with a
+    single heap replacement: O(log docks) per request, however many docks
+    a hub has. Only the multiset of free times matters, not which dock is
+    which, so the docks themselves are not identified.
+
+    Attributes:
+        docks (int): Number of docks
+        _free (list): Heap of the times each dock becomes free
+        journal (Journal): Undo log notified of every change, or None
+    """
+
+    def __init__(self, docks):
+        """
+        Initialize a new DockPool instance with every dock free.
+
+        Args:
+            docks (int): Number of docks
+
+        Raises:
+            ValueError: If there is not at least one dock
+        """
+        if docks < 1:
+            raise ValueError("a DockPool needs at least one dock")
+        self.docks = docks
+        self._free = [0] * docks
+        self.journal = None
+
+    def __len__(self):
+        """
+        Number of docks.
+
+        Returns:
+            int: Number of docks
+        """
+        return self.docks
+
+    def next_free(self):
+        """
+        Time the earliest dock becomes free.
+
+        Returns:
+            int: Free time of the earliest dock
+        """
+        return self._free[0]
+
+    def busy(self, now):
+        """
+        Number of docks still in use at a given time.
+
+        Args:
+            now (int): Simulation time
+
+        Returns:
+            int: Docks that only become free after now
+        """
+        return sum(1 for free in self._free if free > now)
+
+    def request(self, now, duration):
+        """
+        Take the earliest free dock for a service.
+
+        Args:
+            now (int): Time the vehicle is ready to be served
+            duration (int): Service time
+
+        Returns:
+            tuple: (start, end) of the service
+        """
+        previous = self._free[0]
+        start = previous if previous > now else now
+        end = start + duration
+        heapq.heapreplace(self._free, end)
+        if self.journal is not None:
+            self.journal.record(self._release, end, previous)
+        return start, end
+
+    def state(self):
+        """
+        Free times of the docks, for set_state.
+
+        Returns:
+            list: Free time of each dock, in heap order
+        """
+        return list(self._free)
+
+    def set_state(self, state):
+        """
+        Replace the free times of the docks with a state returned by state().
+
+        Args:
+            state (list): Free time of each dock
+        """
+        self._free = list(state)
+        heapq.heapify(self._free)
+        self.docks = len(self._free)
+
+    def _release(self, end, previous):
+        """
+        Undo a request, giving its dock back its previous free time.
+
+        Only used by rollbacks. Finding the entry is a linear scan, which
+        keeps requests themselves at O(log docks).
+
+        Args:
+            end (int): End of the service being undone
+            previous (int): Free time of the dock before the request
+        """
+        self._free[self._free.index(end)] = previous
+        heapq.heapify(self._free)
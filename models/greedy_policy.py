@@ -0,0 +1,302 @@
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from models.policy import Policy
+
+
+def _due_time(order):
+    """
+    Due time of an order, for sorting by urgency.
+
+    Args:
+        order: Order object
+
+    Returns:
+        Due time, or inf for items without one
+    """
+    return getattr(order, 'due_time', math.inf)
+
+
+class GreedyDispatchPolicy(Policy):
+    """
+    Greedy dispatch policy built on a NumPy cost matrix.
+
+    At each decision epoch every free vehicle first unloads and loads the
+    most urgent orders waiting at its location. Vehicles carrying orders
+    head for the destination of their most urgent order. Empty vehicles are
+    matched to pending orders elsewhere through a vehicles x orders cost
+    matrix:
+
+        cost = travel + load + lateness_weight * max(0, -slack)
+
+    where travel is the shortest transit time to the order's origin, load
+    and unload are the handling times at the origin and destination, and
+    slack is the time left before the due time once the order would be
+    delivered. Orders that would be delivered on time cost the time the
+    vehicle spends reaching and loading them, so the nearer of two vehicles
+    always costs less; lateness only adds to the cost. The matrix is solved
+    greedily in rounds: every unassigned vehicle picks its cheapest order
+    with a vectorized argmin, the cheapest vehicle wins each contested
+    order, and the assigned orders are masked out for the next round.
+    Orders a vehicle is already driving to are reserved and left out of the
+    matrix.
+
+    Only the candidates_per_location most urgent orders of each location,
+    and at most max_orders overall, enter the matrix, which keeps the cost
+    of an epoch bounded by the number of free vehicles.
+
+    Attributes:
+        candidates_per_location (int): Orders considered per location
+        max_orders (int): Maximum number of columns of the cost matrix
+        lateness_weight (float): Cost of each minute of lateness
+        max_rounds (int): Maximum number of assignment rounds per epoch
+        _targets (dict): Maps id(vehicle) to the order it is driving to
+        _reserved (set): id() of the orders some vehicle is driving to
+    """
+
+    def __init__(self, locations, fleet, network=None, candidates_per_location=4,
+                 max_orders=1024, lateness_weight=10.0, max_rounds=16):
+        """
+        Initialize a new GreedyDispatchPolicy instance.
+
+        Args:
+            locations (dict): Dictionary of available locations
+            fleet (list): List of available vehicles
+            network (Network, optional): Shortest-path view of the arcs. The
+                simulator provides its own when None. Defaults to None.
+            candidates_per_location (int, optional): Orders considered per
+                location. Defaults to 4.
+            max_orders (int, optional): Maximum number of orders in the cost
+                matrix. Defaults to 1024.
+            lateness_weight (float, optional): Cost of each minute of
+                lateness, in minutes of travel. Defaults to 10.0.
+            max_rounds (int, optional): Maximum number of assignment rounds;
+                vehicles still unassigned afterwards wait. Defaults to 16.
+        """
+        super().__init__(locations, fleet, network)
+        self.candidates_per_location = candidates_per_location
+        self.max_orders = max_orders
+        self.lateness_weight = lateness_weight
+        self.max_rounds = max_rounds
+        self._targets = {}
+        self._reserved = set()
+
+    def __getstate__(self):
+        """
+        State of the policy for pickling.
+
+        The id() keys of the reservations are only meaningful in the
+        current process, so they are stored as (vehicle, order) pairs.
+
+        Returns:
+            dict: Picklable attributes
+        """
+        state = dict(self.__dict__)
+        state['_targets'] = [(vehicle, self._targets[id(vehicle)]) for vehicle in self.fleet
+                             if id(vehicle) in self._targets]
+        del state['_reserved']
+        return state
+
+    def __setstate__(self, state):
+        """
+        Rebuild the policy from a state returned by __getstate__.
+
+        Args:
+            state (dict): Picklable attributes
+        """
+        targets = state.pop('_targets')
+        self.__dict__.update(state)
+        self._targets = {id(vehicle): order for vehicle, order in targets}
+        self._reserved = {id(order) for _, order in targets}
+
+    def choose_actions(self, vehicle, now):
+        """
+        Choose actions for a single vehicle at a given time.
+
+        Args:
+            vehicle: Vehicle object to make decisions for
+            now (int): Current simulation time
+
+        Returns:
+            tuple: (unloads, loads, next_location)
+        """
+        return self.choose_actions_batch([vehicle], now)[0]
+
+    def choose_actions_batch(self, vehicles, now, pending=None):
+        """
+        Choose actions for every vehicle free at a decision epoch.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            now (int): Current simulation time
+            pending (dict, optional): Maps each location identifier to its
+                load queue. Defaults to the load queues of self.locations.
+
+        Returns:
+            list: One (unloads, loads, next_location) tuple per vehicle
+
+        Raises:
+            ValueError: If the policy has no network
+        """
+        if self.network is None:
+            raise ValueError("GreedyDispatchPolicy needs a network; run it through the Simulator or pass one")
+        if pending is None:
+            pending = {location_id: location.load_queue for location_id, location in self.locations.items()}
+
+        # Veículos livres não estão mais a caminho de nenhum pedido
+        for vehicle in vehicles:
+            order = self._targets.pop(id(vehicle), None)
+            if order is not None:
+                self._reserved.discard(id(order))
+
+        claimed = set()
+        decisions = []
+        idle = []
+        for vehicle in vehicles:
+            location_id = vehicle.current_location
+            unloads = vehicle.unload(self.locations[location_id])
+            loads = []
+            queue = pending.get(location_id)
+            if queue:
+                for order in queue:
+                    if len(vehicle.load) >= vehicle.capacity:
+                        break
+                    if id(order) not in claimed and vehicle.load_order(order):
+                        claimed.add(id(order))
+                        loads.append(order)
+
+            if len(vehicle.load):
+                next_location = min(vehicle.load, key=_due_time).destination
+            else:
+                next_location = location_id
+                idle.append(len(decisions))
+            decisions.append((unloads, loads, next_location))
+
+        if idle:
+            targets = self._assign([vehicles[i] for i in idle], now, pending, claimed)
+            for i, order in zip(idle, targets):
+                if order is not None:
+                    unloads, loads, _ = decisions[i]
+                    decisions[i] = (unloads, loads, order.origin)
+                    self._targets[id(vehicles[i])] = order
+                    self._reserved.add(id(order))
+
+        return decisions
+
+    def _candidates(self, pending, now, claimed):
+        """
+        Most urgent unclaimed orders of every location.
+
+        Args:
+            pending (dict): Load queue of each location
+            now (int): Current simulation time
+            claimed (set): id() of the orders loaded in this epoch
+
+        Returns:
+            list: Candidate orders
+        """
+        candidates = []
+        for location_id, queue in pending.items():
+            if not queue or location_id not in self.network.rows:
+                continue
+            available = (
+                order for order in queue
+                if id(order) not in claimed and id(order) not in self._reserved
+            )
+            candidates.extend(itertools.islice(available, self.candidates_per_location))
+        if len(candidates) > self.max_orders:
+            candidates = heapq.nsmallest(self.max_orders, candidates, key=_due_time)
+        return candidates
+
+    def cost_matrix(self, vehicles, orders, now):
+        """
+        Cost of sending each vehicle to pick up each order.
+
+        Args:
+            vehicles (list): Empty vehicles to dispatch
+            orders (list): Candidate orders
+            now (int): Current simulation time
+
+        Returns:
+            numpy.ndarray: float32 matrix of shape (vehicles, orders); inf
+                where the order cannot be served by the vehicle
+        """
+        index = self.network.index
+        rows = self.network.rows
+        times = self.network.times
+        origin = np.fromiter((index[order.origin] for order in orders), dtype=np.intp, count=len(orders))
+        origin_rows = np.fromiter((rows[order.origin] for order in orders), dtype=np.intp, count=len(orders))
+        destination = np.fromiter(
+            (index.get(order.destination, -1) for order in orders), dtype=np.intp, count=len(orders)
+        )
+        load = np.fromiter(
+            (self.locations[order.origin].load_time(order.units) for order in orders), dtype=float, count=len(orders)
+        )
+        unload = np.fromiter(
+            (
+                self.locations[order.destination].unload_time(order.units) if order.destination in self.locations else 0
+                for order in orders
+            ),
+            dtype=float, count=len(orders),
+        )
+        due = np.fromiter((order.due_time for order in orders), dtype=float, count=len(orders))
+
+        transit = times[origin_rows, destination]
+        transit[destination < 0] = np.inf
+
+        # Veículos na mesma localização têm a mesma linha de custo
+        vehicle_nodes = np.fromiter(
+            (index[vehicle.current_location] for vehicle in vehicles), dtype=np.intp, count=len(vehicles)
+        )
+        nodes, inverse = np.unique(vehicle_nodes, return_inverse=True)
+        node_rows = np.fromiter((rows[self.network.location_ids[node]] for node in nodes.tolist()),
+                                dtype=np.intp, count=len(nodes))
+        travel = times[np.ix_(node_rows, origin)]
+        slack = due - now - travel - load - transit - unload
+        cost = travel + load + self.lateness_weight * np.maximum(0, -slack)
+        cost[~np.isfinite(slack) | (nodes[:, None] == origin[None, :])] = np.inf
+        return cost.astype(np.float32)[inverse]
+
+    def _assign(self, vehicles, now, pending, claimed):
+        """
+        Match empty vehicles to pending orders with greedy argmin rounds.
+
+        Args:
+            vehicles (list): Empty vehicles to dispatch
+            now (int): Current simulation time
+            pending (dict): Load queue of each location
+            claimed (set): id() of the orders loaded in this epoch
+
+        Returns:
+            list: Order assigned to each vehicle, or None
+        """
+        orders = self._candidates(pending, now, claimed)
+        if not orders:
+            return [None] * len(vehicles)
+        cost = self.cost_matrix(vehicles, orders, now)
+
+        assigned = np.full(len(vehicles), -1)
+        active = np.arange(len(vehicles))
+        for _ in range(self.max_rounds):
+            if not active.size:
+                break
+            sub = cost[active]
+            best = sub.argmin(axis=1)
+            best_cost = sub[np.arange(active.size), best]
+            feasible = np.isfinite(best_cost)
+            active, best, best_cost = active[feasible], best[feasible], best_cost[feasible]
+            if not active.size:
+                break
+
+            # Em cada pedido disputado vence o veículo de menor custo
+            ranking = np.argsort(best_cost, kind='stable')
+            columns, first = np.unique(best[ranking], return_index=True)
+            winners = active[ranking[first]]
+            assigned[winners] = columns
+            cost[:, columns] = np.inf
+            active = np.setdiff1d(active, winners, assume_unique=True)
+
+        return [orders[column] if column >= 0 else None for column in assigned.tolist()]
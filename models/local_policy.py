@@ -0,0 +1,154 @@
+import math
+
+from models.policy import Policy
+
+# Tempo, em minutos, em que os veículos vazios seguem para o mesmo vizinho
+ROTATION_PERIOD = 30
+
+
+def _due_time(order):
+    """
+    Due time of an order, for sorting by urgency.
+
+    Args:
+        order: Order object
+
+    Returns:
+        Due time, or inf for items without one
+    """
+    return getattr(order, 'due_time', math.inf)
+
+
+class LocalPolicy(Policy):
+    """
+    Deterministic policy that only looks at the vehicle's own location.
+
+    Every free vehicle unloads, loads the most urgent orders waiting at its
+    location until it is full and then heads for the destination of its
+    most urgent order on board. An empty vehicle moves on to one of the
+    neighbors closest to its location in travel time, taking them in turn
+    every ROTATION_PERIOD minutes, so empty vehicles sweep the network
+    without any random draw.
+
+    A decision depends only on the vehicle, the load queue of its location,
+    the network and the clock. The policy therefore makes the same
+    decisions whether it runs in a single Simulator or in one region of a
+    simulator.partition.PartitionedSimulator, where the other load queues
+    live in other processes.
+
+    Attributes:
+        neighbors (int): Closest locations an empty vehicle rotates among
+        _neighbors (dict): Maps a location identifier to its closest
+            reachable locations, in order of travel time
+    """
+
+    def __init__(self, locations, fleet, network=None, neighbors=3):
+        """
+        Initialize a new LocalPolicy instance.
+
+        Args:
+            locations (dict): Dictionary of available locations
+            fleet (list): List of available vehicles
+            network (Network, optional): Shortest-path view of the arcs. The
+                simulator provides its own when None. Defaults to None.
+            neighbors (int, optional): Closest locations an empty vehicle
+                rotates among. Defaults to 3.
+
+        Raises:
+            ValueError: If neighbors is not positive
+        """
+        if neighbors < 1:
+            raise ValueError("neighbors must be at least 1")
+        super().__init__(locations, fleet, network)
+        self.neighbors = neighbors
+        self._neighbors = {}
+
+    def choose_actions_batch(self, vehicles, now, pending=None):
+        """
+        Choose actions for every vehicle free at a decision epoch.
+
+        Decisions are drawn lazily, one vehicle at a time, so each vehicle
+        sees the orders loaded by the vehicles before it removed from the
+        load queue.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            now (int): Current simulation time
+            pending (dict, optional): Maps each location identifier to its
+                load queue. Defaults to the load queues of self.locations.
+
+        Returns:
+            iterable: One (unloads, loads, next_location) tuple per vehicle
+
+        Raises:
+            ValueError: If the policy has no network
+        """
+        if self.network is None:
+            raise ValueError("LocalPolicy needs a network; run it through the Simulator or pass one")
+        if pending is None:
+            pending = {location_id: location.load_queue for location_id, location in self.locations.items()}
+        return (self._decide(vehicle, now, pending) for vehicle in vehicles)
+
+    def choose_actions(self, vehicle, now):
+        """
+        Choose actions for a single vehicle at a given time.
+
+        Args:
+            vehicle: Vehicle object to make decisions for
+            now (int): Current simulation time
+
+        Returns:
+            tuple: (unloads, loads, next_location)
+        """
+        return next(iter(self.choose_actions_batch([vehicle], now)))
+
+    def _decide(self, vehicle, now, pending):
+        """
+        Actions of one free vehicle.
+
+        Args:
+            vehicle: Vehicle object free at the current time
+            now (int): Current simulation time
+            pending (dict): Load queue of each location
+
+        Returns:
+            tuple: (unloads, loads, next_location)
+        """
+        location_id = vehicle.current_location
+        unloads = vehicle.unload(self.locations[location_id])
+        loads = []
+        queue = pending.get(location_id)
+        if queue:
+            for order in queue:
+                if len(vehicle.load) >= vehicle.capacity:
+                    break
+                if vehicle.load_order(order):
+                    loads.append(order)
+
+        if len(vehicle.load):
+            return unloads, loads, min(vehicle.load, key=_due_time).destination
+        neighbors = self.closest(location_id)
+        if not neighbors:
+            return unloads, loads, location_id
+        return unloads, loads, neighbors[(now // ROTATION_PERIOD) % len(neighbors)]
+
+    def closest(self, location_id):
+        """
+        Reachable locations closest to a location, cached per location.
+
+        Ties in travel time are broken by identifier, so the result does
+        not depend on the order of the arcs.
+
+        Args:
+            location_id (str): Location identifier
+
+        Returns:
+            tuple: Up to self.neighbors location identifiers, closest first
+        """
+        neighbors = self._neighbors.get(location_id)
+        if neighbors is None:
+            others = [other for other in self.network.reachable_from(location_id) if other != location_id]
+            others.sort(key=lambda other: (self.network.travel_time(location_id, other), str(other)))
+            neighbors = tuple(others[:self.neighbors])
+            self._neighbors[location_id] = neighbors
+        return neighbors
@@ -1,11 +1,16 @@
 
+from models.dock import DockPool
+from models.order_queue import OrderQueue
+
+
 class Location:
     """
     Represents a location in the logistics network.
     
     A location can be a warehouse, distribution center, or any point where
     loading/unloading operations can occur. Each location has specific
-    time parameters for loading and unloading operations.
+    time parameters for loading and unloading operations and, optionally,
+    a number of docks that vehicles queue for while being served.
     
     Attributes:
         location_id (str): Unique identifier for the location
@@ -13,11 +18,12 @@ class Location:
         gamma (int): Time multiplier for loading based on units
         base_unload (int): Base time required for unloading operations
         delta (int): Time multiplier for unloading based on units
-        load_queue (list): Queue of orders waiting to be loaded
-        unload_queue (list): Queue of orders waiting to be unloaded
+        load_queue (OrderQueue): Queue of orders waiting to be loaded, indexed by urgency and destination
+        unload_queue (OrderQueue): Queue of orders waiting to be unloaded, indexed by urgency and destination
+        docks (DockPool): Docks of the location, or None when service is instantaneous
     """
     
-    def __init__(self, location_id, base_load, gamma, base_unload, delta):
+    def __init__(self, location_id, base_load, gamma, base_unload, delta, docks=None):
         """
         Initialize a new Location instance.
         
@@ -27,14 +33,17 @@ class Location:
             gamma (int): Time multiplier for loading based on units
             base_unload (int): Base time required for unloading operations
             delta (int): Time multiplier for unloading based on units
+            docks (int, optional): Number of docks. Defaults to None, which
+                serves vehicles instantly and without contention.
         """
         self.location_id = location_id
         self.base_load = base_load
         self.gamma = gamma
         self.base_unload = base_unload
         self.delta = delta
-        self.load_queue = []  # Fila de carga (LOAD)
-        self.unload_queue = []  # Fila de descarga (UNLOAD)
+        self.load_queue = OrderQueue()  # Fila de carga (LOAD)
+        self.unload_queue = OrderQueue()  # Fila de descarga (UNLOAD)
+        self.docks = None if docks is None else DockPool(docks)
 
     def load_time(self, units):
         """
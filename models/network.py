@@ -0,0 +1,294 @@
+import heapq
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Acima deste número de nós o cálculo usa Dijkstra por origem em vez de Floyd-Warshall
+FLOYD_WARSHALL_MAX_NODES = 200
+
+# Redes calculadas mais recentemente, indexadas pelo conjunto de arcos e de localizações
+NETWORK_CACHE_SIZE = 4
+_network_cache = OrderedDict()
+
+
+class Network:
+    """
+    Shortest-path view of the logistics network built from its arcs.
+
+    The network indexes every location, keeps an adjacency list built from
+    the arcs and precomputes the all-pairs shortest transit-time matrix
+    together with a next-hop table, so travel times and routes can be
+    looked up in constant time during the simulation.
+
+    Transit times are assumed to be non-negative.
+
+    Attributes:
+        location_ids (tuple): Identifiers of all nodes, in matrix order
+        index (dict): Maps a location identifier to its matrix column
+        rows (dict): Maps each origin with a row in the matrices to that
+            row; the same as index unless the network was restricted
+        adjacency (dict): Maps a location identifier to a list of (neighbor, transit_time)
+        times (numpy.ndarray): Shortest transit time from every origin row to every node (inf if unreachable)
+        next_hops (numpy.ndarray): Index of the first node after the origin on a shortest path (-1 if unreachable)
+    """
+
+    def __init__(self, arcs, location_ids=(), method=None):
+        """
+        Initialize a new Network instance.
+
+        Args:
+            arcs (list): List of Arc objects
+            location_ids (iterable, optional): Locations that may be visited by vehicles.
+                Arc endpoints not listed here are only used to route through.
+                Defaults to every arc endpoint.
+            method (str, optional): 'floyd-warshall' or 'dijkstra'. Defaults to
+                Floyd-Warshall for small networks and Dijkstra for large ones.
+        """
+        nodes = list(dict.fromkeys(location_ids))
+        visitable = set(nodes)
+        seen = set(nodes)
+        for arc in arcs:
+            for location_id in (arc.from_location, arc.to_location):
+                if location_id not in seen:
+                    seen.add(location_id)
+                    nodes.append(location_id)
+        if not visitable:
+            visitable = set(nodes)
+
+        self.location_ids = tuple(nodes)
+        self.index = {location_id: i for i, location_id in enumerate(nodes)}
+        self.rows = self.index
+        self.adjacency = {location_id: [] for location_id in nodes}
+
+        # Mantém apenas o arco mais rápido entre cada par de localizações
+        fastest = {}
+        for arc in arcs:
+            pair = (arc.from_location, arc.to_location)
+            if pair not in fastest or arc.transit_time < fastest[pair]:
+                fastest[pair] = arc.transit_time
+        for (from_location, to_location), transit_time in fastest.items():
+            self.adjacency[from_location].append((to_location, transit_time))
+
+        if method is None:
+            method = 'floyd-warshall' if len(nodes) <= FLOYD_WARSHALL_MAX_NODES else 'dijkstra'
+        if method == 'floyd-warshall':
+            self.times, self.next_hops = self._floyd_warshall(fastest)
+        elif method == 'dijkstra':
+            self.times, self.next_hops = self._dijkstra()
+        else:
+            raise ValueError(f"Unknown shortest-path method: {method}")
+
+        self._visitable = np.array([location_id in visitable for location_id in nodes], dtype=bool)
+        self._reachable = {}
+
+    @classmethod
+    def from_arcs(cls, arcs, location_ids=()):
+        """
+        Build a network, reusing a previously computed one for the same arcs.
+
+        Only the NETWORK_CACHE_SIZE most recently used networks are kept,
+        so sweeps and replications over many scenarios do not keep every
+        network they built alive.
+
+        Args:
+            arcs (list): List of Arc objects
+            location_ids (iterable, optional): Locations that may be visited by vehicles
+
+        Returns:
+            Network: Network for the given arcs and locations
+        """
+        location_ids = tuple(location_ids)
+        key = (
+            frozenset((arc.from_location, arc.to_location, arc.transit_time) for arc in arcs),
+            frozenset(location_ids),
+        )
+        network = _network_cache.get(key)
+        if network is None:
+            network = cls(arcs, location_ids)
+            _network_cache[key] = network
+            if len(_network_cache) > NETWORK_CACHE_SIZE:
+                _network_cache.popitem(last=False)
+        else:
+            _network_cache.move_to_end(key)
+        return network
+
+    def restrict(self, origins):
+        """
+        Copy of the network that only keeps the rows of some origins.
+
+        Travel times, next hops and reachable locations are then only known
+        from those origins, and the matrices take rows x nodes memory. This
+        is all a simulator needs when its vehicles only leave from those
+        origins, as in one region of simulator.partition.
+
+        Args:
+            origins (iterable): Location identifiers to keep the rows of;
+                those not in the network are skipped
+
+        Returns:
+            Network: Restricted copy, sharing index and adjacency with this one
+        """
+        origins = [origin for origin in dict.fromkeys(origins) if origin in self.rows]
+        keep = [self.rows[origin] for origin in origins]
+        network = object.__new__(type(self))
+        network.location_ids = self.location_ids
+        network.index = self.index
+        network.rows = {origin: row for row, origin in enumerate(origins)}
+        network.adjacency = self.adjacency
+        network.times = self.times[keep]
+        network.next_hops = self.next_hops[keep]
+        network._visitable = self._visitable
+        network._reachable = {}
+        return network
+
+    def _floyd_warshall(self, fastest):
+        """
+        Compute all-pairs shortest paths with a vectorized Floyd-Warshall.
+
+        Args:
+            fastest (dict): Maps (from_location, to_location) to the transit time
+
+        Returns:
+            tuple: (times, next_hops) matrices
+        """
+        n = len(self.location_ids)
+        times = np.full((n, n), np.inf)
+        next_hops = np.full((n, n), -1, dtype=np.int32)
+        diagonal = np.arange(n)
+        times[diagonal, diagonal] = 0
+        next_hops[diagonal, diagonal] = diagonal
+
+        for (from_location, to_location), transit_time in fastest.items():
+            i = self.index[from_location]
+            j = self.index[to_location]
+            if transit_time < times[i, j]:
+                times[i, j] = transit_time
+                next_hops[i, j] = j
+
+        for k in range(n):
+            through_k = times[:, k, None] + times[None, k, :]
+            shorter = through_k < times
+            if shorter.any():
+                times = np.where(shorter, through_k, times)
+                next_hops = np.where(shorter, next_hops[:, k, None], next_hops)
+
+        return times, next_hops
+
+    def _dijkstra(self):
+        """
+        Compute all-pairs shortest paths running Dijkstra from every node.
+
+        Returns:
+            tuple: (times, next_hops) matrices
+        """
+        n = len(self.location_ids)
+        neighbors = [
+            [(self.index[to_location], transit_time) for to_location, transit_time in self.adjacency[location_id]]
+            for location_id in self.location_ids
+        ]
+        times = np.empty((n, n))
+        next_hops = np.empty((n, n), dtype=np.int32)
+
+        for source in range(n):
+            distance = [math.inf] * n
+            first_hop = [-1] * n
+            distance[source] = 0
+            first_hop[source] = source
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > distance[u]:
+                    continue
+                for v, transit_time in neighbors[u]:
+                    candidate = d + transit_time
+                    if candidate < distance[v]:
+                        distance[v] = candidate
+                        first_hop[v] = v if u == source else first_hop[u]
+                        heapq.heappush(heap, (candidate, v))
+            times[source] = distance
+            next_hops[source] = first_hop
+
+        return times, next_hops
+
+    def travel_time(self, origin, destination):
+        """
+        Shortest transit time between two locations.
+
+        Args:
+            origin (str): Origin location identifier
+            destination (str): Destination location identifier
+
+        Returns:
+            float: Shortest transit time, or inf if the destination is unreachable
+        """
+        i = self.rows.get(origin)
+        j = self.index.get(destination)
+        if i is None or j is None:
+            return 0.0 if origin == destination else math.inf
+        return self.times.item(i, j)
+
+    def next_hop(self, origin, destination):
+        """
+        First location to visit on a shortest path between two locations.
+
+        Args:
+            origin (str): Origin location identifier
+            destination (str): Destination location identifier
+
+        Returns:
+            str: Next location identifier, or None if the destination is unreachable
+        """
+        i = self.rows.get(origin)
+        j = self.index.get(destination)
+        if i is None or j is None:
+            return None
+        hop = self.next_hops.item(i, j)
+        if hop < 0:
+            return None
+        return self.location_ids[hop]
+
+    def path(self, origin, destination):
+        """
+        Sequence of locations on a shortest path between two locations.
+
+        Args:
+            origin (str): Origin location identifier
+            destination (str): Destination location identifier
+
+        Returns:
+            list: Location identifiers from origin to destination, empty if
+                unreachable or if it goes through an origin without a row
+        """
+        if self.next_hop(origin, destination) is None:
+            return []
+        path = [origin]
+        while path[-1] != destination:
+            hop = self.next_hop(path[-1], destination)
+            if hop is None:
+                return []
+            path.append(hop)
+        return path
+
+    def reachable_from(self, origin):
+        """
+        Locations that a vehicle can reach from a given location.
+
+        The result includes the origin itself and is cached per origin.
+
+        Args:
+            origin (str): Origin location identifier
+
+        Returns:
+            tuple: Identifiers of the reachable locations
+        """
+        reachable = self._reachable.get(origin)
+        if reachable is None:
+            i = self.rows.get(origin)
+            if i is None:
+                reachable = (origin,)
+            else:
+                mask = np.isfinite(self.times[i]) & self._visitable
+                reachable = tuple(self.location_ids[j] for j in np.flatnonzero(mask))
+            self._reachable[origin] = reachable
+        return reachable
@@ -1,4 +1,11 @@
 
+# Estados de um pedido ao longo da simulação
+PENDING = 0
+RELEASED = 1
+LOADED = 2
+DELIVERED = 3
+
+
 class Order:
     """
     Represents a logistics order to be transported between locations.
@@ -14,6 +21,7 @@ class Order:
         due_time (int): Deadline for order delivery
         units (int): Number of units/cargo to be transported
         delivery_time (int): Actual time when the order was delivered
+        status (int): Current state (PENDING, RELEASED, LOADED or DELIVERED)
     """
     
     def __init__(self, order_id, origin, destination, release_time, due_time, units):
@@ -35,6 +43,7 @@ class Order:
         self.due_time = due_time
         self.units = units
         self.delivery_time = 0
+        self.status = PENDING
 
     def __str__(self):
         """
@@ -0,0 +1,329 @@
+import heapq
+import itertools
+import math
+
+class _Removed:
+    """
+    Marker of removed entries that are still inside some heap.
+
+    A removed entry may share its key with the entry that put the same
+    order back after a rollback, so the marker compares as equal to anything.
+    """
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return False
+
+
+# Marca entradas removidas que ainda estão dentro de algum heap
+_REMOVED = _Removed()
+
+
+class OrderQueue:
+    """
+    Queue of orders indexed by urgency and by destination.
+
+    Orders are kept in a binary heap keyed by (due_time, release_time) and,
+    at the same time, in one heap per destination, so the most urgent order
+    overall or heading to a given destination is found without scanning
+    the queue. Insertions and pops are O(log n); removals are O(1) and
+    leave a stale entry behind that is discarded lazily.
+
+    The queue behaves like a list of orders sorted by urgency: it supports
+    append, remove, len, iteration, indexing and comparison with lists.
+    Items without timing attributes are kept after timed orders, in
+    insertion order. Membership and removal are by identity.
+
+    Attributes:
+        _heap (list): Heap of [due_time, release_time, seq, order] entries
+        _buckets (dict): Maps a destination to a heap of the same entries
+        _entries (dict): Maps id(order) to its entry
+        _seq (int): Sequence number of the next insertion
+        _stale (int): Removed entries still present in some heap
+        journal (Journal): Undo log notified of every change, or None
+    """
+
+    def __init__(self, orders=()):
+        """
+        Initialize a new OrderQueue instance.
+
+        Args:
+            orders (iterable, optional): Orders to add to the queue. Defaults to empty.
+        """
+        self._heap = []
+        self._buckets = {}
+        self._entries = {}
+        self._seq = 0
+        self._stale = 0
+        self.journal = None
+        for order in orders:
+            self.append(order)
+
+    def __len__(self):
+        """
+        Number of orders in the queue.
+
+        Returns:
+            int: Number of orders
+        """
+        return len(self._entries)
+
+    def __contains__(self, order):
+        """
+        Check whether an order is in the queue.
+
+        Args:
+            order: Order object
+
+        Returns:
+            bool: True if this very order is in the queue
+        """
+        return id(order) in self._entries
+
+    def __iter__(self):
+        """
+        Iterate over the orders from the most to the least urgent.
+
+        Returns:
+            iterator: Orders sorted by (due_time, release_time)
+        """
+        return self.iter_urgent()
+
+    def __getitem__(self, index):
+        """
+        Order at a given position in urgency order.
+
+        Args:
+            index (int or slice): Position in the sorted queue
+
+        Returns:
+            Order at the given position, or a list for slices
+        """
+        if isinstance(index, slice) or index < 0:
+            return list(self)[index]
+        for order in itertools.islice(self, index, None):
+            return order
+        raise IndexError("OrderQueue index out of range")
+
+    def __eq__(self, other):
+        """
+        Compare the queue with another queue or a list of orders.
+
+        Args:
+            other: OrderQueue, list or tuple
+
+        Returns:
+            bool: True if both hold the same orders in the same order
+        """
+        if isinstance(other, (OrderQueue, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        """
+        Representation of the queue.
+
+        Returns:
+            str: Orders in urgency order
+        """
+        return f"OrderQueue({list(self)!r})"
+
+    def append(self, order):
+        """
+        Add an order to the queue in O(log n).
+
+        Args:
+            order: Order object to add
+        """
+        entry = [
+            getattr(order, 'due_time', math.inf),
+            getattr(order, 'release_time', 0),
+            self._seq,
+            order,
+        ]
+        self._seq += 1
+        self._entries[id(order)] = entry
+        heapq.heappush(self._heap, entry)
+        destination = getattr(order, 'destination', None)
+        heapq.heappush(self._buckets.setdefault(destination, []), entry)
+        if self.journal is not None:
+            self.journal.record(self.remove, order)
+
+    def remove(self, order):
+        """
+        Remove an order from the queue in O(1).
+
+        Args:
+            order: Order object to remove
+
+        Raises:
+            ValueError: If the order is not in the queue
+        """
+        entry = self._entries.pop(id(order), None)
+        if entry is None:
+            raise ValueError("order not in OrderQueue")
+        if self.journal is not None:
+            self.journal.record(self._restore, entry[0], entry[1], entry[2], entry[3])
+        entry[3] = _REMOVED
+        self._stale += 1
+        if self._stale > len(self._entries) + 64:
+            self._compact()
+
+    def pop(self, destination=None):
+        """
+        Remove and return the most urgent order.
+
+        Args:
+            destination (str, optional): Only consider orders heading to this location
+
+        Returns:
+            Most urgent order, or None if there is none
+        """
+        heap = self._heap if destination is None else self._buckets.get(destination)
+        while heap:
+            entry = heapq.heappop(heap)
+            order = entry[3]
+            if order is not _REMOVED:
+                del self._entries[id(order)]
+                if self.journal is not None:
+                    self.journal.record(self._restore, entry[0], entry[1], entry[2], order)
+                entry[3] = _REMOVED
+                self._stale += 1
+                return order
+        return None
+
+    def peek(self, destination=None):
+        """
+        Return the most urgent order without removing it.
+
+        Args:
+            destination (str, optional): Only consider orders heading to this location
+
+        Returns:
+            Most urgent order, or None if there is none
+        """
+        heap = self._heap if destination is None else self._buckets.get(destination)
+        while heap and heap[0][3] is _REMOVED:
+            heapq.heappop(heap)
+        return heap[0][3] if heap else None
+
+    def iter_urgent(self, destination=None, now=None):
+        """
+        Iterate over orders from the most to the least urgent.
+
+        The heap is walked in order with an auxiliary heap of positions, so
+        taking the first k orders costs O(k log k) and leaves the queue
+        untouched. The queue must not be modified while iterating.
+
+        Args:
+            destination (str, optional): Only yield orders heading to this location
+            now (int, optional): Only yield orders released at or before this time
+
+        Yields:
+            Orders sorted by (due_time, release_time)
+        """
+        heap = self._heap if destination is None else self._buckets.get(destination, [])
+        if not heap:
+            return
+        frontier = [(heap[0][0], heap[0][1], heap[0][2], 0)]
+        size = len(heap)
+        while frontier:
+            _, release_time, _, position = heapq.heappop(frontier)
+            order = heap[position][3]
+            if order is not _REMOVED and (now is None or release_time <= now):
+                yield order
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size:
+                    entry = heap[child]
+                    heapq.heappush(frontier, (entry[0], entry[1], entry[2], child))
+
+    def urgent(self, k, destination=None, now=None):
+        """
+        Most urgent orders, optionally filtered by destination and release.
+
+        Args:
+            k (int): Maximum number of orders to return
+            destination (str, optional): Only return orders heading to this location
+            now (int, optional): Only return orders released at or before this time
+
+        Returns:
+            list: Up to k orders sorted by (due_time, release_time)
+        """
+        return list(itertools.islice(self.iter_urgent(destination, now), k))
+
+    def destinations(self):
+        """
+        Destinations of the orders in the queue.
+
+        Returns:
+            list: Destination identifiers with at least one pending order
+        """
+        return [destination for destination in list(self._buckets) if self.peek(destination) is not None]
+
+    def state(self):
+        """
+        Orders in the queue with their insertion sequence numbers, for set_state.
+
+        Returns:
+            tuple: ([(seq, order), ...], next seq, destinations) state of
+                the queue, where destinations lists the per-destination
+                heaps in the order destinations() reports them
+        """
+        return [(entry[2], entry[3]) for entry in self._entries.values()], self._seq, list(self._buckets)
+
+    def set_state(self, state):
+        """
+        Replace the contents of the queue with a state returned by state().
+
+        Orders keep their original sequence numbers, so ties in urgency are
+        broken as before. Nothing is recorded in the journal.
+
+        Args:
+            state (tuple): ([(seq, order), ...], next seq, destinations)
+                state of the queue
+        """
+        entries, self._seq, destinations = state
+        self._heap = []
+        self._buckets = {destination: [] for destination in destinations}
+        self._entries = {}
+        self._stale = 0
+        for seq, order in entries:
+            entry = [getattr(order, 'due_time', math.inf), getattr(order, 'release_time', 0), seq, order]
+            self._entries[id(order)] = entry
+            self._heap.append(entry)
+            self._buckets.setdefault(getattr(order, 'destination', None), []).append(entry)
+        heapq.heapify(self._heap)
+        for heap in self._buckets.values():
+            heapq.heapify(heap)
+
+    def _restore(self, due_time, release_time, seq, order):
+        """
+        Put back a removed order with its original position in the queue.
+
+        Args:
+            due_time: Due time of the removed entry
+            release_time: Release time of the removed entry
+            seq (int): Insertion sequence number of the removed entry
+            order: Order object to put back
+        """
+        entry = [due_time, release_time, seq, order]
+        self._entries[id(order)] = entry
+        heapq.heappush(self._heap, entry)
+        heapq.heappush(self._buckets.setdefault(getattr(order, 'destination', None), []), entry)
+
+    def _compact(self):
+        """
+        Rebuild the heaps without the entries of removed orders.
+        """
+        self._heap = [entry for entry in self._heap if entry[3] is not _REMOVED]
+        heapq.heapify(self._heap)
+        buckets = {}
+        for destination, heap in self._buckets.items():
+            heap = [entry for entry in heap if entry[3] is not _REMOVED]
+            if heap:
+                heapq.heapify(heap)
+                buckets[destination] = heap
+        self._buckets = buckets
+        self._stale = 0
@@ -11,26 +11,31 @@ class Policy:
     Attributes:
         locations (dict): Dictionary of available locations
         fleet (list): List of available vehicles
+        network (Network): Shortest-path view of the arcs, or None
     """
     
-    def __init__(self, locations, fleet):
+    def __init__(self, locations, fleet, network=None):
         """
         Initialize a new Policy instance.
         
         Args:
             locations (dict): Dictionary of available locations
             fleet (list): List of available vehicles
+            network (Network, optional): Shortest-path view of the arcs. The
+                simulator provides its own when None. Defaults to None.
         """
         self.locations = locations
         self.fleet = fleet
+        self.network = network
 
     def choose_actions(self, vehicle, now):
         """
         Choose actions for a vehicle at a given time.
         
         This method determines what actions a vehicle should take,
-        including unloading orders, loading new orders, and selecting
-        the next location to visit.
+        including unloading orders, loading the most urgent orders waiting
+        at its location until it is full, and selecting the next location
+        to visit.
         
         Args:
             vehicle: Vehicle object to make decisions for
@@ -48,7 +53,10 @@ class Policy:
 
         unloads = vehicle.unload(self.locations[vehicle.current_location])
 
+        # A fila é percorrida da ordem mais urgente para a menos urgente
         for order in self.locations[vehicle.current_location].load_queue:
+            if len(vehicle.load) >= vehicle.capacity:
+                break
             if vehicle.load_order(order):
                 loads.append(order)
 
@@ -56,13 +64,38 @@ class Policy:
         
         return unloads, loads, next_location
 
+    def choose_actions_batch(self, vehicles, now, pending=None):
+        """
+        Choose actions for every vehicle free at a decision epoch.
+
+        Policies that optimize vehicles jointly, or that vectorize their
+        decisions, override this method to amortize their setup over the
+        whole batch. The simulator applies the decisions in the order of the
+        vehicles and draws each one only after the previous one has been
+        applied, so the default implementation, which lazily falls back to
+        choose_actions for one vehicle at a time, sees the orders loaded by
+        the vehicles before it removed from the load queues.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            now (int): Current simulation time
+            pending (dict, optional): Maps each location identifier to its
+                load queue of released orders waiting for pickup
+
+        Returns:
+            iterable: One (unloads, loads, next_location) tuple per vehicle,
+                in the order of vehicles
+        """
+        return (self.choose_actions(vehicle, now) for vehicle in vehicles)
+
     def get_next_location(self, current_location):
         """
         Determine the next location for a vehicle to visit.
         
         This method implements the routing logic to decide which location
-        a vehicle should visit next. Currently uses a simple random selection
-        but can be enhanced with optimization algorithms.
+        a vehicle should visit next. Currently uses a simple random selection,
+        restricted to the locations reachable through the network when one
+        is available, but can be enhanced with optimization algorithms.
         
         Args:
             current_location (str): Current location identifier
@@ -70,4 +103,6 @@ class Policy:
         Returns:
             str: Next location identifier to visit
         """
+        if self.network is not None:
+            return random.choice(self.network.reachable_from(current_location))
         return random.choice(list(self.locations.keys()))
@@ -0,0 +1,445 @@
+import heapq
+import math
+import multiprocessing
+import random
+import time
+
+from models.policy import Policy
+
+# Política cujos processos de trabalho estão sendo criados, herdada por eles com fork
+_ACTIVE = None
+
+
+def _serve(connection):
+    """
+    Run the rollouts of a RolloutPolicy in a worker process.
+
+    The policy, its simulator and the network are inherited from the parent
+    process when the worker is forked. At each epoch the worker first
+    brings its copy of the simulation up to date with the changes sent by
+    the parent, then replies to each list of tasks with their rewards,
+    until it receives None.
+
+    Args:
+        connection (Connection): End of the pipe to the parent
+    """
+    policy = _ACTIVE
+    policy.simulator.journal.untrack(policy._changes)
+    epoch = None
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        changes, tasks = message
+        if changes is not None:
+            epoch = policy._apply_changes(changes)
+        connection.send([policy._rollout(*epoch, *task) for task in tasks])
+    connection.close()
+
+
+class RolloutPolicy(Policy):
+    """
+    Policy that picks next locations by simulating their consequences.
+
+    At each decision epoch every free vehicle unloads and loads the most
+    urgent orders at its location, as in the base policy, and a few
+    candidate next locations are drawn from the destinations on board, the
+    origins of the most urgent pending orders and staying put. Each
+    candidate is then scored by rollouts: the simulator is forked, the
+    candidate is applied with the other free vehicles heading for their
+    first candidate, the simulation is advanced by rollout_horizon minutes
+    under rollout_policy, and the deliveries made, minus the lateness
+    incurred, are averaged. Every candidate is rolled out with the same
+    random seeds, so they are compared on the same futures.
+
+    Rollouts are run in rounds of one rollout per candidate until the
+    time budget or the maximum number of rounds is reached. With workers
+    greater than one each round is split across worker processes forked
+    once per run, at the first epoch with rollouts to run, and stopped by
+    close, which Simulator.finish calls. The workers keep their own copy
+    of the simulation; at each epoch they only receive the engine state
+    and the orders, vehicles, load queues and docks changed since the
+    previous epoch, as collected by the simulator's journal.
+
+    The policy is bound to the simulator that runs it, and so cannot be
+    used outside of Simulator.run.
+
+    Attributes:
+        simulator (Simulator): Simulator running the policy, set by the
+            simulator when None
+        rollout_policy (Policy): Policy of the vehicles during rollouts
+        rollout_horizon (int): Minutes simulated by each rollout
+        max_candidates (int): Maximum number of next locations per vehicle
+        time_budget (float): Wall-clock seconds per epoch, or None for no limit
+        max_rounds (int): Maximum number of rollouts per candidate
+        workers (int): Number of worker processes, or 1 to run in process
+        late_minute_cost (float): Reward lost per minute of lateness
+        seed (int): Seed of the first rollout of each epoch
+        _workers (list): (process, connection) of each running worker
+        _changes (dict): Objects changed since the workers were last
+            brought up to date, collected by the simulator's journal
+    """
+
+    def __init__(self, locations, fleet, network=None, rollout_policy=None, rollout_horizon=120,
+                 max_candidates=4, time_budget=0.05, max_rounds=16, workers=1,
+                 late_minute_cost=1 / 60, seed=0):
+        """
+        Initialize a new RolloutPolicy instance.
+
+        Args:
+            locations (dict): Dictionary of available locations
+            fleet (list): List of available vehicles
+            network (Network, optional): Shortest-path view of the arcs. The
+                simulator provides its own when None. Defaults to None.
+            rollout_policy (Policy, optional): Policy of the vehicles during
+                rollouts. Must not keep state between decisions. Defaults
+                to the base Policy.
+            rollout_horizon (int, optional): Minutes simulated by each
+                rollout. Defaults to 120.
+            max_candidates (int, optional): Maximum number of next locations
+                per vehicle. Defaults to 4.
+            time_budget (float, optional): Wall-clock seconds per epoch, or
+                None for no limit. Defaults to 0.05.
+            max_rounds (int, optional): Maximum number of rollouts per
+                candidate. Defaults to 16.
+            workers (int, optional): Number of worker processes. Worker
+                processes need the fork start method; the rollouts are run
+                in process where it is not available. Defaults to 1.
+            late_minute_cost (float, optional): Reward lost per minute of
+                lateness, in deliveries. Defaults to one delivery per hour.
+            seed (int, optional): Seed of the first rollout of each epoch.
+                Defaults to 0.
+        """
+        super().__init__(locations, fleet, network)
+        self.simulator = None
+        self.rollout_policy = rollout_policy
+        self.rollout_horizon = rollout_horizon
+        self.max_candidates = max_candidates
+        self.time_budget = time_budget
+        self.max_rounds = max_rounds
+        self.workers = workers
+        self.late_minute_cost = late_minute_cost
+        self.seed = seed
+        self._workers = []
+        self._changes = None
+        self._order_index = {}
+        self._vehicle_index = {}
+        self._queue_index = {}
+        self._dock_index = {}
+
+    def __getstate__(self):
+        """
+        State of the policy for pickling, without the worker processes.
+
+        Returns:
+            dict: Attributes of the policy
+        """
+        state = dict(vars(self))
+        state.update(_workers=[], _changes=None, _order_index={}, _vehicle_index={},
+                     _queue_index={}, _dock_index={})
+        return state
+
+    def close(self):
+        """
+        Stop the worker processes of the run, if any.
+
+        Called by Simulator.finish. The next epoch with rollouts to run
+        forks new workers.
+        """
+        for _, connection in self._workers:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for worker, _ in self._workers:
+            worker.join()
+        self._workers = []
+        if self._changes is not None:
+            self.simulator.journal.untrack(self._changes)
+            self._changes = None
+
+    def choose_actions(self, vehicle, now):
+        """
+        Choose actions for a single vehicle at a given time.
+
+        Args:
+            vehicle: Vehicle object to make decisions for
+            now (int): Current simulation time
+
+        Returns:
+            tuple: (unloads, loads, next_location)
+        """
+        return self.choose_actions_batch([vehicle], now)[0]
+
+    def choose_actions_batch(self, vehicles, now, pending=None):
+        """
+        Choose actions for every vehicle free at a decision epoch.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            now (int): Current simulation time
+            pending (dict, optional): Maps each location identifier to its
+                load queue. Defaults to the load queues of self.locations.
+
+        Returns:
+            list: One (unloads, loads, next_location) tuple per vehicle
+
+        Raises:
+            ValueError: If the policy is not run by a simulator
+        """
+        if self.simulator is None:
+            raise ValueError("RolloutPolicy needs the simulator running it; run it through Simulator.run")
+        if self.rollout_policy is None:
+            self.rollout_policy = Policy(self.locations, self.simulator.fleet, self.network)
+        if pending is None:
+            pending = {location_id: location.load_queue for location_id, location in self.locations.items()}
+
+        decisions = []
+        claimed = set()
+        for vehicle in vehicles:
+            unloads = vehicle.unload(self.locations[vehicle.current_location])
+            loads = []
+            queue = pending.get(vehicle.current_location, ())
+            for order in queue:
+                if len(vehicle.load) >= vehicle.capacity:
+                    break
+                if id(order) not in claimed and vehicle.load_order(order):
+                    claimed.add(id(order))
+                    loads.append(order)
+            decisions.append((unloads, loads))
+
+        candidates = [self.candidates(vehicle, pending) for vehicle in vehicles]
+        rewards = self.evaluate(vehicles, decisions, candidates)
+
+        return [
+            (unloads, loads, options[max(range(len(options)), key=lambda k: (totals[k], -k))])
+            for (unloads, loads), options, totals in zip(decisions, candidates, rewards)
+        ]
+
+    def candidates(self, vehicle, pending):
+        """
+        Next locations worth rolling out for a vehicle.
+
+        The destinations of the orders on board come first, most urgent
+        first, followed by the origins of the most urgent pending orders
+        and, last, the current location. Unreachable locations are skipped.
+
+        Args:
+            vehicle: Vehicle that has just loaded at its location
+            pending (dict): Maps each location identifier to its load queue
+
+        Returns:
+            list: Up to max_candidates distinct location identifiers
+        """
+        here = vehicle.current_location
+        due = {}
+        for order in vehicle.load:
+            due[order.destination] = min(due.get(order.destination, math.inf), order.due_time)
+        urgent = heapq.nsmallest(
+            self.max_candidates,
+            ((queue.peek().due_time, location_id) for location_id, queue in pending.items()
+             if location_id != here and queue.peek() is not None),
+        )
+
+        options = []
+        for _, location_id in sorted((due_time, location_id) for location_id, due_time in due.items()) + urgent:
+            if len(options) >= self.max_candidates - 1:
+                break
+            if location_id not in options and math.isfinite(self.network.travel_time(here, location_id)):
+                options.append(location_id)
+        options.append(here)
+        return options
+
+    def evaluate(self, vehicles, decisions, candidates):
+        """
+        Total rollout reward of each candidate of each vehicle.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            decisions (list): (unloads, loads) of each vehicle
+            candidates (list): Candidate next locations of each vehicle
+
+        Returns:
+            list: One list of total rewards per vehicle, aligned with its
+                candidates
+        """
+        rewards = [[0.0] * len(options) for options in candidates]
+        tasks = [(i, k) for i, options in enumerate(candidates) if len(options) > 1 for k in range(len(options))]
+        if not tasks:
+            return rewards
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        if self.workers > 1 and not self._workers and 'fork' in multiprocessing.get_all_start_methods():
+            self._start_workers()
+        changes = self._collect_changes(vehicles, decisions, candidates) if self._workers else None
+        for round_index in range(self.max_rounds):
+            seed = self.seed + round_index
+            if not self._workers:
+                results = [self._rollout(vehicles, decisions, candidates, i, k, seed) for i, k in tasks]
+            else:
+                n_workers = len(self._workers)
+                for w, (_, connection) in enumerate(self._workers):
+                    connection.send((changes, [(i, k, seed) for i, k in tasks[w::n_workers]]))
+                changes = None
+                results = [None] * len(tasks)
+                for w, (_, connection) in enumerate(self._workers):
+                    results[w::n_workers] = connection.recv()
+            for (i, k), reward in zip(tasks, results):
+                rewards[i][k] += reward
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return rewards
+
+    def _start_workers(self):
+        """
+        Fork the worker processes of the run.
+
+        The objects of the simulation are indexed first, so the changes
+        sent at each epoch refer to them by index, and the journal starts
+        collecting the changes made from the fork on.
+        """
+        global _ACTIVE
+        simulator = self.simulator
+        self._order_index = {id(order): index for index, order in enumerate(simulator.orders)}
+        self._vehicle_index = {}
+        for index, vehicle in enumerate(simulator.fleet):
+            self._vehicle_index[id(vehicle)] = index
+            self._vehicle_index[id(vehicle.load)] = index
+        self._queue_index = {id(location.load_queue): location_id
+                             for location_id, location in simulator.locations.items()}
+        self._dock_index = {id(location.docks): location_id for location_id, location in simulator.locations.items()
+                            if getattr(location, 'docks', None) is not None}
+        self._changes = simulator.journal.track()
+
+        context = multiprocessing.get_context('fork')
+        _ACTIVE = self
+        try:
+            for _ in range(self.workers):
+                parent, child = context.Pipe()
+                worker = context.Process(target=_serve, args=(child,), daemon=True)
+                worker.start()
+                child.close()
+                self._workers.append((worker, parent))
+        finally:
+            _ACTIVE = None
+
+    def _collect_changes(self, vehicles, decisions, candidates):
+        """
+        Changes to send to the workers at the start of an epoch.
+
+        Objects are referred to by their index in simulator.orders and
+        simulator.fleet or by location id, so only plain values go
+        through the pipes.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            decisions (list): (unloads, loads) of each vehicle
+            candidates (list): Candidate next locations of each vehicle
+
+        Returns:
+            dict: Engine state, changed objects and epoch, for _apply_changes
+        """
+        simulator = self.simulator
+        order_index = self._order_index
+        orders = []
+        changed_vehicles = set()
+        queues = []
+        docks = []
+        for key, obj in self._changes.items():
+            if key in order_index:
+                orders.append((order_index[key], obj.status, obj.delivery_time))
+            elif key in self._vehicle_index:
+                # Um veículo mudou se ele ou a sua carga mudou
+                changed_vehicles.add(self._vehicle_index[key])
+            elif key in self._queue_index:
+                entries, seq, destinations = obj.state()
+                queues.append((self._queue_index[key], [(entry_seq, order_index[id(order)])
+                                                        for entry_seq, order in entries], seq, destinations))
+            elif key in self._dock_index:
+                docks.append((self._dock_index[key], obj.state()))
+        self._changes.clear()
+
+        fleet = simulator.fleet
+        return {
+            'engine': simulator.engine_state(),
+            'orders': orders,
+            'vehicles': [(index, fleet[index].current_location, fleet[index].available_at,
+                          [order_index[id(order)] for order in fleet[index].load])
+                         for index in sorted(changed_vehicles)],
+            'queues': queues,
+            'docks': docks,
+            'epoch': (
+                [self._vehicle_index[id(vehicle)] for vehicle in vehicles],
+                [([order_index[id(order)] for order in unloads], [order_index[id(order)] for order in loads])
+                 for unloads, loads in decisions],
+                candidates,
+            ),
+        }
+
+    def _apply_changes(self, changes):
+        """
+        Bring a worker's copy of the simulation up to date.
+
+        Args:
+            changes (dict): Changes returned by _collect_changes
+
+        Returns:
+            tuple: (vehicles, decisions, candidates) of the epoch, as
+                objects of the worker's copy
+        """
+        simulator = self.simulator
+        orders = simulator.orders
+        fleet = simulator.fleet
+        for index, status, delivery_time in changes['orders']:
+            orders[index].status = status
+            orders[index].delivery_time = delivery_time
+        for index, location_id, available_at, load in changes['vehicles']:
+            vehicle = fleet[index]
+            vehicle.current_location = location_id
+            vehicle.available_at = available_at
+            vehicle.load.set_state([orders[order] for order in load])
+            if simulator.fleet_store is not None:
+                vehicle._sync_load()
+        for location_id, entries, seq, destinations in changes['queues']:
+            simulator.locations[location_id].load_queue.set_state(
+                ([(entry_seq, orders[index]) for entry_seq, index in entries], seq, destinations))
+        for location_id, docks in changes['docks']:
+            simulator.locations[location_id].docks.set_state(docks)
+        simulator.set_engine_state(simulator.policy, changes['engine'])
+
+        vehicles, decisions, candidates = changes['epoch']
+        return (
+            [fleet[index] for index in vehicles],
+            [([orders[index] for index in unloads], [orders[index] for index in loads])
+             for unloads, loads in decisions],
+            candidates,
+        )
+
+    def _rollout(self, vehicles, decisions, candidates, i, k, seed):
+        """
+        Reward of one rollout of a vehicle's candidate.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            decisions (list): (unloads, loads) of each vehicle
+            candidates (list): Candidate next locations of each vehicle
+            i (int): Index of the vehicle being evaluated
+            k (int): Index of the candidate being evaluated
+            seed (int): Seed of the random module during the rollout
+
+        Returns:
+            float: Deliveries made during the rollout minus the cost of
+                their lateness
+        """
+        simulator = self.simulator
+        kpis = simulator.kpis
+        with simulator.lookahead():
+            random.seed(seed)
+            start = (kpis.served_on_time + kpis.served_late, kpis.total_late_minutes)
+            for j, (vehicle, (unloads, loads), options) in enumerate(zip(vehicles, decisions, candidates)):
+                simulator.apply_decision(vehicle, (unloads, loads, options[k if j == i else 0]))
+            simulator.advance(simulator.current_time + self.rollout_horizon, self.rollout_policy)
+            delivered = kpis.served_on_time + kpis.served_late - start[0]
+            late_minutes = kpis.total_late_minutes - start[1]
+        return delivered - self.late_minute_cost * late_minutes
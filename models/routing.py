@@ -0,0 +1,872 @@
+"""
+Rolling-horizon route planning with time windows.
+
+Every vehicle keeps a planned sequence of stops, each the pickup or the
+delivery of an order. New orders are added by cheapest feasible insertion
+and the plan is improved with relocate, exchange and 2-opt moves until a
+wall-clock budget runs out. Moves are only applied when they lower the
+cost, so the plan held at any moment is the best one found so far.
+
+A plan is feasible when every pickup comes before its delivery, the
+vehicle never carries more orders (or units) than its capacity, and every
+delivery happens by its deadline. Travel takes the shortest transit time
+in the network, rounded up to whole minutes, and each stop takes the
+load or unload time of its location.
+"""
+
+import math
+import time
+
+PICKUP = 0
+DELIVERY = 1
+
+
+class Stop:
+    """
+    Pickup or delivery of an order in a planned route.
+
+    Attributes:
+        kind (int): PICKUP or DELIVERY
+        order: Order picked up or delivered
+        location_id (str): Location of the stop
+        deadline (float): Latest arrival time, inf for pickups and for
+            orders that can no longer be delivered on time
+    """
+
+    __slots__ = ('kind', 'order', 'location_id', 'deadline')
+
+    def __init__(self, kind, order, deadline=math.inf):
+        """
+        Initialize a new Stop instance.
+
+        Args:
+            kind (int): PICKUP or DELIVERY
+            order: Order picked up or delivered
+            deadline (float, optional): Latest arrival time. Defaults to inf.
+        """
+        self.kind = kind
+        self.order = order
+        self.location_id = order.origin if kind == PICKUP else order.destination
+        self.deadline = deadline
+
+    def __repr__(self):
+        """
+        String representation of the stop.
+
+        Returns:
+            str: Kind, order and location of the stop
+        """
+        kind = 'pickup' if self.kind == PICKUP else 'delivery'
+        return f"Stop({kind} {self.order.order_id} at {self.location_id})"
+
+
+class Route:
+    """
+    Planned sequence of stops of a vehicle.
+
+    The route starts at start_location at start_time, which is where and
+    when the vehicle is next free. Orders already on board only have a
+    delivery stop.
+
+    Besides the stops, the route keeps the schedule of each stop (arrival,
+    waiting and departure times), the change in load since the start and
+    the forward time slack: the largest delay in the arrival at a stop that
+    keeps that stop and every later one within its deadline. With them, a
+    feasibility check of an insertion only looks at the stops next to the
+    insertion points, which makes it O(1), and finding the best insertion
+    of an order takes O(n^2) instead of O(n^3). The schedule is rebuilt
+    whenever the stops change.
+
+    Attributes:
+        vehicle: Vehicle following the route
+        stops (list): Planned stops, in visiting order; assigning a new
+            list updates the schedule
+        start_location (str): Location the route starts from
+        start_time (int): Time the route starts at
+        network (Network): Shortest-path view of the arcs
+        locations (dict): Dictionary of available locations
+        lateness_weight (float): Cost of each minute of lateness
+        arrival (list): Arrival time at each stop
+        wait (list): Time waited at each pickup for the order to be released
+        departure (list): Departure time from each stop
+        load (list): Orders on board after each stop, relative to the start
+        units (list): Units on board after each stop, relative to the start
+        slack (list): Forward time slack of each stop
+    """
+
+    def __init__(self, vehicle, network, locations, start_time=0, lateness_weight=10.0):
+        """
+        Initialize a new Route instance.
+
+        Args:
+            vehicle: Vehicle following the route
+            network (Network): Shortest-path view of the arcs
+            locations (dict): Dictionary of available locations
+            start_time (int, optional): Time the route starts at. Defaults to 0.
+            lateness_weight (float, optional): Cost of each minute of
+                lateness. Defaults to 10.0.
+        """
+        self.vehicle = vehicle
+        self.network = network
+        self.locations = locations
+        self.lateness_weight = lateness_weight
+        self.start_location = vehicle.current_location
+        self.start_time = start_time
+        self.stops = []
+
+    def __len__(self):
+        """
+        Number of planned stops.
+
+        Returns:
+            int: Number of stops
+        """
+        return len(self._stops)
+
+    @property
+    def stops(self):
+        """
+        Planned stops, in visiting order.
+
+        Returns:
+            list: Stops; must not be modified in place
+        """
+        return self._stops
+
+    @stops.setter
+    def stops(self, stops):
+        """
+        Replace the planned stops and update the schedule.
+
+        Args:
+            stops (list): New stops
+        """
+        self._stops = list(stops)
+        self._update()
+
+    def restart(self, location_id, start_time):
+        """
+        Move the start of the route and update the schedule.
+
+        Args:
+            location_id (str): Location the route starts from
+            start_time (int): Time the route starts at
+        """
+        self.start_location = location_id
+        self.start_time = start_time
+        self._update()
+
+    def travel(self, origin, destination):
+        """
+        Travel time between two stops, as charged by the simulator.
+
+        Args:
+            origin (str): Origin location identifier
+            destination (str): Destination location identifier
+
+        Returns:
+            float: Whole minutes of travel, 0 when staying, inf if unreachable
+        """
+        if origin == destination:
+            return 0
+        travel_time = self.network.travel_time(origin, destination)
+        return travel_time if math.isinf(travel_time) else max(1, math.ceil(travel_time))
+
+    def service_time(self, stop):
+        """
+        Time spent handling the order at a stop.
+
+        Args:
+            stop (Stop): Planned stop
+
+        Returns:
+            int: Load time of pickups, unload time of deliveries
+        """
+        location = self.locations.get(stop.location_id)
+        if location is None:
+            return 0
+        if stop.kind == PICKUP:
+            return location.load_time(stop.order.units)
+        return location.unload_time(stop.order.units)
+
+    def _update(self):
+        """
+        Rebuild the schedule, loads and forward slack of the stops in O(n).
+        """
+        stops = self._stops
+        n = len(stops)
+        self.arrival = arrival = [0] * n
+        self.wait = wait = [0] * n
+        self.departure = departure = [0] * n
+        self.load = load = [0] * n
+        self.units = units = [0] * n
+        self.slack = slack = [math.inf] * n
+        # A partir de cada parada: entregas atrasadas, folga até o primeiro
+        # atraso de uma entrega em dia e espera total
+        self._late_after = late_after = [0] * (n + 1)
+        self._on_time_slack = on_time_slack = [math.inf] * (n + 1)
+        self._wait_after = wait_after = [0] * (n + 1)
+
+        awaiting = {id(stop.order) for stop in stops if stop.kind == PICKUP}
+        precedence = True
+        now = self.start_time
+        location_id = self.start_location
+        on_board = on_board_units = 0
+        travel = lateness = 0
+        for k, stop in enumerate(stops):
+            leg = self.travel(location_id, stop.location_id)
+            travel += leg
+            now += leg
+            arrival[k] = now
+            if stop.kind == PICKUP:
+                wait[k] = max(0, stop.order.release_time - now)
+                now += wait[k]
+                awaiting.discard(id(stop.order))
+                on_board += 1
+                on_board_units += stop.order.units
+            else:
+                precedence = precedence and id(stop.order) not in awaiting
+                if now > stop.order.due_time:
+                    lateness += now - stop.order.due_time
+                on_board -= 1
+                on_board_units -= stop.order.units
+            load[k] = on_board
+            units[k] = on_board_units
+            now += self.service_time(stop)
+            departure[k] = now
+            location_id = stop.location_id
+
+        following = math.inf
+        for k in range(n - 1, -1, -1):
+            stop = stops[k]
+            own = stop.deadline - arrival[k] if stop.kind == DELIVERY else math.inf
+            following = slack[k] = min(own, wait[k] + following)
+            late_after[k] = late_after[k + 1]
+            on_time_slack[k] = on_time_slack[k + 1]
+            if stop.kind == DELIVERY:
+                margin = stop.order.due_time - arrival[k]
+                if margin < 0:
+                    late_after[k] += 1
+                else:
+                    on_time_slack[k] = min(on_time_slack[k], margin)
+            wait_after[k] = wait_after[k + 1] + wait[k]
+
+        self._precedence = precedence
+        self._travel = travel
+        self._lateness = lateness
+
+    def _fits(self, extra_load, extra_units):
+        """
+        Check whether the vehicle can carry more than planned at some point.
+
+        Args:
+            extra_load (int): Largest planned load over the points, relative to the start, plus new orders
+            extra_units (int): Same for units
+
+        Returns:
+            bool: True if the capacity holds
+        """
+        vehicle = self.vehicle
+        if len(vehicle.load) + extra_load > vehicle.capacity:
+            return False
+        unit_capacity = getattr(vehicle, 'unit_capacity', None)
+        return unit_capacity is None or vehicle.load.units + extra_units <= unit_capacity
+
+    def feasible(self):
+        """
+        Check the planned stops.
+
+        Returns:
+            bool: True if precedence, capacity and deadlines hold
+        """
+        if not self._precedence or (self._stops and self.slack[0] < 0):
+            return False
+        return self._fits(max(self.load, default=0), max(self.units, default=0))
+
+    def evaluate(self, stops=None):
+        """
+        Check a sequence of stops and compute its cost.
+
+        The planned stops are answered from the schedule; any other
+        sequence is walked in O(n).
+
+        Args:
+            stops (list, optional): Stops to evaluate. Defaults to self.stops.
+
+        Returns:
+            tuple: (feasible, cost) where cost is the travel time plus
+                lateness_weight times the lateness of the deliveries
+        """
+        if stops is None:
+            if not self.feasible():
+                return False, math.inf
+            return True, self._travel + self.lateness_weight * self._lateness
+        vehicle = self.vehicle
+        unit_capacity = getattr(vehicle, 'unit_capacity', None)
+        load = len(vehicle.load)
+        units = vehicle.load.units
+        awaiting = {id(stop.order) for stop in stops if stop.kind == PICKUP}
+
+        now = self.start_time
+        location_id = self.start_location
+        travel = 0
+        lateness = 0
+        for stop in stops:
+            leg = self.travel(location_id, stop.location_id)
+            travel += leg
+            now += leg
+            if stop.kind == PICKUP:
+                now = max(now, stop.order.release_time)
+                awaiting.discard(id(stop.order))
+                load += 1
+                units += stop.order.units
+                if load > vehicle.capacity or (unit_capacity is not None and units > unit_capacity):
+                    return False, math.inf
+            else:
+                if id(stop.order) in awaiting or now > stop.deadline:
+                    return False, math.inf
+                lateness += max(0, now - stop.order.due_time)
+                load -= 1
+                units -= stop.order.units
+            now += self.service_time(stop)
+            location_id = stop.location_id
+
+        return True, travel + self.lateness_weight * lateness
+
+    def relax(self):
+        """
+        Drop the deadlines the route can no longer meet.
+
+        Deliveries that would arrive after their deadline, for instance
+        because the vehicle became free later than planned, keep their
+        place in the route but lose the deadline, so the route becomes
+        feasible again and only pays for the lateness.
+        """
+        changed = False
+        for stop, arrival in zip(self._stops, self.arrival):
+            if stop.kind == DELIVERY and arrival > stop.deadline:
+                stop.deadline = math.inf
+                changed = True
+        if changed:
+            self._update()
+
+    def cost(self):
+        """
+        Cost of the planned stops.
+
+        Returns:
+            float: Travel time plus weighted lateness, inf if infeasible
+        """
+        return self.evaluate()[1]
+
+    def _previous(self, k):
+        """
+        Location, departure time and relative load before stop k.
+
+        Args:
+            k (int): Stop position, len(stops) for the end of the route
+
+        Returns:
+            tuple: (location_id, departure, load, units)
+        """
+        if k == 0:
+            return self.start_location, self.start_time, 0, 0
+        return self._stops[k - 1].location_id, self.departure[k - 1], self.load[k - 1], self.units[k - 1]
+
+    def _reconnect(self, k, location_id, departure):
+        """
+        Extra travel and arrival delay when stop k is reached from elsewhere.
+
+        Args:
+            k (int): Stop position, len(stops) for the end of the route
+            location_id (str): Location the vehicle now comes from
+            departure (float): Time the vehicle now leaves it
+
+        Returns:
+            tuple: (travel to stop k, arrival delay at stop k); both 0 at the end
+        """
+        if k == len(self._stops):
+            return 0, 0
+        leg = self.travel(location_id, self._stops[k].location_id)
+        return leg, departure + leg - self.arrival[k]
+
+    def _added_lateness(self, k, delay):
+        """
+        Lateness added by delaying the arrival at stop k and after.
+
+        Without waiting times ahead and while no delivery on time becomes
+        late, every late delivery is delayed by the same amount and the
+        answer takes O(1); otherwise the stops are walked.
+
+        Args:
+            k (int): Stop position, len(stops) for the end of the route
+            delay (float): Arrival delay at stop k
+
+        Returns:
+            float: Added minutes of lateness
+        """
+        if delay <= 0:
+            return 0
+        if self._wait_after[k] == 0 and delay <= self._on_time_slack[k]:
+            return delay * self._late_after[k]
+        added = 0
+        for m in range(k, len(self._stops)):
+            if delay <= 0:
+                break
+            stop = self._stops[m]
+            if stop.kind == DELIVERY:
+                margin = stop.order.due_time - self.arrival[m]
+                added += max(0, delay - margin) - max(0, -margin)
+            delay = max(0, delay - self.wait[m])
+        return added
+
+    def best_insertion(self, order, deadline, pickup=True):
+        """
+        Cheapest feasible positions for the stops of an order.
+
+        For each pickup position the delay caused by the pickup is carried
+        along the following stops, absorbed by waiting times, so every
+        delivery position is checked against the forward slack in O(1).
+        Deadlines are hard, but deliveries without one may become later,
+        which is charged in the cost.
+
+        Args:
+            order: Order to insert
+            deadline (float): Latest delivery time
+            pickup (bool, optional): Insert a pickup as well as the
+                delivery; False for orders already on board. Defaults to True.
+
+        Returns:
+            tuple: (added_cost, pickup_index, delivery_index), or None when
+                no feasible insertion exists. delivery_index is relative to
+                the stops before the insertion.
+        """
+        if not self.feasible():
+            return None
+        stops = self._stops
+        n = len(stops)
+        travel = self.travel
+        weight = self.lateness_weight
+        destination = order.destination
+        due_time = order.due_time
+        delivery_service = self.service_time(Stop(DELIVERY, order))
+        best = None
+
+        def removed_leg(k, location_id):
+            """Travel of the leg into stop k that an insertion replaces."""
+            return travel(location_id, stops[k].location_id) if k < n else 0
+
+        def deliver(k, location_id, departure, removed, extra_lateness):
+            """Cost of delivering after leaving location_id, before stop k, or None."""
+            arrival = departure + travel(location_id, destination)
+            if math.isinf(arrival) or arrival > deadline:
+                return None
+            leg, next_delay = self._reconnect(k, destination, arrival + delivery_service)
+            if k < n and next_delay > self.slack[k]:
+                return None
+            lateness = max(0, arrival - due_time) + self._added_lateness(k, next_delay)
+            return arrival - departure + leg - removed + weight * (lateness + extra_lateness)
+
+        if not pickup:
+            for j in range(n + 1):
+                location_id, departure, _, _ = self._previous(j)
+                cost = deliver(j, location_id, departure, removed_leg(j, location_id), 0)
+                if cost is not None and (best is None or cost < best[0]):
+                    best = (cost, None, j)
+            return best
+
+        origin = order.origin
+        pickup_service = self.service_time(Stop(PICKUP, order))
+        for i in range(n + 1):
+            location_id, departure, load, units = self._previous(i)
+            if not self._fits(load + 1, units + order.units):
+                continue
+            arrival = departure + travel(location_id, origin)
+            if math.isinf(arrival):
+                continue
+            leaving = max(arrival, order.release_time) + pickup_service
+            pickup_travel = arrival - departure
+
+            # Entrega logo depois da coleta
+            cost = deliver(i, origin, leaving, removed_leg(i, location_id), 0)
+            if cost is not None:
+                cost += pickup_travel
+                if best is None or cost < best[0]:
+                    best = (cost, i, i)
+            if i == n:
+                continue
+
+            # Entrega depois de outras paradas: o atraso da coleta se propaga
+            leg, delay = self._reconnect(i, origin, leaving)
+            if delay > self.slack[i]:
+                continue
+            pickup_travel += leg - removed_leg(i, location_id)
+            segment_load = load
+            segment_units = units
+            segment_lateness = 0
+            for j in range(i + 1, n + 1):
+                k = j - 1
+                segment_load = max(segment_load, self.load[k])
+                segment_units = max(segment_units, self.units[k])
+                if not self._fits(segment_load + 1, segment_units + order.units):
+                    break
+                if stops[k].kind == DELIVERY and stops[k].order.due_time < self.arrival[k] + delay:
+                    segment_lateness += min(delay, self.arrival[k] + delay - stops[k].order.due_time)
+                delay = max(0, delay - self.wait[k])
+                cost = deliver(j, stops[k].location_id, self.departure[k] + delay,
+                               removed_leg(j, stops[k].location_id), segment_lateness)
+                if cost is not None:
+                    cost += pickup_travel
+                    if best is None or cost < best[0]:
+                        best = (cost, i, j)
+        return best
+
+    def insert(self, order, deadline, pickup_index, delivery_index):
+        """
+        Insert the stops of an order at given positions.
+
+        Args:
+            order: Order to insert
+            deadline (float): Latest delivery time
+            pickup_index (int): Position of the pickup, or None for orders on board
+            delivery_index (int): Position of the delivery, relative to the
+                stops before the insertion
+        """
+        self._stops.insert(delivery_index, Stop(DELIVERY, order, deadline))
+        if pickup_index is not None:
+            self._stops.insert(pickup_index, Stop(PICKUP, order))
+        self._update()
+
+    def remove_order(self, order):
+        """
+        Remove every stop of an order.
+
+        Args:
+            order: Order whose stops are removed
+
+        Returns:
+            float: Deadline of the removed delivery, or None if the order had no stop
+        """
+        deadline = None
+        kept = []
+        for stop in self._stops:
+            if stop.order is order:
+                if stop.kind == DELIVERY:
+                    deadline = stop.deadline
+            else:
+                kept.append(stop)
+        self.stops = kept
+        return deadline
+
+    def pop_front(self):
+        """
+        Remove and return the first stop.
+
+        Returns:
+            Stop: First planned stop
+        """
+        stop = self._stops.pop(0)
+        self._update()
+        return stop
+
+    def orders(self, picked=False):
+        """
+        Orders with stops in the route.
+
+        Args:
+            picked (bool, optional): Only orders still waiting for their
+                pickup, which may be moved to other vehicles. Defaults to False.
+
+        Returns:
+            list: Orders, in the order of their first stop
+        """
+        return [stop.order for stop in self._stops if not picked or stop.kind == PICKUP]
+
+
+class RoutePlanner:
+    """
+    Anytime planner of the routes of a fleet.
+
+    At each decision epoch the routes of the free vehicles are restarted
+    from their current location, pending orders not yet planned are
+    inserted, most urgent first, at their cheapest feasible position over
+    all routes, and the plan is improved by local search. Orders that can
+    no longer be delivered on time are inserted without a deadline and
+    only pay for their lateness in the cost.
+
+    Everything stops when time_budget seconds have passed since the start
+    of the epoch: orders not inserted yet are retried at the next epoch and
+    the best plan found so far is kept.
+
+    Attributes:
+        locations (dict): Dictionary of available locations
+        network (Network): Shortest-path view of the arcs
+        time_budget (float): Wall-clock seconds per epoch, or None for no limit
+        lateness_weight (float): Cost of each minute of lateness
+        max_passes (int): Maximum number of local search passes per epoch, or None
+        routes (dict): Maps id(vehicle) to its Route
+        planned (dict): Maps id(order) to the Route holding its stops
+    """
+
+    def __init__(self, locations, network, time_budget=0.01, lateness_weight=10.0, max_passes=None):
+        """
+        Initialize a new RoutePlanner instance.
+
+        Args:
+            locations (dict): Dictionary of available locations
+            network (Network): Shortest-path view of the arcs
+            time_budget (float, optional): Wall-clock seconds per epoch, or
+                None for no limit. Defaults to 0.01.
+            lateness_weight (float, optional): Cost of each minute of
+                lateness. Defaults to 10.0.
+            max_passes (int, optional): Maximum number of local search
+                passes per epoch. Defaults to no limit.
+        """
+        self.locations = locations
+        self.network = network
+        self.time_budget = time_budget
+        self.lateness_weight = lateness_weight
+        self.max_passes = max_passes
+        self.routes = {}
+        self.planned = {}
+        self._deadline = math.inf
+
+    def __getstate__(self):
+        """
+        State of the planner for pickling.
+
+        The id() keys of routes and planned are only meaningful in the
+        current process: routes are stored as a list, since each knows its
+        vehicle, and planned as (order, route) pairs.
+
+        Returns:
+            dict: Picklable attributes
+        """
+        state = dict(self.__dict__)
+        orders = {id(stop.order): stop.order for route in self.routes.values() for stop in route.stops}
+        state['routes'] = list(self.routes.values())
+        state['planned'] = [(orders[key], route) for key, route in self.planned.items()]
+        return state
+
+    def __setstate__(self, state):
+        """
+        Rebuild the planner from a state returned by __getstate__.
+
+        Args:
+            state (dict): Picklable attributes
+        """
+        self.__dict__.update(state)
+        self.routes = {id(route.vehicle): route for route in state['routes']}
+        self.planned = {id(order): route for order, route in state['planned']}
+
+    def route(self, vehicle):
+        """
+        Route of a vehicle, created empty on first use.
+
+        Args:
+            vehicle: Vehicle object
+
+        Returns:
+            Route: Route of the vehicle
+        """
+        route = self.routes.get(id(vehicle))
+        if route is None:
+            route = Route(vehicle, self.network, self.locations, vehicle.available_at, self.lateness_weight)
+            self.routes[id(vehicle)] = route
+        return route
+
+    def _out_of_time(self):
+        """
+        Check whether the budget of the current epoch has run out.
+
+        Returns:
+            bool: True once the budget is exhausted
+        """
+        return time.perf_counter() > self._deadline
+
+    def plan(self, vehicles, now, pending):
+        """
+        Update the plan at a decision epoch.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            now (int): Current simulation time
+            pending (dict): Load queue of each location
+        """
+        self._deadline = math.inf if self.time_budget is None else time.perf_counter() + self.time_budget
+
+        for vehicle in vehicles:
+            route = self.route(vehicle)
+            route.restart(vehicle.current_location, now)
+            route.relax()
+            # Pedidos a bordo sem parada de entrega planejada
+            for order in vehicle.load:
+                if id(order) not in self.planned:
+                    self._insert(order, [route], pickup=False)
+
+        unplanned = [order for queue in pending.values() for order in queue if id(order) not in self.planned]
+        unplanned.sort(key=lambda order: (order.due_time, order.release_time))
+        routes = list(self.routes.values())
+        for order in unplanned:
+            if self._out_of_time():
+                return
+            self._insert(order, routes)
+
+        self.improve()
+
+    def _insert(self, order, routes, pickup=True):
+        """
+        Insert an order at its cheapest feasible position over some routes.
+
+        Args:
+            order: Order to insert
+            routes (list): Candidate routes
+            pickup (bool, optional): Insert a pickup as well. Defaults to True.
+
+        Returns:
+            bool: True if the order was inserted
+        """
+        for deadline in (order.due_time, math.inf):
+            best = None
+            for route in routes:
+                insertion = route.best_insertion(order, deadline, pickup)
+                if insertion is not None and (best is None or insertion[0] < best[0]):
+                    best = insertion + (route,)
+            if best is not None:
+                _, pickup_index, delivery_index, route = best
+                route.insert(order, deadline, pickup_index, delivery_index)
+                self.planned[id(order)] = route
+                return True
+        return False
+
+    def unplan(self, order):
+        """
+        Drop every stop of an order from the plan.
+
+        Args:
+            order: Order to drop
+        """
+        route = self.planned.pop(id(order), None)
+        if route is not None:
+            route.remove_order(order)
+
+    def improve(self):
+        """
+        Improve the plan by local search until no move helps or time runs out.
+        """
+        passes = 0
+        while not self._out_of_time() and (self.max_passes is None or passes < self.max_passes):
+            passes += 1
+            improved = self._relocate_pass()
+            improved = self._exchange_pass() or improved
+            improved = self._two_opt_pass() or improved
+            if not improved:
+                return
+
+    def _relocate_pass(self):
+        """
+        Move single orders to their cheapest position in any route.
+
+        Returns:
+            bool: True if some move lowered the cost
+        """
+        improved = False
+        routes = list(self.routes.values())
+        for route in routes:
+            for order in route.orders(picked=True):
+                if self._out_of_time():
+                    return improved
+                before = route.cost()
+                snapshot = list(route.stops)
+                deadline = route.remove_order(order)
+                saving = before - route.cost()
+                best = None
+                for target in routes:
+                    insertion = target.best_insertion(order, deadline)
+                    if insertion is not None and (best is None or insertion[0] < best[0]):
+                        best = insertion + (target,)
+                if best is not None and best[0] < saving - 1e-9:
+                    _, pickup_index, delivery_index, target = best
+                    target.insert(order, deadline, pickup_index, delivery_index)
+                    self.planned[id(order)] = target
+                    improved = True
+                else:
+                    route.stops = snapshot
+        return improved
+
+    def _exchange_pass(self):
+        """
+        Swap pairs of orders between two routes.
+
+        Returns:
+            bool: True if some swap lowered the cost
+        """
+        improved = False
+        routes = list(self.routes.values())
+        for a in range(len(routes)):
+            for b in range(a + 1, len(routes)):
+                first, second = routes[a], routes[b]
+                for order_a in first.orders(picked=True):
+                    for order_b in second.orders(picked=True):
+                        if self._out_of_time():
+                            return improved
+                        if id(order_a) not in self.planned or id(order_b) not in self.planned:
+                            continue
+                        if self._try_exchange(first, order_a, second, order_b):
+                            improved = True
+        return improved
+
+    def _try_exchange(self, first, order_a, second, order_b):
+        """
+        Swap two orders between routes if it lowers the total cost.
+
+        Args:
+            first (Route): Route holding order_a
+            order_a: Order moved to the second route
+            second (Route): Route holding order_b
+            order_b: Order moved to the first route
+
+        Returns:
+            bool: True if the swap was applied
+        """
+        if self.planned.get(id(order_a)) is not first or self.planned.get(id(order_b)) is not second:
+            return False
+        before = first.cost() + second.cost()
+        snapshots = (list(first.stops), list(second.stops))
+        deadline_a = first.remove_order(order_a)
+        deadline_b = second.remove_order(order_b)
+        insert_b = first.best_insertion(order_b, deadline_b)
+        insert_a = second.best_insertion(order_a, deadline_a)
+        if insert_a is not None and insert_b is not None:
+            after = first.cost() + second.cost() + insert_a[0] + insert_b[0]
+            if after < before - 1e-9:
+                first.insert(order_b, deadline_b, insert_b[1], insert_b[2])
+                second.insert(order_a, deadline_a, insert_a[1], insert_a[2])
+                self.planned[id(order_a)] = second
+                self.planned[id(order_b)] = first
+                return True
+        first.stops, second.stops = snapshots
+        return False
+
+    def _two_opt_pass(self):
+        """
+        Reverse segments of routes.
+
+        Returns:
+            bool: True if some reversal lowered the cost
+        """
+        improved = False
+        for route in list(self.routes.values()):
+            stops = route.stops
+            best_cost = route.cost()
+            for i in range(len(stops) - 1):
+                for j in range(i + 1, len(stops)):
+                    if self._out_of_time():
+                        return improved
+                    trial = stops[:i] + stops[i:j + 1][::-1] + stops[j + 1:]
+                    feasible, cost = route.evaluate(trial)
+                    if feasible and cost < best_cost - 1e-9:
+                        route.stops = stops = trial
+                        best_cost = cost
+                        improved = True
+        return improved
@@ -0,0 +1,108 @@
+from models.policy import Policy
+from models.routing import DELIVERY, RoutePlanner
+
+
+class RoutingPolicy(Policy):
+    """
+    Policy that follows routes planned by a RoutePlanner.
+
+    At each decision epoch the free vehicles unload, the planner updates
+    the routes within its time budget, and each free vehicle then serves
+    the planned stops at its current location and heads for the location
+    of its next stop. Vehicles without planned stops stay where they are.
+
+    Attributes:
+        planner (RoutePlanner): Planner of the fleet's routes, created
+            once the network is known
+        time_budget (float): Wall-clock seconds per epoch, or None for no limit
+        lateness_weight (float): Cost of each minute of lateness
+        max_passes (int): Maximum number of local search passes per epoch, or None
+    """
+
+    def __init__(self, locations, fleet, network=None, time_budget=0.01, lateness_weight=10.0, max_passes=None):
+        """
+        Initialize a new RoutingPolicy instance.
+
+        Args:
+            locations (dict): Dictionary of available locations
+            fleet (list): List of available vehicles
+            network (Network, optional): Shortest-path view of the arcs. The
+                simulator provides its own when None. Defaults to None.
+            time_budget (float, optional): Wall-clock seconds per epoch, or
+                None for no limit. Defaults to 0.01.
+            lateness_weight (float, optional): Cost of each minute of
+                lateness. Defaults to 10.0.
+            max_passes (int, optional): Maximum number of local search
+                passes per epoch. Defaults to no limit.
+        """
+        super().__init__(locations, fleet, network)
+        self.time_budget = time_budget
+        self.lateness_weight = lateness_weight
+        self.max_passes = max_passes
+        self.planner = None
+
+    def choose_actions(self, vehicle, now):
+        """
+        Choose actions for a single vehicle at a given time.
+
+        Args:
+            vehicle: Vehicle object to make decisions for
+            now (int): Current simulation time
+
+        Returns:
+            tuple: (unloads, loads, next_location)
+        """
+        return self.choose_actions_batch([vehicle], now)[0]
+
+    def choose_actions_batch(self, vehicles, now, pending=None):
+        """
+        Choose actions for every vehicle free at a decision epoch.
+
+        Args:
+            vehicles (list): Vehicles free at the current time
+            now (int): Current simulation time
+            pending (dict, optional): Maps each location identifier to its
+                load queue. Defaults to the load queues of self.locations.
+
+        Returns:
+            list: One (unloads, loads, next_location) tuple per vehicle
+
+        Raises:
+            ValueError: If the policy has no network
+        """
+        if self.network is None:
+            raise ValueError("RoutingPolicy needs a network; run it through the Simulator or pass one")
+        if self.planner is None:
+            self.planner = RoutePlanner(self.locations, self.network, self.time_budget,
+                                        self.lateness_weight, self.max_passes)
+        if pending is None:
+            pending = {location_id: location.load_queue for location_id, location in self.locations.items()}
+
+        unloads = []
+        for vehicle in vehicles:
+            delivered = vehicle.unload(self.locations[vehicle.current_location])
+            for order in delivered:
+                self.planner.unplan(order)
+            unloads.append(delivered)
+
+        self.planner.plan(vehicles, now, pending)
+
+        decisions = []
+        for vehicle, delivered in zip(vehicles, unloads):
+            route = self.planner.route(vehicle)
+            queue = pending.get(vehicle.current_location)
+            loads = []
+            # Atende as paradas planejadas na localização atual
+            while route.stops and route.stops[0].location_id == vehicle.current_location:
+                stop = route.pop_front()
+                if stop.kind == DELIVERY:
+                    continue
+                if queue is not None and stop.order in queue and vehicle.load_order(stop.order):
+                    loads.append(stop.order)
+                else:
+                    self.planner.unplan(stop.order)
+
+            next_location = route.stops[0].location_id if route.stops else vehicle.current_location
+            route.restart(next_location, now + route.travel(vehicle.current_location, next_location))
+            decisions.append((delivered, loads, next_location))
+        return decisions
@@ -1,3 +1,6 @@
+from models.cargo import Cargo
+
+
 class Vehicle:
     """
     Represents a vehicle in the logistics fleet.
@@ -8,12 +11,13 @@ class Vehicle:
     Attributes:
         vehicle_id (str): Unique identifier for the vehicle
         capacity (int): Maximum number of orders the vehicle can carry
+        unit_capacity (int): Maximum number of units the vehicle can carry, or None for no limit
         current_location (str): Current location identifier
-        load (list): List of orders currently loaded on the vehicle
+        load (Cargo): Orders currently loaded on the vehicle, grouped by destination
         available_at (int): Time when the vehicle will be available for next task
     """
     
-    def __init__(self, vehicle_id, capacity, start_location):
+    def __init__(self, vehicle_id, capacity, start_location, unit_capacity=None):
         """
         Initialize a new Vehicle instance.
         
@@ -21,11 +25,14 @@ class Vehicle:
             vehicle_id (str): Unique identifier for the vehicle
             capacity (int): Maximum number of orders the vehicle can carry
             start_location (str): Initial location identifier
+            unit_capacity (int, optional): Maximum number of units the vehicle
+                can carry. Defaults to None (no limit).
         """
         self.vehicle_id = vehicle_id
         self.capacity = capacity
+        self.unit_capacity = unit_capacity
         self.current_location = start_location
-        self.load = []
+        self.load = Cargo()
         self.available_at = 0
     
     def __str__(self):
@@ -42,7 +49,8 @@ class Vehicle:
         Unload orders at a specific location.
         
         Simulates unloading orders that have the specified location as their destination.
-        Orders are removed from the vehicle's load when unloaded.
+        Orders are removed from the vehicle's load when unloaded. Since the load
+        is grouped by destination, this is a single bucket removal.
         
         Args:
             location: Location object where unloading occurs
@@ -50,18 +58,15 @@ class Vehicle:
         Returns:
             list: List of orders that were unloaded
         """
-        unloaded = []
-        for order in self.load:
-            if order.destination == location.location_id:
-                unloaded.append(order)
-                self.load.remove(order)
-        return unloaded
+        return self.load.pop_destination(location.location_id)
     
     def load_order(self, order):
         """
         Load an order onto the vehicle.
         
-        Attempts to load an order if the vehicle has available capacity.
+        Attempts to load an order if the vehicle has available capacity, both
+        in number of orders and, when unit_capacity is set, in units. Both
+        checks use running totals and take constant time.
         
         Args:
             order: Order object to be loaded
@@ -69,7 +74,9 @@ class Vehicle:
         Returns:
             bool: True if order was loaded successfully, False otherwise
         """
-        if len(self.load) < self.capacity:
-            self.load.append(order)
-            return True
-        return False
+        if len(self.load) >= self.capacity:
+            return False
+        if self.unit_capacity is not None and self.load.units + getattr(order, 'units', 0) > self.unit_capacity:
+            return False
+        self.load.add(order)
+        return True
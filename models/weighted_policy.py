@@ -0,0 +1,107 @@
+import math
+
+from models.policy import Policy
+
+
+class WeightedPolicy(Policy):
+    """
+    Policy that ranks next locations by a weighted sum of features.
+
+    Vehicles unload and load the most urgent orders at their location, as
+    in the base policy, and then head for the location with the highest
+    priority among the destinations of the orders on board and the
+    locations with orders waiting for pickup. The priority of a location is
+
+        load_weight * orders - distance_weight * hours - urgency_weight * slack
+
+    where orders counts the orders on board that it receives plus the
+    waiting orders that fit in the vehicle, hours is the travel time to it
+    and slack is the time, in hours, left before the most urgent of those
+    orders is due once the vehicle arrives. A vehicle with no such
+    location stays where it is.
+
+    The weights are the genome evolved by simulator.tuner.
+
+    Attributes:
+        urgency_weight (float): Weight of the slack of the most urgent order
+        distance_weight (float): Weight of the travel time
+        load_weight (float): Weight of the number of orders served
+    """
+
+    def __init__(self, locations, fleet, network=None, urgency_weight=1.0, distance_weight=1.0, load_weight=1.0):
+        """
+        Initialize a new WeightedPolicy instance.
+
+        Args:
+            locations (dict): Dictionary of available locations
+            fleet (list): List of available vehicles
+            network (Network, optional): Shortest-path view of the arcs. The
+                simulator provides its own when None. Defaults to None.
+            urgency_weight (float, optional): Weight of the slack of the
+                most urgent order. Defaults to 1.0.
+            distance_weight (float, optional): Weight of the travel time.
+                Defaults to 1.0.
+            load_weight (float, optional): Weight of the number of orders
+                served. Defaults to 1.0.
+        """
+        super().__init__(locations, fleet, network)
+        self.urgency_weight = urgency_weight
+        self.distance_weight = distance_weight
+        self.load_weight = load_weight
+
+    def choose_actions(self, vehicle, now):
+        """
+        Choose actions for a vehicle at a given time.
+
+        Args:
+            vehicle: Vehicle object to make decisions for
+            now (int): Current simulation time
+
+        Returns:
+            tuple: (unloads, loads, next_location)
+
+        Raises:
+            ValueError: If the policy has no network
+        """
+        if self.network is None:
+            raise ValueError("WeightedPolicy needs a network; run it through the Simulator or pass one")
+        here = vehicle.current_location
+        unloads = vehicle.unload(self.locations[here])
+        loads = []
+        for order in self.locations[here].load_queue:
+            if len(vehicle.load) >= vehicle.capacity:
+                break
+            if vehicle.load_order(order):
+                loads.append(order)
+
+        # Pedidos a bordo e prazo mais próximo de cada destino
+        on_board = {}
+        for order in vehicle.load:
+            count, due_time = on_board.get(order.destination, (0, math.inf))
+            on_board[order.destination] = (count + 1, min(due_time, order.due_time))
+
+        free = vehicle.capacity - len(vehicle.load)
+        best_location = here
+        best_priority = -math.inf
+        for location_id, location in self.locations.items():
+            if location_id == here:
+                continue
+            count, due_time = on_board.get(location_id, (0, math.inf))
+            if free > 0:
+                waiting = location.load_queue.peek()
+                if waiting is not None:
+                    count += min(free, len(location.load_queue))
+                    due_time = min(due_time, waiting.due_time)
+            if count == 0:
+                continue
+            travel_time = self.network.travel_time(here, location_id)
+            if math.isinf(travel_time):
+                continue
+            slack = (due_time - now - travel_time) / 60
+            priority = (self.load_weight * count - self.distance_weight * travel_time / 60
+                        - self.urgency_weight * slack)
+            if priority > best_priority:
+                best_location = location_id
+                best_priority = priority
+
+        return unloads, loads, best_location
@@ -0,0 +1,8 @@
+"""
+Scenario package for the logistics routing simulation system.
+
+This package contains the readers and writers of simulation scenarios:
+building model objects from input records and streaming large inputs.
+"""
+
+# Scenario package 
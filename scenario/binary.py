@@ -0,0 +1,252 @@
+"""
+Compact binary scenario format.
+
+A binary scenario is a directory holding two files:
+
+- scenario.json: locations, arcs and fleet (small), plus the location
+  code table and the number of orders.
+- orders.npy: one fixed-width record per order, sorted by release_time,
+  with the location codes of origin and destination.
+
+orders.npy is opened with a memory map, so opening a scenario with
+millions of orders only reads its header, and several processes opening
+the same scenario share the same pages of the page cache.
+
+Usage:
+    python -m scenario.binary simulation_inputs.json scenario.bin
+    python -m scenario.binary simulation_inputs.json scenario.bin --orders orders.jsonl
+"""
+
+import argparse
+import json
+import os
+from array import array
+
+import numpy as np
+
+from models.columnar import OrderStore
+from scenario.builders import build_arcs, build_fleet, build_locations, build_order
+from scenario.streaming import iter_order_records, read_scenario_header
+
+FORMAT_VERSION = 1
+HEADER_FILE = 'scenario.json'
+ORDERS_FILE = 'orders.npy'
+
+# Pedidos convertidos em objetos a cada bloco lido do arquivo mapeado
+BLOCK_SIZE = 65536
+
+
+def order_dtype(id_width):
+    """
+    Record layout of orders.npy.
+
+    Args:
+        id_width (int): Width in bytes of the order identifier field
+
+    Returns:
+        numpy.dtype: Structured dtype of an order record
+    """
+    return np.dtype([
+        ('order_id', f'S{max(id_width, 1)}'),
+        ('origin', '<i4'),
+        ('destination', '<i4'),
+        ('release_time', '<i8'),
+        ('due_time', '<i8'),
+        ('units', '<i8'),
+    ])
+
+
+def convert_scenario(json_file_path, output_path, orders_path=None):
+    """
+    Convert a JSON scenario to the binary format.
+
+    Orders are streamed from the input, so only their columns are held in
+    memory during the conversion.
+
+    Args:
+        json_file_path (str): Path to the scenario JSON file
+        output_path (str): Directory to write the binary scenario to
+        orders_path (str, optional): Separate order file (JSON or JSON Lines).
+            Defaults to the orders of the scenario file.
+
+    Returns:
+        int: Number of orders written
+    """
+    header = read_scenario_header(json_file_path)
+    location_ids = list(header['locations'])
+    location_index = {location_id: i for i, location_id in enumerate(location_ids)}
+
+    def location_code(location_id):
+        code = location_index.get(location_id)
+        if code is None:
+            code = location_index[location_id] = len(location_ids)
+            location_ids.append(location_id)
+        return code
+
+    order_ids = []
+    origin = array('i')
+    destination = array('i')
+    release_time = array('q')
+    due_time = array('q')
+    units = array('q')
+    for record in iter_order_records(orders_path or json_file_path):
+        order_ids.append(str(record['order_id']).encode('utf-8'))
+        origin.append(location_code(record['origin']))
+        destination.append(location_code(record['destination']))
+        release_time.append(record['release_time'])
+        due_time.append(record['due_time'])
+        units.append(record['units'])
+
+    records = np.empty(len(order_ids), dtype=order_dtype(max(map(len, order_ids), default=1)))
+    records['order_id'] = order_ids
+    records['origin'] = origin
+    records['destination'] = destination
+    records['release_time'] = release_time
+    records['due_time'] = due_time
+    records['units'] = units
+    records = records[np.argsort(records['release_time'], kind='stable')]
+
+    os.makedirs(output_path, exist_ok=True)
+    np.save(os.path.join(output_path, ORDERS_FILE), records)
+    with open(os.path.join(output_path, HEADER_FILE), 'w') as file:
+        json.dump({
+            'format_version': FORMAT_VERSION,
+            'order_count': len(records),
+            'location_ids': location_ids,
+            'locations': header['locations'],
+            'arcs': header['arcs'],
+            'fleet': header['fleet'],
+        }, file)
+    return len(records)
+
+
+class BinaryScenario:
+    """
+    Scenario opened from the binary format.
+
+    Locations, arcs and fleet are built when the scenario is opened; orders
+    stay in the memory-mapped record array until they are requested, either
+    as a lazy stream of Order objects or as an OrderStore.
+
+    Attributes:
+        path (str): Directory of the binary scenario
+        location_ids (list): Location identifier of each location code
+        orders (numpy.memmap): Read-only order records, sorted by release_time
+        locations (dict): Location objects
+        arcs (list): Arc objects
+        fleet (list): Vehicle objects
+    """
+
+    def __init__(self, path, compact=False):
+        """
+        Open a binary scenario.
+
+        Args:
+            path (str): Directory of the binary scenario
+            compact (bool, optional): Build the __slots__ variants. Defaults to False.
+
+        Raises:
+            ValueError: If the scenario was written with another format version
+        """
+        with open(os.path.join(path, HEADER_FILE)) as file:
+            header = json.load(file)
+        if header.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary scenario version: {header.get('format_version')}")
+
+        self.path = path
+        self.compact = compact
+        self.location_ids = header['location_ids']
+        self.orders = np.load(os.path.join(path, ORDERS_FILE), mmap_mode='r')
+        self.locations = build_locations(header['locations'], compact)
+        self.arcs = build_arcs(header['arcs'], compact)
+        self.fleet = build_fleet(header['fleet'], compact)
+
+    def __len__(self):
+        """
+        Number of orders in the scenario.
+
+        Returns:
+            int: Number of orders
+        """
+        return len(self.orders)
+
+    def iter_orders(self):
+        """
+        Stream the orders as Order objects in release_time order.
+
+        Records are decoded a block at a time, so only the pages being read
+        are brought into memory.
+
+        Yields:
+            Order objects sorted by release_time
+        """
+        location_ids = self.location_ids
+        for start in range(0, len(self.orders), BLOCK_SIZE):
+            block = self.orders[start:start + BLOCK_SIZE].tolist()
+            for order_id, origin, destination, release_time, due_time, units in block:
+                yield build_order({
+                    'order_id': order_id.decode('utf-8'),
+                    'origin': location_ids[origin],
+                    'destination': location_ids[destination],
+                    'release_time': release_time,
+                    'due_time': due_time,
+                    'units': units,
+                }, self.compact)
+
+    def order_store(self):
+        """
+        Copy the orders to a columnar OrderStore.
+
+        Returns:
+            OrderStore: Store holding every order
+        """
+        return OrderStore.from_columns(
+            order_ids=np.char.decode(self.orders['order_id'], 'utf-8').tolist(),
+            origin=self.orders['origin'],
+            destination=self.orders['destination'],
+            release_time=self.orders['release_time'],
+            due_time=self.orders['due_time'],
+            units=self.orders['units'],
+            location_ids=self.location_ids,
+        )
+
+    def load(self):
+        """
+        Scenario objects in the same shape as load_simulation_data_streaming.
+
+        Returns:
+            tuple: (locations, arcs, orders, fleet) where orders is an iterator
+        """
+        return self.locations, self.arcs, self.iter_orders(), self.fleet
+
+
+def open_scenario(path, compact=False):
+    """
+    Open a binary scenario.
+
+    Args:
+        path (str): Directory of the binary scenario
+        compact (bool, optional): Build the __slots__ variants. Defaults to False.
+
+    Returns:
+        BinaryScenario: Opened scenario
+    """
+    return BinaryScenario(path, compact)
+
+
+def main():
+    """
+    Command-line entry point converting a JSON scenario to the binary format.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenario', help='scenario JSON file')
+    parser.add_argument('output', help='directory of the binary scenario')
+    parser.add_argument('--orders', help='separate order file (JSON or JSON Lines)')
+    args = parser.parse_args()
+
+    count = convert_scenario(args.scenario, args.output, args.orders)
+    print(f"{count} pedidos convertidos para {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+from models.arc import Arc
+from models.compact import CompactArc, CompactLocation, CompactOrder, CompactVehicle
+from models.location import Location
+from models.order import Order
+from models.vehicle import Vehicle
+
+# Classes usadas para cada representação: regular ou compacta (__slots__)
+MODEL_CLASSES = {
+    False: (Location, Arc, Order, Vehicle),
+    True: (CompactLocation, CompactArc, CompactOrder, CompactVehicle),
+}
+
+
+def build_locations(records, compact=False):
+    """
+    Create Location instances from their input records.
+
+    Args:
+        records (dict): Maps a location identifier to its record
+        compact (bool, optional): Build the __slots__ variant. Defaults to False.
+
+    Returns:
+        dict: Maps a location identifier to its Location
+    """
+    location_class = MODEL_CLASSES[compact][0]
+    locations = {}
+    for loc_id, loc_data in records.items():
+        locations[loc_id] = location_class(
+            location_id=loc_data['location_id'],
+            base_load=loc_data['base_load'],
+            gamma=loc_data['gamma'],
+            base_unload=loc_data['base_unload'],
+            delta=loc_data['delta'],
+            docks=loc_data.get('docks')
+        )
+    return locations
+
+
+def build_arcs(records, compact=False):
+    """
+    Create Arc instances from their input records.
+
+    Args:
+        records (list): Arc records
+        compact (bool, optional): Build the __slots__ variant. Defaults to False.
+
+    Returns:
+        list: Arc objects
+    """
+    arc_class = MODEL_CLASSES[compact][1]
+    return [
+        arc_class(
+            from_location=arc_data['from_location'],
+            to_location=arc_data['to_location'],
+            transit_time=arc_data['transit_time']
+        )
+        for arc_data in records
+    ]
+
+
+def build_order(order_data, compact=False):
+    """
+    Create an Order instance from its input record.
+
+    Args:
+        order_data (dict): Order record
+        compact (bool, optional): Build the __slots__ variant. Defaults to False.
+
+    Returns:
+        Order: Order object
+    """
+    return MODEL_CLASSES[compact][2](
+        order_id=order_data['order_id'],
+        origin=order_data['origin'],
+        destination=order_data['destination'],
+        release_time=order_data['release_time'],
+        due_time=order_data['due_time'],
+        units=order_data['units']
+    )
+
+
+def build_fleet(records, compact=False):
+    """
+    Create Vehicle instances from their input records.
+
+    Args:
+        records (list): Vehicle records
+        compact (bool, optional): Build the __slots__ variant. Defaults to False.
+
+    Returns:
+        list: Vehicle objects
+    """
+    vehicle_class = MODEL_CLASSES[compact][3]
+    return [
+        vehicle_class(
+            vehicle_id=vehicle_data['vehicle_id'],
+            capacity=vehicle_data['capacity'],
+            start_location=vehicle_data['start_location'],
+            unit_capacity=vehicle_data.get('unit_capacity')
+        )
+        for vehicle_data in records
+    ]
+
+
+def build_simulation_data(data, compact=False):
+    """
+    Create every model object of a parsed scenario.
+
+    Args:
+        data (dict): Scenario with 'locations', 'arcs', 'orders' and 'fleet'
+        compact (bool, optional): Build the __slots__ variants. Defaults to False.
+
+    Returns:
+        tuple: (locations, arcs, orders, fleet)
+    """
+    locations = build_locations(data['locations'], compact)
+    arcs = build_arcs(data['arcs'], compact)
+    orders = [build_order(order_data, compact) for order_data in data['orders']]
+    fleet = build_fleet(data['fleet'], compact)
+    return locations, arcs, orders, fleet
@@ -0,0 +1,315 @@
+import heapq
+import json
+import os
+import re
+
+from scenario.builders import build_arcs, build_fleet, build_locations, build_order
+
+# Quantidade de caracteres lida do arquivo a cada vez
+CHUNK_SIZE = 1 << 20
+
+# Quantidade de pedidos mantida em memória para reordenar por release_time
+REORDER_WINDOW = 10_000
+
+_WHITESPACE = re.compile(r'\s*')
+
+
+class _JSONStream:
+    """
+    Incremental reader over a JSON document.
+
+    Only the part of the document that is being decoded is kept in memory:
+    values are decoded one at a time with JSONDecoder.raw_decode and the
+    buffer is refilled from the file whenever a value is cut at a chunk
+    boundary.
+
+    Attributes:
+        _file: Text file being read
+        _buffer (str): Characters read and not yet consumed
+        _pos (int): Position of the next character in the buffer
+        _eof (bool): True once the whole file has been read
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        """
+        Initialize a new _JSONStream instance.
+
+        Args:
+            file: Text file opened for reading
+            chunk_size (int, optional): Characters read at a time
+        """
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """
+        Append the next chunk of the file to the buffer.
+
+        Returns:
+            bool: False if the end of the file was reached
+        """
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """
+        Next non-whitespace character, without consuming it.
+
+        Returns:
+            str: Next character, or '' at the end of the document
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        """
+        Consume the next non-whitespace character, which must be char.
+
+        Args:
+            char (str): Expected character
+
+        Raises:
+            ValueError: If the document has another character there
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON document, found {found!r}")
+        self._pos += 1
+
+    def value(self):
+        """
+        Decode and consume the next JSON value.
+
+        Returns:
+            Decoded value
+
+        Raises:
+            json.JSONDecodeError: If the document is malformed or truncated
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Um número no fim do buffer pode ter sido cortado ao meio
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self, array_key):
+        """
+        Iterate over the top-level members of the document.
+
+        Members are yielded as (key, value) pairs, except for the member
+        named array_key, which must be an array and is yielded as
+        (array_key, iterator over its elements). That iterator must be
+        consumed before asking for the next member.
+
+        Args:
+            array_key (str): Member whose elements are decoded one at a time
+
+        Yields:
+            tuple: (key, value) pairs
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            if key == array_key:
+                yield key, self._elements()
+            else:
+                yield key, self.value()
+            if self.peek() == '}':
+                return
+            self.expect(',')
+
+    def _elements(self):
+        """
+        Decode the elements of the array at the current position.
+
+        Yields:
+            Decoded elements, one at a time
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ']':
+                self._pos += 1
+                return
+            self.expect(',')
+
+
+def _detect_format(path, format):
+    """
+    Input format of an order file.
+
+    Args:
+        path (str): Path to the file
+        format (str): 'json', 'jsonl' or None to guess from the extension
+
+    Returns:
+        str: 'json' or 'jsonl'
+    """
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        format = 'jsonl' if extension in ('.jsonl', '.ndjson') else 'json'
+    if format not in ('json', 'jsonl'):
+        raise ValueError(f"Unknown order file format: {format}")
+    return format
+
+
+def iter_order_records(path, format=None, chunk_size=CHUNK_SIZE):
+    """
+    Iterate over the raw order records of a scenario or order feed.
+
+    Works on a scenario JSON document (reading its 'orders' array) or on a
+    JSON Lines feed with one order per line, in file order and without
+    loading the whole file.
+
+    Args:
+        path (str): Path to the file
+        format (str, optional): 'json' or 'jsonl'. Guessed from the
+            extension (.jsonl / .ndjson) when None.
+        chunk_size (int, optional): Characters read at a time
+
+    Yields:
+        dict: Order records
+    """
+    format = _detect_format(path, format)
+    with open(path, 'r') as file:
+        if format == 'jsonl':
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        for key, value in _JSONStream(file, chunk_size).items('orders'):
+            if key == 'orders':
+                yield from value
+                return
+
+
+def read_scenario_header(path, chunk_size=CHUNK_SIZE):
+    """
+    Read every top-level member of a scenario except its orders.
+
+    The orders array is decoded element by element and discarded, so the
+    memory used does not depend on the number of orders.
+
+    Args:
+        path (str): Path to the scenario JSON file
+        chunk_size (int, optional): Characters read at a time
+
+    Returns:
+        dict: Scenario members, such as 'locations', 'arcs' and 'fleet'
+    """
+    header = {}
+    with open(path, 'r') as file:
+        for key, value in _JSONStream(file, chunk_size).items('orders'):
+            if key == 'orders':
+                for _ in value:
+                    pass
+            else:
+                header[key] = value
+    return header
+
+
+def in_release_order(orders, window=REORDER_WINDOW):
+    """
+    Reorder a stream of orders by release_time within a bounded window.
+
+    Up to window orders are buffered in a heap, so a feed that is sorted
+    or only locally out of order is emitted in release_time order with
+    bounded memory.
+
+    Args:
+        orders (iterable): Order objects
+        window (int, optional): Maximum number of buffered orders
+
+    Yields:
+        Order objects sorted by release_time
+
+    Raises:
+        ValueError: If an order arrives later than the window allows
+    """
+    heap = []
+    emitted = None
+    for seq, order in enumerate(orders):
+        if emitted is not None and order.release_time < emitted:
+            raise ValueError(
+                f"Order {order.order_id} is released at {order.release_time}, before an order "
+                f"already emitted at {emitted}; sort the feed or increase the reorder window"
+            )
+        heapq.heappush(heap, (order.release_time, seq, order))
+        if len(heap) > window:
+            emitted, _, order = heapq.heappop(heap)
+            yield order
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def iter_orders(path, format=None, compact=False, window=REORDER_WINDOW, chunk_size=CHUNK_SIZE):
+    """
+    Stream the orders of a scenario or order feed in release_time order.
+
+    Args:
+        path (str): Path to a scenario JSON file or a JSON Lines order feed
+        format (str, optional): 'json' or 'jsonl'. Guessed from the extension when None.
+        compact (bool, optional): Build the __slots__ variant. Defaults to False.
+        window (int, optional): Maximum number of orders buffered for reordering
+        chunk_size (int, optional): Characters read at a time
+
+    Yields:
+        Order objects sorted by release_time
+    """
+    records = iter_order_records(path, format, chunk_size)
+    return in_release_order((build_order(record, compact) for record in records), window)
+
+
+def load_simulation_data_streaming(json_file_path, orders_path=None, compact=False, window=REORDER_WINDOW):
+    """
+    Load a scenario with its orders as a lazy stream.
+
+    Locations, arcs and fleet are built right away; orders are returned as
+    an iterator in release_time order that the simulator consumes as their
+    release time arrives.
+
+    Args:
+        json_file_path (str): Path to the scenario JSON file
+        orders_path (str, optional): Separate order file (JSON or JSON Lines).
+            Defaults to the orders of the scenario file.
+        compact (bool, optional): Build the __slots__ variants. Defaults to False.
+        window (int, optional): Maximum number of orders buffered for reordering
+
+    Returns:
+        tuple: (locations, arcs, orders, fleet) where orders is an iterator
+    """
+    header = read_scenario_header(json_file_path)
+    locations = build_locations(header['locations'], compact)
+    arcs = build_arcs(header['arcs'], compact)
+    fleet = build_fleet(header['fleet'], compact)
+    orders = iter_orders(orders_path or json_file_path, compact=compact, window=window)
+    return locations, arcs, orders, fleet
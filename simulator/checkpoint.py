@@ -0,0 +1,455 @@
+"""
+Periodic checkpoints of a simulation run, and resumption from them.
+
+A Checkpointer advances a simulation in steps of a fixed number of
+simulated minutes and writes a checkpoint after each step. A checkpoint
+holds everything the rest of the run depends on: the engine state
+(clock, pending events, KPI counters, random generator states, see
+Simulator.engine_state), the status of the orders, the location, time
+and cargo of the vehicles, the load queues, the docks and the state of
+the policy.
+A run resumed from a checkpoint produces the same results as one that
+was never interrupted.
+
+Checkpoints come in chains. Every full_every-th checkpoint is full and
+holds the whole state; the ones in between are deltas holding only the
+orders, vehicles, queues and docks changed since the previous checkpoint, as
+reported by the simulator's journal, so their size follows the activity
+of the run rather than the size of the instance. The engine and policy
+states are written whole in every checkpoint.
+
+Objects are stored by their index in simulator.orders and simulator.fleet
+or by location id, never by value, and the policy is pickled with
+references to the simulation objects in place of copies. Each file is a
+zlib-compressed pickle written atomically:
+    checkpoint-000000.full
+    checkpoint-000001.delta
+    ...
+
+Usage:
+    checkpointer = Checkpointer('checkpoints', every=60, full_every=8)
+    results = checkpointer.run(Simulator(locations, arcs, orders, fleet), policy)
+
+Running the same code again after an interruption resumes from the last
+checkpoint in the directory.
+"""
+
+import io
+import os
+import pickle
+import re
+import zlib
+
+# Nome dos arquivos de checkpoint: número de sequência e tipo
+_FILE_NAME = re.compile(r'^checkpoint-(\d{6})\.(full|delta)$')
+
+FORMAT_VERSION = 2
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickler that stores the simulation objects as references.
+    """
+
+    def __init__(self, file, references):
+        """
+        Initialize a new _Pickler instance.
+
+        Args:
+            file: Binary file to write to
+            references (dict): Maps id() of each shared object to its reference
+        """
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._references = references
+
+    def persistent_id(self, obj):
+        """
+        Reference of a shared object.
+
+        Args:
+            obj: Object being pickled
+
+        Returns:
+            tuple: Reference, or None to pickle the object by value
+        """
+        return self._references.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    """
+    Unpickler that resolves the references written by _Pickler.
+    """
+
+    def __init__(self, file, objects):
+        """
+        Initialize a new _Unpickler instance.
+
+        Args:
+            file: Binary file to read from
+            objects (dict): Maps each reference to the live object
+        """
+        super().__init__(file)
+        self._objects = objects
+
+    def persistent_load(self, pid):
+        """
+        Live object of a reference.
+
+        Args:
+            pid (tuple): Reference written by _Pickler
+
+        Returns:
+            Object the reference stands for
+
+        Raises:
+            pickle.UnpicklingError: If the reference is unknown
+        """
+        try:
+            return self._objects[pid]
+        except KeyError:
+            raise pickle.UnpicklingError(f"unknown reference {pid!r} in checkpoint") from None
+
+
+class Checkpointer:
+    """
+    Writer and reader of the checkpoints of a simulation run.
+
+    Attributes:
+        directory (str): Directory holding the checkpoint files
+        every (int): Simulated minutes between checkpoints
+        full_every (int): A full checkpoint is written every full_every
+            checkpoints, deltas in between
+        sequence (int): Number of the next checkpoint
+        time (int): Simulation time the last checkpoint was taken at
+        written (list): (path, size in bytes) of the files written by this instance
+    """
+
+    def __init__(self, directory, every=60, full_every=8):
+        """
+        Initialize a new Checkpointer instance.
+
+        Args:
+            directory (str): Directory holding the checkpoint files, created if needed
+            every (int, optional): Simulated minutes between checkpoints. Defaults to 60.
+            full_every (int, optional): Checkpoints per full checkpoint;
+                1 makes every checkpoint full. Defaults to 8.
+
+        Raises:
+            ValueError: If every or full_every is not positive
+        """
+        if every <= 0 or full_every <= 0:
+            raise ValueError("every and full_every must be positive")
+        self.directory = directory
+        self.every = every
+        self.full_every = full_every
+        self.sequence = 0
+        self.time = 0
+        self.written = []
+        self._simulator = None
+        self._order_index = {}
+        self._vehicle_index = {}
+        self._queue_index = {}
+        self._dock_index = {}
+        self._saved_queues = {}
+        self._references = {}
+        self._objects = {}
+
+    def run(self, simulator, policy, until=None):
+        """
+        Run a simulation, writing checkpoints, or resume it from the last one.
+
+        The simulator and policy must be built the same way as those of the
+        run that wrote the checkpoints.
+
+        Args:
+            simulator (Simulator): Simulator to run
+            policy: Policy object that defines routing decisions
+            until (int, optional): Stop at this time instead of the horizon,
+                leaving the run to be resumed later. Defaults to the horizon.
+
+        Returns:
+            dict: Simulation results at the time the run stopped
+        """
+        if not self.resume(simulator, policy):
+            simulator.start(policy)
+            self._bind(simulator)
+            self.sequence = 0
+            self.time = 0
+            simulator.journal.dirty = {}
+
+        limit = simulator.horizon if until is None else min(until, simulator.horizon)
+        while self.time + self.every <= limit and not simulator.done:
+            simulator.advance(self.time + self.every)
+            self.save(simulator, policy, self.time + self.every)
+        # Trecho final, mais curto que o intervalo entre checkpoints
+        simulator.advance(limit)
+        if until is None or simulator.done:
+            return simulator.finish()
+        return simulator.get_results()
+
+    def save(self, simulator, policy, time):
+        """
+        Write the next checkpoint.
+
+        Args:
+            simulator (Simulator): Simulator between two calls to advance
+            policy: Policy of the run
+            time (int): Simulation time the run has been advanced to
+
+        Returns:
+            str: Path of the written file
+        """
+        full = self.sequence % self.full_every == 0
+        dirty = simulator.journal.dirty
+        if full or dirty is None:
+            full = True
+            orders = range(len(simulator.orders))
+            vehicles = range(len(simulator.fleet))
+            queues = list(self._queue_index)
+            docks = list(self._dock_index)
+        else:
+            orders = sorted(self._order_index[key] for key in dirty if key in self._order_index)
+            # Um veículo está sujo se ele ou a sua carga mudou
+            vehicles = sorted({self._vehicle_index[key] for key in dirty if key in self._vehicle_index})
+            queues = [location_id for location_id, key in self._queue_index.items() if key in dirty]
+            docks = [location_id for location_id, key in self._dock_index.items() if key in dirty]
+        simulator.journal.dirty = {}
+
+        state = {
+            'version': FORMAT_VERSION,
+            'kind': 'full' if full else 'delta',
+            'sequence': self.sequence,
+            'time': time,
+            'shape': (len(simulator.orders), len(simulator.fleet), list(simulator.locations)),
+            'engine': simulator.engine_state(),
+            'orders': [(index, simulator.orders[index].status, simulator.orders[index].delivery_time)
+                       for index in orders],
+            'vehicles': [self._vehicle_state(simulator.fleet[index], index) for index in vehicles],
+            'queues': [self._queue_state(simulator, location_id, full) for location_id in queues],
+            'docks': [(location_id, simulator.locations[location_id].docks.state()) for location_id in docks],
+        }
+        buffer = io.BytesIO()
+        pickler = _Pickler(buffer, self._references)
+        pickler.dump(state)
+        pickler.dump(policy)
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"checkpoint-{self.sequence:06d}.{state['kind']}")
+        temporary = f"{path}.tmp"
+        data = zlib.compress(buffer.getvalue())
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+        if full:
+            self._prune(self.sequence)
+        self.written.append((path, len(data)))
+        self.sequence += 1
+        self.time = time
+        return path
+
+    def resume(self, simulator, policy):
+        """
+        Load the last checkpoint of the directory into a fresh simulation.
+
+        The last full checkpoint is applied, then every delta written after
+        it, and the engine continues from the time of the last one.
+
+        Args:
+            simulator (Simulator): Simulator built as for the original run,
+                not started
+            policy: Policy built as for the original run
+
+        Returns:
+            bool: True if a checkpoint was loaded, False if there is none
+
+        Raises:
+            ValueError: If the checkpoints do not match the simulation
+        """
+        chain = self._chain()
+        if not chain:
+            return False
+        self._bind(simulator)
+        for path in chain:
+            with open(path, 'rb') as file:
+                unpickler = _Unpickler(io.BytesIO(zlib.decompress(file.read())), self._objects)
+                state = unpickler.load()
+                restored = unpickler.load()
+            if state['version'] != FORMAT_VERSION:
+                raise ValueError(f"{path} has format version {state['version']}, expected {FORMAT_VERSION}")
+            if state['shape'] != (len(simulator.orders), len(simulator.fleet), list(simulator.locations)):
+                raise ValueError(f"{path} was written for a different set of orders, vehicles or locations")
+            self._apply(simulator, state)
+
+        # Estado do motor e da política vem apenas do último checkpoint
+        if type(restored) is not type(policy):
+            raise ValueError(f"{chain[-1]} holds a {type(restored).__name__}, not a {type(policy).__name__}")
+        vars(policy).update(vars(restored))
+        simulator.set_engine_state(policy, state['engine'])
+        if simulator.fleet_store is not None:
+            for vehicle in simulator.fleet:
+                vehicle._sync_load()
+        for location_id, location in simulator.locations.items():
+            self._saved_queues[location_id] = {self._order_index[id(order)]: entry_seq
+                                               for entry_seq, order in location.load_queue.state()[0]}
+        simulator.journal.dirty = {}
+        self.sequence = state['sequence'] + 1
+        self.time = state['time']
+        return True
+
+    def _bind(self, simulator):
+        """
+        Index the simulation objects stored by reference.
+
+        Args:
+            simulator (Simulator): Simulator of the run
+        """
+        if self._simulator is simulator:
+            return
+        self._simulator = simulator
+        self._order_index = {id(order): index for index, order in enumerate(simulator.orders)}
+        self._vehicle_index = {}
+        for index, vehicle in enumerate(simulator.fleet):
+            self._vehicle_index[id(vehicle)] = index
+            self._vehicle_index[id(vehicle.load)] = index
+        self._queue_index = {location_id: id(location.load_queue)
+                             for location_id, location in simulator.locations.items()}
+        self._dock_index = {location_id: id(location.docks) for location_id, location in simulator.locations.items()
+                            if getattr(location, 'docks', None) is not None}
+
+        objects = {
+            ('simulator',): simulator,
+            ('network',): simulator.network,
+            ('locations',): simulator.locations,
+            ('orders',): simulator.orders,
+            ('fleet',): simulator.fleet,
+        }
+        for index, order in enumerate(simulator.orders):
+            objects[('order', index)] = order
+        for index, vehicle in enumerate(simulator.fleet):
+            objects[('vehicle', index)] = vehicle
+            objects[('cargo', index)] = vehicle.load
+        for location_id, location in simulator.locations.items():
+            objects[('location', location_id)] = location
+            objects[('queue', location_id)] = location.load_queue
+            if location_id in self._dock_index:
+                objects[('docks', location_id)] = location.docks
+        self._objects = objects
+        self._references = {id(obj): reference for reference, obj in objects.items()}
+
+    def _vehicle_state(self, vehicle, index):
+        """
+        Stored state of a vehicle.
+
+        Args:
+            vehicle: Vehicle object
+            index (int): Index of the vehicle in the fleet
+
+        Returns:
+            tuple: (index, current_location, available_at, indices of the
+                orders on board in cargo order)
+        """
+        return (index, vehicle.current_location, vehicle.available_at,
+                [self._order_index[id(order)] for order in vehicle.load])
+
+    def _queue_state(self, simulator, location_id, full):
+        """
+        Stored state of a load queue, relative to the previous checkpoint.
+
+        Queues can grow long, so a delta only holds the entries added and
+        removed since the previous checkpoint; a full checkpoint holds every
+        entry as added.
+
+        Args:
+            simulator (Simulator): Simulator of the run
+            location_id (str): Location identifier
+            full (bool): Whether the checkpoint is full
+
+        Returns:
+            tuple: (location_id, [(seq, order index), ...] added, [order
+                index, ...] removed, next seq, destinations)
+        """
+        entries, seq, destinations = simulator.locations[location_id].load_queue.state()
+        current = {self._order_index[id(order)]: entry_seq for entry_seq, order in entries}
+        previous = {} if full else self._saved_queues.get(location_id, {})
+        added = [(entry_seq, index) for index, entry_seq in current.items() if index not in previous]
+        removed = [index for index in previous if index not in current]
+        self._saved_queues[location_id] = current
+        return location_id, added, removed, seq, destinations
+
+    def _apply(self, simulator, state):
+        """
+        Write the objects of a checkpoint back into the simulation.
+
+        Args:
+            simulator (Simulator): Simulator of the run
+            state (dict): Contents of a checkpoint file
+        """
+        orders = simulator.orders
+        for index, status, delivery_time in state['orders']:
+            order = orders[index]
+            order.status = status
+            order.delivery_time = delivery_time
+        for index, location_id, available_at, load in state['vehicles']:
+            vehicle = simulator.fleet[index]
+            vehicle.current_location = location_id
+            vehicle.available_at = available_at
+            vehicle.load.set_state([orders[order] for order in load])
+        for location_id, added, removed, seq, destinations in state['queues']:
+            queue = simulator.locations[location_id].load_queue
+            entries = {} if state['kind'] == 'full' else {id(order): (entry_seq, order)
+                                                          for entry_seq, order in queue.state()[0]}
+            for index in removed:
+                del entries[id(orders[index])]
+            for entry_seq, index in added:
+                entries[id(orders[index])] = (entry_seq, orders[index])
+            queue.set_state((sorted(entries.values(), key=lambda entry: entry[0]), seq, destinations))
+        for location_id, docks in state['docks']:
+            simulator.locations[location_id].docks.set_state(docks)
+
+    def _files(self):
+        """
+        Checkpoint files of the directory.
+
+        Returns:
+            list: (sequence, kind, path) tuples, in sequence order
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        files = []
+        for name in os.listdir(self.directory):
+            match = _FILE_NAME.match(name)
+            if match:
+                files.append((int(match.group(1)), match.group(2), os.path.join(self.directory, name)))
+        return sorted(files)
+
+    def _chain(self):
+        """
+        Files to load to rebuild the state of the last checkpoint.
+
+        Returns:
+            list: Path of the last full checkpoint followed by the deltas
+                written after it, or [] if there is no full checkpoint
+        """
+        files = self._files()
+        fulls = [i for i, (_, kind, _) in enumerate(files) if kind == 'full']
+        if not fulls:
+            return []
+        chain = [files[fulls[-1]][2]]
+        expected = files[fulls[-1]][0] + 1
+        for sequence, kind, path in files[fulls[-1] + 1:]:
+            if sequence != expected:
+                break
+            chain.append(path)
+            expected += 1
+        return chain
+
+    def _prune(self, sequence):
+        """
+        Delete the checkpoints made obsolete by a new full checkpoint.
+
+        Args:
+            sequence (int): Sequence number of the full checkpoint just written
+        """
+        for other, _, path in self._files():
+            if other != sequence:
+                os.remove(path)
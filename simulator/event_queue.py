@@ -0,0 +1,94 @@
+import heapq
+
+# Tipos de evento, na ordem em que são processados dentro do mesmo instante
+ORDER_RELEASE = 0
+VEHICLE_ARRIVAL = 1
+VEHICLE_READY = 2
+
+
+class EventQueue:
+    """
+    Priority queue of simulation events ordered by time.
+
+    Events scheduled for the same instant are ordered by kind (order
+    releases first, then vehicle arrivals, then vehicles becoming ready)
+    and then by an integer key identifying the entity, so the processing
+    order does not depend on the order in which events were pushed.
+
+    Attributes:
+        _heap (list): Binary heap of (time, kind, key, seq, payload) entries
+        _seq (int): Tie-breaker for entries with equal keys
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty EventQueue instance.
+        """
+        self._heap = []
+        self._seq = 0
+
+    def __len__(self):
+        """
+        Number of scheduled events.
+
+        Returns:
+            int: Number of events in the queue
+        """
+        return len(self._heap)
+
+    def push(self, time, kind, key, payload):
+        """
+        Schedule an event.
+
+        Args:
+            time (int): Simulation time at which the event happens
+            kind (int): Event type (ORDER_RELEASE, VEHICLE_ARRIVAL or VEHICLE_READY)
+            key (int): Stable identifier of the entity, used to break ties
+            payload: Object associated with the event
+        """
+        heapq.heappush(self._heap, (time, kind, key, self._seq, payload))
+        self._seq += 1
+
+    def pop(self):
+        """
+        Remove and return the earliest event.
+
+        Returns:
+            tuple: (time, kind, key, payload) of the earliest event
+        """
+        time, kind, key, _, payload = heapq.heappop(self._heap)
+        return time, kind, key, payload
+
+    def peek(self):
+        """
+        Return the earliest event without removing it.
+
+        Returns:
+            tuple: (time, kind) of the earliest event, or None if the queue is empty
+        """
+        if not self._heap:
+            return None
+        entry = self._heap[0]
+        return entry[0], entry[1]
+
+    def state(self):
+        """
+        Copy of the scheduled events, for set_state.
+
+        Entries are immutable tuples, so copying the heap is enough and
+        costs one reference per event.
+
+        Returns:
+            tuple: (heap, seq) state of the queue
+        """
+        return list(self._heap), self._seq
+
+    def set_state(self, state):
+        """
+        Replace the scheduled events with a state returned by state().
+
+        Args:
+            state (tuple): (heap, seq) state of the queue
+        """
+        heap, self._seq = state
+        self._heap = list(heap)
@@ -0,0 +1,355 @@
+"""
+Run-time metrics of the simulation engine.
+
+A Metrics registry holds counters, gauges and histograms, each
+identified by a name and an optional tuple of (label, value) pairs. The
+simulator records into the registry given as its metrics argument, and
+nothing at all when it is None. The registry can be exported in the
+Prometheus text format, served from a local HTTP endpoint while a run is
+in progress, or summarized as JSON.
+
+Metrics recorded by the simulator:
+    simulator_events_total{kind}: Events processed, by kind
+    simulator_decision_epochs_total: Calls to choose_actions_batch
+    simulator_decisions_total: Vehicle decisions applied
+    simulator_policy_seconds: Wall time of the policy per decision epoch
+    simulator_orders_loaded_total: Orders loaded onto vehicles
+    simulator_orders_unloaded_total: Orders delivered
+    simulator_queue_length{location}: Orders waiting at each location
+    simulator_time_minutes: Simulation clock
+    simulator_minutes_per_second: Simulated minutes per wall-clock second
+
+Usage:
+    metrics = Metrics()
+    server = serve_metrics(metrics, port=9100)
+    Simulator(locations, arcs, orders, fleet, metrics=metrics).run(policy)
+    print(metrics.to_prometheus())
+"""
+
+import bisect
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Limites superiores dos buckets de latência, em segundos
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'simulator_events_total': 'Events processed, by kind',
+    'simulator_decision_epochs_total': 'Calls to choose_actions_batch',
+    'simulator_decisions_total': 'Vehicle decisions applied',
+    'simulator_policy_seconds': 'Wall time of the policy per decision epoch',
+    'simulator_orders_loaded_total': 'Orders loaded onto vehicles',
+    'simulator_orders_unloaded_total': 'Orders delivered',
+    'simulator_queue_length': 'Orders waiting at each location',
+    'simulator_time_minutes': 'Simulation clock',
+    'simulator_minutes_per_second': 'Simulated minutes per wall-clock second',
+}
+
+
+class Histogram:
+    """
+    Distribution of observed values over fixed buckets.
+
+    Attributes:
+        bounds (tuple): Upper bounds of the buckets, in increasing order
+        counts (list): Observations per bucket, plus one for larger values
+        count (int): Number of observations
+        sum (float): Sum of the observations
+    """
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """
+        Initialize an empty Histogram instance.
+
+        Args:
+            bounds (tuple, optional): Upper bounds of the buckets. Defaults
+                to LATENCY_BUCKETS.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """
+        Record a value.
+
+        Args:
+            value (float): Observed value
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket holding a quantile.
+
+        Args:
+            q (float): Quantile, between 0 and 1
+
+        Returns:
+            float: Bucket bound, inf past the last bucket, or nan when empty
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+
+class Metrics:
+    """
+    Registry of counters, gauges and histograms.
+
+    Labels are passed as a tuple of (name, value) pairs, which is hashed
+    as is, so recording a value costs one dictionary update.
+
+    Attributes:
+        counters (dict): Maps (name, labels) to a monotonic total
+        gauges (dict): Maps (name, labels) to the last value set
+        histograms (dict): Maps (name, labels) to a Histogram
+        summary_path (str): JSON file written by write_summary, or None
+    """
+
+    def __init__(self, summary_path=None):
+        """
+        Initialize an empty Metrics instance.
+
+        Args:
+            summary_path (str, optional): JSON file the simulator writes the
+                summary to at the end of each run. Defaults to None.
+        """
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.summary_path = summary_path
+
+    def inc(self, name, value=1, labels=()):
+        """
+        Increase a counter.
+
+        Args:
+            name (str): Metric name
+            value (float, optional): Increment. Defaults to 1.
+            labels (tuple, optional): (label, value) pairs. Defaults to none.
+        """
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, labels=()):
+        """
+        Set a gauge.
+
+        Args:
+            name (str): Metric name
+            value (float): New value
+            labels (tuple, optional): (label, value) pairs. Defaults to none.
+        """
+        self.gauges[(name, labels)] = value
+
+    def observe(self, name, value, labels=()):
+        """
+        Record a value in a histogram.
+
+        Args:
+            name (str): Metric name
+            value (float): Observed value
+            labels (tuple, optional): (label, value) pairs. Defaults to none.
+        """
+        histogram = self.histograms.get((name, labels))
+        if histogram is None:
+            histogram = self.histograms[(name, labels)] = Histogram()
+        histogram.observe(value)
+
+    def to_prometheus(self):
+        """
+        Snapshot of every metric in the Prometheus text format.
+
+        Returns:
+            str: Exposition text, one sample per line
+        """
+        lines = []
+        for kind, samples in (('counter', self.counters), ('gauge', self.gauges)):
+            for name, group in _by_name(samples):
+                lines += _header(name, kind)
+                lines += [f"{name}{_labels(labels)} {_number(value)}" for labels, value in group]
+        for name, group in _by_name(self.histograms):
+            lines += _header(name, 'histogram')
+            for labels, histogram in group:
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + (math.inf,), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """
+        JSON-serializable summary of every metric.
+
+        Histograms are summarized by their count, sum, mean and the bucket
+        bounds of their median and 99th percentile.
+
+        Returns:
+            dict: Maps each metric, with its labels, to its value
+        """
+        summary = {}
+        for samples in (self.counters, self.gauges):
+            for (name, labels), value in list(samples.items()):
+                summary[name + _labels(labels)] = value
+        for (name, labels), histogram in list(self.histograms.items()):
+            summary[name + _labels(labels)] = {
+                'count': histogram.count,
+                'sum': histogram.sum,
+                'mean': histogram.sum / histogram.count if histogram.count else None,
+                'p50': _json_number(histogram.quantile(0.5)),
+                'p99': _json_number(histogram.quantile(0.99)),
+            }
+        return summary
+
+    def write_summary(self, path=None):
+        """
+        Write the summary as JSON.
+
+        Args:
+            path (str, optional): Output file. Defaults to self.summary_path;
+                nothing is written when both are None.
+
+        Returns:
+            dict: The summary
+        """
+        summary = self.summary()
+        path = path or self.summary_path
+        if path:
+            with open(path, 'w') as file:
+                json.dump(summary, file, indent=2, sort_keys=True)
+        return summary
+
+
+def _by_name(samples):
+    """
+    Group samples by metric name, in name order.
+
+    Args:
+        samples (dict): Maps (name, labels) to a value
+
+    Returns:
+        list: (name, [(labels, value), ...]) pairs
+    """
+    groups = {}
+    for (name, labels), value in list(samples.items()):
+        groups.setdefault(name, []).append((labels, value))
+    return sorted(groups.items())
+
+
+def _header(name, kind):
+    """
+    HELP and TYPE lines of a metric.
+
+    Args:
+        name (str): Metric name
+        kind (str): Prometheus metric type
+
+    Returns:
+        list: Header lines
+    """
+    lines = [f"# HELP {name} {HELP[name]}"] if name in HELP else []
+    return lines + [f"# TYPE {name} {kind}"]
+
+
+def _labels(labels):
+    """
+    Prometheus label set.
+
+    Args:
+        labels (tuple): (label, value) pairs
+
+    Returns:
+        str: Label set in braces, or an empty string
+    """
+    if not labels:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+def _number(value):
+    """
+    Prometheus representation of a sample value.
+
+    Args:
+        value (float): Sample value
+
+    Returns:
+        str: Value, with +Inf, -Inf and NaN spelled as Prometheus expects
+    """
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _json_number(value):
+    """
+    JSON-safe number.
+
+    Args:
+        value (float): Number that may be infinite or nan
+
+    Returns:
+        float: The value, or None when it is not finite
+    """
+    return value if math.isfinite(value) else None
+
+
+def serve_metrics(metrics, port=9100, host='127.0.0.1'):
+    """
+    Serve a registry over HTTP from a background thread.
+
+    GET /metrics returns the Prometheus text snapshot and GET /summary the
+    JSON summary. The server is a daemon and does not keep the process
+    alive.
+
+    Args:
+        metrics (Metrics): Registry to serve
+        port (int, optional): Port to listen on; 0 picks a free one. Defaults to 9100.
+        host (str, optional): Interface to bind. Defaults to localhost.
+
+    Returns:
+        ThreadingHTTPServer: Running server; call shutdown() to stop it
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body = metrics.to_prometheus().encode()
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            elif self.path == '/summary':
+                body = json.dumps(metrics.summary(), sort_keys=True).encode()
+                content_type = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,161 @@
+class Journal:
+    """
+    Undo log of the mutations made to the simulation state.
+
+    While at least one mark is open, every mutation reported to the journal
+    is recorded together with the call that reverts it. Rolling back to a
+    mark replays those calls in reverse order, so going back costs time
+    proportional to what changed since the mark instead of to the size of
+    the state. With no open mark nothing is recorded and the journal only
+    costs one attribute check per mutation.
+
+    Independently of the marks, the journal can also collect the objects
+    changed since some point, for incremental checkpoints: while dirty is
+    a dictionary, every object set through the journal, and the owner of
+    every recorded undo method, is added to it. Other consumers of the
+    changes, such as the rollout workers of models.rollout_policy, each
+    collect them in a dictionary of their own returned by track(), so
+    they do not reset dirty under the checkpoints.
+
+    Attributes:
+        dirty (dict): Maps id() of each object changed since tracking
+            started to the object, or None when not tracking
+        _trackers (list): Dictionaries returned by track(), filled as dirty
+        _log (list): Recorded (undo, args) pairs, oldest first
+        _marks (int): Number of open marks
+        _replaying (bool): True while a rollback is running, so the undo
+            calls are not recorded again
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty Journal instance.
+        """
+        self._log = []
+        self._marks = 0
+        self._replaying = False
+        self.dirty = None
+        self._trackers = []
+
+    def __len__(self):
+        """
+        Number of recorded mutations.
+
+        Returns:
+            int: Length of the undo log
+        """
+        return len(self._log)
+
+    @property
+    def recording(self):
+        """
+        Whether mutations are currently being recorded.
+
+        Returns:
+            bool: True if a mark is open and no rollback is running
+        """
+        return self._marks > 0 and not self._replaying
+
+    def record(self, undo, *args):
+        """
+        Record how to revert a mutation that was just made.
+
+        Args:
+            undo (callable): Function that reverts the mutation
+            *args: Arguments of undo
+        """
+        if self._marks and not self._replaying:
+            self._log.append((undo, args))
+        if self.dirty is not None:
+            owner = getattr(undo, '__self__', None)
+            if owner is not None:
+                self.dirty[id(owner)] = owner
+        if self._trackers:
+            owner = getattr(undo, '__self__', None)
+            if owner is not None:
+                for tracker in self._trackers:
+                    tracker[id(owner)] = owner
+
+    def set(self, obj, name, value):
+        """
+        Set an attribute, recording its previous value.
+
+        Args:
+            obj: Object whose attribute is set
+            name (str): Attribute name
+            value: New value
+        """
+        if self._marks and not self._replaying:
+            self._log.append((setattr, (obj, name, getattr(obj, name))))
+        if self.dirty is not None:
+            self.dirty[id(obj)] = obj
+        for tracker in self._trackers:
+            tracker[id(obj)] = obj
+        setattr(obj, name, value)
+
+    def track(self):
+        """
+        Start collecting the objects changed from now on, as dirty does.
+
+        The returned dictionary is filled until it is passed to untrack,
+        and may be cleared by its owner at any time.
+
+        Returns:
+            dict: Maps id() of each changed object to the object
+        """
+        tracker = {}
+        self._trackers.append(tracker)
+        return tracker
+
+    def untrack(self, tracker):
+        """
+        Stop filling a dictionary returned by track.
+
+        Args:
+            tracker (dict): Dictionary returned by track
+        """
+        self._trackers = [other for other in self._trackers if other is not tracker]
+
+    def mark(self):
+        """
+        Open a mark at the current position of the log.
+
+        Returns:
+            int: Position to roll back to
+        """
+        self._marks += 1
+        return len(self._log)
+
+    def rollback(self, mark):
+        """
+        Revert every mutation recorded after a mark.
+
+        The mark stays open, so the state can be rolled back to it again.
+
+        Args:
+            mark (int): Position returned by mark()
+        """
+        log = self._log
+        self._replaying = True
+        try:
+            while len(log) > mark:
+                undo, args = log.pop()
+                undo(*args)
+        finally:
+            self._replaying = False
+
+    def release(self, mark):
+        """
+        Close a mark. The log is dropped once no mark is left open.
+
+        Args:
+            mark (int): Position returned by mark()
+
+        Raises:
+            ValueError: If there is no open mark
+        """
+        if self._marks == 0:
+            raise ValueError("no open mark in Journal")
+        self._marks -= 1
+        if self._marks == 0:
+            self._log.clear()
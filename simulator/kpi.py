@@ -0,0 +1,174 @@
+class KPIAccumulator:
+    """
+    Running key performance indicators of a simulation.
+
+    The simulator reports every release, load, delivery and move as it
+    happens, and each report updates the counters in constant time, so a
+    snapshot of the full metric set can be taken at any moment without
+    going over the orders again.
+
+    The metrics follow the challenge description:
+        - on_time_rate: served_on_time / total_orders
+        - mean_lateness: total_late_minutes / served_late
+        - distance_per_vehicle: total_distance / number_of_vehicles, with
+          distances measured as transit time
+        - capacity_utilization: orders on board integrated over time,
+          divided by (fleet capacity * elapsed time)
+        - makespan: time of the last delivery
+
+    Attributes:
+        n_vehicles (int): Number of vehicles in the fleet
+        total_capacity (int): Sum of the vehicle capacities, in orders
+        total_orders (int): Orders released so far
+        served_on_time (int): Orders delivered by their due time
+        served_late (int): Orders delivered after their due time
+        total_late_minutes (int): Sum of the delays of late orders
+        total_distance (int): Transit time traveled by all vehicles
+        units_transported (int): Units of the delivered orders
+        orders_on_board (int): Orders currently on board any vehicle
+        units_on_board (int): Units currently on board any vehicle
+        order_minutes (int): Orders on board integrated over time
+        unit_minutes (int): Units on board integrated over time
+        makespan (int): Time of the last delivery
+        last_time (int): Time of the last update of the integrals
+    """
+
+    def __init__(self, fleet=()):
+        """
+        Initialize a new KPIAccumulator instance.
+
+        Args:
+            fleet (list, optional): Vehicles of the simulation
+        """
+        self.n_vehicles = len(fleet)
+        self.total_capacity = sum(vehicle.capacity for vehicle in fleet)
+        self.reset()
+
+    def reset(self):
+        """
+        Set every counter back to zero.
+        """
+        self.total_orders = 0
+        self.served_on_time = 0
+        self.served_late = 0
+        self.total_late_minutes = 0
+        self.total_distance = 0
+        self.units_transported = 0
+        self.orders_on_board = 0
+        self.units_on_board = 0
+        self.order_minutes = 0
+        self.unit_minutes = 0
+        self.makespan = 0
+        self.last_time = 0
+
+    def _advance(self, now):
+        """
+        Integrate the load on board up to a given time.
+
+        Args:
+            now (int): Current simulation time
+        """
+        elapsed = now - self.last_time
+        if elapsed > 0:
+            self.order_minutes += self.orders_on_board * elapsed
+            self.unit_minutes += self.units_on_board * elapsed
+            self.last_time = now
+
+    def on_release(self, order, now):
+        """
+        Record an order becoming available.
+
+        Args:
+            order: Order object released
+            now (int): Current simulation time
+        """
+        self.total_orders += 1
+
+    def on_load(self, order, now):
+        """
+        Record an order being loaded onto a vehicle.
+
+        Args:
+            order: Order object loaded
+            now (int): Current simulation time
+        """
+        self._advance(now)
+        self.orders_on_board += 1
+        self.units_on_board += order.units
+
+    def on_delivery(self, order, now):
+        """
+        Record an order being delivered.
+
+        Args:
+            order: Order object delivered
+            now (int): Current simulation time
+        """
+        self._advance(now)
+        self.orders_on_board -= 1
+        self.units_on_board -= order.units
+        self.units_transported += order.units
+        if now <= order.due_time:
+            self.served_on_time += 1
+        else:
+            self.served_late += 1
+            self.total_late_minutes += now - order.due_time
+        if now > self.makespan:
+            self.makespan = now
+
+    def on_move(self, vehicle, travel_time, now):
+        """
+        Record a vehicle departing to another location.
+
+        Args:
+            vehicle: Vehicle object departing
+            travel_time (int): Transit time of the trip
+            now (int): Current simulation time
+        """
+        self.total_distance += travel_time
+
+    def results(self):
+        """
+        KPIs returned by Simulator.get_results.
+
+        Returns:
+            dict: served_on_time, served_late and total_late_minutes
+        """
+        return {
+            'served_on_time': self.served_on_time,
+            'served_late': self.served_late,
+            'total_late_minutes': self.total_late_minutes
+        }
+
+    def snapshot(self, now=None):
+        """
+        Full metric set at a given time, computed in constant time.
+
+        Args:
+            now (int, optional): Time of the snapshot. Defaults to the last update.
+
+        Returns:
+            dict: Counters and derived metrics
+        """
+        if now is None or now < self.last_time:
+            now = self.last_time
+        elapsed = now - self.last_time
+        order_minutes = self.order_minutes + self.orders_on_board * elapsed
+        unit_minutes = self.unit_minutes + self.units_on_board * elapsed
+        served = self.served_on_time + self.served_late
+
+        snapshot = self.results()
+        snapshot.update({
+            'time': now,
+            'total_orders': self.total_orders,
+            'pending_orders': self.total_orders - served,
+            'on_time_rate': self.served_on_time / self.total_orders if self.total_orders else 0.0,
+            'mean_lateness': self.total_late_minutes / self.served_late if self.served_late else 0.0,
+            'total_distance': self.total_distance,
+            'distance_per_vehicle': self.total_distance / self.n_vehicles if self.n_vehicles else 0.0,
+            'units_transported': self.units_transported,
+            'unit_minutes': unit_minutes,
+            'capacity_utilization': order_minutes / (self.total_capacity * now) if self.total_capacity and now else 0.0,
+            'makespan': self.makespan,
+        })
+        return snapshot
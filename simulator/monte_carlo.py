@@ -0,0 +1,171 @@
+import json
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scenario.builders import build_simulation_data
+from simulator.simulator import Simulator
+
+# Cenário já lido em cada processo de trabalho
+_worker_scenario = None
+
+
+def load_scenario(scenario):
+    """
+    Parsed scenario data from a path or an already parsed dictionary.
+
+    Args:
+        scenario (str or dict): Path to a scenario JSON file, or its contents
+
+    Returns:
+        dict: Scenario with 'locations', 'arcs', 'orders' and 'fleet'
+    """
+    if isinstance(scenario, dict):
+        return scenario
+    with open(scenario, 'r') as file:
+        return json.load(file)
+
+
+def replication_seeds(seed, n_replications):
+    """
+    Independent seeds for each replication, derived from a root seed.
+
+    Args:
+        seed (int): Root seed
+        n_replications (int): Number of replications
+
+    Returns:
+        list: One integer seed per replication
+    """
+    children = np.random.SeedSequence(seed).spawn(n_replications)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def run_replication(data, policy_class, seed, horizon=480, policy_params=None):
+    """
+    Run one independent replication of a scenario.
+
+    Model objects are rebuilt from the parsed data, so replications never
+    share state, and the random generators are seeded before the run.
+
+    Args:
+        data (dict): Parsed scenario data
+        policy_class (type): Policy subclass to run
+        seed (int): Seed of this replication
+        horizon (int, optional): Simulation time horizon. Defaults to 480.
+        policy_params (dict, optional): Extra keyword arguments of the policy
+
+    Returns:
+        dict: KPIs returned by Simulator.run
+    """
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+    locations, arcs, orders, fleet = build_simulation_data(data)
+    simulator = Simulator(locations, arcs, orders, fleet, horizon)
+    policy = policy_class(locations, fleet, **(policy_params or {}))
+    return simulator.run(policy)
+
+
+def _init_worker(scenario):
+    """
+    Read the scenario once in each worker process.
+
+    Args:
+        scenario (str or dict): Path to a scenario JSON file, or its contents
+    """
+    global _worker_scenario
+    _worker_scenario = load_scenario(scenario)
+
+
+def _run_worker_replication(task):
+    """
+    Run a replication on the scenario loaded by _init_worker.
+
+    Args:
+        task (tuple): (policy_class, seed, horizon, policy_params)
+
+    Returns:
+        dict: KPIs returned by Simulator.run
+    """
+    policy_class, seed, horizon, policy_params = task
+    return run_replication(_worker_scenario, policy_class, seed, horizon, policy_params)
+
+
+def summarize(results, confidence=0.95):
+    """
+    Mean and confidence interval of every KPI over several replications.
+
+    The interval uses the normal approximation of the sample mean, which
+    is adequate from a few tens of replications on.
+
+    Args:
+        results (list): KPI dictionaries, one per replication
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+
+    Returns:
+        dict: Maps each KPI to a dict with mean, std, ci_low, ci_high and n
+    """
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    summary = {}
+    for key in (results[0] if results else {}):
+        values = [result[key] for result in results]
+        mean = statistics.fmean(values)
+        std = statistics.stdev(values) if len(values) > 1 else 0.0
+        half_width = z * std / len(values) ** 0.5
+        summary[key] = {
+            'mean': mean,
+            'std': std,
+            'ci_low': mean - half_width,
+            'ci_high': mean + half_width,
+            'n': len(values),
+        }
+    return summary
+
+
+def run_monte_carlo(scenario, policy_class, n_replications, seed=0, workers=None,
+                    horizon=480, policy_params=None, confidence=0.95):
+    """
+    Run independent replications of a scenario in parallel.
+
+    Each worker process reads the scenario once and rebuilds the model
+    objects for every replication it runs. Replications are handed out in
+    chunks to keep the inter-process traffic low, and each one has its own
+    seed, so results do not depend on the number of workers.
+
+    Args:
+        scenario (str or dict): Path to a scenario JSON file, or its contents
+        policy_class (type): Policy subclass to run; must be importable by the workers
+        n_replications (int): Number of replications
+        seed (int, optional): Root seed of the replication seeds. Defaults to 0.
+        workers (int, optional): Number of processes. Defaults to the number
+            of CPUs; 1 runs every replication in the current process.
+        horizon (int, optional): Simulation time horizon. Defaults to 480.
+        policy_params (dict, optional): Extra keyword arguments of the policy
+        confidence (float, optional): Confidence level of the intervals. Defaults to 0.95.
+
+    Returns:
+        dict: Dictionary containing:
+            - seeds: Seed of each replication
+            - replications: KPIs of each replication
+            - summary: Mean and confidence interval of each KPI
+    """
+    seeds = replication_seeds(seed, n_replications)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        data = load_scenario(scenario)
+        replications = [run_replication(data, policy_class, s, horizon, policy_params) for s in seeds]
+    else:
+        tasks = [(policy_class, s, horizon, policy_params) for s in seeds]
+        chunksize = max(1, n_replications // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scenario,)) as executor:
+            replications = list(executor.map(_run_worker_replication, tasks, chunksize=chunksize))
+
+    return {
+        'seeds': seeds,
+        'replications': replications,
+        'summary': summarize(replications, confidence),
+    }
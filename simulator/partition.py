@@ -0,0 +1,697 @@
+"""
+Spatially partitioned simulation across worker processes.
+
+The network is cut into regions of locations joined by short arcs, and
+each region is simulated by a RegionSimulator in its own process. A
+vehicle leaving for another region is sent to it as a message with the
+orders on board, and the regions are kept in step by conservative
+synchronization: a trip between regions takes at least the lookahead L,
+the shortest transit time of an arc between two regions, so once the
+earliest pending event of the whole simulation is at time T, every
+region can process its events up to T + L without any message for that
+window still to come. The coordinator then routes the messages sent in
+the window and opens the next one.
+
+Each region releases the orders of its own locations and decides for the
+vehicles there, so the run matches Simulator.run exactly when the policy
+only looks at the vehicle, the load queue of its location and the
+network, as models.local_policy.LocalPolicy does. Policies that read
+other locations or draw random numbers decide on what their region can
+see, and so may give different results. Lookahead policies, such as
+models.rollout_policy.RolloutPolicy, only simulate their own region: a
+vehicle that leaves it during a lookahead drops out of that future, and
+the message it would have sent is taken back with the rest of the
+lookahead.
+
+Usage:
+    python -m simulator.partition simulation_inputs.json --workers 4
+
+with --policy taking a 'module:Class' path, LocalPolicy by default.
+"""
+
+import argparse
+import heapq
+import math
+import multiprocessing
+import random
+
+import numpy as np
+
+from models.network import Network
+from models.order import PENDING, LOADED
+from scenario.builders import build_fleet, build_order, build_simulation_data
+from simulator.event_queue import EventQueue, ORDER_RELEASE, VEHICLE_ARRIVAL
+from simulator.kpi import KPIAccumulator
+from simulator.monte_carlo import load_scenario
+from simulator.simulator import Simulator
+from simulator.sweep import policy_path, resolve_policy
+
+
+def partition_locations(location_ids, arcs, n_regions, weights=None, imbalance=0.1):
+    """
+    Split the nodes of a network into regions joined by long arcs.
+
+    Arcs are taken from the shortest to the longest, and each one joins
+    the regions of its endpoints unless the result would weigh more than
+    (1 + imbalance) times an even share, so short arcs end up inside
+    regions and the arcs between regions, which set the lookahead, are
+    the long ones. The lightest region is then merged into its lightest
+    neighbor until n_regions are left.
+
+    Every arc endpoint gets a region, including those only used to route
+    through, so any trip between regions crosses an arc between regions.
+    The result only depends on the identifiers, not on the order of the
+    arcs.
+
+    Args:
+        location_ids (iterable): Location identifiers
+        arcs (list): List of Arc objects
+        n_regions (int): Number of regions wanted
+        weights (dict, optional): Load of each node, such as the orders
+            released there. Defaults to 1 per location and 0 for the
+            other arc endpoints.
+        imbalance (float, optional): Slack over an even share of the
+            weight allowed while joining regions. Defaults to 0.1.
+
+    Returns:
+        dict: Maps each node to a region number in range(n_regions); fewer
+            regions are used when there are fewer nodes
+
+    Raises:
+        ValueError: If n_regions is not positive
+    """
+    if n_regions < 1:
+        raise ValueError("n_regions must be at least 1")
+    location_ids = list(location_ids)
+    nodes = list(dict.fromkeys(location_ids + [end for arc in arcs for end in (arc.from_location, arc.to_location)]))
+    if weights is None:
+        weights = dict.fromkeys(location_ids, 1)
+    weight = {node: weights.get(node, 0) for node in nodes}
+
+    # Arestas não direcionadas, com o menor tempo entre cada par
+    edges = {}
+    for arc in arcs:
+        if arc.from_location == arc.to_location:
+            continue
+        pair = tuple(sorted((arc.from_location, arc.to_location), key=str))
+        if pair not in edges or arc.transit_time < edges[pair]:
+            edges[pair] = arc.transit_time
+    ordered = sorted(edges.items(), key=lambda item: (item[1], str(item[0][0]), str(item[0][1])))
+
+    parent = {node: node for node in nodes}
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    cap = sum(weight.values()) / n_regions * (1 + imbalance)
+    for (a, b), _ in ordered:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b and weight[root_a] + weight[root_b] <= cap:
+            parent[root_b] = root_a
+            weight[root_a] += weight[root_b]
+
+    roots = {find(node) for node in nodes}
+    while len(roots) > n_regions:
+        lightest = min(roots, key=lambda root: (weight[root], str(root)))
+        neighbors = {find(b) for (a, b), _ in ordered if find(a) == lightest}
+        neighbors |= {find(a) for (a, b), _ in ordered if find(b) == lightest}
+        neighbors.discard(lightest)
+        # Sem vizinhos, a região isolada é juntada à mais leve
+        target = min(neighbors or roots - {lightest}, key=lambda root: (weight[root], str(root)))
+        parent[lightest] = target
+        weight[target] += weight[lightest]
+        roots.discard(lightest)
+
+    members = {}
+    for node in nodes:
+        members.setdefault(find(node), []).append(node)
+    labels = sorted(members.values(), key=lambda group: min(str(node) for node in group))
+    return {node: region for region, group in enumerate(labels) for node in group}
+
+
+def lookahead(arcs, regions):
+    """
+    Shortest time a vehicle can take to go from one region to another.
+
+    Trips last at least one minute and are rounded up to whole minutes, as
+    in Simulator._apply_decision, and any path between regions crosses an
+    arc between regions, so the shortest of those arcs bounds every trip.
+
+    Args:
+        arcs (list): List of Arc objects
+        regions (dict): Region of each node, as returned by partition_locations
+
+    Returns:
+        float: Lookahead in minutes, or inf when no arc joins two regions
+    """
+    crossing = [arc.transit_time for arc in arcs if regions[arc.from_location] != regions[arc.to_location]]
+    if not crossing:
+        return math.inf
+    return max(1, math.ceil(min(crossing)))
+
+
+class RegionEventQueue(EventQueue):
+    """
+    Event queue of one region, which hands over vehicles leaving it.
+
+    Attributes:
+        region (frozenset): Locations of the region
+        emigrate (callable): Called with (time, key, payload) for every
+            arrival at a location outside the region, instead of
+            scheduling it
+    """
+
+    def __init__(self, region, emigrate):
+        """
+        Initialize an empty RegionEventQueue instance.
+
+        Args:
+            region (frozenset): Locations of the region
+            emigrate (callable): Receives the arrivals outside the region
+        """
+        super().__init__()
+        self.region = region
+        self.emigrate = emigrate
+
+    def push(self, time, kind, key, payload):
+        """
+        Schedule an event, or hand it over if it happens in another region.
+
+        Args:
+            time (int): Simulation time at which the event happens
+            kind (int): Event type (ORDER_RELEASE, VEHICLE_ARRIVAL or VEHICLE_READY)
+            key (int): Stable identifier of the entity, used to break ties
+            payload: Object associated with the event
+        """
+        if kind == VEHICLE_ARRIVAL and payload[1] not in self.region:
+            self.emigrate(time, key, payload)
+        else:
+            super().push(time, kind, key, payload)
+
+
+def _order_record(order):
+    """
+    Input record of an order, to send it to another region.
+
+    Args:
+        order: Order object
+
+    Returns:
+        dict: Order record, as in the 'orders' of a scenario
+    """
+    return {'order_id': order.order_id, 'origin': order.origin, 'destination': order.destination,
+            'release_time': order.release_time, 'due_time': order.due_time, 'units': order.units}
+
+
+def _vehicle_record(vehicle):
+    """
+    Input record of a vehicle, to send it to another region.
+
+    Args:
+        vehicle: Vehicle object
+
+    Returns:
+        dict: Vehicle record, as in the 'fleet' of a scenario
+    """
+    return {'vehicle_id': vehicle.vehicle_id, 'capacity': vehicle.capacity,
+            'start_location': vehicle.current_location, 'unit_capacity': vehicle.unit_capacity}
+
+
+class RegionSimulator(Simulator):
+    """
+    Simulator of the locations of one region.
+
+    Only holds the orders released in the region and the vehicles that
+    start there or have been sent to it since, and a network restricted to
+    the rows of the region's locations. Orders and vehicles are keyed by
+    their index in the whole scenario, which orders their events as in a
+    single Simulator. A vehicle leaving for another region is dropped from
+    the event queue and added to the outbox as a message
+
+        (arrival_time, vehicle key, vehicle record, origin, destination, cargo)
+
+    where cargo lists the (order key, order record) of the orders on
+    board, so the destination region can build the vehicle and the orders
+    it has not seen before. The message is taken by that region through
+    receive. Sending it is recorded in the journal, so a lookahead that
+    sends a vehicle away takes the message back when it is rolled back.
+
+    Attributes:
+        region (frozenset): Locations of the region
+        order_keys (list): Key of each order of self.orders
+        vehicle_keys (list): Key of each vehicle of self.fleet
+        outbox (list): Messages of the vehicles that left the region
+        owned (set): Keys of the vehicles whose last event is in the region
+    """
+
+    def __init__(self, locations, orders, fleet, region, network, order_keys, vehicle_keys, horizon=480):
+        """
+        Initialize a new RegionSimulator instance.
+
+        Args:
+            locations (dict): Dictionary of every location
+            orders (list): Orders released in the region
+            fleet (list): Vehicles that start in the region
+            region (iterable): Locations of the region
+            network (Network): Shortest paths, with at least the rows of
+                the locations of the region
+            order_keys (list): Index of each order in the whole scenario
+            vehicle_keys (list): Index of each vehicle in the whole scenario
+            horizon (int, optional): Simulation time horizon. Defaults to 480.
+        """
+        super().__init__(locations, [], orders, fleet, horizon, network=network)
+        self.region = frozenset(region)
+        self.order_keys = list(order_keys)
+        self.vehicle_keys = list(vehicle_keys)
+        self.outbox = []
+        self.owned = set()
+        self._orders_by_key = dict(zip(self.order_keys, self.orders))
+        self._vehicles_by_key = dict(zip(self.vehicle_keys, self.fleet))
+        self._order_keys = {}
+
+    def start(self, policy):
+        """
+        Reset the clock and schedule the first events of the region.
+
+        Args:
+            policy: Policy object that defines routing decisions
+        """
+        super().start(policy)
+        heap, seq = self._events.state()
+        # Os eventos dos veículos usam a chave global, como em um único Simulator
+        heap = [
+            entry if entry[1] == ORDER_RELEASE else (entry[0], entry[1], self.vehicle_keys[entry[2]], *entry[3:])
+            for entry in heap if entry[1] == ORDER_RELEASE or entry[4][1] in self.region
+        ]
+        heapq.heapify(heap)
+        self._events = RegionEventQueue(self.region, self._emigrate)
+        self._events.set_state((heap, seq))
+        self.owned = {
+            key for key, vehicle in zip(self.vehicle_keys, self.fleet)
+            if vehicle.current_location in self.region
+        }
+
+    def _bind(self, policy):
+        """
+        Bind the policy and key the orders and vehicles by their global index.
+
+        Args:
+            policy: Policy object that defines routing decisions
+        """
+        super()._bind(policy)
+        self._keys = {id(vehicle): key for key, vehicle in zip(self.vehicle_keys, self.fleet)}
+        self._order_keys = {id(order): key for key, order in zip(self.order_keys, self.orders)}
+
+    def _schedule_next_release(self):
+        """
+        Schedule the release of the next order of the region, under its global key.
+        """
+        if self._next_release < len(self._releases):
+            index = self._releases[self._next_release]
+            order = self.orders[index]
+            self._events.push(order.release_time, ORDER_RELEASE, self.order_keys[index], order)
+            self._next_release += 1
+
+    def engine_state(self):
+        """
+        Refuse to checkpoint a region, whose events are keyed by global index.
+
+        Raises:
+            ValueError: Always
+        """
+        raise ValueError("A region of a PartitionedSimulator cannot be checkpointed; "
+                         "run lookahead policies with workers=1")
+
+    def next_time(self):
+        """
+        Time of the earliest pending event of the region.
+
+        Returns:
+            float: Event time, or inf when there is none
+        """
+        next_event = self._events.peek()
+        return math.inf if next_event is None else next_event[0]
+
+    def receive(self, messages):
+        """
+        Take in the vehicles sent by other regions.
+
+        Vehicles and orders the region has not held before are built from
+        their records.
+
+        Args:
+            messages (list): Messages from the outboxes of other regions
+        """
+        for time, key, record, origin, destination, cargo in messages:
+            orders = [self._order(order_key, order_record) for order_key, order_record in cargo]
+            for order in orders:
+                order.status = LOADED
+            vehicle = self._vehicles_by_key.get(key)
+            if vehicle is None:
+                vehicle = build_fleet([record])[0]
+                vehicle.load.journal = self.journal
+                self.fleet.append(vehicle)
+                self.vehicle_keys.append(key)
+                self._vehicles_by_key[key] = vehicle
+                self._keys[id(vehicle)] = key
+            vehicle.current_location = origin
+            vehicle.available_at = time
+            vehicle.load.set_state(orders)
+            self.owned.add(key)
+            self._events.push(time, VEHICLE_ARRIVAL, key, (vehicle, destination))
+
+    def _order(self, key, record):
+        """
+        Order of a global key, built from its record the first time it is seen.
+
+        Args:
+            key (int): Index of the order in the whole scenario
+            record (dict): Order record
+
+        Returns:
+            Order: Order object of the region
+        """
+        order = self._orders_by_key.get(key)
+        if order is None:
+            order = build_order(record)
+            self.orders.append(order)
+            self.order_keys.append(key)
+            self._orders_by_key[key] = order
+            self._order_keys[id(order)] = key
+        return order
+
+    def take_outbox(self):
+        """
+        Messages sent since the last call.
+
+        Returns:
+            list: Messages of the vehicles that left the region
+        """
+        outbox, self.outbox = self.outbox, []
+        return outbox
+
+    def report(self):
+        """
+        State of the region at the end of the run.
+
+        Returns:
+            dict: 'kpis' counters, 'orders' as (key, status, delivery_time)
+                for every order the region released, loaded or delivered,
+                and 'vehicles' as (key, location, available_at, order
+                keys) for the vehicles it owns
+        """
+        orders = [
+            (key, order.status, order.delivery_time)
+            for key, order in zip(self.order_keys, self.orders) if order.status != PENDING
+        ]
+        vehicles = [
+            (key, self._vehicles_by_key[key].current_location, self._vehicles_by_key[key].available_at,
+             [self._order_keys[id(order)] for order in self._vehicles_by_key[key].load])
+            for key in sorted(self.owned)
+        ]
+        return {'kpis': dict(vars(self.kpis)), 'orders': orders, 'vehicles': vehicles}
+
+    def _emigrate(self, time, key, payload):
+        """
+        Send a vehicle leaving the region to the outbox.
+
+        Inside a lookahead the message and the change of owner are undone
+        with the rest of the lookahead.
+
+        Args:
+            time (int): Arrival time at the destination
+            key (int): Key of the vehicle
+            payload (tuple): (vehicle, destination) of the arrival
+        """
+        vehicle, destination = payload
+        cargo = [(self._order_keys[id(order)], _order_record(order)) for order in vehicle.load]
+        self.outbox.append((time, key, _vehicle_record(vehicle), vehicle.current_location, destination, cargo))
+        self.journal.record(self.outbox.pop)
+        if key in self.owned:
+            self.owned.discard(key)
+            self.journal.record(self.owned.add, key)
+
+
+def _serve(connection, data, policy, policy_params, region, network, order_keys, vehicle_keys, horizon, seed):
+    """
+    Simulate one region in a worker process, on the coordinator's orders.
+
+    Replies to ('advance', until, messages) with (outbox, next event
+    time), and to ('finish', messages) with the report of the region.
+
+    Args:
+        connection (Connection): End of the pipe to the coordinator
+        data (dict): Scenario with every location but only the orders and
+            vehicles of the region
+        policy (str): 'module:Class' path of the policy
+        policy_params (dict): Extra keyword arguments of the policy
+        region (frozenset): Locations of the region
+        network (Network): Network restricted to the rows of the region
+        order_keys (list): Index of each order of data in the whole scenario
+        vehicle_keys (list): Index of each vehicle of data in the whole scenario
+        horizon (int): Simulation time horizon
+        seed (int): Seed of the random generators
+    """
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+    locations, _, orders, fleet = build_simulation_data(data)
+    simulator = RegionSimulator(locations, orders, fleet, region, network, order_keys, vehicle_keys, horizon)
+    simulator.start(resolve_policy(policy)(locations, fleet, **(policy_params or {})))
+    connection.send(simulator.next_time())
+    while True:
+        command, *args = connection.recv()
+        if command == 'advance':
+            until, messages = args
+            simulator.receive(messages)
+            simulator.advance(until)
+            connection.send((simulator.take_outbox(), simulator.next_time()))
+        else:
+            simulator.receive(args[0])
+            connection.send(simulator.report())
+            break
+    connection.close()
+
+
+class PartitionedSimulator:
+    """
+    Simulation of a scenario split into regions run by worker processes.
+
+    Regions come from partition_locations, weighted by the orders released
+    at each location, and each one is simulated by a RegionSimulator in
+    its own process. A worker is only given every location, the orders
+    released and the vehicles starting in its region, and the rows of the
+    shortest-path matrices of the region's locations, so the shortest
+    paths are computed once, by the coordinator, and the workers' memory
+    follows the size of their region. At the end the states of the regions
+    are gathered into self.orders and self.fleet, and their KPI counters
+    into self.kpis, so the run can be inspected as a Simulator run would.
+
+    Attributes:
+        scenario (dict): Parsed scenario data, sliced by region for the workers
+        policy (str): 'module:Class' path of the policy
+        policy_params (dict): Extra keyword arguments of the policy, or None
+        seed (int): Seed of the random generators of every worker
+        locations (dict): Dictionary of available locations
+        arcs (list): List of network arcs/connections
+        network (Network): Shortest paths of the whole network
+        orders (list): List of orders, with their final state after run
+        fleet (list): List of vehicles, with their final state after run
+        horizon (int): Simulation time horizon
+        regions (dict): Region of each node
+        lookahead (float): Shortest trip between regions, in minutes
+        kpis (KPIAccumulator): KPI counters of the whole run
+        windows (int): Synchronization windows of the last run
+    """
+
+    def __init__(self, scenario, policy, n_workers, horizon=480, policy_params=None, regions=None, seed=0):
+        """
+        Initialize a new PartitionedSimulator instance.
+
+        Args:
+            scenario (str or dict): Path to a scenario JSON file, or its contents
+            policy (type or str): Policy class or 'module:Class' path
+            n_workers (int): Number of regions, and of worker processes
+            horizon (int, optional): Simulation time horizon. Defaults to 480.
+            policy_params (dict, optional): Extra keyword arguments of the policy
+            regions (dict, optional): Region of each node. Defaults to
+                partition_locations with n_workers regions.
+            seed (int, optional): Seed of the random generators of every
+                worker. Defaults to 0.
+        """
+        self.scenario = load_scenario(scenario)
+        self.policy = policy_path(policy)
+        self.policy_params = policy_params
+        self.horizon = horizon
+        self.seed = seed
+        self.locations, self.arcs, self.orders, self.fleet = build_simulation_data(self.scenario)
+        if regions is None:
+            weights = dict.fromkeys(self.locations, 1)
+            for order in self.orders:
+                if order.origin in weights:
+                    weights[order.origin] += 1
+            regions = partition_locations(self.locations, self.arcs, n_workers, weights)
+        self.regions = regions
+        self.lookahead = lookahead(self.arcs, regions)
+        self.network = Network.from_arcs(self.arcs, self.locations.keys())
+        self.kpis = KPIAccumulator(self.fleet)
+        self.windows = 0
+
+    def run(self):
+        """
+        Run every region to the horizon in parallel.
+
+        Returns:
+            dict: Simulation results, as returned by Simulator.run
+        """
+        members = {}
+        for node, region in self.regions.items():
+            members.setdefault(region, set()).add(node)
+        labels = sorted(members)
+        context = multiprocessing.get_context()
+        connections, workers = [], []
+        for label in labels:
+            region = frozenset(members[label])
+            data, order_keys, vehicle_keys = self.region_data(region)
+            parent, child = context.Pipe()
+            worker = context.Process(
+                target=_serve,
+                args=(child, data, self.policy, self.policy_params, region, self.network.restrict(region),
+                      order_keys, vehicle_keys, self.horizon, self.seed),
+            )
+            worker.start()
+            child.close()
+            connections.append(parent)
+            workers.append(worker)
+
+        try:
+            reports = self._coordinate(connections, {label: i for i, label in enumerate(labels)})
+        finally:
+            # Fechar os pipes encerra os processos que ainda esperam ordens
+            for connection in connections:
+                connection.close()
+            for worker in workers:
+                worker.join()
+        self._gather(reports)
+        return self.kpis.results()
+
+    def region_data(self, region):
+        """
+        Part of the scenario a worker needs to simulate a region.
+
+        Args:
+            region (frozenset): Locations of the region
+
+        Returns:
+            tuple: (data, order keys, vehicle keys), where data is a
+                scenario with every location and no arc, but only the
+                orders released in the region and the vehicles starting
+                there, whose indices in the whole scenario are the keys
+        """
+        order_keys = [index for index, order in enumerate(self.orders) if order.origin in region]
+        vehicle_keys = [index for index, vehicle in enumerate(self.fleet) if vehicle.current_location in region]
+        data = {
+            'locations': self.scenario['locations'],
+            'arcs': [],
+            'orders': [self.scenario['orders'][index] for index in order_keys],
+            'fleet': [self.scenario['fleet'][index] for index in vehicle_keys],
+        }
+        return data, order_keys, vehicle_keys
+
+    def _coordinate(self, connections, positions):
+        """
+        Drive the workers window by window up to the horizon.
+
+        Args:
+            connections (list): Pipe to each worker
+            positions (dict): Maps each region to the position of its worker
+
+        Returns:
+            list: Report of each region
+        """
+        times = [connection.recv() for connection in connections]
+        inbox = [[] for _ in connections]
+        self.windows = 0
+        while True:
+            now = min(times + [message[0] for messages in inbox for message in messages])
+            if now >= self.horizon:
+                break
+            # Nenhuma mensagem enviada nesta janela chega antes do seu fim
+            end = min(now + self.lookahead, self.horizon)
+            active = [i for i, time in enumerate(times) if time < end or inbox[i]]
+            for i in active:
+                connections[i].send(('advance', end, inbox[i]))
+                inbox[i] = []
+            for i in active:
+                outbox, times[i] = connections[i].recv()
+                for message in outbox:
+                    inbox[positions[self.regions[message[4]]]].append(message)
+            self.windows += 1
+
+        for connection, messages in zip(connections, inbox):
+            connection.send(('finish', messages))
+        return [connection.recv() for connection in connections]
+
+    def _gather(self, reports):
+        """
+        Bring the final states of the regions together.
+
+        The load-time integrals of each region are carried up to the last
+        update of any region before being added, so the sums equal the
+        integrals of a single run.
+
+        Args:
+            reports (list): Report of each region
+        """
+        kpis = self.kpis
+        kpis.reset()
+        last_time = max(report['kpis']['last_time'] for report in reports)
+        for report in reports:
+            counters = report['kpis']
+            elapsed = last_time - counters['last_time']
+            for name in ('total_orders', 'served_on_time', 'served_late', 'total_late_minutes', 'total_distance',
+                         'units_transported', 'orders_on_board', 'units_on_board'):
+                setattr(kpis, name, getattr(kpis, name) + counters[name])
+            kpis.order_minutes += counters['order_minutes'] + counters['orders_on_board'] * elapsed
+            kpis.unit_minutes += counters['unit_minutes'] + counters['units_on_board'] * elapsed
+            kpis.makespan = max(kpis.makespan, counters['makespan'])
+        kpis.last_time = last_time
+
+        # Os estados de um pedido só avançam, então vale o mais adiantado
+        for report in reports:
+            for index, status, delivery_time in report['orders']:
+                order = self.orders[index]
+                if status > order.status:
+                    order.status = status
+                    order.delivery_time = delivery_time
+            for key, location_id, available_at, cargo in report['vehicles']:
+                vehicle = self.fleet[key]
+                vehicle.current_location = location_id
+                vehicle.available_at = available_at
+                vehicle.load.set_state([self.orders[index] for index in cargo])
+
+
+def main():
+    """
+    Command-line entry point running a scenario split across processes.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenario', help='scenario JSON file')
+    parser.add_argument('--workers', type=int, default=2, help='number of regions and processes')
+    parser.add_argument('--policy', default='models.local_policy:LocalPolicy', help="'module:Class' path of the policy")
+    parser.add_argument('--horizon', type=int, default=480)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    simulator = PartitionedSimulator(args.scenario, args.policy, args.workers, args.horizon, seed=args.seed)
+    results = simulator.run()
+    regions = len(set(simulator.regions.values()))
+    print(f"{regions} regiões, lookahead de {simulator.lookahead} min, {simulator.windows} janelas")
+    for key, value in results.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
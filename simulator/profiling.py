@@ -0,0 +1,274 @@
+"""
+Profiling mode of simulation runs.
+
+profile_run wraps Simulator.run in a CPU profiler and in tracemalloc and
+writes three files to an output directory:
+    profile.collapsed: Collapsed stacks, one 'frame;frame;...;frame weight'
+        line per stack, ready for flamegraph.pl or speedscope
+    profile.pstats: cProfile statistics, for pstats or snakeviz (cprofile
+        mode only)
+    allocations.txt: Top allocation sites of each module of interest and
+        the peak traced memory
+
+Two CPU profilers are available. The deterministic one is cProfile, whose
+caller/callee graph is unfolded into stacks by spreading the time of
+each function over its callers in proportion to their calls; weights are
+microseconds. The sampling one is a background thread that reads the
+stack of the simulation thread at a fixed interval, so its stacks are
+exact, its overhead does not depend on the number of calls, and weights
+are numbers of samples.
+
+Usage:
+    python main.py --profile sampling --profile-dir profile_output
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+# Módulos com relatório de alocações por padrão
+DEFAULT_MODULES = ('models.vehicle', 'models.policy', 'simulator.simulator')
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples the stack of one thread.
+
+    Used as a context manager around the code to profile, which must run
+    in the thread that enters the context.
+
+    Attributes:
+        interval (float): Seconds between samples
+        stacks (dict): Maps a tuple of frame names, outermost first, to its
+            number of samples
+    """
+
+    def __init__(self, interval=0.001):
+        """
+        Initialize a new SamplingProfiler instance.
+
+        Args:
+            interval (float, optional): Seconds between samples. Defaults to 0.001.
+        """
+        self.interval = interval
+        self.stacks = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._target = None
+
+    def __enter__(self):
+        """
+        Start sampling the current thread.
+
+        Returns:
+            SamplingProfiler: This profiler
+        """
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stop sampling.
+        """
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self):
+        """
+        Sampling loop, run in the background thread.
+        """
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                stack.append(frame_name(frame.f_globals.get('__name__', '?'), frame.f_code.co_name))
+                frame = frame.f_back
+            if stack:
+                key = tuple(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+
+def frame_name(module, function):
+    """
+    Name of a stack frame in the collapsed output.
+
+    Args:
+        module (str): Module name
+        function (str): Function name
+
+    Returns:
+        str: 'module:function', without the separators of the format
+    """
+    return f"{module}:{function}".replace(';', ':').replace(' ', '_')
+
+
+def collapse_pstats(stats, max_depth=64):
+    """
+    Collapsed stacks of a cProfile run.
+
+    Each function's own time is split among the stacks that reach it in
+    proportion to the calls made along each one, since cProfile only keeps
+    the direct caller of every call.
+
+    Args:
+        stats (pstats.Stats): Statistics of the run
+        max_depth (int, optional): Deepest stack unfolded. Defaults to 64.
+
+    Returns:
+        dict: Maps a tuple of frame names, outermost first, to microseconds
+    """
+    raw = stats.stats
+    callees = {}
+    for function, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative))
+
+    def name(function):
+        filename, _, function_name = function
+        module = filename
+        for root in sys.path:
+            if root and filename.startswith(root + os.sep):
+                module = os.path.splitext(os.path.relpath(filename, root))[0].replace(os.sep, '.')
+                break
+        return frame_name(module, function_name)
+
+    stacks = {}
+    # O próprio Profiler.disable aparece como raiz e não faz parte da execução
+    roots = [function for function, entry in raw.items()
+             if not entry[4] and function[2] != "<method 'disable' of '_lsprof.Profiler' objects>"]
+    work = [((function,), 1.0) for function in roots]
+    while work:
+        path, share = work.pop()
+        function = path[-1]
+        own = raw[function][2]
+        weight = int(round(own * share * 1e6))
+        if weight > 0:
+            key = tuple(name(f) for f in path)
+            stacks[key] = stacks.get(key, 0) + weight
+        if len(path) >= max_depth:
+            continue
+        for callee, edge in callees.get(function, ()):
+            total = raw[callee][3]
+            if callee not in path and total > 0:
+                work.append((path + (callee,), share * edge / total))
+    return stacks
+
+
+def write_collapsed(stacks, path):
+    """
+    Write collapsed stacks, heaviest first.
+
+    Args:
+        stacks (dict): Maps a tuple of frame names to a weight
+        path (str): Output file
+    """
+    with open(path, 'w') as file:
+        for stack, weight in sorted(stacks.items(), key=lambda item: -item[1]):
+            file.write(f"{';'.join(stack)} {weight}\n")
+
+
+def allocation_report(snapshot, modules=DEFAULT_MODULES, top=10):
+    """
+    Top allocation sites of each module.
+
+    Args:
+        snapshot (tracemalloc.Snapshot): Allocations still alive at the end of the run
+        modules (tuple, optional): Module names. Defaults to DEFAULT_MODULES.
+        top (int, optional): Sites listed per module. Defaults to 10.
+
+    Returns:
+        dict: Maps each module to a list of (location, size in bytes, count)
+            tuples, largest first; modules that are not loaded map to []
+    """
+    report = {}
+    for module_name in modules:
+        module = sys.modules.get(module_name)
+        filename = getattr(module, '__file__', None)
+        if filename is None:
+            report[module_name] = []
+            continue
+        statistics = snapshot.filter_traces([tracemalloc.Filter(True, filename)]).statistics('lineno')
+        report[module_name] = [
+            (f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size, stat.count)
+            for stat in statistics[:top]
+        ]
+    return report
+
+
+def profile_run(simulator, policy, output_dir, mode='sampling', interval=0.001,
+                modules=DEFAULT_MODULES, top=10):
+    """
+    Run a simulation under a CPU profiler and tracemalloc.
+
+    Args:
+        simulator (Simulator): Simulator to run
+        policy: Policy object that defines routing decisions
+        output_dir (str): Directory the reports are written to, created if needed
+        mode (str, optional): 'sampling' or 'cprofile'. Defaults to 'sampling'.
+        interval (float, optional): Seconds between samples in sampling
+            mode. Defaults to 0.001.
+        modules (tuple, optional): Modules of the allocation report.
+            Defaults to DEFAULT_MODULES.
+        top (int, optional): Allocation sites listed per module. Defaults to 10.
+
+    Returns:
+        dict: Dictionary containing:
+            - results: KPIs returned by Simulator.run
+            - wall_time: Seconds taken by the run
+            - peak_memory: Peak traced memory, in bytes
+            - files: Paths of the written reports
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in ('sampling', 'cprofile'):
+        raise ValueError(f"Unknown profiling mode {mode!r}; use 'sampling' or 'cprofile'")
+    os.makedirs(output_dir, exist_ok=True)
+    files = {'collapsed': os.path.join(output_dir, 'profile.collapsed'),
+             'allocations': os.path.join(output_dir, 'allocations.txt')}
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    try:
+        start = time.perf_counter()
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            results = profiler.runcall(simulator.run, policy)
+        else:
+            with SamplingProfiler(interval) as profiler:
+                results = simulator.run(policy)
+        wall_time = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    if mode == 'cprofile':
+        files['pstats'] = os.path.join(output_dir, 'profile.pstats')
+        profiler.dump_stats(files['pstats'])
+        write_collapsed(collapse_pstats(pstats.Stats(profiler)), files['collapsed'])
+    else:
+        write_collapsed(profiler.stacks, files['collapsed'])
+
+    with open(files['allocations'], 'w') as file:
+        file.write(f"Tempo de execução: {wall_time:.3f} s\n")
+        file.write(f"Pico de memória rastreada: {peak_memory / 1024:.1f} KiB\n")
+        for module_name, sites in allocation_report(snapshot, modules, top).items():
+            file.write(f"\n{module_name}\n")
+            if not sites:
+                file.write("  (nenhuma alocação viva)\n")
+            for location, size, count in sites:
+                file.write(f"  {location:<32} {size / 1024:>10.1f} KiB {count:>8} blocos\n")
+
+    return {'results': results, 'wall_time': wall_time, 'peak_memory': peak_memory, 'files': files}
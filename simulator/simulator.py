@@ -1,3 +1,82 @@
+import math
+import random
+from contextlib import contextmanager
+from time import perf_counter
+
+import numpy as np
+
+from models.columnar import FleetStore, OrderStore
+from models.network import Network
+from models.order import RELEASED, LOADED, DELIVERED
+from simulator.event_queue import EventQueue, ORDER_RELEASE, VEHICLE_ARRIVAL, VEHICLE_READY
+from simulator.journal import Journal
+from simulator.kpi import KPIAccumulator
+from simulator.trace import RELEASE, LOAD, UNLOAD, DEPART, ARRIVE, WAIT
+
+# Tempo de espera de um veículo que permanece parado na localização
+WAIT_TIME = 30
+
+# Rótulos de simulator_events_total por tipo de evento
+_EVENT_LABELS = {
+    ORDER_RELEASE: (('kind', 'order_release'),),
+    VEHICLE_ARRIVAL: (('kind', 'vehicle_arrival'),),
+    VEHICLE_READY: (('kind', 'vehicle_ready'),),
+}
+
+
+def _batch_mismatch(policy, ready):
+    """
+    Reject a batch of decisions that does not match the free vehicles.
+    
+    Args:
+        policy: Policy that returned the batch
+        ready (list): (index in the fleet, vehicle) pairs of the vehicles
+            free at the current time
+        
+    Raises:
+        ValueError: Always
+    """
+    raise ValueError(
+        f"{type(policy).__name__}.choose_actions_batch must return one decision per vehicle, "
+        f"in the order of the {len(ready)} free vehicles"
+    )
+
+
+class Snapshot:
+    """
+    Simulation state saved by Simulator.snapshot.
+    
+    Attributes:
+        mark (int): Position of the simulator's journal
+        current_time (int): Simulation clock
+        next_release (int): Position of the next order in release order
+        events (tuple): State of the event queue
+        kpis (dict): KPI counters
+        random_state (tuple): State of the random module
+    """
+
+    __slots__ = ('mark', 'current_time', 'next_release', 'events', 'kpis', 'random_state')
+
+    def __init__(self, mark, current_time, next_release, events, kpis, random_state):
+        """
+        Initialize a new Snapshot instance.
+        
+        Args:
+            mark (int): Position of the simulator's journal
+            current_time (int): Simulation clock
+            next_release (int): Position of the next order in release order
+            events (tuple): State of the event queue
+            kpis (dict): KPI counters
+            random_state (tuple): State of the random module
+        """
+        self.mark = mark
+        self.current_time = current_time
+        self.next_release = next_release
+        self.events = events
+        self.kpis = kpis
+        self.random_state = random_state
+
+
 class Simulator:
     """
     Main simulation engine for the logistics routing system.
@@ -11,32 +90,106 @@ class Simulator:
         orders (list): List of orders to be processed
         fleet (list): List of available vehicles
         horizon (int): Simulation time horizon
+        network (Network): Shortest-path view of the arcs
+        order_store (OrderStore): Columnar order state, or None
+        fleet_store (FleetStore): Columnar vehicle state, or None
+        current_time (int): Current simulation time
+        pending (dict): Load queue of each location, as seen by the policy
+        kpis (KPIAccumulator): Running KPIs of the current run
+        journal (Journal): Undo log of the state changes made after a snapshot
+        policy: Policy of the current run
+        metrics (Metrics): Registry of run-time metrics, or None
+        trace (TraceSink): Binary trace of the state changes, or None
     """
     
-    def __init__(self, locations, arcs, orders, fleet, horizon=480):
+    def __init__(self, locations, arcs, orders, fleet, horizon=480, columnar=False, metrics=None, trace=None,
+                 network=None):
         """
         Initialize a new Simulator instance.
         
+        With columnar=True the state of orders and vehicles is moved to
+        NumPy-backed stores, and self.orders / self.fleet hold views with
+        the same interface as Order and Vehicle. Policies should then be
+        built with simulator.fleet.
+        
+        Orders may also be given as an iterator sorted by release_time, such
+        as the one returned by scenario.streaming.iter_orders. They are then
+        pulled one at a time as their release time arrives, and
+        self.orders only holds the orders released so far. An OrderStore,
+        such as the one of a binary scenario, is used as the order state
+        directly.
+        
         Args:
             locations (dict): Dictionary of available locations
             arcs (list): List of network arcs/connections
-            orders (list): List of orders to be processed
+            orders (list, iterator or OrderStore): Orders to be processed
             fleet (list): List of available vehicles
             horizon (int, optional): Simulation time horizon. Defaults to 480.
+            columnar (bool, optional): Keep order and vehicle state in
+                NumPy arrays. Defaults to False.
+            metrics (Metrics, optional): Registry the run is instrumented
+                into. Defaults to None, which records nothing.
+            trace (TraceSink, optional): Binary trace every state change
+                is recorded to. Defaults to None, which records nothing.
+            network (Network, optional): Shortest paths of the arcs.
+                Defaults to Network.from_arcs of the arcs and locations.
         """
         self.locations = locations
         self.arcs = arcs
+        self.order_store = None
+        self.fleet_store = None
+        self._order_feed = None
+        if isinstance(orders, OrderStore):
+            self.order_store = orders
+            orders = orders.views()
+        elif not isinstance(orders, (list, tuple)) and not columnar:
+            # Pedidos chegam sob demanda, em ordem de release_time
+            self._order_feed = iter(orders)
+            orders = []
+        if columnar:
+            if self.order_store is None:
+                self.order_store = OrderStore.from_orders(orders, locations.keys())
+            self.fleet_store = FleetStore.from_vehicles(fleet, locations.keys())
+            orders = self.order_store.views()
+            fleet = self.fleet_store.views()
         self.orders = orders
         self.fleet = fleet
         self.horizon = horizon
+        self.network = Network.from_arcs(arcs, locations.keys()) if network is None else network
+        self.current_time = 0
+        self.pending = {}
+        self.kpis = KPIAccumulator(self.fleet)
+        self.journal = Journal()
+        self.policy = None
+        self._events = EventQueue()
+        self._releases = []
+        self._next_release = 0
+        self._keys = {}
+        self._docks = {}
+        self.metrics = metrics
+        self.trace = trace
+        self._wall_start = 0.0
 
     def run(self, policy):
         """
         Execute the simulation with a given policy.
         
-        Runs the simulation for the specified time horizon, applying
-        the routing policy to make decisions for each vehicle at each
-        time step.
+        Runs a discrete-event simulation up to the time horizon. Order
+        releases, vehicle arrivals and vehicles becoming ready are kept in
+        a priority queue, so the clock jumps straight to the next event and
+        the policy is only consulted for vehicles that are actually free.
+        Every vehicle free at the same time is handed to
+        policy.choose_actions_batch in a single call, after the orders
+        released at that time.
+        
+        With metrics, the run is instrumented into the registry, and its
+        JSON summary is written to metrics.summary_path at the end. With
+        trace, every state change is recorded and the trace is flushed at
+        the end.
+        
+        The simulator's network is handed to policies that do not have one,
+        and the simulator itself to policies with a simulator attribute set
+        to None, such as lookahead policies.
         
         Args:
             policy: Policy object that defines routing decisions
@@ -44,23 +197,519 @@ class Simulator:
         Returns:
             dict: Simulation results and performance metrics
         """
-        current_time = 0
-        while current_time < self.horizon:
-            for vehicle in self.fleet:
-                unloads, loads, next_location = policy.choose_actions(vehicle, current_time)
-                
-                vehicle.current_location = next_location
-                vehicle.available_at = current_time + 30
+        self.start(policy)
+        self.advance()
+        return self.finish()
+
+    def start(self, policy):
+        """
+        Reset the clock and schedule the first events, without running them.
+        
+        Releases are scheduled one at a time, in (release_time, index)
+        order, so the event queue only ever holds the next release and one
+        event per vehicle.
+        
+        Args:
+            policy: Policy object that defines routing decisions
+        """
+        self._bind(policy)
+        self.current_time = 0
+        self.kpis.reset()
+        if self.trace is not None:
+            self.trace.begin(self)
+        self._wall_start = perf_counter()
+        self._events = EventQueue()
+        if self._order_feed is None:
+            self._next_release = 0
+            self._schedule_next_release()
+        else:
+            self._schedule_next_order(self._events)
+        for index, vehicle in enumerate(self.fleet):
+            self._events.push(vehicle.available_at, VEHICLE_READY, index,
+                              (vehicle, vehicle.current_location))
+
+    def _bind(self, policy):
+        """
+        Hand the policy its network and simulator and hook up the journal.
+        
+        Args:
+            policy: Policy object that defines routing decisions
+        """
+        if getattr(policy, 'network', None) is None:
+            policy.network = self.network
+        if hasattr(policy, 'simulator') and policy.simulator is None:
+            policy.simulator = self
+        self.policy = policy
+        self.pending = {location_id: location.load_queue for location_id, location in self.locations.items()}
+        for location in self.locations.values():
+            location.load_queue.journal = self.journal
+        for vehicle in self.fleet:
+            vehicle.load.journal = self.journal
+        self._docks = {}
+        for location_id, location in self.locations.items():
+            if getattr(location, 'docks', None) is not None:
+                location.docks.journal = self.journal
+                self._docks[location_id] = location.docks
+        self._keys = {id(vehicle): index for index, vehicle in enumerate(self.fleet)}
+        if self.order_store is not None:
+            # Ordenação estável nas colunas, sem criar as visões de todos os pedidos
+            self._releases = np.argsort(self.order_store.release_time, kind='stable').tolist()
+        elif self._order_feed is None:
+            self._releases = sorted(range(len(self.orders)), key=lambda index: self.orders[index].release_time)
+
+    def advance(self, until=None, policy=None):
+        """
+        Process events up to a given time.
+        
+        Stops before the first event at or after until (or the horizon), so
+        the simulation can be advanced again later from where it stopped.
+        Events processed inside a lookahead are not recorded in the metrics
+        or the trace.
+        
+        Args:
+            until (int, optional): Time to stop at. Defaults to the horizon.
+            policy (optional): Policy used for the decisions of this call.
+                Defaults to the policy given to start.
+        """
+        policy = self.policy if policy is None else policy
+        limit = self.horizon if until is None else min(until, self.horizon)
+        events = self._events
+        journal = self.journal
+        metrics = None if journal.recording else self.metrics
+        trace = None if journal.recording else self.trace
+        docks = self._docks
+
+        # Veículos livres no instante atual, decididos em um único lote
+        ready = []
+        while events:
+            if events.peek()[0] >= limit:
+                break
+            time, kind, key, payload = events.pop()
+            self.current_time = time
+            if metrics is not None:
+                metrics.inc('simulator_events_total', labels=_EVENT_LABELS[kind])
 
-            current_time += 1
+            if kind == ORDER_RELEASE:
+                self._release_order(payload)
+                if self._order_feed is not None:
+                    self.orders.append(payload)
+                    self._schedule_next_order(events)
+                else:
+                    self._schedule_next_release()
+            else:
+                vehicle, location_id = payload
+                journal.set(vehicle, 'current_location', location_id)
+                if trace is not None and kind == VEHICLE_ARRIVAL:
+                    trace.record(time, ARRIVE, key, -1, trace.location(location_id))
+                units = None
+                if docks and kind == VEHICLE_ARRIVAL and location_id in docks:
+                    units = vehicle.load.units_for(location_id)
+                if units is None:
+                    ready.append((key, vehicle))
+                else:
+                    # Descarga em uma doca: o veículo só decide quando ela termina
+                    _, end = docks[location_id].request(time, self.locations[location_id].unload_time(units))
+                    journal.set(vehicle, 'available_at', end)
+                    events.push(end, VEHICLE_READY, key, payload)
+                    if trace is not None:
+                        trace.record(time, WAIT, key, end - time, trace.location(location_id))
+
+            next_event = events.peek()
+            if ready and (next_event is None or next_event[0] != time):
+                if metrics is None:
+                    self._dispatch(policy, events, ready)
+                else:
+                    self._dispatch_instrumented(policy, events, ready, metrics)
+                ready = []
+
+    def finish(self):
+        """
+        Close a run: write the metrics summary, flush the trace and let
+        the policy release what it holds for the run, through its close
+        method when it has one.
+        
+        Returns:
+            dict: Simulation results and performance metrics
+        """
+        close = getattr(self.policy, 'close', None)
+        if close is not None:
+            close()
+        if self.metrics is not None:
+            self.metrics.write_summary()
+        if self.trace is not None:
+            self.trace.flush()
         return self.get_results()
 
+    @property
+    def done(self):
+        """
+        Whether every event before the horizon has been processed.
+        
+        Returns:
+            bool: True once advance has nothing left to do
+        """
+        next_event = self._events.peek()
+        return next_event is None or next_event[0] >= self.horizon
+
+    def engine_state(self):
+        """
+        State of the engine itself, for checkpoints.
+        
+        Covers the clock, the pending events, the position in release order,
+        the KPI counters and the state of the random generators. Events are
+        encoded with the index of their order or vehicle instead of the
+        object, so the state only holds plain values. The state of
+        vehicles, orders and load queues is not included.
+        
+        Returns:
+            dict: Picklable state for set_engine_state
+            
+        Raises:
+            ValueError: If the orders come from a streaming feed
+        """
+        if self._order_feed is not None:
+            raise ValueError("A simulation fed by an order stream cannot be checkpointed")
+        heap, seq = self._events.state()
+        return {
+            'current_time': self.current_time,
+            'next_release': self._next_release,
+            'events': [
+                (time, kind, key, entry_seq, None if kind == ORDER_RELEASE else payload[1])
+                for time, kind, key, entry_seq, payload in heap
+            ],
+            'event_seq': seq,
+            'kpis': dict(vars(self.kpis)),
+            'random_state': random.getstate(),
+            'numpy_random_state': np.random.get_state(),
+        }
+
+    def set_engine_state(self, policy, state):
+        """
+        Resume the engine from a state returned by engine_state.
+        
+        Takes the place of start when a run is continued: the policy is
+        bound as start would, unless it is already the policy of the run,
+        but nothing is reset. Vehicles, orders and load queues must already
+        hold the state of the same instant.
+        
+        Args:
+            policy: Policy object that defines routing decisions
+            state (dict): State returned by engine_state
+        """
+        if policy is not self.policy:
+            self._bind(policy)
+        self.current_time = state['current_time']
+        self._next_release = state['next_release']
+        heap = [
+            (time, kind, key, entry_seq,
+             self.orders[key] if kind == ORDER_RELEASE else (self.fleet[key], location_id))
+            for time, kind, key, entry_seq, location_id in state['events']
+        ]
+        self._events = EventQueue()
+        self._events.set_state((heap, state['event_seq']))
+        vars(self.kpis).update(state['kpis'])
+        random.setstate(state['random_state'])
+        np.random.set_state(state['numpy_random_state'])
+        self._wall_start = perf_counter()
+
+    def snapshot(self):
+        """
+        Fork point of the full simulation state.
+        
+        Nothing is copied but the clock, the KPI counters, the random
+        generator state and the event queue, which holds one event per
+        vehicle and the next release, so the cost of a snapshot does not
+        depend on the number of orders. Changes made afterwards to
+        vehicles, orders, cargo and load queues are recorded in
+        self.journal and undone by restore. State kept by the policies
+        themselves is not part of the snapshot.
+        
+        Snapshots may be nested, and must be released in reverse order of
+        creation.
+        
+        Returns:
+            Snapshot: State to pass to restore and release
+            
+        Raises:
+            ValueError: If the orders come from a streaming feed
+        """
+        if self._order_feed is not None:
+            raise ValueError("A simulation fed by an order stream cannot be forked")
+        return Snapshot(
+            self.journal.mark(),
+            self.current_time,
+            self._next_release,
+            self._events.state(),
+            dict(vars(self.kpis)),
+            random.getstate(),
+        )
+
+    def restore(self, snapshot):
+        """
+        Bring the simulation back to a snapshot.
+        
+        The snapshot stays valid, so several futures can be explored from
+        the same point.
+        
+        Args:
+            snapshot (Snapshot): State returned by snapshot
+        """
+        self.journal.rollback(snapshot.mark)
+        self.current_time = snapshot.current_time
+        self._next_release = snapshot.next_release
+        self._events.set_state(snapshot.events)
+        vars(self.kpis).update(snapshot.kpis)
+        random.setstate(snapshot.random_state)
+        if self.fleet_store is not None:
+            for vehicle in self.fleet:
+                vehicle._sync_load()
+
+    def release(self, snapshot):
+        """
+        Discard a snapshot, keeping the current state.
+        
+        Args:
+            snapshot (Snapshot): State returned by snapshot
+        """
+        self.journal.release(snapshot.mark)
+
+    @contextmanager
+    def lookahead(self):
+        """
+        Context in which the simulation can be advanced and is then rolled back.
+        
+        Example:
+            with simulator.lookahead() as snapshot:
+                simulator.advance(simulator.current_time + 120, rollout_policy)
+                value = simulator.get_results()
+        
+        Yields:
+            Snapshot: State the simulation returns to on exit
+        """
+        snapshot = self.snapshot()
+        try:
+            yield snapshot
+        finally:
+            self.restore(snapshot)
+            self.release(snapshot)
+
+    def _schedule_next_release(self):
+        """
+        Schedule the release of the next order in release order.
+        """
+        if self._next_release < len(self._releases):
+            index = self._releases[self._next_release]
+            order = self.orders[index]
+            self._events.push(order.release_time, ORDER_RELEASE, index, order)
+            self._next_release += 1
+
+    def _schedule_next_order(self, events):
+        """
+        Pull the next order from the order feed and schedule its release.
+        
+        Args:
+            events (EventQueue): Pending simulation events
+            
+        Raises:
+            ValueError: If the feed is not sorted by release_time
+        """
+        order = next(self._order_feed, None)
+        if order is None:
+            return
+        if order.release_time < self.current_time:
+            raise ValueError(
+                f"Order {order.order_id} is released at {order.release_time}, "
+                f"after the simulation reached {self.current_time}; the order feed must be sorted by release_time"
+            )
+        events.push(order.release_time, ORDER_RELEASE, len(self.orders), order)
+
+    def _release_order(self, order):
+        """
+        Make an order available for pickup at its origin.
+        
+        Args:
+            order: Order object being released
+        """
+        location = self.locations.get(order.origin)
+        if location is not None:
+            self.journal.set(order, 'status', RELEASED)
+            location.load_queue.append(order)
+            self.kpis.on_release(order, self.current_time)
+            if not self.journal.recording:
+                if self.metrics is not None:
+                    self.metrics.set('simulator_queue_length', len(location.load_queue),
+                                     (('location', order.origin),))
+                if self.trace is not None:
+                    self.trace.record(self.current_time, RELEASE, -1, self.trace.order(order),
+                                      self.trace.location(order.origin))
+
+    def _dispatch(self, policy, events, ready):
+        """
+        Ask the policy for the actions of the free vehicles and apply them.
+        
+        Unloaded orders are marked as delivered, loaded orders leave the
+        location's load queue and each vehicle's next event is scheduled.
+        Travel takes the shortest transit time in the network, rounded up
+        to whole minutes; a vehicle that stays put, or that chose an
+        unreachable location, waits WAIT_TIME minutes before deciding again.
+        Decisions are applied one at a time, as they are drawn from the
+        policy's batch.
+        
+        At locations with docks, service takes time and docks are shared:
+        a vehicle arriving with orders for the location queues for a dock
+        and only becomes free, and has its orders delivered, once
+        unloading (base_unload + delta * units) is over. A vehicle that
+        loads orders takes a dock again for base_load + gamma * units
+        minutes and only leaves when loading is over. Without docks,
+        service is instantaneous.
+        
+        Args:
+            policy: Policy object that defines routing decisions
+            events (EventQueue): Pending simulation events
+            ready (list): (index in the fleet, vehicle) pairs of the
+                vehicles free at the current time
+            
+        Raises:
+            ValueError: If the policy does not return one decision per vehicle
+        """
+        vehicles = [vehicle for _, vehicle in ready]
+        decisions = iter(policy.choose_actions_batch(vehicles, self.current_time, self.pending))
+        for key, vehicle in ready:
+            decision = next(decisions, None)
+            if decision is None:
+                _batch_mismatch(policy, ready)
+            self._apply_decision(events, key, vehicle, decision)
+        if next(decisions, None) is not None:
+            _batch_mismatch(policy, ready)
+
+    def _dispatch_instrumented(self, policy, events, ready, metrics):
+        """
+        Same as _dispatch, recording its cost and effects into a registry.
+        
+        Only the time spent in the policy, creating the batch and drawing
+        each decision from it, counts as policy time.
+        
+        Args:
+            policy: Policy object that defines routing decisions
+            events (EventQueue): Pending simulation events
+            ready (list): (index in the fleet, vehicle) pairs of the
+                vehicles free at the current time
+            metrics (Metrics): Registry to record into
+            
+        Raises:
+            ValueError: If the policy does not return one decision per vehicle
+        """
+        vehicles = [vehicle for _, vehicle in ready]
+        start = perf_counter()
+        decisions = iter(policy.choose_actions_batch(vehicles, self.current_time, self.pending))
+        elapsed = perf_counter() - start
+        applied = loaded = unloaded = 0
+        try:
+            for key, vehicle in ready:
+                start = perf_counter()
+                decision = next(decisions, None)
+                elapsed += perf_counter() - start
+                if decision is None:
+                    _batch_mismatch(policy, ready)
+                location_id = vehicle.current_location
+                self._apply_decision(events, key, vehicle, decision)
+                applied += 1
+                unloaded += len(decision[0])
+                if decision[1]:
+                    loaded += len(decision[1])
+                    metrics.set('simulator_queue_length', len(self.locations[location_id].load_queue),
+                                (('location', location_id),))
+            if next(decisions, None) is not None:
+                _batch_mismatch(policy, ready)
+        finally:
+            # Mesmo com um lote inválido, registra apenas o que foi aplicado
+            metrics.observe('simulator_policy_seconds', elapsed)
+            metrics.inc('simulator_decision_epochs_total')
+            metrics.inc('simulator_decisions_total', applied)
+            metrics.inc('simulator_orders_loaded_total', loaded)
+            metrics.inc('simulator_orders_unloaded_total', unloaded)
+            metrics.set('simulator_time_minutes', self.current_time)
+            wall = perf_counter() - self._wall_start
+            if wall > 0:
+                metrics.set('simulator_minutes_per_second', self.current_time / wall)
+
+    def _apply_decision(self, events, key, vehicle, decision):
+        """
+        Apply the actions chosen for a free vehicle.
+        
+        Args:
+            events (EventQueue): Pending simulation events
+            key (int): Index of the vehicle in the fleet
+            vehicle: Vehicle object that is free at the current time
+            decision (tuple): (unloads, loads, next_location) chosen by the policy
+        """
+        now = self.current_time
+        unloads, loads, next_location = decision
+
+        journal = self.journal
+        trace = None if journal.recording else self.trace
+        if trace is not None:
+            here = trace.location(vehicle.current_location)
+        for order in unloads:
+            journal.set(order, 'delivery_time', now)
+            journal.set(order, 'status', DELIVERED)
+            self.kpis.on_delivery(order, now)
+            if trace is not None:
+                trace.record(now, UNLOAD, key, trace.order(order), here)
+        if loads:
+            queue = self.locations[vehicle.current_location].load_queue
+            for order in loads:
+                queue.remove(order)
+                journal.set(order, 'status', LOADED)
+                self.kpis.on_load(order, now)
+                if trace is not None:
+                    trace.record(now, LOAD, key, trace.order(order), here)
+
+        # Com docas, o veículo só parte quando a carga termina
+        departure = now
+        if loads and self._docks and vehicle.current_location in self._docks:
+            units = sum(order.units for order in loads)
+            _, departure = self._docks[vehicle.current_location].request(
+                now, self.locations[vehicle.current_location].load_time(units))
+
+        travel_time = self.network.travel_time(vehicle.current_location, next_location)
+        if next_location == vehicle.current_location or math.isinf(travel_time):
+            journal.set(vehicle, 'available_at', departure + WAIT_TIME)
+            events.push(vehicle.available_at, VEHICLE_READY, key, (vehicle, vehicle.current_location))
+            if trace is not None:
+                trace.record(now, WAIT, key, vehicle.available_at - now, here)
+        else:
+            trip_time = max(1, math.ceil(travel_time))
+            journal.set(vehicle, 'available_at', departure + trip_time)
+            self.kpis.on_move(vehicle, trip_time, now)
+            events.push(vehicle.available_at, VEHICLE_ARRIVAL, key, (vehicle, next_location))
+            if trace is not None:
+                # O tempo na doca vai em um WAIT próprio, e o DEPART leva só a viagem
+                if departure > now:
+                    trace.record(now, WAIT, key, departure - now, here)
+                trace.record(now, DEPART, key, trip_time, trace.location(next_location))
+
+    def apply_decision(self, vehicle, decision):
+        """
+        Apply actions to a free vehicle outside of the policy's batch.
+        
+        Lets a lookahead policy play a candidate decision on a snapshot
+        before advancing the simulation.
+        
+        Args:
+            vehicle: Vehicle of the fleet that is free at the current time
+            decision (tuple): (unloads, loads, next_location) for the vehicle
+        """
+        self._apply_decision(self._events, self._keys[id(vehicle)], vehicle, decision)
+
     def get_results(self):
         """
         Collect and return simulation results.
         
         Calculates key performance indicators (KPIs) including
-        on-time deliveries, late deliveries, and total delay time.
+        on-time deliveries, late deliveries, and total delay time. Only
+        delivered orders are counted; the counters are kept up to date
+        during the run by self.kpis.
         
         Returns:
             dict: Dictionary containing simulation KPIs:
@@ -68,18 +717,15 @@ class Simulator:
                 - served_late: Number of orders delivered late
                 - total_late_minutes: Total delay time for late orders
         """
-        served_on_time = 0
-        served_late = 0
-        total_late_minutes = 0
-        for order in self.orders:
-            if order.delivery_time <= order.due_time:
-                served_on_time += 1
-            else:
-                served_late += 1
-                total_late_minutes += (order.delivery_time - order.due_time)
+        return self.kpis.results()
 
-        return {
-            'served_on_time': served_on_time,
-            'served_late': served_late,
-            'total_late_minutes': total_late_minutes
-        }
+    def get_kpis(self):
+        """
+        Full set of KPIs at the current simulation time.
+        
+        Cheap enough to be polled while a simulation is running.
+        
+        Returns:
+            dict: Metrics returned by KPIAccumulator.snapshot
+        """
+        return self.kpis.snapshot(self.current_time)
@@ -0,0 +1,348 @@
+"""
+Parameter sweep / policy tournament harness.
+
+Runs every cell of a grid of (scenario, policy class, policy parameters,
+seed) in parallel and stores each result in an on-disk cache keyed by a
+content hash of the scenario file, the source code of the policy and of
+the simulation engine, the parameters, the seed and the horizon. Cells
+whose key is already cached are not run again, so a nightly sweep only
+pays for what changed. Results are written as one tidy CSV row per cell.
+
+Usage:
+    python -m simulator.sweep sweep.json
+
+where sweep.json looks like:
+    {
+        "scenarios": ["simulation_inputs.json"],
+        "policies": ["models.policy:Policy"],
+        "params": [{}],
+        "seeds": [0, 1, 2],
+        "horizon": 480,
+        "cache_dir": ".sweep_cache",
+        "output": "sweep_results.csv"
+    }
+"""
+
+import argparse
+import csv
+import hashlib
+import importlib
+import inspect
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulator.monte_carlo import load_scenario, run_replication
+
+# Pacotes cujo código entra na chave de todas as células
+ENGINE_PACKAGES = ('models', 'scenario', 'simulator')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cenários já lidos neste processo, por caminho
+_scenario_cache = {}
+
+
+def policy_path(policy):
+    """
+    Import path of a policy class.
+
+    Args:
+        policy (type or str): Policy class or 'module:Class' path
+
+    Returns:
+        str: 'module:Class' path
+    """
+    if isinstance(policy, str):
+        return policy
+    return f"{policy.__module__}:{policy.__qualname__}"
+
+
+def resolve_policy(path):
+    """
+    Import a policy class from its 'module:Class' path.
+
+    Args:
+        path (str): 'module:Class' path
+
+    Returns:
+        type: Policy class
+    """
+    module_name, _, class_name = path.partition(':')
+    target = importlib.import_module(module_name)
+    for name in class_name.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+def file_digest(path):
+    """
+    SHA-256 of the contents of a file, read in chunks.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: Hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def engine_files(root=ROOT, packages=ENGINE_PACKAGES):
+    """
+    Source files of the packages every simulation run depends on.
+
+    Args:
+        root (str, optional): Directory holding the packages. Defaults to
+            the root of the repository.
+        packages (tuple, optional): Package directories to include.
+            Defaults to ENGINE_PACKAGES.
+
+    Returns:
+        list: Paths of every .py file in the packages, sorted
+    """
+    files = []
+    for package in packages:
+        for directory, subdirectories, names in os.walk(os.path.join(root, package)):
+            subdirectories[:] = sorted(name for name in subdirectories if name != '__pycache__')
+            files.extend(os.path.join(directory, name) for name in sorted(names) if name.endswith('.py'))
+    return files
+
+
+def policy_digest(policy_class):
+    """
+    SHA-256 of the source code a policy run depends on.
+
+    Hashes every source file of the models, scenario and simulator
+    packages, together with its path, and the source files of the class
+    hierarchy of the policy that live elsewhere. Any change to the
+    policy, to a base policy, to the model classes, to the scenario
+    builders or to the engine invalidates the cached results.
+
+    Args:
+        policy_class (type): Policy class
+
+    Returns:
+        str: Hexadecimal digest
+    """
+    digest = hashlib.sha256(policy_path(policy_class).encode())
+    files = engine_files()
+    for cls in policy_class.__mro__:
+        if cls is object:
+            continue
+        source_file = inspect.getsourcefile(cls)
+        if source_file:
+            source_file = os.path.abspath(source_file)
+            if source_file not in files:
+                files.append(source_file)
+    for source_file in files:
+        digest.update(os.path.relpath(source_file, ROOT).encode())
+        digest.update(file_digest(source_file).encode())
+    return digest.hexdigest()
+
+
+def cell_key(scenario_digest, code_digest, params, seed, horizon):
+    """
+    Cache key of a sweep cell.
+
+    Args:
+        scenario_digest (str): Digest of the scenario file
+        code_digest (str): Digest of the policy source code
+        params (dict): Policy parameters
+        seed (int): Replication seed
+        horizon (int): Simulation time horizon
+
+    Returns:
+        str: Hexadecimal key
+    """
+    payload = json.dumps([scenario_digest, code_digest, params, seed, horizon], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def sweep_grid(scenarios, policies, params=({},), seeds=(0,)):
+    """
+    Cells of the full grid of scenarios, policies, parameters and seeds.
+
+    Args:
+        scenarios (list): Paths to scenario JSON files
+        policies (list): Policy classes or 'module:Class' paths
+        params (list, optional): Policy parameter dictionaries. Defaults to [{}].
+        seeds (list, optional): Replication seeds. Defaults to [0].
+
+    Returns:
+        list: Cells as dictionaries with scenario, policy, params and seed
+    """
+    return [
+        {'scenario': scenario, 'policy': policy_path(policy), 'params': dict(cell_params), 'seed': seed}
+        for scenario, policy, cell_params, seed in itertools.product(scenarios, policies, params, seeds)
+    ]
+
+
+def _run_cell(scenario, policy, params, seed, horizon):
+    """
+    Run one sweep cell. Executed in a worker process.
+
+    Args:
+        scenario (str): Path to the scenario JSON file
+        policy (str): 'module:Class' path of the policy
+        params (dict): Policy parameters
+        seed (int): Replication seed
+        horizon (int): Simulation time horizon
+
+    Returns:
+        dict: KPIs returned by Simulator.run
+    """
+    data = _scenario_cache.get(scenario)
+    if data is None:
+        data = _scenario_cache[scenario] = load_scenario(scenario)
+    return run_replication(data, resolve_policy(policy), seed, horizon, params)
+
+
+def _cache_path(cache_dir, key):
+    """
+    File holding the cached result of a cell.
+
+    Args:
+        cache_dir (str): Cache directory
+        key (str): Cache key of the cell
+
+    Returns:
+        str: Path to the result file
+    """
+    return os.path.join(cache_dir, key[:2], f"{key}.json")
+
+
+def _write_cache(cache_dir, key, results):
+    """
+    Store the result of a cell atomically.
+
+    Args:
+        cache_dir (str): Cache directory
+        key (str): Cache key of the cell
+        results (dict): KPIs of the cell
+    """
+    path = _cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w') as file:
+        json.dump(results, file)
+    os.replace(temporary, path)
+
+
+def write_table(rows, output_path):
+    """
+    Write sweep rows as a CSV table.
+
+    Args:
+        rows (list): Row dictionaries returned by run_sweep
+        output_path (str): Path to the CSV file
+    """
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    with open(output_path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_sweep(cells, cache_dir, output_path=None, workers=None, horizon=480):
+    """
+    Run the cells of a sweep, skipping those already in the cache.
+
+    Args:
+        cells (list): Cells returned by sweep_grid
+        cache_dir (str): Directory of the result cache
+        output_path (str, optional): CSV file to write the table to
+        workers (int, optional): Number of processes. Defaults to the number
+            of CPUs; 1 runs every cell in the current process.
+        horizon (int, optional): Simulation time horizon. Defaults to 480.
+
+    Returns:
+        list: One row per cell, in the order of the cells, with scenario,
+            policy, params (as JSON), seed, key, cached and every KPI
+    """
+    scenario_digests = {}
+    code_digests = {}
+    keys = []
+    for cell in cells:
+        if cell['scenario'] not in scenario_digests:
+            scenario_digests[cell['scenario']] = file_digest(cell['scenario'])
+        if cell['policy'] not in code_digests:
+            code_digests[cell['policy']] = policy_digest(resolve_policy(cell['policy']))
+        keys.append(cell_key(scenario_digests[cell['scenario']], code_digests[cell['policy']],
+                             cell['params'], cell['seed'], horizon))
+
+    results = {}
+    cached = set()
+    for key in keys:
+        path = _cache_path(cache_dir, key)
+        if key not in results and os.path.exists(path):
+            with open(path) as file:
+                results[key] = json.load(file)
+            cached.add(key)
+
+    pending = {}
+    for key, cell in zip(keys, cells):
+        if key not in results:
+            pending[key] = cell
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(pending) <= 1:
+        for key, cell in pending.items():
+            results[key] = _run_cell(cell['scenario'], cell['policy'], cell['params'], cell['seed'], horizon)
+            _write_cache(cache_dir, key, results[key])
+    elif pending:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = {
+                executor.submit(_run_cell, cell['scenario'], cell['policy'], cell['params'], cell['seed'], horizon): key
+                for key, cell in pending.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                results[key] = future.result()
+                _write_cache(cache_dir, key, results[key])
+
+    rows = []
+    for key, cell in zip(keys, cells):
+        row = {
+            'scenario': cell['scenario'],
+            'policy': cell['policy'],
+            'params': json.dumps(cell['params'], sort_keys=True),
+            'seed': cell['seed'],
+            'key': key,
+            'cached': key in cached,
+        }
+        row.update(results[key])
+        rows.append(row)
+
+    if output_path:
+        write_table(rows, output_path)
+    return rows
+
+
+def main():
+    """
+    Command-line entry point running a sweep described by a JSON file.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('config', help='sweep configuration JSON file')
+    parser.add_argument('--workers', type=int, help='number of processes')
+    args = parser.parse_args()
+
+    with open(args.config) as file:
+        config = json.load(file)
+    cells = sweep_grid(config['scenarios'], config['policies'], config.get('params', [{}]), config.get('seeds', [0]))
+    rows = run_sweep(cells, config.get('cache_dir', '.sweep_cache'), config.get('output', 'sweep_results.csv'),
+                     args.workers, config.get('horizon', 480))
+
+    cached = sum(row['cached'] for row in rows)
+    print(f"{len(rows)} células ({cached} do cache) gravadas em {config.get('output', 'sweep_results.csv')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,446 @@
+"""
+Compact binary trace of a simulation run.
+
+Every state change made by the simulator is packed into a fixed-width
+21-byte record, struct format '<qBiii':
+    time (int64): Simulation time of the change
+    kind (uint8): RELEASE, LOAD, UNLOAD, DEPART, ARRIVE or WAIT
+    vehicle (int32): Index of the vehicle in the fleet, or -1
+    order (int32): Index of the order in the trace, or -1; for DEPART
+        records, the trip time, and for WAIT records, the minutes until the
+        vehicle is free again, or until it leaves when a DEPART follows at
+        the same time (loading at a dock)
+    location (int32): Index of the location: the origin of a released
+        order, the destination of a departure, otherwise where the vehicle is
+
+Records are written in processing order, so their times never decrease.
+Strings and the order and vehicle attributes needed to rebuild the KPIs
+are kept out of the records, in a JSON string table written next to the
+trace file. A trace of 10^8 records takes 2.1 GB.
+
+Records go either to an append-only file (TraceWriter) or to an
+in-memory ring buffer that keeps the most recent ones (TraceRing).
+TraceReader maps a trace file with numpy.memmap, and replay_results,
+replay_kpis and replay_state rebuild the KPIs or the state at any time
+from the records alone, without running the policy again.
+
+Usage:
+    trace = TraceWriter('run.trace')
+    Simulator(locations, arcs, orders, fleet, trace=trace).run(policy)
+    trace.close()
+    replay_kpis(TraceReader('run.trace'), until=240)
+"""
+
+import json
+import struct
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+
+import numpy as np
+
+from simulator.kpi import KPIAccumulator
+
+# Tipos de registro
+RELEASE = 0
+LOAD = 1
+UNLOAD = 2
+DEPART = 3
+ARRIVE = 4
+WAIT = 5
+
+KIND_NAMES = ('release', 'load', 'unload', 'depart', 'arrive', 'wait')
+
+RECORD = struct.Struct('<qBiii')
+RECORD_DTYPE = np.dtype([('time', '<i8'), ('kind', 'u1'), ('vehicle', '<i4'), ('order', '<i4'), ('location', '<i4')])
+
+
+def strings_path(path):
+    """
+    Path of the string table of a trace file.
+
+    Args:
+        path (str): Trace file
+
+    Returns:
+        str: Path of the JSON string table
+    """
+    return f"{path}.strings.json"
+
+
+class TraceSink(ABC):
+    """
+    Base class of the trace destinations.
+
+    Subclasses implement record, which stores one record, and may override
+    flush. The base class keeps the string table: the simulator's
+    locations and fleet, captured by begin, and the orders, indexed in the
+    order they are released.
+
+    Attributes:
+        locations (list): Location identifiers
+        vehicles (list): [vehicle_id, capacity, location, available_at] of
+            each vehicle when the run starts
+        orders (list): [order_id, origin, destination, release_time,
+            due_time, units] of each released order
+        count (int): Number of records written
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty TraceSink instance.
+        """
+        self.locations = []
+        self.vehicles = []
+        self.orders = []
+        self.count = 0
+        self._location_index = {}
+        self._order_index = {}
+
+    def begin(self, simulator):
+        """
+        Capture the string table of a run that is starting.
+
+        Args:
+            simulator (Simulator): Simulator about to run
+        """
+        self.locations = list(simulator.locations)
+        self._location_index = {location_id: i for i, location_id in enumerate(self.locations)}
+        self.vehicles = [
+            [vehicle.vehicle_id, int(vehicle.capacity), vehicle.current_location, int(vehicle.available_at)]
+            for vehicle in simulator.fleet
+        ]
+        self.orders = []
+        self._order_index = {}
+
+    def location(self, location_id):
+        """
+        Index of a location.
+
+        Args:
+            location_id (str): Location identifier
+
+        Returns:
+            int: Index in the string table, or -1 if unknown
+        """
+        return self._location_index.get(location_id, -1)
+
+    def order(self, order):
+        """
+        Index of an order, added to the string table on first sight.
+
+        Args:
+            order: Order object
+
+        Returns:
+            int: Index in the string table
+        """
+        index = self._order_index.get(id(order))
+        if index is None:
+            index = self._order_index[id(order)] = len(self.orders)
+            self.orders.append([order.order_id, order.origin, order.destination,
+                                int(order.release_time), int(order.due_time), int(order.units)])
+        return index
+
+    @abstractmethod
+    def record(self, time, kind, vehicle, order, location):
+        """
+        Append a record.
+
+        Args:
+            time (int): Simulation time
+            kind (int): Record type
+            vehicle (int): Vehicle index, or -1
+            order (int): Order index or duration, or -1
+            location (int): Location index
+        """
+
+    def strings(self):
+        """
+        String table of the trace.
+
+        Returns:
+            dict: JSON-serializable table
+        """
+        return {'kinds': list(KIND_NAMES), 'locations': self.locations,
+                'vehicles': self.vehicles, 'orders': self.orders}
+
+    def flush(self):
+        """
+        Make the records written so far durable or readable.
+        """
+
+
+class TraceWriter(TraceSink):
+    """
+    Append-only trace file.
+
+    Records are packed into a reusable chunk and written out when it is
+    full, so writing a record costs one struct.pack_into call.
+
+    Attributes:
+        path (str): Trace file
+    """
+
+    def __init__(self, path, chunk_records=65536):
+        """
+        Initialize a new TraceWriter instance, truncating the file.
+
+        Args:
+            path (str): Trace file
+            chunk_records (int, optional): Records buffered in memory.
+                Defaults to 65536.
+        """
+        super().__init__()
+        self.path = path
+        self._file = open(path, 'wb')
+        self._chunk = bytearray(RECORD.size * chunk_records)
+        self._offset = 0
+
+    def record(self, time, kind, vehicle, order, location):
+        """
+        Append a record.
+
+        Args:
+            time (int): Simulation time
+            kind (int): Record type
+            vehicle (int): Vehicle index, or -1
+            order (int): Order index or duration, or -1
+            location (int): Location index
+        """
+        RECORD.pack_into(self._chunk, self._offset, time, kind, vehicle, order, location)
+        self._offset += RECORD.size
+        self.count += 1
+        if self._offset == len(self._chunk):
+            self._file.write(self._chunk)
+            self._offset = 0
+
+    def flush(self):
+        """
+        Write the buffered records and the string table.
+        """
+        if self._offset:
+            self._file.write(memoryview(self._chunk)[:self._offset])
+            self._offset = 0
+        self._file.flush()
+        with open(strings_path(self.path), 'w') as file:
+            json.dump(self.strings(), file)
+
+    def close(self):
+        """
+        Flush and close the trace file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class TraceRing(TraceSink):
+    """
+    In-memory ring buffer holding the most recent records.
+
+    Once it has wrapped around, the oldest state changes are lost, so its
+    records are meant for inspection; the replay functions need a trace
+    that starts with the run.
+
+    Attributes:
+        capacity (int): Maximum number of records kept
+    """
+
+    def __init__(self, capacity):
+        """
+        Initialize a new TraceRing instance.
+
+        Args:
+            capacity (int): Maximum number of records kept
+        """
+        super().__init__()
+        self.capacity = capacity
+        self._buffer = bytearray(RECORD.size * capacity)
+
+    def record(self, time, kind, vehicle, order, location):
+        """
+        Append a record, overwriting the oldest one when full.
+
+        Args:
+            time (int): Simulation time
+            kind (int): Record type
+            vehicle (int): Vehicle index, or -1
+            order (int): Order index or duration, or -1
+            location (int): Location index
+        """
+        RECORD.pack_into(self._buffer, (self.count % self.capacity) * RECORD.size,
+                         time, kind, vehicle, order, location)
+        self.count += 1
+
+    def records(self):
+        """
+        Records kept, oldest first.
+
+        Returns:
+            numpy.ndarray: Structured array of RECORD_DTYPE
+        """
+        records = np.frombuffer(self._buffer, dtype=RECORD_DTYPE)
+        if self.count < self.capacity:
+            return records[:self.count].copy()
+        return np.roll(records, -(self.count % self.capacity))
+
+    def save(self, path):
+        """
+        Write the records kept and the string table as a trace file.
+
+        Args:
+            path (str): Trace file
+        """
+        self.records().tofile(path)
+        with open(strings_path(path), 'w') as file:
+            json.dump(self.strings(), file)
+
+
+class TraceReader:
+    """
+    Read-only view of a trace file.
+
+    Attributes:
+        records (numpy.ndarray): Records mapped from the file
+        locations (list): Location identifiers
+        vehicles (list): Initial attributes of each vehicle, as in TraceSink.vehicles
+        orders (list): Attributes of each order, as in TraceSink.orders
+    """
+
+    def __init__(self, path):
+        """
+        Map a trace file and load its string table.
+
+        Args:
+            path (str): Trace file
+        """
+        with open(strings_path(path)) as file:
+            strings = json.load(file)
+        self.locations = strings['locations']
+        self.vehicles = strings['vehicles']
+        self.orders = strings['orders']
+        try:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r')
+        except ValueError:
+            # Arquivo vazio não pode ser mapeado
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def until(self, time):
+        """
+        Records up to and including a given time.
+
+        Args:
+            time (int): Simulation time, or None for every record
+
+        Returns:
+            numpy.ndarray: Leading slice of the records
+        """
+        if time is None:
+            return self.records
+        return self.records[:np.searchsorted(self.records['time'], time, side='right')]
+
+
+def replay_results(trace, until=None):
+    """
+    KPIs returned by Simulator.get_results, computed vectorized.
+
+    Args:
+        trace (TraceReader): Trace to replay
+        until (int, optional): Last simulation time replayed. Defaults to all.
+
+    Returns:
+        dict: served_on_time, served_late and total_late_minutes
+    """
+    records = trace.until(until)
+    deliveries = records[records['kind'] == UNLOAD]
+    due_times = np.array([order[4] for order in trace.orders], dtype=np.int64)
+    lateness = deliveries['time'] - due_times[deliveries['order']] if len(due_times) else np.zeros(0, np.int64)
+    late = lateness > 0
+    return {
+        'served_on_time': int((~late).sum()),
+        'served_late': int(late.sum()),
+        'total_late_minutes': int(lateness[late].sum()),
+    }
+
+
+def replay_kpis(trace, until=None):
+    """
+    Full KPI snapshot at a given time, as returned by Simulator.get_kpis.
+
+    The records are fed to a KPIAccumulator one at a time; use
+    replay_results when only the final counters are needed.
+
+    Args:
+        trace (TraceReader): Trace to replay
+        until (int, optional): Time of the snapshot. Defaults to the end.
+
+    Returns:
+        dict: Metrics returned by KPIAccumulator.snapshot
+    """
+    kpis = KPIAccumulator([SimpleNamespace(capacity=vehicle[1]) for vehicle in trace.vehicles])
+    orders = [SimpleNamespace(due_time=order[4], units=order[5]) for order in trace.orders]
+    now = 0
+    for time, kind, vehicle, order, _ in trace.until(until).tolist():
+        now = time
+        if kind == RELEASE:
+            kpis.on_release(orders[order], time)
+        elif kind == LOAD:
+            kpis.on_load(orders[order], time)
+        elif kind == UNLOAD:
+            kpis.on_delivery(orders[order], time)
+        elif kind == DEPART:
+            kpis.on_move(vehicle, order, time)
+    return kpis.snapshot(now if until is None else until)
+
+
+def replay_state(trace, until=None):
+    """
+    State of the simulation at a given time.
+
+    Args:
+        trace (TraceReader): Trace to replay
+        until (int, optional): Simulation time. Defaults to the end.
+
+    Returns:
+        dict: Dictionary containing:
+            - vehicles: Maps each vehicle id to its location (the one it is
+              heading to while traveling), its available_at time and the
+              ids of the orders on board
+            - queues: Maps each location id to the ids of the orders
+              waiting there, in release order
+            - delivered: Maps each delivered order id to its delivery time
+    """
+    locations = trace.locations
+    orders = trace.orders
+    names = [vehicle[0] for vehicle in trace.vehicles]
+    vehicles = {
+        vehicle_id: {'location': location_id, 'available_at': available_at, 'load': {}}
+        for vehicle_id, _, location_id, available_at in trace.vehicles
+    }
+    # Dicionários mantêm a ordem de inserção e removem em O(1)
+    queues = {location_id: {} for location_id in locations}
+    delivered = {}
+    for time, kind, vehicle, order, location in trace.until(until).tolist():
+        if kind == RELEASE:
+            queues[locations[location]][orders[order][0]] = None
+            continue
+        state = vehicles[names[vehicle]]
+        state['location'] = locations[location]
+        if kind == LOAD:
+            del queues[locations[location]][orders[order][0]]
+            state['load'][orders[order][0]] = None
+        elif kind == UNLOAD:
+            del state['load'][orders[order][0]]
+            delivered[orders[order][0]] = time
+        elif kind == WAIT:
+            state['available_at'] = time + order
+        elif kind == DEPART:
+            # Um WAIT no mesmo instante adia a partida até o fim da carga
+            state['available_at'] = max(time, state['available_at']) + order
+    for state in vehicles.values():
+        state['load'] = list(state['load'])
+    return {
+        'vehicles': vehicles,
+        'queues': {location_id: list(queue) for location_id, queue in queues.items()},
+        'delivered': delivered,
+    }
@@ -0,0 +1,333 @@
+"""
+Genetic algorithm tuner of policy parameters.
+
+Evolves a population of genomes, each a dictionary of numeric policy
+parameters drawn from given bounds. The fitness of a genome is the mean,
+over a few replication seeds, of the deliveries made by Simulator.run
+minus a cost per minute of lateness. Each generation keeps its best
+genomes, and fills the rest of the population with children of
+tournament-selected parents: uniform crossover followed by Gaussian
+mutation.
+
+Genomes are rounded to a fixed number of decimals, so equal genomes
+come up often. Their fitness is memoized and only new genomes are
+evaluated, in parallel in a process pool. After every generation the
+population, the memo and the random generator state are written to a
+JSON checkpoint, so an interrupted job picks up where it stopped.
+
+Usage:
+    python -m simulator.tuner tuning.json
+
+where tuning.json looks like:
+    {
+        "scenario": "simulation_inputs.json",
+        "policy": "models.weighted_policy:WeightedPolicy",
+        "bounds": {"urgency_weight": [0, 5], "distance_weight": [0, 5], "load_weight": [0, 5]},
+        "population_size": 20,
+        "generations": 30,
+        "seeds": [0, 1, 2],
+        "horizon": 480,
+        "checkpoint": "tuning_checkpoint.json"
+    }
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from simulator.monte_carlo import load_scenario, run_replication
+from simulator.sweep import policy_path, resolve_policy
+
+# Cenário já lido em cada processo de trabalho
+_worker_scenario = None
+
+
+def fitness(results, late_minute_cost=1 / 60):
+    """
+    Fitness of the KPIs of a run.
+
+    Args:
+        results (dict): KPIs returned by Simulator.run
+        late_minute_cost (float, optional): Fitness lost per minute of
+            lateness. Defaults to one delivery per hour.
+
+    Returns:
+        float: Orders delivered minus the cost of their lateness
+    """
+    delivered = results['served_on_time'] + results['served_late']
+    return delivered - late_minute_cost * results['total_late_minutes']
+
+
+def genome_key(genome):
+    """
+    Memoization key of a genome.
+
+    Args:
+        genome (dict): Policy parameters
+
+    Returns:
+        str: Canonical JSON of the genome
+    """
+    return json.dumps(genome, sort_keys=True)
+
+
+def random_genome(bounds, rng, precision=3):
+    """
+    Genome drawn uniformly within the bounds.
+
+    Args:
+        bounds (dict): Maps each parameter to its (low, high) bounds
+        rng (random.Random): Random generator
+        precision (int, optional): Decimals kept. Defaults to 3.
+
+    Returns:
+        dict: Policy parameters
+    """
+    return {name: round(rng.uniform(low, high), precision) for name, (low, high) in sorted(bounds.items())}
+
+
+def crossover(first, second, rng):
+    """
+    Uniform crossover of two genomes.
+
+    Args:
+        first (dict): First parent
+        second (dict): Second parent
+        rng (random.Random): Random generator
+
+    Returns:
+        dict: Child taking each parameter from either parent
+    """
+    return {name: first[name] if rng.random() < 0.5 else second[name] for name in first}
+
+
+def mutate(genome, bounds, rng, rate=0.3, scale=0.1, precision=3):
+    """
+    Gaussian mutation of a genome, clipped to the bounds.
+
+    Args:
+        genome (dict): Policy parameters
+        bounds (dict): Maps each parameter to its (low, high) bounds
+        rng (random.Random): Random generator
+        rate (float, optional): Probability of mutating each parameter. Defaults to 0.3.
+        scale (float, optional): Standard deviation of a mutation, as a
+            fraction of the parameter range. Defaults to 0.1.
+        precision (int, optional): Decimals kept. Defaults to 3.
+
+    Returns:
+        dict: Mutated copy of the genome
+    """
+    child = {}
+    for name, value in genome.items():
+        low, high = bounds[name]
+        if rng.random() < rate:
+            value = min(high, max(low, rng.gauss(value, scale * (high - low))))
+        child[name] = round(value, precision)
+    return child
+
+
+def _init_worker(scenario):
+    """
+    Read the scenario once in each worker process.
+
+    Args:
+        scenario (str or dict): Path to a scenario JSON file, or its contents
+    """
+    global _worker_scenario
+    _worker_scenario = load_scenario(scenario)
+
+
+def _evaluate(task):
+    """
+    Fitness of a genome on the scenario loaded by _init_worker.
+
+    Args:
+        task (tuple): (policy path, genome, seeds, horizon, late_minute_cost)
+
+    Returns:
+        float: Mean fitness over the seeds
+    """
+    policy, genome, seeds, horizon, late_minute_cost = task
+    policy_class = resolve_policy(policy)
+    return statistics.fmean(
+        fitness(run_replication(_worker_scenario, policy_class, seed, horizon, genome), late_minute_cost)
+        for seed in seeds
+    )
+
+
+def _write_checkpoint(path, state):
+    """
+    Store the tuner state atomically.
+
+    Args:
+        path (str): Checkpoint file
+        state (dict): JSON-serializable tuner state
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w') as file:
+        json.dump(state, file)
+    os.replace(temporary, path)
+
+
+def _read_checkpoint(path):
+    """
+    Load a tuner state written by _write_checkpoint.
+
+    Args:
+        path (str): Checkpoint file
+
+    Returns:
+        dict: Tuner state, with the random generator state as a tuple
+    """
+    with open(path) as file:
+        state = json.load(file)
+    version, internal, gauss_next = state['rng_state']
+    state['rng_state'] = (version, tuple(internal), gauss_next)
+    return state
+
+
+def evolve(scenario, policy, bounds, population_size=20, generations=30, seeds=(0,), horizon=480,
+           workers=None, checkpoint=None, elite=2, tournament=3, mutation_rate=0.3, mutation_scale=0.1,
+           precision=3, late_minute_cost=1 / 60, seed=0):
+    """
+    Evolve policy parameters with a genetic algorithm.
+
+    When the checkpoint file exists, the run resumes from the generation
+    it records, and its result is the same as that of an uninterrupted run.
+
+    Args:
+        scenario (str or dict): Path to a scenario JSON file, or its contents
+        policy (type or str): Policy class, or 'module:Class' path, that
+            takes the parameters as keyword arguments
+        bounds (dict): Maps each parameter to its (low, high) bounds
+        population_size (int, optional): Genomes per generation. Defaults to 20.
+        generations (int, optional): Number of generations. Defaults to 30.
+        seeds (list, optional): Replication seeds of each evaluation. Defaults to [0].
+        horizon (int, optional): Simulation time horizon. Defaults to 480.
+        workers (int, optional): Number of processes. Defaults to the number
+            of CPUs; 1 evaluates every genome in the current process.
+        checkpoint (str, optional): JSON file the state is saved to after
+            every generation and resumed from. Defaults to no checkpoint.
+        elite (int, optional): Best genomes carried over unchanged. Defaults to 2.
+        tournament (int, optional): Genomes drawn per parent selection. Defaults to 3.
+        mutation_rate (float, optional): Probability of mutating each
+            parameter. Defaults to 0.3.
+        mutation_scale (float, optional): Standard deviation of a mutation,
+            as a fraction of the parameter range. Defaults to 0.1.
+        precision (int, optional): Decimals kept in the genomes. Defaults to 3.
+        late_minute_cost (float, optional): Fitness lost per minute of
+            lateness. Defaults to one delivery per hour.
+        seed (int, optional): Seed of the genetic operators. Defaults to 0.
+
+    Returns:
+        dict: Dictionary containing:
+            - best: Parameters of the fittest genome
+            - best_fitness: Its fitness
+            - history: Best and mean fitness of each generation
+            - evaluations: Number of distinct genomes evaluated
+    """
+    policy = policy_path(policy)
+    seeds = list(seeds)
+    if checkpoint and os.path.exists(checkpoint):
+        state = _read_checkpoint(checkpoint)
+        rng = random.Random()
+        rng.setstate(state['rng_state'])
+    else:
+        rng = random.Random(seed)
+        state = {
+            'generation': 0,
+            'population': [random_genome(bounds, rng, precision) for _ in range(population_size)],
+            'memo': {},
+            'history': [],
+        }
+    memo = state['memo']
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(scenario)
+    executor = None
+    try:
+        while state['generation'] < generations:
+            population = state['population']
+            new = {}
+            for genome in population:
+                key = genome_key(genome)
+                if key not in memo:
+                    new[key] = genome
+            if new:
+                tasks = [(policy, genome, seeds, horizon, late_minute_cost) for genome in new.values()]
+                if workers == 1:
+                    scores = [_evaluate(task) for task in tasks]
+                else:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                       initargs=(scenario,))
+                    scores = list(executor.map(_evaluate, tasks))
+                memo.update(zip(new, scores))
+
+            scores = [memo[genome_key(genome)] for genome in population]
+            state['history'].append({'best': max(scores), 'mean': statistics.fmean(scores)})
+
+            # Próxima geração: elite mais filhos de pais escolhidos por torneio
+            ranked = sorted(range(len(population)), key=lambda i: -scores[i])
+            children = [population[i] for i in ranked[:elite]]
+            while len(children) < population_size:
+                parents = [
+                    population[max(rng.sample(range(len(population)), min(tournament, len(population))),
+                                   key=lambda i: scores[i])]
+                    for _ in range(2)
+                ]
+                children.append(mutate(crossover(*parents, rng), bounds, rng, mutation_rate,
+                                       mutation_scale, precision))
+            state['population'] = children
+            state['generation'] += 1
+            state['rng_state'] = rng.getstate()
+            if checkpoint:
+                _write_checkpoint(checkpoint, state)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    best_key = max(memo, key=memo.get)
+    return {
+        'best': json.loads(best_key),
+        'best_fitness': memo[best_key],
+        'history': state['history'],
+        'evaluations': len(memo),
+    }
+
+
+def main():
+    """
+    Command-line entry point running a tuning job described by a JSON file.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('config', help='tuning configuration JSON file')
+    parser.add_argument('--workers', type=int, help='number of processes')
+    args = parser.parse_args()
+
+    with open(args.config) as file:
+        config = json.load(file)
+    result = evolve(
+        config['scenario'],
+        config['policy'],
+        {name: tuple(bound) for name, bound in config['bounds'].items()},
+        population_size=config.get('population_size', 20),
+        generations=config.get('generations', 30),
+        seeds=config.get('seeds', [0]),
+        horizon=config.get('horizon', 480),
+        workers=args.workers,
+        checkpoint=config.get('checkpoint'),
+        seed=config.get('seed', 0),
+    )
+
+    for generation, scores in enumerate(result['history']):
+        print(f"geração {generation}: melhor {scores['best']:.3f}, média {scores['mean']:.3f}")
+    print(f"{result['evaluations']} genomas avaliados; melhor: {result['best']} ({result['best_fitness']:.3f})")
+
+
+if __name__ == '__main__':
+    main()
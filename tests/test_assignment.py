@@ -0,0 +1,77 @@
+"""
+Unit tests for the auction assignment algorithm.
+"""
+
+import itertools
+
+import numpy as np
+from models.assignment import auction_assignment
+
+
+def brute_force(cost):
+    """Minimum total cost over every assignment of the smaller side."""
+    n_rows, n_cols = cost.shape
+    if n_rows <= n_cols:
+        return min(
+            sum(cost[row, column] for row, column in enumerate(columns))
+            for columns in itertools.permutations(range(n_cols), n_rows)
+        )
+    return brute_force(cost.T)
+
+
+def total_cost(cost, assignment):
+    """Total cost of the assigned pairs."""
+    return sum(cost[row, column] for row, column in enumerate(assignment) if column >= 0)
+
+
+class TestAuctionAssignment:
+    """Test cases for auction_assignment."""
+
+    def test_matches_brute_force(self):
+        """Test optimality on random integer problems, square and rectangular."""
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            n_rows, n_cols = rng.integers(1, 7, 2)
+            cost = rng.integers(-10, 60, (n_rows, n_cols)).astype(float)
+
+            assignment, prices = auction_assignment(cost)
+
+            assigned = assignment[assignment >= 0]
+            assert len(assigned) == min(n_rows, n_cols)
+            assert len(set(assigned.tolist())) == len(assigned)
+            assert total_cost(cost, assignment) == brute_force(cost)
+            assert prices.shape == (n_cols,)
+
+    def test_warm_start(self):
+        """Test that a warm start from previous prices is still optimal."""
+        rng = np.random.default_rng(1)
+        for _ in range(100):
+            cost = rng.integers(0, 100, (5, 5)).astype(float)
+            _, prices = auction_assignment(cost)
+            cost[rng.integers(0, 5), rng.integers(0, 5)] += rng.integers(-30, 30)
+
+            assignment, _ = auction_assignment(cost, prices)
+
+            assert total_cost(cost, assignment) == brute_force(cost)
+
+    def test_forbidden_pairs(self):
+        """Test that infinite costs are avoided or reported as unassigned."""
+        cost = np.array([
+            [np.inf, 1.0],
+            [np.inf, 2.0],
+            [5.0, np.inf],
+        ])
+
+        assignment, _ = auction_assignment(cost)
+
+        assert assignment.tolist() == [1, -1, 0]
+
+        assignment, _ = auction_assignment(np.full((2, 2), np.inf))
+        assert assignment.tolist() == [-1, -1]
+
+    def test_empty(self):
+        """Test problems without rows or columns."""
+        assignment, prices = auction_assignment(np.zeros((3, 0)))
+
+        assert assignment.tolist() == [-1, -1, -1]
+        assert prices.shape == (0,)
@@ -0,0 +1,50 @@
+"""
+Unit tests for the AuctionAssignmentPolicy class.
+"""
+
+from models.arc import Arc
+from models.assignment_policy import AuctionAssignmentPolicy
+from models.greedy_policy import GreedyDispatchPolicy
+from models.location import Location
+from models.network import Network
+from models.order import Order
+from models.vehicle import Vehicle
+from simulator.simulator import Simulator
+
+
+class TestAuctionAssignmentPolicy:
+    """Test cases for the AuctionAssignmentPolicy class."""
+
+    def test_optimal_matching_beats_greedy_on_travel(self):
+        """Test that the matching minimizes the total travel, where greedy rounds do not."""
+        arcs = [Arc("A", "B", 10), Arc("B", "A", 10), Arc("B", "C", 5), Arc("C", "B", 5),
+                Arc("C", "D", 10), Arc("D", "C", 10)]
+        travel = {}
+        for policy_class in (GreedyDispatchPolicy, AuctionAssignmentPolicy):
+            locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+            locations["A"].load_queue.append(Order("O1", "A", "D", 0, 500, 1))
+            locations["C"].load_queue.append(Order("O2", "C", "D", 0, 500, 1))
+            fleet = [Vehicle("V1", 5, "B"), Vehicle("V2", 5, "D")]
+            network = Network(arcs, locations.keys())
+            policy = policy_class(locations, fleet, network)
+
+            decisions = policy.choose_actions_batch(fleet, 0)
+
+            travel[policy_class] = sum(network.travel_time(vehicle.current_location, next_location)
+                                       for vehicle, (_, _, next_location) in zip(fleet, decisions))
+
+        # Greedy sends V1 to the nearer C and leaves V2 25 away from A; V1 -> A and V2 -> C costs 20
+        assert travel == {GreedyDispatchPolicy: 30, AuctionAssignmentPolicy: 20}
+        assert len(policy._prices) == 2
+
+    def test_simulation(self):
+        """Test a full simulation with the assignment policy."""
+        locations = {location_id: Location(location_id, 1, 1, 1, 1) for location_id in "ABC"}
+        arcs = [Arc("A", "B", 10), Arc("B", "A", 10), Arc("B", "C", 10), Arc("C", "B", 10)]
+        orders = [Order(f"O{i}", "A" if i % 2 else "C", "B", 10 * i, 10 * i + 60, 1) for i in range(10)]
+        fleet = [Vehicle("V1", 2, "B"), Vehicle("V2", 2, "B")]
+
+        simulator = Simulator(locations, arcs, orders, fleet)
+        results = simulator.run(AuctionAssignmentPolicy(locations, fleet))
+
+        assert results['served_on_time'] == 10
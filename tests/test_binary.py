@@ -0,0 +1,97 @@
+"""
+Unit tests for the binary scenario format.
+"""
+
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+from main import load_simulation_data
+from models.policy import Policy
+from scenario.binary import convert_scenario, open_scenario
+from simulator.simulator import Simulator
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+class TestBinaryScenario:
+    """Test cases for converting and opening binary scenarios."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a converted scenario holds the same data."""
+        output = str(tmp_path / "scenario.bin")
+        assert convert_scenario(SCENARIO, output) == 6
+
+        scenario = open_scenario(output)
+        locations, arcs, orders, fleet = load_simulation_data(SCENARIO)
+        orders.sort(key=lambda order: order.release_time)
+
+        assert isinstance(scenario.orders, np.memmap)
+        assert len(scenario) == 6
+        assert scenario.locations.keys() == locations.keys()
+        assert [str(arc) for arc in scenario.arcs] == [str(arc) for arc in arcs]
+        assert [str(vehicle) for vehicle in scenario.fleet] == [str(vehicle) for vehicle in fleet]
+        assert [vars(order) for order in scenario.iter_orders()] == [vars(order) for order in orders]
+
+    def test_order_store(self, tmp_path):
+        """Test building a columnar store from the mapped records."""
+        output = str(tmp_path / "scenario.bin")
+        convert_scenario(SCENARIO, output)
+        scenario = open_scenario(output)
+
+        store = scenario.order_store()
+
+        assert store.order_ids == [order.order_id for order in scenario.iter_orders()]
+        assert store.release_time.tolist() == sorted(store.release_time.tolist())
+        assert store.views()[0].origin in scenario.locations
+        with pytest.raises(ValueError):
+            store.due_time[0] = 1
+
+    def test_separate_order_feed(self, tmp_path):
+        """Test converting a scenario whose orders come from JSON Lines."""
+        feed = tmp_path / "orders.jsonl"
+        feed.write_text(
+            json.dumps({"order_id": "X1", "origin": "A", "destination": "Z", "release_time": 9, "due_time": 50, "units": 2})
+            + "\n"
+            + json.dumps({"order_id": "X2", "origin": "B", "destination": "A", "release_time": 3, "due_time": 40, "units": 1})
+        )
+        output = str(tmp_path / "scenario.bin")
+
+        convert_scenario(SCENARIO, output, str(feed))
+        orders = list(open_scenario(output).iter_orders())
+
+        assert [order.order_id for order in orders] == ["X2", "X1"]
+        assert orders[1].destination == "Z"
+
+    def test_unsupported_version(self, tmp_path):
+        """Test that other format versions are rejected."""
+        output = str(tmp_path / "scenario.bin")
+        convert_scenario(SCENARIO, output)
+        header_path = os.path.join(output, "scenario.json")
+        with open(header_path) as file:
+            header = json.load(file)
+        header["format_version"] = 99
+        with open(header_path, "w") as file:
+            json.dump(header, file)
+
+        with pytest.raises(ValueError):
+            open_scenario(output)
+
+    def test_simulation_from_binary(self, tmp_path):
+        """Test that streamed and stored binary orders give the same results."""
+        output = str(tmp_path / "scenario.bin")
+        convert_scenario(SCENARIO, output)
+
+        scenario = open_scenario(output)
+        locations, arcs, orders, fleet = scenario.load()
+        random.seed(8)
+        expected = Simulator(locations, arcs, orders, fleet).run(Policy(locations, fleet))
+
+        scenario = open_scenario(output)
+        simulator = Simulator(scenario.locations, scenario.arcs, scenario.order_store(), scenario.fleet)
+        random.seed(8)
+        results = simulator.run(Policy(scenario.locations, scenario.fleet))
+
+        assert results == expected
@@ -0,0 +1,117 @@
+"""
+Unit tests for the checkpoint module.
+"""
+
+import os
+import random
+
+import pytest
+from models.arc import Arc
+from models.assignment_policy import AuctionAssignmentPolicy
+from models.greedy_policy import GreedyDispatchPolicy
+from models.location import Location
+from models.order import Order
+from models.policy import Policy
+from models.routing_policy import RoutingPolicy
+from models.vehicle import Vehicle
+from simulator.checkpoint import Checkpointer
+from simulator.simulator import Simulator
+
+POLICIES = {
+    "random": lambda locations, fleet: Policy(locations, fleet),
+    "greedy": lambda locations, fleet: GreedyDispatchPolicy(locations, fleet),
+    "auction": lambda locations, fleet: AuctionAssignmentPolicy(locations, fleet),
+    "routing": lambda locations, fleet: RoutingPolicy(locations, fleet, time_budget=None, max_passes=2),
+}
+
+
+def make_simulation(policy_name, n_orders=60, docks=None):
+    """Ring of five locations with orders released over the horizon, and a fresh policy."""
+    names = "ABCDE"
+    locations = {name: Location(name, 1, 1, 1, 1, docks) for name in names}
+    arcs = []
+    for i, name in enumerate(names):
+        following = names[(i + 1) % len(names)]
+        arcs += [Arc(name, following, 15 + 5 * i), Arc(following, name, 15 + 5 * i)]
+    rng = random.Random(7)
+    orders = []
+    for i in range(n_orders):
+        origin, destination = rng.sample(names, 2)
+        release_time = rng.randrange(0, 400)
+        orders.append(Order(f"O{i}", origin, destination, release_time, release_time + rng.randrange(40, 200),
+                            rng.randrange(1, 4)))
+    fleet = [Vehicle(f"V{i}", 3, names[i]) for i in range(4)]
+    simulator = Simulator(locations, arcs, orders, fleet, horizon=600)
+    return simulator, POLICIES[policy_name](locations, fleet)
+
+
+def state(simulator):
+    """Observable state of a finished simulation."""
+    return (
+        [(order.status, order.delivery_time) for order in simulator.orders],
+        [(vehicle.current_location, vehicle.available_at, [order.order_id for order in vehicle.load])
+         for vehicle in simulator.fleet],
+        dict(vars(simulator.kpis)),
+    )
+
+
+class TestCheckpointer:
+    """Test cases for the Checkpointer class."""
+
+    @pytest.mark.parametrize("policy_name,docks", [(name, None) for name in sorted(POLICIES)] + [("greedy", 1)])
+    def test_resume_matches_uninterrupted_run(self, tmp_path, policy_name, docks):
+        """Test that a run interrupted and resumed in a fresh process gives the same results."""
+        random.seed(3)
+        simulator, policy = make_simulation(policy_name, docks=docks)
+        expected = simulator.run(policy)
+        expected_state = state(simulator)
+
+        random.seed(3)
+        simulator, policy = make_simulation(policy_name, docks=docks)
+        Checkpointer(str(tmp_path), every=45, full_every=3).run(simulator, policy, until=250)
+
+        # Objetos novos, como em um novo processo; a semente não importa mais
+        random.seed(99)
+        simulator, policy = make_simulation(policy_name, docks=docks)
+        checkpointer = Checkpointer(str(tmp_path), every=45, full_every=3)
+        results = checkpointer.run(simulator, policy)
+
+        assert checkpointer.written[0][0].endswith("checkpoint-000005.delta")
+        assert results == expected
+        assert state(simulator) == expected_state
+
+    def test_checkpoints_do_not_change_results(self, tmp_path):
+        """Test that writing checkpoints leaves the run unchanged."""
+        random.seed(5)
+        simulator, policy = make_simulation("greedy")
+        expected = simulator.run(policy)
+
+        random.seed(5)
+        simulator, policy = make_simulation("greedy")
+        results = Checkpointer(str(tmp_path), every=30).run(simulator, policy)
+
+        assert results == expected
+
+    def test_deltas_are_smaller_than_full_checkpoints(self, tmp_path):
+        """Test that deltas only hold what changed and old chains are pruned."""
+        simulator, policy = make_simulation("greedy", n_orders=5000)
+        checkpointer = Checkpointer(str(tmp_path), every=20, full_every=4)
+        checkpointer.run(simulator, policy)
+
+        sizes = {"full": [], "delta": []}
+        for path, size in checkpointer.written:
+            sizes[path.rsplit(".", 1)[1]].append(size)
+        # Os deltas carregam o estado do motor e dos geradores, mas não os pedidos parados
+        assert max(sizes["delta"]) < max(sizes["full"]) / 3
+        remaining = sorted(os.listdir(tmp_path))
+        assert remaining[0].endswith(".full")
+        assert len(remaining) <= 4
+
+    def test_resume_rejects_other_simulation(self, tmp_path):
+        """Test that checkpoints of a different instance are not loaded."""
+        simulator, policy = make_simulation("greedy")
+        Checkpointer(str(tmp_path), every=60).run(simulator, policy, until=200)
+
+        simulator, policy = make_simulation("greedy", n_orders=30)
+        with pytest.raises(ValueError):
+            Checkpointer(str(tmp_path), every=60).run(simulator, policy)
@@ -0,0 +1,137 @@
+"""
+Unit tests for the columnar order and fleet stores.
+"""
+
+import random
+
+import pytest
+from models.arc import Arc
+from models.columnar import FleetStore, OrderStore, OrderView, VehicleView
+from models.location import Location
+from models.order import Order, DELIVERED, PENDING
+from models.policy import Policy
+from models.vehicle import Vehicle
+from simulator.simulator import Simulator
+
+
+def build_scenario():
+    """Small scenario shared by the simulator comparisons."""
+    locations = {
+        "A": Location("A", 1, 1, 1, 1),
+        "B": Location("B", 1, 1, 1, 1),
+        "C": Location("C", 1, 1, 1, 1)
+    }
+    arcs = [Arc("A", "B", 20), Arc("B", "C", 15), Arc("C", "A", 25)]
+    orders = [
+        Order(f"O{i}", "ABC"[i % 3], "ABC"[(i + 1) % 3], 5 * i, 5 * i + 60, 1 + i % 4)
+        for i in range(30)
+    ]
+    fleet = [Vehicle("V1", 3, "A"), Vehicle("V2", 2, "B")]
+    return locations, arcs, orders, fleet
+
+
+class TestOrderStore:
+    """Test cases for the OrderStore class."""
+
+    def test_from_orders(self):
+        """Test that orders are copied to the columns."""
+        orders = [Order("O1", "A", "B", 0, 100, 2), Order("O2", "B", "C", 10, 50, 5)]
+        store = OrderStore.from_orders(orders, ["A", "B"])
+
+        assert len(store) == 2
+        assert store.order_ids == ["O1", "O2"]
+        assert store.release_time.tolist() == [0, 10]
+        assert store.due_time.tolist() == [100, 50]
+        assert store.units.tolist() == [2, 5]
+        assert store.status.tolist() == [PENDING, PENDING]
+        assert store.location_ids == ["A", "B", "C"]
+
+    def test_views_read_and_write_columns(self):
+        """Test that views behave like orders backed by the arrays."""
+        store = OrderStore.from_orders([Order("O1", "A", "B", 0, 100, 2)])
+        view = store.views()[0]
+
+        assert isinstance(view, OrderView)
+        assert not hasattr(view, '__dict__')
+        assert view.origin == "A"
+        assert view.destination == "B"
+        assert str(view) == "Order O1: A -> B, 2 units"
+
+        view.delivery_time = 80
+        view.status = DELIVERED
+
+        assert store.delivery_time[0] == 80
+        assert store.status[0] == DELIVERED
+        assert store.views()[0] is view
+
+    def test_views_are_created_on_access(self):
+        """Test that only the rows accessed get a view, always the same one."""
+        orders = [Order(f"O{i}", "A", "B", i, 100, 1) for i in range(5)]
+        store = OrderStore.from_orders(orders)
+        views = store.views()
+
+        assert len(views) == 5
+        assert views._views == [None] * 5
+        assert views[-1] is store.view(4)
+        assert views[1:3] == [views[1], views[2]]
+        assert sum(view is not None for view in views._views) == 3
+        assert [view.order_id for view in views] == [f"O{i}" for i in range(5)]
+
+
+class TestFleetStore:
+    """Test cases for the FleetStore class."""
+
+    def test_vehicle_views(self):
+        """Test that vehicle views keep location and load in the arrays."""
+        store = FleetStore.from_vehicles([Vehicle("V1", 2, "A")], ["A", "B"])
+        vehicle = store.views()[0]
+
+        assert isinstance(vehicle, VehicleView)
+        assert not hasattr(vehicle, '__dict__')
+        assert str(vehicle) == "Vehicle V1 at A"
+
+        vehicle.current_location = "B"
+        vehicle.available_at = 45
+        assert vehicle.load_order(Order("O1", "A", "B", 0, 100, 3)) == True
+
+        assert store.location_ids[store.location[0]] == "B"
+        assert store.available_at[0] == 45
+        assert store.load[0] == 1
+        assert store.load_units[0] == 3
+
+        vehicle.unload(Location("B", 1, 1, 1, 1))
+
+        assert store.load[0] == 0
+        assert store.load_units[0] == 0
+
+
+class TestColumnarSimulation:
+    """Test cases for the simulator running on columnar state."""
+
+    def test_same_results_as_objects(self):
+        """Test that columnar and object state give the same KPIs."""
+        locations, arcs, orders, fleet = build_scenario()
+        simulator = Simulator(locations, arcs, orders, fleet, horizon=300)
+        random.seed(11)
+        expected = simulator.run(Policy(locations, fleet))
+
+        locations, arcs, orders, fleet = build_scenario()
+        simulator = Simulator(locations, arcs, orders, fleet, horizon=300, columnar=True)
+        random.seed(11)
+        results = simulator.run(Policy(locations, simulator.fleet))
+
+        assert results == expected
+        assert simulator.order_store.delivery_time.tolist() == [
+            order.delivery_time for order in simulator.orders
+        ]
+
+    def test_unreleased_orders_get_no_view(self):
+        """Test that a run only creates views of the orders it reached."""
+        locations, arcs, orders, fleet = build_scenario()
+        simulator = Simulator(locations, arcs, orders, fleet, horizon=50, columnar=True)
+        random.seed(11)
+        simulator.run(Policy(locations, simulator.fleet))
+
+        # Pedidos liberados antes do horizonte, mais o próximo agendado
+        created = [view is not None for view in simulator.orders._views]
+        assert created == [i <= 10 for i in range(30)]
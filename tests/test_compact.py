@@ -0,0 +1,62 @@
+"""
+Unit tests for the compact (__slots__) model classes.
+"""
+
+import os
+
+import pytest
+from main import load_simulation_data
+from models.arc import Arc
+from models.compact import CompactArc, CompactLocation, CompactOrder, CompactVehicle
+from models.order import Order
+from models.vehicle import Vehicle
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+class TestCompactModels:
+    """Test cases for the compact model classes."""
+
+    def test_no_instance_dict(self):
+        """Test that compact instances do not carry a __dict__."""
+        instances = [
+            CompactArc("A", "B", 30),
+            CompactLocation("A", 1, 1, 1, 1),
+            CompactOrder("O1", "A", "B", 0, 100, 1),
+            CompactVehicle("V1", 5, "A")
+        ]
+
+        for instance in instances:
+            assert not hasattr(instance, '__dict__')
+            with pytest.raises(AttributeError):
+                instance.extra = 1
+
+    def test_same_string_representation(self):
+        """Test that compact and regular classes print the same way."""
+        assert str(CompactArc("C", "D", 45)) == str(Arc("C", "D", 45))
+        assert str(CompactOrder("O2", "C", "D", 10, 200, 3)) == str(Order("O2", "C", "D", 10, 200, 3))
+        assert str(CompactVehicle("V2", 10, "B")) == str(Vehicle("V2", 10, "B"))
+
+    def test_same_behavior(self):
+        """Test that compact classes keep the methods of the regular ones."""
+        location = CompactLocation("B", 5, 2, 3, 1)
+        vehicle = CompactVehicle("V1", 2, "A")
+        order = CompactOrder("O1", "A", "B", 0, 100, 4)
+
+        assert location.load_time(3) == 11
+        assert location.unload_time(2) == 5
+        assert vehicle.load_order(order) == True
+        assert vehicle.load.units == 4
+        assert vehicle.unload(location) == [order]
+        assert len(vehicle.load) == 0
+
+    def test_load_simulation_data_compact(self):
+        """Test loading the sample scenario with compact classes."""
+        locations, arcs, orders, fleet = load_simulation_data(SCENARIO, compact=True)
+        regular = load_simulation_data(SCENARIO)
+
+        assert all(isinstance(order, CompactOrder) for order in orders)
+        assert all(isinstance(vehicle, CompactVehicle) for vehicle in fleet)
+        assert [str(order) for order in orders] == [str(order) for order in regular[2]]
+        assert [str(arc) for arc in arcs] == [str(arc) for arc in regular[1]]
+        assert locations.keys() == regular[0].keys()
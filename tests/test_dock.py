@@ -0,0 +1,61 @@
+"""
+Unit tests for the DockPool class.
+"""
+
+import pytest
+from models.dock import DockPool
+from simulator.journal import Journal
+
+
+class TestDockPool:
+    """Test cases for the DockPool class."""
+
+    def test_requires_a_dock(self):
+        """Test that a pool without docks is refused."""
+        with pytest.raises(ValueError):
+            DockPool(0)
+
+    def test_requests_take_the_earliest_free_dock(self):
+        """Test that services wait only when every dock is busy."""
+        docks = DockPool(2)
+
+        assert docks.request(0, 10) == (0, 10)
+        assert docks.request(2, 5) == (2, 7)
+        assert docks.request(3, 4) == (7, 11)
+        assert docks.request(20, 1) == (20, 21)
+        assert docks.next_free() == 11
+        assert docks.busy(15) == 1
+
+    def test_many_docks(self):
+        """Test a large hub: the n-th vehicle of a burst waits for n // docks services."""
+        docks = DockPool(300)
+
+        starts = [docks.request(0, 7)[0] for _ in range(3000)]
+
+        assert starts == [7 * (i // 300) for i in range(3000)]
+
+    def test_rollback(self):
+        """Test that requests are undone by the journal."""
+        docks = DockPool(3)
+        docks.request(0, 10)
+        docks.journal = journal = Journal()
+        expected = sorted(docks.state())
+
+        mark = journal.mark()
+        for now in range(5):
+            docks.request(now, 6)
+        journal.rollback(mark)
+
+        assert sorted(docks.state()) == expected
+        assert docks.request(0, 1) == (0, 1)
+
+    def test_state_round_trip(self):
+        """Test that set_state restores the free times."""
+        docks = DockPool(2)
+        docks.request(0, 10)
+        copy = DockPool(1)
+
+        copy.set_state(docks.state())
+
+        assert len(copy) == 2
+        assert copy.request(0, 3) == docks.request(0, 3)
@@ -0,0 +1,141 @@
+"""
+Unit tests for the GreedyDispatchPolicy class.
+"""
+
+import numpy as np
+import pytest
+from models.arc import Arc
+from models.greedy_policy import GreedyDispatchPolicy
+from models.location import Location
+from models.network import Network
+from models.order import Order
+from models.vehicle import Vehicle
+from simulator.simulator import Simulator
+
+
+def make_locations(*location_ids):
+    """Locations with unit handling times."""
+    return {location_id: Location(location_id, 1, 1, 1, 1) for location_id in location_ids}
+
+
+def make_network(locations):
+    """Line network A - B - C with 10 minutes between neighbors."""
+    arcs = [Arc("A", "B", 10), Arc("B", "A", 10), Arc("B", "C", 10), Arc("C", "B", 10)]
+    return Network(arcs, locations.keys())
+
+
+class TestGreedyDispatchPolicy:
+    """Test cases for the GreedyDispatchPolicy class."""
+
+    def test_requires_network(self):
+        """Test that the policy refuses to decide without a network."""
+        locations = make_locations("A")
+        fleet = [Vehicle("V1", 5, "A")]
+
+        with pytest.raises(ValueError):
+            GreedyDispatchPolicy(locations, fleet).choose_actions(fleet[0], 0)
+
+    def test_loads_locally_and_heads_to_most_urgent_destination(self):
+        """Test that a loaded vehicle drives to its most urgent destination."""
+        locations = make_locations("A", "B", "C")
+        locations["A"].load_queue.append(Order("O1", "A", "C", 0, 200, 1))
+        locations["A"].load_queue.append(Order("O2", "A", "B", 0, 50, 1))
+        fleet = [Vehicle("V1", 5, "A")]
+        policy = GreedyDispatchPolicy(locations, fleet, make_network(locations))
+
+        unloads, loads, next_location = policy.choose_actions(fleet[0], 0)
+
+        assert unloads == []
+        assert [order.order_id for order in loads] == ["O2", "O1"]
+        assert next_location == "B"
+
+    def test_vehicles_in_a_batch_do_not_share_orders(self):
+        """Test that two vehicles at the same location load different orders."""
+        locations = make_locations("A", "B", "C")
+        locations["A"].load_queue.append(Order("O1", "A", "C", 0, 200, 1))
+        locations["A"].load_queue.append(Order("O2", "A", "B", 0, 50, 1))
+        fleet = [Vehicle("V1", 1, "A"), Vehicle("V2", 1, "A")]
+        policy = GreedyDispatchPolicy(locations, fleet, make_network(locations))
+
+        decisions = policy.choose_actions_batch(fleet, 0)
+
+        assert [order.order_id for order in decisions[0][1]] == ["O2"]
+        assert [order.order_id for order in decisions[1][1]] == ["O1"]
+
+    def test_empty_vehicles_are_matched_to_distinct_orders(self):
+        """Test that the cheapest vehicle wins each contested order."""
+        locations = make_locations("A", "B", "C")
+        locations["A"].load_queue.append(Order("O1", "A", "B", 0, 100, 1))
+        locations["C"].load_queue.append(Order("O2", "C", "B", 0, 100, 1))
+        fleet = [Vehicle("V1", 5, "B"), Vehicle("V2", 5, "B")]
+        policy = GreedyDispatchPolicy(locations, fleet, make_network(locations))
+
+        decisions = policy.choose_actions_batch(fleet, 0)
+
+        assert sorted(next_location for _, _, next_location in decisions) == ["A", "C"]
+
+    def test_reserved_orders_are_not_targeted_twice(self):
+        """Test that an order a vehicle is driving to is left to that vehicle."""
+        locations = make_locations("A", "B", "C")
+        locations["A"].load_queue.append(Order("O1", "A", "B", 0, 100, 1))
+        fleet = [Vehicle("V1", 5, "B"), Vehicle("V2", 5, "C")]
+        policy = GreedyDispatchPolicy(locations, fleet, make_network(locations))
+
+        assert policy.choose_actions(fleet[0], 0)[2] == "A"
+        assert policy.choose_actions(fleet[1], 0)[2] == "C"
+        # Once V1 is free again its reservation is released
+        assert policy.choose_actions(fleet[0], 10)[2] == "A"
+
+    def test_cost_matrix(self):
+        """Test travel, handling times and lateness in the cost matrix."""
+        locations = make_locations("A", "B", "C")
+        orders = [Order("O1", "A", "C", 0, 100, 2), Order("O2", "B", "C", 0, 100, 2), Order("O3", "A", "C", 0, 30, 2)]
+        fleet = [Vehicle("V1", 5, "A"), Vehicle("V2", 5, "C")]
+        policy = GreedyDispatchPolicy(locations, fleet, make_network(locations), lateness_weight=10)
+
+        cost = policy.cost_matrix(fleet, orders, 0)
+
+        # V2 at C: travel 20 to A and load 3, delivered at 46, in time for O1
+        assert cost[1, 0] == pytest.approx(20 + 3)
+        # O3 is due at 30, so V2 would deliver it 16 minutes late
+        assert cost[1, 2] == pytest.approx(20 + 3 + 10 * 16)
+        # V1 is already at the origin of O1
+        assert np.isinf(cost[0, 0])
+        assert cost.dtype == np.float32
+
+    def test_cost_matrix_with_restricted_network(self):
+        """Test that the rows of the vehicles and order origins are enough for the cost matrix."""
+        locations = make_locations("A", "B", "C")
+        orders = [Order("O1", "A", "C", 0, 30, 2), Order("O2", "B", "C", 0, 100, 2)]
+        fleet = [Vehicle("V1", 5, "B"), Vehicle("V2", 5, "A")]
+        network = make_network(locations)
+        restricted = network.restrict(["B", "A"])
+
+        expected = GreedyDispatchPolicy(locations, fleet, network).cost_matrix(fleet, orders, 0)
+        cost = GreedyDispatchPolicy(locations, fleet, restricted).cost_matrix(fleet, orders, 0)
+
+        np.testing.assert_array_equal(cost, expected)
+
+    def test_nearer_vehicle_wins(self):
+        """Test that the nearer of two otherwise equal vehicles gets the order."""
+        locations = make_locations("A", "B", "C")
+        locations["A"].load_queue.append(Order("O1", "A", "B", 0, 100, 1))
+        fleet = [Vehicle("V1", 5, "C"), Vehicle("V2", 5, "B")]
+        policy = GreedyDispatchPolicy(locations, fleet, make_network(locations))
+
+        decisions = policy.choose_actions_batch(fleet, 0)
+
+        assert [next_location for _, _, next_location in decisions] == ["C", "A"]
+
+    def test_simulation(self):
+        """Test a full simulation with the greedy policy."""
+        locations = make_locations("A", "B", "C")
+        arcs = [Arc("A", "B", 10), Arc("B", "A", 10), Arc("B", "C", 10), Arc("C", "B", 10)]
+        orders = [Order(f"O{i}", "A" if i % 2 else "C", "B", 10 * i, 10 * i + 60, 1) for i in range(10)]
+        fleet = [Vehicle("V1", 2, "B"), Vehicle("V2", 2, "B")]
+
+        simulator = Simulator(locations, arcs, orders, fleet)
+        results = simulator.run(GreedyDispatchPolicy(locations, fleet))
+
+        assert results['served_on_time'] == 10
+        assert results['served_late'] == 0
@@ -0,0 +1,135 @@
+"""
+Unit tests for the instrumentation of the simulator.
+"""
+
+import json
+import math
+import os
+import random
+import urllib.request
+
+import pytest
+from main import load_simulation_data
+from models.policy import Policy
+from simulator.instrumentation import Histogram, Metrics, serve_metrics
+from simulator.simulator import Simulator
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+def run_scenario(metrics=None):
+    """Run the sample scenario with a fixed seed."""
+    random.seed(0)
+    locations, arcs, orders, fleet = load_simulation_data(SCENARIO)
+    simulator = Simulator(locations, arcs, orders, fleet, metrics=metrics)
+    return simulator, simulator.run(Policy(locations, fleet))
+
+
+class TestMetrics:
+    """Test cases for the Metrics registry."""
+
+    def test_histogram(self):
+        """Test bucket counts and quantiles."""
+        histogram = Histogram((1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3, 10):
+            histogram.observe(value)
+
+        assert histogram.counts == [1, 2, 1, 1]
+        assert histogram.quantile(0.5) == 2
+        assert histogram.quantile(1.0) == math.inf
+        assert math.isnan(Histogram().quantile(0.5))
+
+    def test_prometheus_format(self):
+        """Test the text exposition of each metric type."""
+        metrics = Metrics()
+        metrics.inc('simulator_events_total', labels=(('kind', 'order_release'),))
+        metrics.inc('simulator_events_total', 2, labels=(('kind', 'order_release'),))
+        metrics.set('custom_gauge', 1.5, (('location', 'A"1'),))
+        metrics.observe('simulator_policy_seconds', 0.003)
+
+        text = metrics.to_prometheus()
+
+        assert '# TYPE simulator_events_total counter\n' in text
+        assert 'simulator_events_total{kind="order_release"} 3\n' in text
+        assert 'custom_gauge{location="A\\"1"} 1.5\n' in text
+        assert 'simulator_policy_seconds_bucket{le="0.0025"} 0\n' in text
+        assert 'simulator_policy_seconds_bucket{le="0.005"} 1\n' in text
+        assert 'simulator_policy_seconds_bucket{le="+Inf"} 1\n' in text
+        assert 'simulator_policy_seconds_count 1\n' in text
+
+
+class TestInstrumentedSimulator:
+    """Test cases for a simulator run with metrics."""
+
+    def test_results_unchanged(self):
+        """Test that instrumentation does not change the simulation."""
+        assert run_scenario(Metrics())[1] == run_scenario()[1]
+
+    def test_counters(self, tmp_path):
+        """Test the recorded counters and the JSON summary written at the end of the run."""
+        metrics = Metrics(summary_path=str(tmp_path / "summary.json"))
+        simulator, results = run_scenario(metrics)
+
+        delivered = results['served_on_time'] + results['served_late']
+        assert metrics.counters[('simulator_orders_unloaded_total', ())] == delivered
+        assert metrics.counters[('simulator_events_total', (('kind', 'order_release'),))] == len(simulator.orders)
+        assert metrics.histograms[('simulator_policy_seconds', ())].count == \
+            metrics.counters[('simulator_decision_epochs_total', ())]
+        assert metrics.gauges[('simulator_minutes_per_second', ())] > 0
+        for location_id, location in simulator.locations.items():
+            assert metrics.gauges[('simulator_queue_length', (('location', location_id),))] == len(location.load_queue)
+
+        with open(tmp_path / "summary.json") as file:
+            summary = json.load(file)
+        assert summary['simulator_orders_unloaded_total'] == delivered
+        assert summary['simulator_policy_seconds']['count'] > 0
+
+    def test_short_batch_rejected(self):
+        """Test that a short batch raises and only the decisions applied are counted."""
+        locations, arcs, orders, fleet = load_simulation_data(SCENARIO)
+
+        class ShortBatchPolicy(Policy):
+            def choose_actions_batch(self, vehicles, now, pending=None):
+                return list(super().choose_actions_batch(vehicles, now, pending))[:-1]
+
+        metrics = Metrics()
+        simulator = Simulator(locations, arcs, orders, fleet, metrics=metrics)
+        with pytest.raises(ValueError):
+            simulator.run(ShortBatchPolicy(locations, fleet))
+
+        # No instante 0 todos os veículos estão livres, e só o último fica sem decisão
+        assert metrics.counters[('simulator_decisions_total', ())] == len(fleet) - 1
+        assert metrics.counters[('simulator_decision_epochs_total', ())] == 1
+
+    def test_lookahead_not_recorded(self):
+        """Test that events simulated inside a lookahead are left out."""
+        random.seed(0)
+        locations, arcs, orders, fleet = load_simulation_data(SCENARIO)
+        metrics = Metrics()
+        simulator = Simulator(locations, arcs, orders, fleet, metrics=metrics)
+        simulator.start(Policy(locations, fleet))
+        simulator.advance(100)
+        counters = dict(metrics.counters)
+
+        with simulator.lookahead():
+            simulator.advance(300)
+
+        assert metrics.counters == counters
+
+    def test_http_endpoint(self):
+        """Test that the registry is served over HTTP."""
+        metrics = Metrics()
+        run_scenario(metrics)
+        server = serve_metrics(metrics, port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                text = response.read().decode()
+            with urllib.request.urlopen(f"{url}/summary") as response:
+                summary = json.load(response)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert text == metrics.to_prometheus()
+        assert summary == json.loads(json.dumps(metrics.summary(), sort_keys=True))
@@ -0,0 +1,113 @@
+"""
+Unit tests for the Journal class and the undo hooks of the state containers.
+"""
+
+import pytest
+
+from models.cargo import Cargo
+from models.order import Order
+from models.order_queue import OrderQueue
+from simulator.journal import Journal
+
+
+class TestJournal:
+    """Test cases for the Journal class."""
+
+    def test_nothing_recorded_without_mark(self):
+        """Test that mutations are not logged while no mark is open."""
+        journal = Journal()
+        order = Order("O1", "A", "B", 0, 100, 1)
+
+        journal.set(order, 'status', 'RELEASED')
+
+        assert order.status == 'RELEASED'
+        assert len(journal) == 0
+        assert not journal.recording
+
+    def test_rollback_attributes(self):
+        """Test that attributes are set back in reverse order."""
+        journal = Journal()
+        order = Order("O1", "A", "B", 0, 100, 1)
+        status = order.status
+
+        mark = journal.mark()
+        journal.set(order, 'status', 'LOADED')
+        journal.set(order, 'status', 'DELIVERED')
+        journal.rollback(mark)
+
+        assert order.status == status
+        assert len(journal) == 0
+        journal.release(mark)
+        with pytest.raises(ValueError):
+            journal.release(mark)
+
+    def test_nested_marks(self):
+        """Test that an inner rollback keeps the changes made before its mark."""
+        journal = Journal()
+        order = Order("O1", "A", "B", 0, 100, 1)
+
+        delivery_time = order.delivery_time
+        outer = journal.mark()
+        journal.set(order, 'delivery_time', 10)
+        inner = journal.mark()
+        journal.set(order, 'delivery_time', 20)
+        journal.rollback(inner)
+        journal.release(inner)
+
+        assert order.delivery_time == 10
+        assert journal.recording
+        journal.rollback(outer)
+        journal.release(outer)
+        assert order.delivery_time == delivery_time
+
+    def test_order_queue_rollback(self):
+        """Test that appends, removals and pops are undone in urgency order."""
+        orders = [Order(f"O{i}", "A", "BC"[i % 2], 0, 100 - i, 1) for i in range(5)]
+        queue = OrderQueue(orders[:3])
+        queue.journal = journal = Journal()
+        expected = list(queue)
+
+        mark = journal.mark()
+        queue.append(orders[3])
+        queue.remove(orders[0])
+        queue.pop("C")
+        queue.pop()
+        queue.append(orders[4])
+        journal.rollback(mark)
+
+        assert queue == expected
+        assert queue.peek("C") is orders[1]
+        assert len(queue) == 3
+
+    def test_cargo_rollback(self):
+        """Test that loads and unloads are undone with the original grouping."""
+        orders = [Order(f"O{i}", "A", "BCD"[i % 3], 0, 100, i + 1) for i in range(6)]
+        cargo = Cargo()
+        for order in orders[:4]:
+            cargo.add(order)
+        cargo.journal = journal = Journal()
+        expected = (list(cargo), cargo.destinations(), cargo.units, len(cargo))
+
+        mark = journal.mark()
+        cargo.pop_destination("C")
+        cargo.remove(orders[3])
+        cargo.remove(orders[0])
+        cargo.add(orders[5])
+        journal.rollback(mark)
+
+        assert (list(cargo), cargo.destinations(), cargo.units, len(cargo)) == expected
+
+    def test_dirty_tracking(self):
+        """Test that changed objects are collected while dirty is a dictionary."""
+        orders = [Order(f"O{i}", "A", "B", 0, 100, 1) for i in range(3)]
+        queue = OrderQueue()
+        queue.journal = journal = Journal()
+        journal.set(orders[0], "status", "RELEASED")
+        assert journal.dirty is None
+
+        journal.dirty = {}
+        journal.set(orders[1], "status", "RELEASED")
+        queue.append(orders[2])
+
+        assert journal.dirty == {id(orders[1]): orders[1], id(queue): queue}
+        assert len(journal) == 0
@@ -0,0 +1,102 @@
+"""
+Unit tests for the KPIAccumulator class.
+"""
+
+import pytest
+from models.arc import Arc
+from models.location import Location
+from models.order import Order
+from models.policy import Policy
+from models.vehicle import Vehicle
+from simulator.kpi import KPIAccumulator
+from simulator.simulator import Simulator
+
+
+class TestKPIAccumulator:
+    """Test cases for the KPIAccumulator class."""
+
+    def test_deliveries(self):
+        """Test on-time and late deliveries."""
+        kpis = KPIAccumulator([Vehicle("V1", 2, "A")])
+        on_time = Order("O1", "A", "B", 0, 50, 3)
+        late = Order("O2", "A", "B", 0, 40, 1)
+        for order in (on_time, late):
+            kpis.on_release(order, 0)
+            kpis.on_load(order, 0)
+        kpis.on_delivery(on_time, 45)
+        kpis.on_delivery(late, 45)
+
+        snapshot = kpis.snapshot()
+
+        assert kpis.results() == {'served_on_time': 1, 'served_late': 1, 'total_late_minutes': 5}
+        assert snapshot['on_time_rate'] == 0.5
+        assert snapshot['mean_lateness'] == 5
+        assert snapshot['units_transported'] == 4
+        assert snapshot['makespan'] == 45
+
+    def test_undelivered_orders_are_not_served(self):
+        """Test that released but undelivered orders are only pending."""
+        kpis = KPIAccumulator()
+        kpis.on_release(Order("O1", "A", "B", 0, 50, 1), 0)
+
+        snapshot = kpis.snapshot(100)
+
+        assert snapshot['served_on_time'] == 0
+        assert snapshot['pending_orders'] == 1
+        assert snapshot['on_time_rate'] == 0
+
+    def test_utilization_and_distance(self):
+        """Test load integrals, capacity utilization and distance per vehicle."""
+        fleet = [Vehicle("V1", 2, "A"), Vehicle("V2", 2, "A")]
+        kpis = KPIAccumulator(fleet)
+        order = Order("O1", "A", "B", 0, 100, 5)
+        kpis.on_load(order, 10)
+        kpis.on_move(fleet[0], 30, 10)
+        kpis.on_delivery(order, 40)
+
+        snapshot = kpis.snapshot(50)
+
+        assert snapshot['unit_minutes'] == 150
+        assert snapshot['capacity_utilization'] == pytest.approx(30 / (4 * 50))
+        assert snapshot['distance_per_vehicle'] == 15
+
+    def test_snapshot_does_not_change_state(self):
+        """Test that mid-run snapshots integrate without updating the counters."""
+        kpis = KPIAccumulator([Vehicle("V1", 1, "A")])
+        kpis.on_load(Order("O1", "A", "B", 0, 100, 2), 0)
+
+        assert kpis.snapshot(10)['unit_minutes'] == 20
+        assert kpis.snapshot(20)['unit_minutes'] == 40
+        assert kpis.unit_minutes == 0
+        assert kpis.last_time == 0
+
+
+class TestSimulatorKPIs:
+    """Test cases for the KPIs collected by the Simulator."""
+
+    def test_unserved_orders_are_not_on_time(self):
+        """Test that orders never delivered are not counted as on time."""
+        locations = {"A": Location("A", 1, 1, 1, 1)}
+        orders = [Order("O1", "A", "B", 0, 100, 1)]
+
+        simulator = Simulator(locations, [], orders, [])
+        results = simulator.run(Policy(locations, []))
+
+        assert results == {'served_on_time': 0, 'served_late': 0, 'total_late_minutes': 0}
+        assert simulator.get_kpis()['pending_orders'] == 1
+
+    def test_kpis_match_orders(self):
+        """Test that the accumulated KPIs match the final order state."""
+        locations = {"A": Location("A", 1, 1, 1, 1), "B": Location("B", 1, 1, 1, 1)}
+        arcs = [Arc("A", "B", 20), Arc("B", "A", 20)]
+        orders = [Order(f"O{i}", "A", "B", 5 * i, 30 + 10 * i, 1) for i in range(6)]
+        fleet = [Vehicle("V1", 2, "A")]
+
+        simulator = Simulator(locations, arcs, orders, fleet)
+        simulator.run(Policy(locations, fleet))
+        kpis = simulator.get_kpis()
+
+        delivered = [order for order in orders if order.delivery_time]
+        assert kpis['served_on_time'] + kpis['served_late'] == len(delivered)
+        assert kpis['total_late_minutes'] == sum(max(0, o.delivery_time - o.due_time) for o in delivered)
+        assert kpis['total_distance'] > 0
@@ -0,0 +1,58 @@
+"""
+Unit tests for the LocalPolicy class.
+"""
+
+import pytest
+from models.arc import Arc
+from models.local_policy import LocalPolicy, ROTATION_PERIOD
+from models.location import Location
+from models.network import Network
+from models.order import Order
+from models.vehicle import Vehicle
+
+
+def make_policy(neighbors=2):
+    """Hub A 10 minutes from B, 20 from C and 60 from D, with a vehicle at A."""
+    locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+    arcs = []
+    for location_id, transit_time in (("B", 10), ("C", 20), ("D", 60)):
+        arcs += [Arc("A", location_id, transit_time), Arc(location_id, "A", transit_time)]
+    fleet = [Vehicle("V1", 2, "A")]
+    return LocalPolicy(locations, fleet, Network(arcs, locations.keys()), neighbors), locations, fleet
+
+
+class TestLocalPolicy:
+    """Test cases for the LocalPolicy class."""
+
+    def test_requires_network(self):
+        """Test that the policy refuses to decide without a network."""
+        locations = {"A": Location("A", 0, 0, 0, 0)}
+        fleet = [Vehicle("V1", 5, "A")]
+
+        with pytest.raises(ValueError):
+            LocalPolicy(locations, fleet).choose_actions(fleet[0], 0)
+
+    def test_rejects_no_neighbors(self):
+        """Test that empty vehicles need at least one neighbor to rotate among."""
+        with pytest.raises(ValueError):
+            LocalPolicy({}, [], neighbors=0)
+
+    def test_heads_for_most_urgent_order(self):
+        """Test that a vehicle loads the most urgent orders and heads for the earliest due."""
+        policy, locations, fleet = make_policy()
+        for order in (Order("O1", "A", "B", 0, 300, 1), Order("O2", "A", "D", 0, 90, 1),
+                      Order("O3", "A", "C", 0, 400, 1)):
+            locations["A"].load_queue.append(order)
+
+        unloads, loads, next_location = policy.choose_actions(fleet[0], 0)
+
+        assert [order.order_id for order in loads] == ["O2", "O1"]
+        assert next_location == "D"
+
+    def test_empty_vehicle_rotates_among_closest(self):
+        """Test that an empty vehicle takes the closest neighbors in turn as time passes."""
+        policy, _, fleet = make_policy()
+
+        destinations = [policy.choose_actions(fleet[0], period * ROTATION_PERIOD)[2] for period in range(4)]
+
+        assert destinations == ["B", "C", "B", "C"]
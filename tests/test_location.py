@@ -20,6 +20,14 @@ class TestLocation:
         assert location.delta == 1
         assert location.load_queue == []
         assert location.unload_queue == []
+        assert location.docks is None
+    
+    def test_location_with_docks(self):
+        """Test that a number of docks creates the location's DockPool."""
+        location = Location("A", 3, 1, 2, 1, docks=4)
+        
+        assert len(location.docks) == 4
+        assert location.docks.next_free() == 0
     
     def test_load_time_calculation(self):
         """Test load time calculation with different unit amounts."""
@@ -0,0 +1,60 @@
+"""
+Unit tests for the Monte Carlo replication runner.
+"""
+
+import os
+
+import pytest
+from models.policy import Policy
+from simulator.monte_carlo import (
+    load_scenario,
+    replication_seeds,
+    run_monte_carlo,
+    run_replication,
+    summarize,
+)
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+class TestMonteCarlo:
+    """Test cases for the Monte Carlo runner."""
+
+    def test_replication_seeds(self):
+        """Test that seeds are reproducible and distinct."""
+        seeds = replication_seeds(42, 50)
+
+        assert seeds == replication_seeds(42, 50)
+        assert len(set(seeds)) == 50
+        assert seeds != replication_seeds(43, 50)
+
+    def test_replication_is_reproducible(self):
+        """Test that a replication only depends on its seed."""
+        data = load_scenario(SCENARIO)
+
+        first = run_replication(data, Policy, 123)
+        second = run_replication(data, Policy, 123)
+
+        assert first == second
+
+    def test_summarize(self):
+        """Test mean and confidence interval of the KPIs."""
+        results = [{'late': 2}, {'late': 4}, {'late': 6}]
+
+        summary = summarize(results)
+
+        assert summary['late']['mean'] == 4
+        assert summary['late']['std'] == 2
+        assert summary['late']['n'] == 3
+        assert summary['late']['ci_low'] == pytest.approx(4 - 1.959964 * 2 / 3 ** 0.5, rel=1e-5)
+        assert summary['late']['ci_high'] == pytest.approx(4 + 1.959964 * 2 / 3 ** 0.5, rel=1e-5)
+        assert summarize([]) == {}
+
+    def test_parallel_matches_serial(self):
+        """Test that the number of workers does not change the results."""
+        serial = run_monte_carlo(SCENARIO, Policy, 6, seed=1, workers=1)
+        parallel = run_monte_carlo(SCENARIO, Policy, 6, seed=1, workers=2)
+
+        assert parallel['seeds'] == serial['seeds']
+        assert parallel['replications'] == serial['replications']
+        assert set(serial['summary']) == {'served_on_time', 'served_late', 'total_late_minutes'}
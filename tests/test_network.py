@@ -0,0 +1,139 @@
+"""
+Unit tests for the Network class.
+"""
+
+import math
+import random
+
+import pytest
+from models.arc import Arc
+from models.location import Location
+import models.network as network_module
+from models.network import NETWORK_CACHE_SIZE, Network
+from models.policy import Policy
+from models.vehicle import Vehicle
+
+
+class TestNetwork:
+    """Test cases for the Network class."""
+
+    def sample_arcs(self):
+        """Arcs of the sample scenario in simulation_inputs.json."""
+        return [
+            Arc("A", "B", 30),
+            Arc("B", "C", 25),
+            Arc("C", "D", 20),
+            Arc("D", "A", 35),
+            Arc("A", "C", 45),
+            Arc("B", "D", 40)
+        ]
+
+    def test_shortest_travel_times(self):
+        """Test shortest transit times through intermediate locations."""
+        network = Network(self.sample_arcs())
+
+        assert network.travel_time("A", "A") == 0
+        assert network.travel_time("A", "B") == 30
+        assert network.travel_time("A", "C") == 45
+        assert network.travel_time("A", "D") == 65  # A -> C -> D
+        assert network.travel_time("B", "A") == 75  # B -> D -> A
+
+    def test_next_hop_and_path(self):
+        """Test next-hop table and path reconstruction."""
+        network = Network(self.sample_arcs())
+
+        assert network.next_hop("B", "A") == "D"
+        assert network.path("A", "D") == ["A", "C", "D"]
+        assert network.path("C", "C") == ["C"]
+
+    def test_unreachable_locations(self):
+        """Test lookups between disconnected locations."""
+        network = Network([Arc("A", "B", 30)], ["A", "B", "C"])
+
+        assert math.isinf(network.travel_time("B", "A"))
+        assert network.next_hop("B", "A") is None
+        assert network.path("B", "A") == []
+        assert math.isinf(network.travel_time("A", "Z"))
+
+    def test_methods_agree(self):
+        """Test that Floyd-Warshall and Dijkstra produce the same times."""
+        rng = random.Random(7)
+        ids = [f"L{i}" for i in range(30)]
+        arcs = [
+            Arc(rng.choice(ids), rng.choice(ids), rng.randint(1, 60))
+            for _ in range(90)
+        ]
+
+        floyd = Network(arcs, ids, method="floyd-warshall")
+        dijkstra = Network(arcs, ids, method="dijkstra")
+
+        assert (floyd.times == dijkstra.times).all()
+        for origin in ids:
+            for destination in ids:
+                path = dijkstra.path(origin, destination)
+                if path:
+                    total = sum(
+                        dijkstra.travel_time(a, b) for a, b in zip(path, path[1:])
+                    )
+                    assert total == floyd.travel_time(origin, destination)
+
+    def test_unknown_method(self):
+        """Test that an unknown shortest-path method is rejected."""
+        with pytest.raises(ValueError):
+            Network([], method="bellman-ford")
+
+    def test_from_arcs_cache(self):
+        """Test that networks with the same arcs are only computed once."""
+        first = Network.from_arcs(self.sample_arcs(), ["A", "B", "C", "D"])
+        second = Network.from_arcs(list(reversed(self.sample_arcs())), ["A", "B", "C", "D"])
+        other = Network.from_arcs([Arc("A", "B", 10)], ["A", "B"])
+
+        assert first is second
+        assert first is not other
+
+    def test_from_arcs_cache_is_bounded(self):
+        """Test that only the most recently used networks stay cached."""
+        oldest = Network.from_arcs([Arc("A", "B", 100)], ["A", "B"])
+        recent = Network.from_arcs([Arc("A", "B", 101)], ["A", "B"])
+        for transit_time in range(102, 102 + NETWORK_CACHE_SIZE - 1):
+            Network.from_arcs([Arc("A", "B", transit_time)], ["A", "B"])
+            # Usar a rede a mantém entre as mais recentes
+            assert Network.from_arcs([Arc("A", "B", 101)], ["A", "B"]) is recent
+
+        assert len(network_module._network_cache) == NETWORK_CACHE_SIZE
+        assert Network.from_arcs([Arc("A", "B", 101)], ["A", "B"]) is recent
+        assert Network.from_arcs([Arc("A", "B", 100)], ["A", "B"]) is not oldest
+
+    def test_restrict(self):
+        """Test that a restricted network keeps the lookups from its origins only."""
+        network = Network(self.sample_arcs())
+        restricted = network.restrict(["B", "A", "Z"])
+
+        assert restricted.times.shape == (2, 4)
+        assert restricted.rows == {"B": 0, "A": 1}
+        assert restricted.travel_time("B", "A") == 75
+        assert restricted.path("A", "D") == []
+        assert restricted.path("B", "A") == []
+        assert set(restricted.reachable_from("A")) == {"A", "B", "C", "D"}
+        assert math.isinf(restricted.travel_time("C", "D"))
+
+    def test_reachable_from(self):
+        """Test reachable locations, excluding pass-through nodes."""
+        network = Network([Arc("A", "B", 5), Arc("B", "X", 5), Arc("X", "C", 5)], ["A", "B", "C"])
+
+        assert set(network.reachable_from("A")) == {"A", "B", "C"}
+        assert network.reachable_from("C") == ("C",)
+
+    def test_policy_uses_network(self):
+        """Test that the policy only picks reachable locations."""
+        locations = {
+            "A": Location("A", 1, 1, 1, 1),
+            "B": Location("B", 1, 1, 1, 1),
+            "C": Location("C", 1, 1, 1, 1)
+        }
+        network = Network([Arc("A", "B", 10)], locations.keys())
+        policy = Policy(locations, [Vehicle("V1", 5, "A")], network)
+
+        for _ in range(20):
+            assert policy.get_next_location("A") in ("A", "B")
+            assert policy.get_next_location("B") == "B"
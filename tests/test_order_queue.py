@@ -0,0 +1,117 @@
+"""
+Unit tests for the OrderQueue class.
+"""
+
+import random
+
+import pytest
+from models.order import Order
+from models.order_queue import OrderQueue
+
+
+class TestOrderQueue:
+    """Test cases for the OrderQueue class."""
+
+    def test_empty_queue(self):
+        """Test an empty queue."""
+        queue = OrderQueue()
+
+        assert len(queue) == 0
+        assert queue == []
+        assert queue.pop() is None
+        assert queue.peek("A") is None
+        assert queue.urgent(5) == []
+
+    def test_iteration_in_urgency_order(self):
+        """Test that orders are iterated by due time, then release time."""
+        o1 = Order("O1", "A", "B", 10, 200, 1)
+        o2 = Order("O2", "A", "C", 0, 100, 1)
+        o3 = Order("O3", "A", "B", 5, 100, 1)
+        queue = OrderQueue([o1, o2, o3])
+
+        assert list(queue) == [o2, o3, o1]
+        assert queue[0] is o2
+        assert queue[2] is o1
+        assert queue[-1] is o1
+        with pytest.raises(IndexError):
+            queue[3]
+
+    def test_pop_by_destination(self):
+        """Test popping the most urgent order heading to a destination."""
+        o1 = Order("O1", "A", "B", 0, 300, 1)
+        o2 = Order("O2", "A", "C", 0, 100, 1)
+        o3 = Order("O3", "A", "B", 0, 200, 1)
+        queue = OrderQueue([o1, o2, o3])
+
+        assert queue.pop("B") is o3
+        assert queue.pop() is o2
+        assert queue.pop("C") is None
+        assert list(queue) == [o1]
+        assert queue.destinations() == ["B"]
+
+    def test_remove(self):
+        """Test removing orders from the queue."""
+        o1 = Order("O1", "A", "B", 0, 100, 1)
+        o2 = Order("O2", "A", "B", 0, 200, 1)
+        queue = OrderQueue([o1, o2])
+
+        queue.remove(o1)
+
+        assert o1 not in queue
+        assert o2 in queue
+        assert queue.peek("B") is o2
+        with pytest.raises(ValueError):
+            queue.remove(o1)
+
+    def test_urgent_released_orders(self):
+        """Test querying released orders heading to a destination."""
+        orders = [
+            Order("O1", "A", "B", 0, 100, 1),
+            Order("O2", "A", "B", 50, 90, 1),
+            Order("O3", "A", "C", 0, 80, 1),
+            Order("O4", "A", "B", 10, 150, 1)
+        ]
+        queue = OrderQueue(orders)
+
+        assert queue.urgent(2, destination="B", now=20) == [orders[0], orders[3]]
+        assert queue.urgent(1, now=60) == [orders[2]]
+
+    def test_matches_sorted_list_after_many_operations(self):
+        """Test the queue against a sorted list under random operations."""
+        rng = random.Random(3)
+        queue = OrderQueue()
+        reference = []
+        for i in range(2000):
+            if reference and rng.random() < 0.4:
+                order = rng.choice(reference)
+                reference.remove(order)
+                queue.remove(order)
+            else:
+                order = Order(f"O{i}", "A", rng.choice("BCD"), rng.randint(0, 50), rng.randint(0, 500), 1)
+                reference.append(order)
+                queue.append(order)
+
+        def key(order):
+            return order.due_time, order.release_time
+
+        assert len(queue) == len(reference)
+        assert [key(order) for order in queue] == sorted(key(order) for order in reference)
+        for destination in "BCD":
+            expected = sorted(key(order) for order in reference if order.destination == destination)
+            assert [key(order) for order in queue.iter_urgent(destination)] == expected
+
+    def test_state_round_trip(self):
+        """Test that set_state rebuilds the same queue, ties and destinations included."""
+        orders = [Order(f"O{i}", "A", "BCD"[i % 3], 0, 100 if i % 2 else 50, 1) for i in range(8)]
+        queue = OrderQueue(orders)
+        queue.remove(orders[1])
+        queue.pop("C")
+
+        copy = OrderQueue()
+        copy.set_state(queue.state())
+        copy.append(Order("O8", "A", "B", 0, 50, 1))
+        queue.append(Order("O8", "A", "B", 0, 50, 1))
+
+        assert [order.order_id for order in copy] == [order.order_id for order in queue]
+        assert copy.destinations() == queue.destinations()
+        assert copy.state()[1] == queue.state()[1]
@@ -0,0 +1,158 @@
+"""
+Unit tests for the partition module.
+"""
+
+import math
+import random
+
+import pytest
+from models.arc import Arc
+from models.local_policy import LocalPolicy
+from models.rollout_policy import RolloutPolicy
+from scenario.builders import build_simulation_data
+from simulator.partition import PartitionedSimulator, lookahead, partition_locations
+from simulator.simulator import Simulator
+
+
+def make_scenario(n_clusters=3, docks=None, n_orders=200):
+    """Rings of four locations 5 to 10 minutes apart whose hubs are 40 to 50 minutes apart."""
+    rng = random.Random(11)
+    clusters = [[f"{name}{i}" for i in range(4)] for name in "XYZW"[:n_clusters]]
+    location_ids = [location_id for cluster in clusters for location_id in cluster]
+    locations = {
+        location_id: {'location_id': location_id, 'base_load': 2, 'gamma': 1, 'base_unload': 1, 'delta': 1,
+                      'docks': docks}
+        for location_id in location_ids
+    }
+    arcs = []
+    for cluster in clusters:
+        for a, b in zip(cluster, cluster[1:] + cluster[:1]):
+            transit_time = rng.randint(5, 10)
+            arcs += [{'from_location': a, 'to_location': b, 'transit_time': transit_time},
+                     {'from_location': b, 'to_location': a, 'transit_time': transit_time}]
+    for c, cluster in enumerate(clusters):
+        following = clusters[(c + 1) % len(clusters)]
+        arcs += [{'from_location': cluster[0], 'to_location': following[0], 'transit_time': 40 + 5 * c},
+                 {'from_location': following[0], 'to_location': cluster[0], 'transit_time': 40 + 5 * c}]
+    orders = []
+    for i in range(n_orders):
+        origin, destination = rng.sample(location_ids, 2)
+        release_time = rng.randrange(0, 400)
+        orders.append({'order_id': f"O{i}", 'origin': origin, 'destination': destination,
+                       'release_time': release_time, 'due_time': release_time + rng.randrange(40, 200),
+                       'units': rng.randrange(1, 4)})
+    fleet = [{'vehicle_id': f"V{i}", 'capacity': 3, 'start_location': location_ids[i % len(location_ids)]}
+             for i in range(8)]
+    return {'locations': locations, 'arcs': arcs, 'orders': orders, 'fleet': fleet}
+
+
+def state(orders, fleet):
+    """Observable state of the orders and vehicles of a finished simulation."""
+    return (
+        [(order.status, order.delivery_time) for order in orders],
+        [(vehicle.current_location, vehicle.available_at, [order.order_id for order in vehicle.load])
+         for vehicle in fleet],
+    )
+
+
+class TestPartitionLocations:
+    """Test cases for partition_locations and lookahead."""
+
+    def test_cuts_the_long_arcs(self):
+        """Test that clusters joined by long arcs end up in regions of their own."""
+        data = make_scenario()
+        _, arcs, _, _ = build_simulation_data(data)
+
+        regions = partition_locations(data['locations'], arcs, 3)
+
+        assert sorted(set(regions.values())) == [0, 1, 2]
+        for cluster in "XYZ":
+            assert len({regions[f"{cluster}{i}"] for i in range(4)}) == 1
+        assert lookahead(arcs, regions) == 40
+
+    def test_merges_down_to_the_number_of_regions(self):
+        """Test that fewer regions merge neighboring clusters and one region holds everything."""
+        data = make_scenario()
+        _, arcs, _, _ = build_simulation_data(data)
+
+        assert len(set(partition_locations(data['locations'], arcs, 2).values())) == 2
+        regions = partition_locations(data['locations'], arcs, 1)
+        assert set(regions.values()) == {0}
+        assert lookahead(arcs, regions) == math.inf
+
+    def test_route_through_nodes_get_a_region(self):
+        """Test that arc endpoints that are not locations are assigned too."""
+        arcs = [Arc("A", "J", 2.5), Arc("J", "B", 3), Arc("B", "C", 50)]
+
+        regions = partition_locations(["A", "B", "C"], arcs, 2)
+
+        assert set(regions) == {"A", "B", "C", "J"}
+        assert regions["A"] == regions["J"] == regions["B"] != regions["C"]
+
+    def test_rejects_no_regions(self):
+        """Test that at least one region is required."""
+        with pytest.raises(ValueError):
+            partition_locations(["A"], [], 0)
+
+
+class TestPartitionedSimulator:
+    """Test cases for the PartitionedSimulator class."""
+
+    @pytest.mark.parametrize("n_workers,docks", [(2, None), (3, None), (3, 1)])
+    def test_matches_single_process(self, n_workers, docks):
+        """Test that a run split across processes gives the same results and state as one Simulator."""
+        data = make_scenario(docks=docks)
+        locations, arcs, orders, fleet = build_simulation_data(data)
+        simulator = Simulator(locations, arcs, orders, fleet, horizon=600)
+        expected = simulator.run(LocalPolicy(locations, fleet))
+
+        partitioned = PartitionedSimulator(data, LocalPolicy, n_workers, horizon=600)
+        results = partitioned.run()
+
+        assert partitioned.lookahead == 40
+        assert partitioned.windows > 1
+        assert results == expected
+        assert state(partitioned.orders, partitioned.fleet) == state(orders, fleet)
+        assert vars(partitioned.kpis) == vars(simulator.kpis)
+
+    def test_given_regions(self):
+        """Test that regions can be given instead of computed."""
+        data = make_scenario(n_clusters=2, n_orders=60)
+        locations, arcs, orders, fleet = build_simulation_data(data)
+        expected = Simulator(locations, arcs, orders, fleet).run(LocalPolicy(locations, fleet))
+        regions = {location_id: int(location_id[1]) % 2 for location_id in data['locations']}
+
+        partitioned = PartitionedSimulator(data, "models.local_policy:LocalPolicy", 2, regions=regions)
+
+        assert partitioned.lookahead == min(arc['transit_time'] for arc in data['arcs']
+                                            if regions[arc['from_location']] != regions[arc['to_location']])
+        assert partitioned.run() == expected
+
+    def test_lookahead_policy_keeps_vehicles_in_one_region(self):
+        """Test that vehicles sent away during rollouts are taken back with the rollout."""
+        data = make_scenario(n_clusters=2, n_orders=60)
+        params = {'time_budget': None, 'max_rounds': 1, 'rollout_horizon': 60}
+
+        partitioned = PartitionedSimulator(data, RolloutPolicy, 2, horizon=240, policy_params=params)
+        results = partitioned.run()
+
+        on_board = [order.order_id for vehicle in partitioned.fleet for order in vehicle.load]
+        assert len(on_board) == len(set(on_board)) == partitioned.kpis.orders_on_board
+        assert results['served_on_time'] + results['served_late'] + len(on_board) <= partitioned.kpis.total_orders
+
+    def test_workers_only_get_their_region(self):
+        """Test that a worker is given the orders and vehicles of its region and the rows of its locations."""
+        data = make_scenario(n_clusters=2, n_orders=60)
+        regions = {location_id: location_id[0] for location_id in data['locations']}
+        partitioned = PartitionedSimulator(data, LocalPolicy, 2, regions=regions)
+        region = frozenset(location_id for location_id in data['locations'] if location_id[0] == "X")
+
+        region_data, order_keys, vehicle_keys = partitioned.region_data(region)
+        network = partitioned.network.restrict(region)
+
+        assert order_keys == [index for index, order in enumerate(data['orders']) if order['origin'] in region]
+        assert region_data['orders'] == [data['orders'][index] for index in order_keys]
+        assert vehicle_keys == [0, 1, 2, 3]
+        assert [vehicle['start_location'] for vehicle in region_data['fleet']] == ["X0", "X1", "X2", "X3"]
+        assert network.times.shape == (4, 8)
+        assert network.travel_time("X0", "Y0") == partitioned.network.travel_time("X0", "Y0")
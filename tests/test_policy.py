@@ -199,4 +199,21 @@ class TestPolicy:
             
             assert isinstance(unloads, list)
             assert isinstance(loads, list)
-            assert next_location in locations.keys() 
\ No newline at end of file
+            assert next_location in locations.keys()
+    
+    def test_choose_actions_batch_default(self):
+        """Test that the default batch decides each vehicle with choose_actions."""
+        locations = {
+            "A": Location("A", 1, 1, 1, 1),
+            "B": Location("B", 1, 1, 1, 1)
+        }
+        fleet = [Vehicle("V1", 5, "A"), Vehicle("V2", 5, "B")]
+        policy = Policy(locations, fleet)
+        
+        decisions = list(policy.choose_actions_batch(fleet, 0))
+        
+        assert len(decisions) == 2
+        for unloads, loads, next_location in decisions:
+            assert unloads == []
+            assert loads == []
+            assert next_location in locations
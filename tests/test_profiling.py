@@ -0,0 +1,89 @@
+"""
+Unit tests for the profiling mode.
+"""
+
+import os
+import random
+import time
+
+import pytest
+from main import load_simulation_data
+from models.policy import Policy
+from simulator.profiling import SamplingProfiler, profile_run
+from simulator.simulator import Simulator
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+def busy(seconds):
+    """Spin for a while so the sampler catches this frame."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def make_run(horizon=480):
+    """Simulator and policy of the sample scenario."""
+    random.seed(0)
+    locations, arcs, orders, fleet = load_simulation_data(SCENARIO)
+    return Simulator(locations, arcs, orders, fleet, horizon), Policy(locations, fleet)
+
+
+def read_collapsed(path):
+    """Parse a collapsed stacks file."""
+    stacks = {}
+    with open(path) as file:
+        for line in file:
+            stack, weight = line.rsplit(" ", 1)
+            stacks[tuple(stack.split(";"))] = int(weight)
+    return stacks
+
+
+class TestProfiling:
+    """Test cases for the profiling mode."""
+
+    def test_sampling_profiler(self):
+        """Test that samples hold the full stack, outermost frame first."""
+        with SamplingProfiler(interval=0.001) as profiler:
+            busy(0.05)
+
+        assert profiler.stacks
+        stack = max(profiler.stacks, key=profiler.stacks.get)
+        assert f"{__name__}:busy" in stack
+        assert stack.index(f"{__name__}:test_sampling_profiler") < stack.index(f"{__name__}:busy")
+
+    def test_cprofile_mode(self, tmp_path):
+        """Test the reports of a cProfile run."""
+        # Horizonte longo: a política precisa acumular ao menos um microssegundo por pilha
+        simulator, policy = make_run(horizon=20000)
+        expected = simulator.run(policy)
+        simulator, policy = make_run(horizon=20000)
+
+        profile = profile_run(simulator, policy, str(tmp_path), mode="cprofile")
+
+        assert profile["results"] == expected
+        assert set(profile["files"]) == {"collapsed", "allocations", "pstats"}
+        stacks = read_collapsed(profile["files"]["collapsed"])
+        assert stacks
+        assert all(stack[0] == "simulator.simulator:run" for stack in stacks)
+        assert any("models.policy:choose_actions" in stack for stack in stacks)
+        with open(profile["files"]["allocations"]) as file:
+            report = file.read()
+        for module in ("models.vehicle", "models.policy", "simulator.simulator"):
+            assert f"\n{module}\n" in report
+
+    def test_sampling_mode(self, tmp_path):
+        """Test that a sampling run writes its reports."""
+        simulator, policy = make_run()
+
+        profile = profile_run(simulator, policy, str(tmp_path / "out"), mode="sampling")
+
+        assert os.path.exists(profile["files"]["collapsed"])
+        assert profile["peak_memory"] > 0
+
+    def test_unknown_mode(self, tmp_path):
+        """Test that an unknown mode is refused."""
+        simulator, policy = make_run()
+
+        with pytest.raises(ValueError):
+            profile_run(simulator, policy, str(tmp_path), mode="perf")
@@ -0,0 +1,101 @@
+"""
+Unit tests for the RolloutPolicy class.
+"""
+
+import random
+
+import pytest
+from models.arc import Arc
+from models.location import Location
+from models.order import Order
+from models.rollout_policy import RolloutPolicy
+from models.vehicle import Vehicle
+from simulator.simulator import Simulator
+
+
+def star_instance(n_orders=0):
+    """Hub A linked to B, C and D, with random orders between the four locations."""
+    locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+    arcs = []
+    for location_id in "BCD":
+        arcs += [Arc("A", location_id, 10), Arc(location_id, "A", 10)]
+    rng = random.Random(0)
+    orders = []
+    for i in range(n_orders):
+        release = rng.randint(0, 200)
+        orders.append(Order(f"O{i}", *rng.sample("ABCD", 2), release, release + rng.randint(30, 120), 1))
+    return locations, arcs, orders
+
+
+class TestRolloutPolicy:
+    """Test cases for the RolloutPolicy class."""
+
+    def test_requires_simulator(self):
+        """Test that the policy refuses to decide outside of a simulation."""
+        locations, _, _ = star_instance()
+        fleet = [Vehicle("V1", 5, "A")]
+
+        with pytest.raises(ValueError):
+            RolloutPolicy(locations, fleet).choose_actions(fleet[0], 0)
+
+    def test_heads_for_deliveries(self):
+        """Test that rollouts send a loaded vehicle to the destination of its order."""
+        locations, arcs, _ = star_instance()
+        orders = [Order("O1", "A", "B", 0, 15, 1)]
+        fleet = [Vehicle("V1", 5, "A")]
+        policy = RolloutPolicy(locations, fleet, time_budget=None, max_rounds=4)
+
+        random.seed(0)
+        results = Simulator(locations, arcs, orders, fleet, horizon=30).run(policy)
+
+        assert orders[0].delivery_time == 10
+        assert results['served_on_time'] == 1
+
+    def test_candidates(self):
+        """Test that destinations on board come before pending origins and staying put."""
+        locations, arcs, _ = star_instance()
+        fleet = [Vehicle("V1", 5, "A")]
+        simulator = Simulator(locations, arcs, [], fleet)
+        policy = RolloutPolicy(locations, fleet, network=simulator.network, max_candidates=3)
+        fleet[0].load_order(Order("O1", "A", "C", 0, 50, 1))
+        locations["D"].load_queue.append(Order("O2", "D", "B", 0, 20, 1))
+        locations["B"].load_queue.append(Order("O3", "B", "C", 0, 40, 1))
+
+        options = policy.candidates(fleet[0], {location_id: location.load_queue
+                                               for location_id, location in locations.items()})
+
+        assert options == ["C", "D", "A"]
+
+    def test_worker_processes_match_in_process(self):
+        """Test that parallel rollouts pick the same actions as in-process ones."""
+        results = []
+        for workers in (1, 2):
+            locations, arcs, orders = star_instance(40)
+            fleet = [Vehicle("V1", 2, "A"), Vehicle("V2", 2, "B")]
+            policy = RolloutPolicy(locations, fleet, time_budget=None, max_rounds=2, workers=workers)
+            random.seed(0)
+            results.append(Simulator(locations, arcs, orders, fleet, horizon=120).run(policy))
+
+        assert results[0] == results[1]
+
+    def test_workers_are_forked_once_per_run(self):
+        """Test that the worker processes serve every epoch and are stopped by finish."""
+        locations, arcs, orders = star_instance(40)
+        fleet = [Vehicle("V1", 2, "A"), Vehicle("V2", 2, "B")]
+        policy = RolloutPolicy(locations, fleet, time_budget=None, max_rounds=2, workers=2)
+        evaluate = policy.evaluate
+        pids = []
+
+        def spy(*args):
+            rewards = evaluate(*args)
+            if policy._workers:
+                pids.append(tuple(worker.pid for worker, _ in policy._workers))
+            return rewards
+
+        policy.evaluate = spy
+        random.seed(0)
+        Simulator(locations, arcs, orders, fleet, horizon=240).run(policy)
+
+        assert len(pids) > 1
+        assert len(set(pids)) == 1
+        assert policy._workers == []
@@ -0,0 +1,190 @@
+"""
+Unit tests for the route planning classes.
+"""
+
+import math
+import random
+
+from models.arc import Arc
+from models.location import Location
+from models.network import Network
+from models.order import Order
+from models.routing import DELIVERY, PICKUP, Route, RoutePlanner, Stop
+from models.vehicle import Vehicle
+
+
+def line_network(locations):
+    """Line network A - B - C - D with 10 minutes between neighbors."""
+    arcs = []
+    for a, b in zip("ABC", "BCD"):
+        arcs += [Arc(a, b, 10), Arc(b, a, 10)]
+    return Network(arcs, locations.keys())
+
+
+def make_route(capacity=5, start="A"):
+    """Route of a new vehicle on the line network, without handling times."""
+    locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+    vehicle = Vehicle("V1", capacity, start)
+    return Route(vehicle, line_network(locations), locations)
+
+
+class TestRoute:
+    """Test cases for the Route class."""
+
+    def test_evaluate(self):
+        """Test travel cost and lateness of a sequence of stops."""
+        route = make_route()
+        order = Order("O1", "B", "D", 0, 25, 1)
+        route.insert(order, math.inf, 0, 0)
+
+        feasible, cost = route.evaluate()
+
+        # 10 to B, 20 to D, arriving 5 minutes late
+        assert feasible
+        assert cost == 30 + route.lateness_weight * 5
+        assert [stop.kind for stop in route.stops] == [PICKUP, DELIVERY]
+
+    def test_infeasible_sequences(self):
+        """Test deadlines, precedence and capacity."""
+        route = make_route(capacity=1)
+        first = Order("O1", "B", "D", 0, 100, 1)
+        second = Order("O2", "B", "C", 0, 100, 1)
+
+        assert not route.evaluate([Stop(PICKUP, first), Stop(DELIVERY, first, 20)])[0]
+        assert not route.evaluate([Stop(DELIVERY, first, 100), Stop(PICKUP, first)])[0]
+        assert not route.evaluate([
+            Stop(PICKUP, first), Stop(PICKUP, second), Stop(DELIVERY, second, 100), Stop(DELIVERY, first, 100),
+        ])[0]
+
+    def test_best_insertion(self):
+        """Test the cheapest feasible positions of a new order."""
+        route = make_route()
+        route.insert(Order("O1", "B", "D", 0, 100, 1), 100, 0, 0)
+        order = Order("O2", "C", "D", 0, 100, 1)
+
+        added_cost, pickup_index, delivery_index = route.best_insertion(order, 100)
+        route.insert(order, 100, pickup_index, delivery_index)
+
+        # Picking up at C on the way to D costs nothing
+        assert added_cost == 0
+        assert [stop.location_id for stop in route.stops] == ["B", "C", "D", "D"]
+        assert route.best_insertion(Order("O3", "D", "A", 0, 10, 1), 10) is None
+
+    def test_best_insertion_matches_full_evaluation(self):
+        """Test the O(1) slack checks against walking every candidate route."""
+        rng = random.Random(0)
+        location_ids = "ABCDEF"
+        locations = {
+            location_id: Location(location_id, rng.randint(0, 3), rng.randint(0, 2), rng.randint(0, 3), rng.randint(0, 2))
+            for location_id in location_ids
+        }
+        arcs = [Arc(a, b, rng.randint(1, 30)) for a in location_ids for b in location_ids if a != b and rng.random() < 0.6]
+        network = Network(arcs, location_ids)
+
+        for _ in range(300):
+            route = Route(Vehicle("V1", rng.randint(1, 4), rng.choice(location_ids)), network, locations)
+            for k in range(rng.randint(0, 6)):
+                order = Order(f"O{k}", *rng.sample(location_ids, 2), 0, rng.randint(20, 200), rng.randint(1, 3))
+                deadline = order.due_time if rng.random() < 0.6 else math.inf
+                insertion = route.best_insertion(order, deadline)
+                if insertion is not None:
+                    route.insert(order, deadline, insertion[1], insertion[2])
+            order = Order("N", *rng.sample(location_ids, 2), 0, rng.randint(10, 200), 1)
+            deadline = order.due_time if rng.random() < 0.5 else math.inf
+
+            expected = None
+            stops = route.stops
+            for i in range(len(stops) + 1):
+                for j in range(i, len(stops) + 1):
+                    trial = stops[:i] + [Stop(PICKUP, order)] + stops[i:j] + [Stop(DELIVERY, order, deadline)] + stops[j:]
+                    feasible, cost = route.evaluate(trial)
+                    if feasible and (expected is None or cost - route.cost() < expected):
+                        expected = cost - route.cost()
+
+            insertion = route.best_insertion(order, deadline)
+            assert (insertion is None) == (expected is None)
+            if insertion is not None:
+                assert insertion[0] == expected
+
+    def test_schedule_is_updated(self):
+        """Test arrival times, loads and forward slack kept by the route."""
+        route = make_route()
+        route.insert(Order("O1", "B", "D", 0, 45, 1), 45, 0, 0)
+
+        assert route.arrival == [10, 30]
+        assert route.load == [1, 0]
+        assert route.slack == [15, 15]
+
+        route.pop_front()
+        assert route.arrival == [30]
+        assert route.load == [-1]
+
+    def test_relax(self):
+        """Test that deadlines missed after a delay are dropped."""
+        route = make_route()
+        order = Order("O1", "B", "D", 0, 40, 1)
+        route.insert(order, 40, 0, 0)
+        route.restart("A", 30)
+
+        assert not route.evaluate()[0]
+        route.relax()
+        assert route.evaluate() == (True, 30 + route.lateness_weight * 20)
+
+
+class TestRoutePlanner:
+    """Test cases for the RoutePlanner class."""
+
+    def test_plan_inserts_pending_orders(self):
+        """Test that pending orders are spread over the routes."""
+        locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+        fleet = [Vehicle("V1", 5, "A"), Vehicle("V2", 5, "D")]
+        orders = [Order("O1", "A", "B", 0, 100, 1), Order("O2", "D", "C", 0, 100, 1)]
+        for order in orders:
+            locations[order.origin].load_queue.append(order)
+        planner = RoutePlanner(locations, line_network(locations), time_budget=None)
+
+        planner.plan(fleet, 0, {location_id: location.load_queue for location_id, location in locations.items()})
+
+        assert planner.route(fleet[0]).orders(picked=True) == [orders[0]]
+        assert planner.route(fleet[1]).orders(picked=True) == [orders[1]]
+        assert planner.planned[id(orders[0])] is planner.route(fleet[0])
+
+    def test_relocate_improves_plan(self):
+        """Test that local search moves an order to a cheaper route."""
+        locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+        fleet = [Vehicle("V1", 5, "A"), Vehicle("V2", 5, "D")]
+        planner = RoutePlanner(locations, line_network(locations), time_budget=None)
+        order = Order("O1", "D", "C", 0, 500, 1)
+        planner.route(fleet[0]).insert(order, 500, 0, 0)
+        planner.planned[id(order)] = planner.route(fleet[0])
+        planner.route(fleet[1])
+
+        planner.improve()
+
+        assert planner.route(fleet[0]).stops == []
+        assert planner.route(fleet[1]).orders() == [order, order]
+
+    def test_two_opt_improves_route(self):
+        """Test that a wasteful visiting order is reversed."""
+        locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+        fleet = [Vehicle("V1", 5, "A")]
+        planner = RoutePlanner(locations, line_network(locations), time_budget=None)
+        route = planner.route(fleet[0])
+        near = Order("O1", "A", "B", 0, 500, 1)
+        far = Order("O2", "A", "D", 0, 500, 1)
+        route.stops = [Stop(PICKUP, near), Stop(PICKUP, far), Stop(DELIVERY, far, 500), Stop(DELIVERY, near, 500)]
+
+        planner.improve()
+
+        assert [stop.location_id for stop in route.stops] == ["A", "A", "B", "D"]
+
+    def test_time_budget(self):
+        """Test that an exhausted budget leaves orders for the next epoch."""
+        locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABCD"}
+        fleet = [Vehicle("V1", 5, "A")]
+        locations["A"].load_queue.append(Order("O1", "A", "B", 0, 100, 1))
+        planner = RoutePlanner(locations, line_network(locations), time_budget=-1)
+
+        planner.plan(fleet, 0, {location_id: location.load_queue for location_id, location in locations.items()})
+
+        assert planner.planned == {}
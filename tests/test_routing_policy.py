@@ -0,0 +1,53 @@
+"""
+Unit tests for the RoutingPolicy class.
+"""
+
+import pytest
+from models.arc import Arc
+from models.location import Location
+from models.order import Order
+from models.routing_policy import RoutingPolicy
+from models.vehicle import Vehicle
+from simulator.simulator import Simulator
+
+
+class TestRoutingPolicy:
+    """Test cases for the RoutingPolicy class."""
+
+    def test_requires_network(self):
+        """Test that the policy refuses to decide without a network."""
+        locations = {"A": Location("A", 1, 1, 1, 1)}
+        fleet = [Vehicle("V1", 5, "A")]
+
+        with pytest.raises(ValueError):
+            RoutingPolicy(locations, fleet).choose_actions(fleet[0], 0)
+
+    def test_serves_stops_at_current_location(self):
+        """Test that a vehicle loads its planned pickups and heads to its next stop."""
+        locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABC"}
+        arcs = [Arc("A", "B", 10), Arc("B", "A", 10), Arc("B", "C", 10), Arc("C", "B", 10)]
+        orders = [Order("O1", "A", "C", 0, 100, 1), Order("O2", "A", "B", 0, 100, 1)]
+        fleet = [Vehicle("V1", 5, "A")]
+        policy = RoutingPolicy(locations, fleet, time_budget=None)
+
+        simulator = Simulator(locations, arcs, orders, fleet, horizon=1)
+        simulator.run(policy)
+
+        assert sorted(order.order_id for order in fleet[0].load) == ["O1", "O2"]
+        route = policy.planner.route(fleet[0])
+        assert [stop.location_id for stop in route.stops] == ["B", "C"]
+        assert route.start_location == "B"
+        assert route.start_time == 10
+
+    def test_simulation(self):
+        """Test a full simulation with the routing policy."""
+        locations = {location_id: Location(location_id, 1, 1, 1, 1) for location_id in "ABC"}
+        arcs = [Arc("A", "B", 10), Arc("B", "A", 10), Arc("B", "C", 10), Arc("C", "B", 10)]
+        orders = [Order(f"O{i}", "A" if i % 2 else "C", "B", 10 * i, 10 * i + 60, 1) for i in range(10)]
+        fleet = [Vehicle("V1", 2, "B"), Vehicle("V2", 2, "B")]
+
+        simulator = Simulator(locations, arcs, orders, fleet)
+        results = simulator.run(RoutingPolicy(locations, fleet, time_budget=None))
+
+        assert results['served_on_time'] == 10
+        assert results['served_late'] == 0
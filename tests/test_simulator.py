@@ -221,4 +221,232 @@ class TestSimulator:
         for _ in range(3):
             results = simulator.run(policy)
             assert isinstance(results, dict)
-            assert all(key in results for key in ['served_on_time', 'served_late', 'total_late_minutes']) 
\ No newline at end of file
+            assert all(key in results for key in ['served_on_time', 'served_late', 'total_late_minutes'])
+    
+    def test_simulator_only_consults_free_vehicles(self):
+        """Test that the policy is only called when a vehicle becomes free."""
+        locations = {"A": Location("A", 1, 1, 1, 1)}
+        fleet = [Vehicle("V1", 5, "A")]
+        
+        class CountingPolicy(Policy):
+            def __init__(self, locations, fleet):
+                super().__init__(locations, fleet)
+                self.calls = []
+            
+            def choose_actions(self, vehicle, now):
+                self.calls.append(now)
+                return super().choose_actions(vehicle, now)
+        
+        simulator = Simulator(locations, [], [], fleet, horizon=100)
+        policy = CountingPolicy(locations, fleet)
+        simulator.run(policy)
+        
+        # One decision every 30 minutes instead of one per minute
+        assert policy.calls == [0, 30, 60, 90]
+    
+    def test_simulator_releases_orders_at_release_time(self):
+        """Test that orders enter the origin load queue when released."""
+        locations = {"A": Location("A", 1, 1, 1, 1)}
+        order = Order("O1", "A", "B", 50, 100, 1)
+        
+        simulator = Simulator(locations, [], [order], [], horizon=40)
+        simulator.run(Policy(locations, []))
+        assert order not in locations["A"].load_queue
+        
+        simulator = Simulator(locations, [], [order], [], horizon=60)
+        simulator.run(Policy(locations, []))
+        assert order in locations["A"].load_queue
+    
+    def test_simulator_delivers_orders(self):
+        """Test that loaded orders are delivered on arrival at their destination."""
+        locations = {
+            "A": Location("A", 1, 1, 1, 1),
+            "B": Location("B", 1, 1, 1, 1)
+        }
+        orders = [Order("O1", "A", "B", 0, 100, 1)]
+        fleet = [Vehicle("V1", 5, "A"), Vehicle("V2", 5, "A")]
+        
+        class ShuttlePolicy(Policy):
+            def get_next_location(self, current_location):
+                return "B" if current_location == "A" else "A"
+        
+        simulator = Simulator(locations, [Arc("A", "B", 30)], orders, fleet, horizon=60)
+        results = simulator.run(ShuttlePolicy(locations, fleet))
+        
+        # Loaded by the first vehicle only and removed from the queue
+        assert orders[0] not in fleet[1].load
+        assert len(locations["A"].load_queue) == 0
+        assert orders[0].delivery_time == 30
+        assert results['served_on_time'] == 1
+    
+    def test_simulator_batches_free_vehicles(self):
+        """Test that vehicles free at the same time are decided in one batch."""
+        locations = {"A": Location("A", 1, 1, 1, 1)}
+        orders = [Order("O1", "A", "B", 0, 100, 1)]
+        fleet = [Vehicle("V1", 5, "A"), Vehicle("V2", 5, "A")]
+        
+        class BatchPolicy(Policy):
+            def __init__(self, locations, fleet):
+                super().__init__(locations, fleet)
+                self.batches = []
+            
+            def choose_actions_batch(self, vehicles, now, pending=None):
+                self.batches.append((now, [vehicle.vehicle_id for vehicle in vehicles], len(pending["A"])))
+                return super().choose_actions_batch(vehicles, now, pending)
+        
+        simulator = Simulator(locations, [], orders, fleet, horizon=60)
+        policy = BatchPolicy(locations, fleet)
+        simulator.run(policy)
+        
+        # The order released at time 0 is visible to the first batch
+        assert policy.batches == [(0, ["V1", "V2"], 1), (30, ["V1", "V2"], 0)]
+        # The default batch applies each decision before the next vehicle
+        assert orders[0] in fleet[0].load
+        assert orders[0] not in fleet[1].load
+    
+    @pytest.mark.parametrize("extra", [-1, 1])
+    def test_simulator_rejects_batch_of_wrong_size(self, extra):
+        """Test that a batch with fewer or more decisions than free vehicles is rejected."""
+        locations = {"A": Location("A", 1, 1, 1, 1)}
+        fleet = [Vehicle("V1", 5, "A"), Vehicle("V2", 5, "A")]
+        
+        class WrongSizePolicy(Policy):
+            def choose_actions_batch(self, vehicles, now, pending=None):
+                return [([], [], "A")] * (len(vehicles) + extra)
+        
+        simulator = Simulator(locations, [], [], fleet, horizon=60)
+        with pytest.raises(ValueError):
+            simulator.run(WrongSizePolicy(locations, fleet))
+    
+    def _shuttle_simulation(self, columnar=False, docks=None):
+        """Two locations served by shuttling vehicles, with orders released over time."""
+        locations = {
+            "A": Location("A", 1, 1, 1, 1, docks),
+            "B": Location("B", 1, 1, 1, 1, docks)
+        }
+        orders = [Order(f"O{i}", "AB"[i % 2], "BA"[i % 2], 10 * i, 10 * i + 60, 1) for i in range(20)]
+        fleet = [Vehicle("V1", 2, "A"), Vehicle("V2", 1, "B")]
+        
+        class ShuttlePolicy(Policy):
+            def get_next_location(self, current_location):
+                return "B" if current_location == "A" else "A"
+        
+        simulator = Simulator(locations, [Arc("A", "B", 25), Arc("B", "A", 25)], orders, fleet,
+                              horizon=300, columnar=columnar)
+        return simulator, ShuttlePolicy(locations, simulator.fleet)
+    
+    @staticmethod
+    def _state(simulator):
+        """Observable state of a simulation."""
+        return (
+            simulator.current_time,
+            [(order.status, order.delivery_time) for order in simulator.orders],
+            [(vehicle.current_location, vehicle.available_at, list(vehicle.load)) for vehicle in simulator.fleet],
+            {location_id: list(location.load_queue) for location_id, location in simulator.locations.items()},
+            {location_id: sorted(location.docks.state()) for location_id, location in simulator.locations.items()
+             if location.docks is not None},
+            dict(vars(simulator.kpis)),
+        )
+    
+    @pytest.mark.parametrize("columnar,docks", [(False, None), (True, None), (False, 1)])
+    def test_simulator_restore_snapshot(self, columnar, docks):
+        """Test that a restored snapshot replays the same future."""
+        simulator, policy = self._shuttle_simulation(columnar, docks)
+        expected = simulator.run(policy)
+        
+        simulator, policy = self._shuttle_simulation(columnar, docks)
+        simulator.start(policy)
+        simulator.advance(100)
+        before = self._state(simulator)
+        snapshot = simulator.snapshot()
+        
+        for _ in range(2):
+            simulator.advance()
+            assert simulator.get_results() == expected
+            simulator.restore(snapshot)
+            assert self._state(simulator) == before
+        simulator.release(snapshot)
+        assert len(simulator.journal) == 0
+        
+        simulator.advance()
+        assert simulator.get_results() == expected
+    
+    def test_simulator_lookahead(self):
+        """Test candidate decisions explored and discarded inside a lookahead."""
+        simulator, policy = self._shuttle_simulation()
+        simulator.start(policy)
+        simulator.advance(50)
+        before = self._state(simulator)
+        vehicle = simulator.fleet[0]
+        
+        with simulator.lookahead():
+            now = simulator.current_time
+            simulator.apply_decision(vehicle, ([], [], vehicle.current_location))
+            assert vehicle.available_at == now + 30
+            with simulator.lookahead():
+                simulator.advance(200)
+                assert simulator.current_time > 50
+            simulator.advance(120)
+        
+        assert self._state(simulator) == before
+    
+    def test_simulator_snapshot_size(self):
+        """Test that a snapshot only copies one event per vehicle and the next release."""
+        simulator, policy = self._shuttle_simulation()
+        simulator.start(policy)
+        simulator.advance(100)
+        
+        snapshot = simulator.snapshot()
+        
+        assert len(snapshot.events[0]) == len(simulator.fleet) + 1
+        simulator.release(snapshot)
+    
+    def test_simulator_snapshot_with_order_feed(self):
+        """Test that a streaming simulation refuses to fork."""
+        locations = {"A": Location("A", 1, 1, 1, 1)}
+        simulator = Simulator(locations, [], iter([Order("O1", "A", "B", 0, 100, 1)]), [])
+        simulator.start(Policy(locations, []))
+        
+        with pytest.raises(ValueError):
+            simulator.snapshot()
+    
+    def test_simulator_docks_without_contention(self):
+        """Test that service times delay delivery and departure at a dock."""
+        locations = {
+            "A": Location("A", 2, 3, 0, 0, docks=1),
+            "B": Location("B", 0, 0, 4, 5, docks=1)
+        }
+        orders = [Order("O1", "A", "B", 0, 100, 2)]
+        fleet = [Vehicle("V1", 5, "A")]
+        
+        class ShuttlePolicy(Policy):
+            def get_next_location(self, current_location):
+                return "B"
+        
+        simulator = Simulator(locations, [Arc("A", "B", 10)], orders, fleet, horizon=100)
+        simulator.run(ShuttlePolicy(locations, fleet))
+        
+        # Carga de 2 + 3*2 minutos, viagem de 10 e descarga de 4 + 5*2
+        assert orders[0].delivery_time == 8 + 10 + 14
+    
+    def test_simulator_dock_contention(self):
+        """Test that vehicles queue for a busy dock and not for a free one."""
+        def run(docks):
+            locations = {
+                "A": Location("A", 0, 0, 0, 0),
+                "B": Location("B", 0, 0, 10, 0, docks=docks)
+            }
+            orders = [Order(f"O{i}", "A", "B", 0, 100, 1) for i in range(3)]
+            fleet = [Vehicle(f"V{i}", 1, "A") for i in range(3)]
+            
+            class ShuttlePolicy(Policy):
+                def get_next_location(self, current_location):
+                    return "B"
+            
+            Simulator(locations, [Arc("A", "B", 10)], orders, fleet, horizon=100).run(ShuttlePolicy(locations, fleet))
+            return sorted(order.delivery_time for order in orders)
+        
+        assert run(None) == [10, 10, 10]
+        assert run(1) == [20, 30, 40]
+        assert run(2) == [20, 20, 30]
+        assert run(3) == [20, 20, 20]
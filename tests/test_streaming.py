@@ -0,0 +1,101 @@
+"""
+Unit tests for the streaming scenario loader.
+"""
+
+import json
+import os
+import random
+
+import pytest
+from main import load_simulation_data
+from models.order import Order
+from models.policy import Policy
+from scenario.streaming import (
+    in_release_order,
+    iter_order_records,
+    iter_orders,
+    load_simulation_data_streaming,
+    read_scenario_header,
+)
+from simulator.simulator import Simulator
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+class TestStreamingLoader:
+    """Test cases for the streaming loader."""
+
+    def test_records_match_json_load(self):
+        """Test that streamed records match a full json.load, across chunk boundaries."""
+        with open(SCENARIO) as file:
+            expected = json.load(file)["orders"]
+
+        for chunk_size in (1, 7, 64, 1 << 20):
+            assert list(iter_order_records(SCENARIO, chunk_size=chunk_size)) == expected
+
+    def test_header_skips_orders(self):
+        """Test reading locations, arcs and fleet placed after the orders."""
+        with open(SCENARIO) as file:
+            expected = json.load(file)
+
+        header = read_scenario_header(SCENARIO)
+
+        assert "orders" not in header
+        assert header["fleet"] == expected["fleet"]
+        assert header["arcs"] == expected["arcs"]
+        assert header["locations"] == expected["locations"]
+
+    def test_json_lines_feed(self, tmp_path):
+        """Test streaming a JSON Lines order feed."""
+        with open(SCENARIO) as file:
+            records = json.load(file)["orders"]
+        path = tmp_path / "orders.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records) + "\n\n")
+
+        orders = list(iter_orders(str(path)))
+
+        assert [order.order_id for order in orders] == [
+            record["order_id"] for record in sorted(records, key=lambda record: record["release_time"])
+        ]
+        assert all(isinstance(order, Order) for order in orders)
+
+    def test_reorder_window(self):
+        """Test reordering within the window and rejecting later arrivals."""
+        orders = [Order(f"O{t}", "A", "B", t, 100, 1) for t in (5, 1, 3, 2, 8, 6)]
+
+        assert [order.release_time for order in in_release_order(orders, window=3)] == [1, 2, 3, 5, 6, 8]
+        with pytest.raises(ValueError):
+            list(in_release_order(orders, window=1))
+
+    def test_malformed_document(self, tmp_path):
+        """Test that a truncated document raises an error."""
+        path = tmp_path / "broken.json"
+        path.write_text('{"orders": [{"order_id": "O1"}, {"order_id"')
+
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_order_records(str(path), chunk_size=4))
+
+    def test_simulator_pulls_orders_lazily(self):
+        """Test that the simulator gives the same results with streamed orders."""
+        locations, arcs, orders, fleet = load_simulation_data(SCENARIO)
+        orders.sort(key=lambda order: order.release_time)
+        random.seed(5)
+        expected = Simulator(locations, arcs, orders, fleet).run(Policy(locations, fleet))
+
+        locations, arcs, orders, fleet = load_simulation_data_streaming(SCENARIO)
+        simulator = Simulator(locations, arcs, orders, fleet)
+        assert simulator.orders == []
+        random.seed(5)
+        results = simulator.run(Policy(locations, fleet))
+
+        assert results == expected
+        assert len(simulator.orders) == 6
+
+    def test_simulator_rejects_unsorted_feed(self):
+        """Test that an unsorted order feed is reported."""
+        locations, arcs, _, fleet = load_simulation_data(SCENARIO)
+        orders = iter([Order("O1", "A", "B", 50, 100, 1), Order("O2", "A", "B", 10, 100, 1)])
+        simulator = Simulator(locations, arcs, orders, fleet)
+
+        with pytest.raises(ValueError):
+            simulator.run(Policy(locations, fleet))
@@ -0,0 +1,87 @@
+"""
+Unit tests for the parameter sweep harness.
+"""
+
+import csv
+import os
+
+import pytest
+from models.policy import Policy
+from simulator.sweep import (
+    cell_key,
+    engine_files,
+    policy_digest,
+    policy_path,
+    resolve_policy,
+    run_sweep,
+    sweep_grid,
+)
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+class TestSweep:
+    """Test cases for the sweep harness."""
+
+    def test_policy_path_round_trip(self):
+        """Test importing a policy class back from its path."""
+        assert policy_path(Policy) == "models.policy:Policy"
+        assert resolve_policy("models.policy:Policy") is Policy
+
+    def test_grid(self):
+        """Test the cells of a full grid."""
+        cells = sweep_grid([SCENARIO], [Policy], [{}, {"network": None}], [0, 1, 2])
+
+        assert len(cells) == 6
+        assert cells[0] == {"scenario": SCENARIO, "policy": "models.policy:Policy", "params": {}, "seed": 0}
+
+    def test_cell_key(self):
+        """Test that every input of a cell changes its key."""
+        code = policy_digest(Policy)
+        key = cell_key("s", code, {}, 0, 480)
+
+        assert key == cell_key("s", code, {}, 0, 480)
+        assert key != cell_key("t", code, {}, 0, 480)
+        assert key != cell_key("s", "other", {}, 0, 480)
+        assert key != cell_key("s", code, {"a": 1}, 0, 480)
+        assert key != cell_key("s", code, {}, 1, 480)
+        assert key != cell_key("s", code, {}, 0, 240)
+
+    def test_engine_files_cover_every_package(self):
+        """Test that the code digest covers the model, scenario and engine modules."""
+        root = os.path.dirname(SCENARIO)
+        files = {os.path.relpath(path, root) for path in engine_files()}
+
+        for path in ("models/network.py", "models/cargo.py", "models/dock.py", "models/columnar.py",
+                     "scenario/builders.py", "simulator/kpi.py", "simulator/journal.py"):
+            assert path in files
+        assert all(path.endswith(".py") and "__pycache__" not in path for path in files)
+
+    def test_engine_files_walk_subpackages(self, tmp_path):
+        """Test that nested modules are found, in a stable order."""
+        for path in ("models/b.py", "models/a.py", "simulator/sub/c.py", "scenario/data.json",
+                     "models/__pycache__/a.cpython.py", "other/d.py"):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("")
+
+        files = [os.path.relpath(path, tmp_path) for path in engine_files(str(tmp_path))]
+
+        assert files == ["models/a.py", "models/b.py", "simulator/sub/c.py"]
+
+    def test_rerun_uses_cache(self, tmp_path):
+        """Test that a second run reads every cell from the cache."""
+        cells = sweep_grid([SCENARIO], [Policy], seeds=[0, 1, 2])
+        cache_dir = str(tmp_path / "cache")
+        output = str(tmp_path / "results.csv")
+
+        first = run_sweep(cells, cache_dir, output, workers=2)
+        second = run_sweep(cells, cache_dir, workers=1)
+
+        assert not any(row["cached"] for row in first)
+        assert all(row["cached"] for row in second)
+        assert [row["served_late"] for row in first] == [row["served_late"] for row in second]
+
+        with open(output, newline="") as file:
+            table = list(csv.DictReader(file))
+        assert len(table) == 3
+        assert {"scenario", "policy", "params", "seed", "served_on_time"} <= set(table[0])
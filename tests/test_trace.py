@@ -0,0 +1,140 @@
+"""
+Unit tests for the binary trace and its replay.
+"""
+
+import os
+import random
+
+import numpy as np
+import pytest
+from main import load_simulation_data
+from models.dock import DockPool
+from models.order import DELIVERED, Order
+from models.policy import Policy
+from simulator.simulator import Simulator
+from simulator.trace import (
+    RECORD,
+    RECORD_DTYPE,
+    TraceReader,
+    TraceRing,
+    TraceSink,
+    TraceWriter,
+    replay_kpis,
+    replay_results,
+    replay_state,
+)
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+
+
+def make_simulator(trace, n_orders=60, docks=None):
+    """Sample network with random extra orders, recording to a trace."""
+    rng = random.Random(1)
+    locations, arcs, orders, fleet = load_simulation_data(SCENARIO)
+    if docks is not None:
+        for location in locations.values():
+            location.docks = DockPool(docks)
+    for i in range(n_orders):
+        release = rng.randint(0, 300)
+        orders.append(Order(f"X{i}", *rng.sample(list(locations), 2), release, release + rng.randint(30, 200), 1))
+    random.seed(0)
+    return Simulator(locations, arcs, orders, fleet, trace=trace), Policy(locations, fleet)
+
+
+def observed_state(simulator):
+    """Loads, queues, availability and deliveries of a running simulation."""
+    return (
+        {vehicle.vehicle_id: (sorted(order.order_id for order in vehicle.load), vehicle.available_at)
+         for vehicle in simulator.fleet},
+        {location_id: sorted(order.order_id for order in location.load_queue)
+         for location_id, location in simulator.locations.items()},
+        {order.order_id: order.delivery_time for order in simulator.orders if order.status == DELIVERED},
+    )
+
+
+def replayed_state(state):
+    """Same view as observed_state, from replay_state."""
+    return (
+        {vehicle_id: (sorted(vehicle["load"]), vehicle["available_at"]) for vehicle_id, vehicle in state["vehicles"].items()},
+        {location_id: sorted(queue) for location_id, queue in state["queues"].items()},
+        state["delivered"],
+    )
+
+
+class TestTrace:
+    """Test cases for the trace writers and replay."""
+
+    def test_record_layout(self):
+        """Test that records are 21 bytes and map onto the NumPy dtype."""
+        assert RECORD.size == RECORD_DTYPE.itemsize == 21
+        record = np.frombuffer(RECORD.pack(2 ** 40, 3, 7, -1, 2), dtype=RECORD_DTYPE)[0]
+        assert (int(record["time"]), record["kind"], record["vehicle"], record["order"], record["location"]) == \
+            (2 ** 40, 3, 7, -1, 2)
+
+    def test_sink_requires_record(self):
+        """Test that a destination without record cannot be created."""
+        with pytest.raises(TypeError):
+            TraceSink()
+
+    @pytest.mark.parametrize("docks", [None, 1])
+    def test_replay_matches_run(self, tmp_path, docks):
+        """Test that the KPIs and the final state are rebuilt from the trace alone, with or without docks."""
+        path = str(tmp_path / "run.trace")
+        trace = TraceWriter(path, chunk_records=16)
+        simulator, policy = make_simulator(trace, docks=docks)
+        results = simulator.run(policy)
+        trace.close()
+
+        reader = TraceReader(path)
+        assert len(reader.records) == trace.count
+        assert np.all(np.diff(reader.records["time"]) >= 0)
+        assert replay_results(reader) == results
+        assert replay_kpis(reader, simulator.current_time) == simulator.get_kpis()
+        assert replayed_state(replay_state(reader)) == observed_state(simulator)
+
+    @pytest.mark.parametrize("docks", [None, 1])
+    def test_replay_intermediate_state(self, tmp_path, docks):
+        """Test the state rebuilt at an intermediate time."""
+        path = str(tmp_path / "run.trace")
+        trace = TraceWriter(path)
+        simulator, policy = make_simulator(trace, docks=docks)
+        simulator.start(policy)
+        simulator.advance(200)
+        expected = observed_state(simulator)
+        kpis = simulator.get_kpis()
+        simulator.advance()
+        trace.close()
+
+        reader = TraceReader(path)
+        assert replayed_state(replay_state(reader, 199)) == expected
+        assert replay_kpis(reader, 199) == {**kpis, "time": 199}
+
+    def test_ring_keeps_latest_records(self, tmp_path):
+        """Test that the ring buffer holds the most recent records in order."""
+        path = str(tmp_path / "run.trace")
+        trace = TraceWriter(path)
+        simulator, policy = make_simulator(trace)
+        simulator.run(policy)
+        trace.close()
+        ring = TraceRing(capacity=25)
+        simulator, policy = make_simulator(ring)
+        simulator.run(policy)
+
+        full = TraceReader(path).records
+        assert ring.count == len(full)
+        assert np.array_equal(ring.records(), full[-25:])
+        ring.save(str(tmp_path / "ring.trace"))
+        assert np.array_equal(TraceReader(str(tmp_path / "ring.trace")).records, full[-25:])
+
+    def test_lookahead_not_traced(self, tmp_path):
+        """Test that rolled back futures leave no records."""
+        ring = TraceRing(capacity=1000)
+        simulator, policy = make_simulator(ring)
+        simulator.start(policy)
+        simulator.advance(100)
+        count = ring.count
+
+        with simulator.lookahead():
+            simulator.advance(300)
+
+        assert ring.count == count
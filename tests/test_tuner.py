@@ -0,0 +1,58 @@
+"""
+Unit tests for the genetic algorithm tuner.
+"""
+
+import json
+import os
+import random
+
+from simulator.tuner import crossover, evolve, fitness, mutate, random_genome
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation_inputs.json")
+POLICY = "models.weighted_policy:WeightedPolicy"
+BOUNDS = {"urgency_weight": (0, 5), "distance_weight": (0, 5), "load_weight": (0, 5)}
+
+
+class TestTuner:
+    """Test cases for the tuner."""
+
+    def test_fitness(self):
+        """Test that lateness is charged per minute."""
+        assert fitness({"served_on_time": 3, "served_late": 1, "total_late_minutes": 120}) == 2
+
+    def test_operators_respect_bounds(self):
+        """Test that genomes stay within their bounds and precision."""
+        rng = random.Random(0)
+        for _ in range(100):
+            child = mutate(crossover(random_genome(BOUNDS, rng), random_genome(BOUNDS, rng), rng),
+                           BOUNDS, rng, rate=1.0, scale=1.0)
+            for name, (low, high) in BOUNDS.items():
+                assert low <= child[name] <= high
+                assert child[name] == round(child[name], 3)
+
+    def test_memoization(self):
+        """Test that each distinct genome is evaluated once."""
+        result = evolve(SCENARIO, POLICY, BOUNDS, population_size=6, generations=4, workers=1)
+
+        assert len(result["history"]) == 4
+        assert result["evaluations"] < 6 * 4
+        assert set(result["best"]) == set(BOUNDS)
+
+    def test_resume_from_checkpoint(self, tmp_path):
+        """Test that an interrupted run resumes to the same result."""
+        checkpoint = str(tmp_path / "checkpoint.json")
+        expected = evolve(SCENARIO, POLICY, BOUNDS, population_size=6, generations=3, workers=1)
+
+        evolve(SCENARIO, POLICY, BOUNDS, population_size=6, generations=1, workers=1, checkpoint=checkpoint)
+        with open(checkpoint) as file:
+            assert json.load(file)["generation"] == 1
+        resumed = evolve(SCENARIO, POLICY, BOUNDS, population_size=6, generations=3, workers=1,
+                         checkpoint=checkpoint)
+
+        assert resumed == expected
+
+    def test_process_pool(self):
+        """Test that parallel evaluation gives the same result."""
+        kwargs = dict(population_size=4, generations=2, seeds=[0, 1])
+
+        assert evolve(SCENARIO, POLICY, BOUNDS, workers=2, **kwargs) == evolve(SCENARIO, POLICY, BOUNDS, workers=1, **kwargs)
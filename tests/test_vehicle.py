@@ -138,4 +138,44 @@ class TestVehicle:
         vehicle.load_order(Order("order4", "E", "A", 0, 100, 1))
         
         # Check final state
-        assert len(vehicle.load) == 4  # Should exceed capacity, but we're not enforcing it strictly 
\ No newline at end of file
+        assert len(vehicle.load) == 4  # Should exceed capacity, but we're not enforcing it strictly
+    
+    def test_unload_consecutive_orders_for_same_destination(self):
+        """Regression test: no order is skipped when several share a destination."""
+        location = Location("A", 1, 1, 1, 1)
+        vehicle = Vehicle("V010", 5, "A")
+        orders = [Order(f"O{i}", "B", "A", 0, 100, 1) for i in range(4)]
+        other = Order("O9", "B", "C", 0, 100, 1)
+        
+        for order in orders:
+            vehicle.load_order(order)
+        vehicle.load_order(other)
+        
+        unloaded = vehicle.unload(location)
+        
+        assert unloaded == orders
+        assert vehicle.load == [other]
+    
+    def test_load_tracks_units(self):
+        """Test the running total of units on board."""
+        vehicle = Vehicle("V011", 5, "A")
+        vehicle.load_order(Order("O1", "A", "B", 0, 100, 3))
+        vehicle.load_order(Order("O2", "A", "C", 0, 100, 4))
+        vehicle.load_order(Order("O3", "A", "B", 0, 100, 2))
+        
+        assert vehicle.load.units == 9
+        
+        vehicle.unload(Location("B", 1, 1, 1, 1))
+        
+        assert vehicle.load.units == 4
+        assert len(vehicle.load) == 1
+    
+    def test_unit_capacity(self):
+        """Test that unit_capacity limits the units on board."""
+        vehicle = Vehicle("V012", 5, "A", unit_capacity=5)
+        
+        assert vehicle.unit_capacity == 5
+        assert vehicle.load_order(Order("O1", "A", "B", 0, 100, 3)) == True
+        assert vehicle.load_order(Order("O2", "A", "B", 0, 100, 3)) == False
+        assert vehicle.load_order(Order("O3", "A", "B", 0, 100, 2)) == True
+        assert vehicle.load.units == 5
@@ -0,0 +1,50 @@
+"""
+Unit tests for the WeightedPolicy class.
+"""
+
+import pytest
+from models.arc import Arc
+from models.location import Location
+from models.network import Network
+from models.order import Order
+from models.vehicle import Vehicle
+from models.weighted_policy import WeightedPolicy
+
+
+def make_policy(**weights):
+    """Hub A 10 minutes from B and 60 minutes from C, with a vehicle at A."""
+    locations = {location_id: Location(location_id, 0, 0, 0, 0) for location_id in "ABC"}
+    arcs = [Arc("A", "B", 10), Arc("B", "A", 10), Arc("A", "C", 60), Arc("C", "A", 60)]
+    fleet = [Vehicle("V1", 5, "A")]
+    return WeightedPolicy(locations, fleet, Network(arcs, locations.keys()), **weights), locations, fleet
+
+
+class TestWeightedPolicy:
+    """Test cases for the WeightedPolicy class."""
+
+    def test_requires_network(self):
+        """Test that the policy refuses to decide without a network."""
+        locations = {"A": Location("A", 0, 0, 0, 0)}
+        fleet = [Vehicle("V1", 5, "A")]
+
+        with pytest.raises(ValueError):
+            WeightedPolicy(locations, fleet).choose_actions(fleet[0], 0)
+
+    def test_weights_change_the_destination(self):
+        """Test that distance and urgency weights pull towards different locations."""
+        for weights, expected in [({"distance_weight": 10, "urgency_weight": 0}, "B"),
+                                  ({"distance_weight": 0, "urgency_weight": 10}, "C")]:
+            policy, locations, fleet = make_policy(**weights)
+            locations["A"].load_queue.append(Order("O1", "A", "B", 0, 300, 1))
+            locations["A"].load_queue.append(Order("O2", "A", "C", 0, 90, 1))
+
+            unloads, loads, next_location = policy.choose_actions(fleet[0], 0)
+
+            assert len(loads) == 2
+            assert next_location == expected
+
+    def test_stays_without_work(self):
+        """Test that a vehicle with nothing to deliver or pick up stays put."""
+        policy, _, fleet = make_policy()
+
+        assert policy.choose_actions(fleet[0], 0) == ([], [], "A")